@@ -1,4 +1,11 @@
 from .cabinet import CabinetAdmin
 from .sagefemme import SageFemmeAdmin
+from .patient import PatientAdmin
+from .consultation import ConsultationAdmin
+from .etat_recapitulatif import EtatRecapitulatifAdmin
+from .tarif import TarifAdmin
+from .tache import TacheAdmin
+from .grossesse import GrossesseAdmin
+from .audit import JournalAuditAdmin
 
-__all__ = ['CabinetAdmin', 'SageFemmeAdmin']
\ No newline at end of file
+__all__ = ['CabinetAdmin', 'SageFemmeAdmin', 'PatientAdmin', 'ConsultationAdmin', 'EtatRecapitulatifAdmin', 'TarifAdmin', 'TacheAdmin', 'GrossesseAdmin', 'JournalAuditAdmin']
@@ -0,0 +1,29 @@
+from django.contrib import admin
+from core.models.audit import JournalAudit
+
+
+@admin.register(JournalAudit)
+class JournalAuditAdmin(admin.ModelAdmin):
+    """Journal en ajout seul : consultation uniquement"""
+    list_display = ['horodatage', 'objet', 'action', 'champs_modifies', 'utilisateur']
+    list_filter = ['modele', 'action']
+    search_fields = ['objet', 'utilisateur']
+    date_hierarchy = 'horodatage'
+    ordering = ['-horodatage', '-id']
+    
+    readonly_fields = [
+        'horodatage', 'modele', 'objet_id', 'objet', 'action', 'changements', 'utilisateur_id', 'utilisateur',
+    ]
+    
+    @admin.display(description="Champs modifiés")
+    def champs_modifies(self, obj):
+        return ', '.join(obj.changements)
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+    
+    def has_delete_permission(self, request, obj=None):
+        return False
@@ -1,6 +1,7 @@
 from django.contrib import admin
 from django.http import HttpResponseRedirect
 from django.urls import path
+from core.audit import changements_formulaire, journaliser
 from ..models import Cabinet
 
 @admin.register(Cabinet)
@@ -23,7 +24,7 @@ class CabinetAdmin(admin.ModelAdmin):
     
     def has_add_permission(self, request):
         # Disable add if cabinet already exists
-        return not Cabinet.objects.exists()
+        return Cabinet.get_cached() is None
     
     def has_delete_permission(self, request, obj=None):
         # Disable delete permission
@@ -31,12 +32,19 @@ class CabinetAdmin(admin.ModelAdmin):
     
     def changelist_view(self, request, extra_context=None):
         # Redirect to change view if cabinet exists, otherwise to add view
-        if Cabinet.objects.exists():
-            cabinet = Cabinet.objects.first()
+        cabinet = Cabinet.get_cached()
+        if cabinet is not None:
             return HttpResponseRedirect(f'../cabinet/{cabinet.id}/change/')
         else:
             return HttpResponseRedirect('../cabinet/add/')
     
+    def save_model(self, request, obj, form, change):
+        # Audit trail of the changed fields (core.audit)
+        super().save_model(request, obj, form, change)
+        changements = changements_formulaire(form)
+        if changements or not change:
+            journaliser(request.user, obj, 'modification' if change else 'creation', changements)
+    
     def response_add(self, request, obj, post_url_override=None):
         # After adding, redirect to change view
         return HttpResponseRedirect(f'../cabinet/{obj.id}/change/')
@@ -0,0 +1,24 @@
+from django.contrib import admin
+from core.models.consultation import Consultation
+
+
+@admin.register(Consultation)
+class ConsultationAdmin(admin.ModelAdmin):
+    list_display = ['date', 'patient', 'sage_femme', 'type_acte', 'statut', 'montant']
+    list_filter = ['type_acte', 'statut', 'sage_femme']
+    list_select_related = ['patient', 'sage_femme']
+    date_hierarchy = 'date'
+    search_fields = ['patient__nom', 'patient__prenom']
+    autocomplete_fields = ['patient']
+    ordering = ['-date', '-id']
+    
+    fieldsets = (
+        ('Consultation', {
+            'fields': ('date', 'sage_femme', 'patient')
+        }),
+        ('Acte', {
+            'fields': ('type_acte', 'statut', 'motif', 'notes', 'duree_minutes', 'montant')
+        }),
+    )
+    
+    readonly_fields = ['created_at', 'updated_at']
@@ -0,0 +1,20 @@
+from django.contrib import admin
+from core.models.etat_recapitulatif import EtatRecapitulatif
+
+
+@admin.register(EtatRecapitulatif)
+class EtatRecapitulatifAdmin(admin.ModelAdmin):
+    """États générés par `manage.py generer_etats_recapitulatifs` : consultation seule"""
+    list_display = ['mois', 'sage_femme', 'nombre_consultations', 'montant_total', 'updated_at']
+    list_filter = ['mois']
+    list_select_related = ['sage_femme']
+    date_hierarchy = 'mois'
+    ordering = ['-mois', 'sage_femme__nom']
+    
+    readonly_fields = [
+        'mois', 'sage_femme', 'empreinte', 'fichier', 'nombre_consultations',
+        'montant_total', 'created_at', 'updated_at',
+    ]
+    
+    def has_add_permission(self, request):
+        return False
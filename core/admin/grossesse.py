@@ -0,0 +1,40 @@
+from django.contrib import admin
+from django.utils import timezone
+from core.calendrier_grossesse import calendrier, formater_age
+from core.models.grossesse import Grossesse
+
+
+@admin.register(Grossesse)
+class GrossesseAdmin(admin.ModelAdmin):
+    list_display = ['patient', 'date_dernieres_regles', 'terme', 'age_gestationnel', 'sage_femme', 'date_fin']
+    list_filter = ['sage_femme']
+    list_select_related = ['patient', 'sage_femme']
+    date_hierarchy = 'date_dernieres_regles'
+    search_fields = ['patient__nom', 'patient__prenom']
+    autocomplete_fields = ['patient']
+    ordering = ['-date_dernieres_regles']
+    
+    fieldsets = (
+        ('Grossesse', {
+            'fields': ('patient', 'sage_femme')
+        }),
+        ('Datation', {
+            'fields': ('date_dernieres_regles', 'date_terme_echographique', 'terme', 'age_gestationnel')
+        }),
+        ('Suivi', {
+            'fields': ('date_fin',)
+        }),
+    )
+    
+    readonly_fields = ['terme', 'age_gestationnel', 'created_at', 'updated_at']
+    
+    @admin.display(description="Terme")
+    def terme(self, obj):
+        return obj.terme if obj.pk else None
+    
+    @admin.display(description="Âge gestationnel")
+    def age_gestationnel(self, obj):
+        if not obj.pk or obj.date_fin:
+            return '-'
+        age = calendrier(obj.date_dernieres_regles, timezone.localdate(), obj.date_terme_echographique)['age']
+        return formater_age(age) if age >= 0 else '-'
@@ -0,0 +1,28 @@
+from django.contrib import admin
+from core.models.patient import Patient
+
+
+@admin.register(Patient)
+class PatientAdmin(admin.ModelAdmin):
+    list_display = ['nom', 'prenom', 'date_naissance', 'telephone', 'numero_cafat', 'updated_at']
+    search_fields = ['nom', 'prenom', 'numero_cafat']
+    ordering = ['nom', 'prenom']
+    
+    fieldsets = (
+        ('Identité', {
+            'fields': ('nom', 'prenom', 'date_naissance')
+        }),
+        ('Contact', {
+            'fields': ('telephone', 'email')
+        }),
+        ('Adresse', {
+            'fields': ('rue', 'code_postal', 'ville'),
+            'classes': ('collapse',),
+            'description': 'Adresse optionnelle'
+        }),
+        ('Assurance', {
+            'fields': ('numero_cafat',)
+        }),
+    )
+    
+    readonly_fields = ['created_at', 'updated_at']
@@ -1,5 +1,8 @@
 from django.contrib import admin
+from django.db.models import Q
 from django.forms import ModelForm
+from core.audit import changements_formulaire, journaliser
+from core.models.functions import normaliser_recherche
 from core.models.sagefemme import SageFemme
 
 
@@ -128,17 +131,48 @@ class SageFemmeAdmin(admin.ModelAdmin):
         
         return readonly
     
+    def get_search_results(self, request, queryset, search_term):
+        """
+        Recherche indexée : correspondance exacte sur CAFAT/RIDET, sinon
+        recherche par trigrammes sans accents (index core_sagefemme_recherche_trgm)
+        """
+        terme = search_term.strip()
+        if not terme:
+            return queryset, False
+        
+        # Chemin rapide : numéro CAFAT ou RIDET saisi en entier
+        if ' ' not in terme and any(c.isdigit() for c in terme):
+            exacts = queryset.filter(Q(numero_cafat=terme) | Q(ridet=terme))
+            if exacts.exists():
+                return exacts, False
+        
+        queryset = queryset.annotate(texte_recherche=SageFemme.texte_recherche())
+        for mot in normaliser_recherche(terme).split():
+            queryset = queryset.filter(texte_recherche__contains=mot)
+        return queryset, False
+    
     def save_model(self, request, obj, form, change):
-        """Personnalisation de la sauvegarde"""
+        """Sauvegarde journalisée (core.audit) : champs modifiés, avant et après"""
+        super().save_model(request, obj, form, change)
+        
         # Log de l'action
         if change:
-            # Modification
-            pass
+            # Modification : seulement si un champ a changé
+            changements = changements_formulaire(form)
+            if changements:
+                journaliser(request.user, obj, 'modification', changements)
         else:
             # Création
-            pass
-        
-        super().save_model(request, obj, form, change)
+            journaliser(request.user, obj, 'creation', changements_formulaire(form))
+    
+    def delete_model(self, request, obj):
+        journaliser(request.user, obj, 'suppression')
+        super().delete_model(request, obj)
+    
+    def delete_queryset(self, request, queryset):
+        for obj in queryset:
+            journaliser(request.user, obj, 'suppression')
+        super().delete_queryset(request, queryset)
     
     class Media:
         js = ('admin/js/sagefemme_admin.js',)
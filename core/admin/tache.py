@@ -0,0 +1,18 @@
+from django.contrib import admin
+from core.models.tache import Tache
+
+
+@admin.register(Tache)
+class TacheAdmin(admin.ModelAdmin):
+    """Tâches planifiées par l'interface et exécutées par `manage.py run_jobs` : consultation seule"""
+    list_display = ['id', 'nom', 'statut', 'tentatives', 'created_at', 'debut', 'fin']
+    list_filter = ['statut', 'nom']
+    ordering = ['-created_at']
+    
+    readonly_fields = [
+        'nom', 'arguments', 'statut', 'tentatives', 'tentatives_max', 'executer_apres', 'bail_expire',
+        'progression', 'resultat', 'erreur', 'created_at', 'debut', 'fin',
+    ]
+    
+    def has_add_permission(self, request):
+        return False
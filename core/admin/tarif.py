@@ -0,0 +1,20 @@
+from django.contrib import admin
+from core.models.tarif import Tarif
+
+
+@admin.register(Tarif)
+class TarifAdmin(admin.ModelAdmin):
+    """Nomenclature CAFAT : chaque modification recharge l'index des tarifs des workers"""
+    list_display = ['code', 'libelle', 'montant', 'date_debut', 'date_fin']
+    list_filter = ['date_debut', 'date_fin']
+    search_fields = ['code', 'libelle']
+    ordering = ['code', '-date_debut']
+    
+    fieldsets = (
+        ('Acte', {
+            'fields': ('code', 'libelle', 'montant')
+        }),
+        ('Validité', {
+            'fields': ('date_debut', 'date_fin')
+        }),
+    )
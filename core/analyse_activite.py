@@ -0,0 +1,189 @@
+"""
+Analyse d'activité vectorisée (NumPy)
+Les consultations de la période sont chargées en colonnes avec values_list,
+puis toutes les séries sont calculées sur des tableaux, sans boucle par consultation.
+"""
+
+import numpy as np
+from django.core.cache import cache
+from django.db import connection
+
+from core.models import Cabinet, Consultation, SageFemme
+
+
+CACHE_ANALYSE_PREFIX = 'maieutix:analyse:'
+# La version des consultations invalide le résultat ; la durée ne sert qu'au ménage
+DUREE_CACHE_ANALYSE = 24 * 3600
+FENETRE_MOYENNE_MOBILE = 4  # semaines
+
+
+class Colonnes:
+    """Consultations d'une période sous forme de tableaux alignés"""
+
+    def __init__(self, debut, fin, jours, sages_femmes, actes, durees, montants):
+        self.debut = debut
+        self.fin = fin
+        self.jours = jours                  # datetime64[D]
+        self.sages_femmes = sages_femmes    # int64
+        self.actes = actes                  # str
+        self.durees = durees                # float64, nan si non renseignée
+        self.montants = montants            # float64, nan si non renseigné
+
+    def __len__(self):
+        return len(self.jours)
+
+
+def charger_colonnes(debut, fin):
+    """Charge les consultations de [debut, fin[ en une requête, sans instancier de modèle"""
+    lignes = list(
+        Consultation.objects
+        .filter(date__gte=debut, date__lt=fin)
+        .order_by()
+        .values_list('date', 'sage_femme_id', 'type_acte', 'duree_minutes', 'montant')
+    )
+    jours, sages_femmes, actes, durees, montants = list(zip(*lignes)) or [()] * 5
+    return Colonnes(
+        debut, fin,
+        jours=np.array(jours, dtype='datetime64[D]'),
+        sages_femmes=np.array(sages_femmes, dtype=np.int64),
+        actes=np.array(actes, dtype=str),
+        # None devient nan
+        durees=np.array(durees, dtype=np.float64),
+        montants=np.array(montants, dtype=np.float64),
+    )
+
+
+def moyenne_par_groupe(groupes, valeurs, taille):
+    """Moyenne des valeurs renseignées par groupe (nan pour un groupe sans valeur)"""
+    renseignees = ~np.isnan(valeurs)
+    sommes = np.bincount(groupes[renseignees], weights=valeurs[renseignees], minlength=taille)
+    effectifs = np.bincount(groupes[renseignees], minlength=taille)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return sommes / effectifs
+
+
+def en_liste(tableau):
+    """Liste Python, nan remplacé par None (résultat mis en cache et affiché)"""
+    return [None if valeur != valeur else valeur for valeur in np.round(tableau, 2).tolist()]
+
+
+def volumes_hebdomadaires(colonnes):
+    origine = np.datetime64(colonnes.debut, 'D')
+    origine -= (origine.astype(np.int64) + 3) % 7  # lundi de la première semaine (1970-01-01 est un jeudi)
+    nombre_semaines = int((np.datetime64(colonnes.fin, 'D') - origine).astype(np.int64) + 6) // 7
+    semaines = (colonnes.jours - origine).astype(np.int64) // 7
+    volumes = np.bincount(semaines, minlength=nombre_semaines)
+
+    # Moyenne mobile sur les FENETRE_MOYENNE_MOBILE dernières semaines, par sommes cumulées
+    cumul = np.concatenate(([0], np.cumsum(volumes)))
+    fin = np.arange(1, nombre_semaines + 1)
+    debut = np.maximum(fin - FENETRE_MOYENNE_MOBILE, 0)
+    moyennes = (cumul[fin] - cumul[debut]) / (fin - debut)
+
+    lundis = (origine + 7 * np.arange(nombre_semaines)).astype(object)
+    return [
+        {'debut': lundi, 'nombre': nombre, 'moyenne_mobile': moyenne}
+        for lundi, nombre, moyenne in zip(lundis, volumes.tolist(), en_liste(moyennes))
+    ]
+
+
+def saisonnalite(colonnes):
+    """Nombre moyen de consultations par mois calendaire et indice (1 = mois moyen)"""
+    mois_debut = np.datetime64(colonnes.debut, 'M').astype(np.int64)
+    mois_fin = (np.datetime64(colonnes.fin, 'D') - 1).astype('datetime64[M]').astype(np.int64) + 1
+    # Nombre d'occurrences de chaque mois calendaire dans la période
+    occurrences = np.bincount(np.arange(mois_debut, mois_fin) % 12, minlength=12)
+    volumes = np.bincount(colonnes.jours.astype('datetime64[M]').astype(np.int64) % 12, minlength=12)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        moyennes = volumes / occurrences
+        indices = moyennes / (volumes.sum() / occurrences.sum())
+    return [
+        {'mois': mois, 'moyenne': moyenne, 'indice': indice}
+        for mois, moyenne, indice in zip(range(1, 13), en_liste(moyennes), en_liste(indices))
+    ]
+
+
+def durees_par_acte(colonnes):
+    libelles = dict(Consultation.TYPE_ACTE_CHOICES)
+    actes, groupes = np.unique(colonnes.actes, return_inverse=True)
+    nombres = np.bincount(groupes, minlength=len(actes))
+    moyennes = moyenne_par_groupe(groupes, colonnes.durees, len(actes))
+    return [
+        {'type_acte': acte, 'libelle': libelles.get(acte, acte), 'nombre': nombre, 'duree_moyenne': moyenne}
+        for acte, nombre, moyenne in zip(actes.tolist(), nombres.tolist(), en_liste(moyennes))
+    ]
+
+
+def charge_par_sage_femme(colonnes, nombre_semaines):
+    identifiants, groupes = np.unique(colonnes.sages_femmes, return_inverse=True)
+    taille = len(identifiants)
+    nombres = np.bincount(groupes, minlength=taille)
+    montants = np.bincount(groupes, weights=np.nan_to_num(colonnes.montants), minlength=taille)
+    durees = moyenne_par_groupe(groupes, colonnes.durees, taille)
+    par_semaine = nombres / max(nombre_semaines, 1)
+
+    noms = dict(
+        SageFemme.objects.filter(pk__in=identifiants.tolist())
+        .values_list('pk', 'nom')
+        .order_by()
+    )
+    resultats = [
+        {
+            'sage_femme_id': pk, 'nom': noms.get(pk, ''), 'nombre': nombre,
+            'montant_total': montant, 'duree_moyenne': duree, 'par_semaine': semaine,
+        }
+        for pk, nombre, montant, duree, semaine in zip(
+            identifiants.tolist(), nombres.tolist(), en_liste(montants),
+            en_liste(durees), en_liste(par_semaine),
+        )
+    ]
+    return sorted(resultats, key=lambda ligne: -ligne['nombre'])
+
+
+def analyser(colonnes):
+    """Calcule toutes les séries de l'analyse d'activité pour la période chargée"""
+    semaines = volumes_hebdomadaires(colonnes)
+    groupe_unique = np.zeros(len(colonnes), dtype=np.int64)
+    return {
+        'debut': colonnes.debut,
+        'fin': colonnes.fin,
+        'nombre_total': len(colonnes),
+        'montant_total': round(float(np.nansum(colonnes.montants)), 2),
+        'duree_moyenne': en_liste(moyenne_par_groupe(groupe_unique, colonnes.durees, 1))[0],
+        'semaines': semaines,
+        'saisonnalite': saisonnalite(colonnes),
+        'durees_par_acte': durees_par_acte(colonnes),
+        'sages_femmes': charge_par_sage_femme(colonnes, len(semaines)),
+    }
+
+
+def version_consultations():
+    """
+    Version des consultations, incrémentée par un trigger à chaque instruction
+    qui modifie la table (migration 0013) : bulk_create et update() compris
+    """
+    with connection.cursor() as curseur:
+        curseur.execute("SELECT valeur FROM core_version_donnees WHERE nom = 'consultations'")
+        return curseur.fetchone()[0]
+
+
+def analyse_activite(debut, fin):
+    """
+    Analyse de [debut, fin[ mise en cache par cabinet et période.
+    La version des consultations, lue en base avant les données, invalide le
+    résultat dès qu'une consultation est créée, modifiée ou supprimée.
+    """
+    cabinet = Cabinet.get_cached()
+    cle = '{}{}:{}:{}:{}'.format(
+        CACHE_ANALYSE_PREFIX,
+        cabinet.pk if cabinet else 0,
+        debut.isoformat(), fin.isoformat(),
+        version_consultations(),
+    )
+    resultat = cache.get(cle)
+    if resultat is None:
+        resultat = analyser(charger_colonnes(debut, fin))
+        # Une lecture faite dans une transaction peut être annulée : pas de mise en cache
+        if not connection.in_atomic_block:
+            cache.set(cle, resultat, timeout=DUREE_CACHE_ANALYSE)
+    return resultat
@@ -0,0 +1,74 @@
+"""
+Journal d'audit des fiches sages-femmes et cabinet
+Les changements champ par champ (RIB, banque…) sont calculés depuis le
+formulaire de l'administration, sans requête, et mis en tampon : toutes les
+entrées d'une transaction sont écrites ensemble, par un seul INSERT
+multi-lignes, une fois la transaction validée. Une transaction annulée
+n'écrit rien.
+"""
+
+from django.db import connection, transaction
+from django.db.models import Model
+
+from core.models import JournalAudit
+
+
+class TamponAudit:
+    """Entrées en attente d'une transaction, écrites par on_commit"""
+
+    def __init__(self):
+        self.entrees = []
+
+    def __call__(self):
+        entrees, self.entrees = self.entrees, []
+        if entrees:
+            JournalAudit.objects.bulk_create(entrees)
+
+
+def tampon_courant():
+    """
+    Tampon de la transaction (et du point de sauvegarde) en cours, retrouvé
+    parmi les callbacks on_commit : si le bloc est annulé, Django retire le
+    callback et ses entrées avec lui.
+    """
+    points_sauvegarde = set(connection.savepoint_ids)
+    for sids, callback, _ in connection.run_on_commit:
+        if isinstance(callback, TamponAudit) and sids == points_sauvegarde:
+            return callback
+    tampon = TamponAudit()
+    transaction.on_commit(tampon)
+    return tampon
+
+
+def valeur_journal(valeur):
+    """Valeur sérialisable : une fiche liée est journalisée par sa clé"""
+    if isinstance(valeur, Model):
+        return valeur.pk
+    return valeur
+
+
+def changements_formulaire(form):
+    """{champ: [avant, après]} des champs modifiés d'un ModelForm, sans requête"""
+    return {
+        champ: [valeur_journal(form.initial.get(champ)), valeur_journal(form.cleaned_data.get(champ))]
+        for champ in form.changed_data
+    }
+
+
+def journaliser(utilisateur, objet, action, changements=None):
+    """Ajoute une entrée au tampon ; écrite à la validation de la transaction"""
+    entree = JournalAudit(
+        modele=objet._meta.model_name,
+        objet_id=objet.pk,
+        objet=str(objet)[:200],
+        action=action,
+        changements=changements or {},
+        utilisateur_id=getattr(utilisateur, 'pk', None),
+        utilisateur=getattr(utilisateur, 'username', '') or '',
+    )
+    if connection.in_atomic_block:
+        tampon_courant().entrees.append(entree)
+    else:
+        # Hors transaction (autocommit) : rien à attendre
+        entree.save()
+    return entree
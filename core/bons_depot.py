@@ -0,0 +1,183 @@
+"""
+Bons de dépôt des feuilles de soins à la CAFAT
+
+Les feuilles de soins (consultations complètes) du mois sont regroupées par
+titulaire effectif des bons de dépôt (bons_depot_communs), découpées en
+bordereaux de CAFAT_FEUILLES_PAR_BORDEREAU feuilles, puis rendues en flux :
+un PDF unique ou une archive ZIP d'un PDF par titulaire. Les consultations
+sont lues par lots et chaque bordereau est émis dès qu'il est rendu, la
+mémoire reste donc constante quel que soit le volume du mois.
+"""
+
+import math
+import zipfile
+from decimal import Decimal
+from itertools import chain, groupby, islice
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count
+from django.utils import dateformat
+from django.utils.text import slugify
+
+from core.etats_recapitulatifs import formater_montant
+from core.fichiers import TamponFlux
+from core.models import Cabinet, Consultation, SageFemme
+from core.partitions import mois_suivant
+from core.pdf import HAUTEUR_A4, LARGEUR_A4, Page, ecrire_pdf
+
+
+TAILLE_LOT_LECTURE = 500
+
+MARGE = 40
+INTERLIGNE = 16
+COLONNES = (MARGE, MARGE + 65, MARGE + 215, MARGE + 300, MARGE + 410, LARGEUR_A4 - MARGE)
+
+
+class Bordereau:
+    """Un bon de dépôt : au plus CAFAT_FEUILLES_PAR_BORDEREAU feuilles d'un titulaire"""
+
+    def __init__(self, mois, titulaire, numero, nombre_bordereaux, feuilles):
+        self.mois = mois
+        self.titulaire = titulaire
+        self.numero = numero
+        self.nombre_bordereaux = nombre_bordereaux
+        self.feuilles = feuilles
+
+    @property
+    def montant_total(self):
+        return sum((feuille['montant'] for feuille in self.feuilles), Decimal('0'))
+
+
+def _consultations_du_mois(mois):
+    return Consultation.objects.filter(
+        date__gte=mois, date__lt=mois_suivant(mois), statut='complete'
+    )
+
+
+def bordereaux(mois, limite=None):
+    """
+    Génère les bordereaux du mois, titulaire par titulaire.
+    Une requête de comptage, puis une lecture par lots pour chaque titulaire,
+    le tout dans une transaction REPEATABLE READ : le nombre de bordereaux
+    annoncé correspond aux feuilles lues, même si des consultations sont
+    saisies pendant l'envoi du flux.
+    """
+    # Le niveau d'isolation ne peut être choisi que par la transaction la plus externe
+    externe = not connection.in_atomic_block
+    with transaction.atomic():
+        if externe:
+            with connection.cursor() as curseur:
+                curseur.execute('SET TRANSACTION ISOLATION LEVEL REPEATABLE READ')
+        yield from _bordereaux(mois, limite or settings.CAFAT_FEUILLES_PAR_BORDEREAU)
+
+
+def _bordereaux(mois, limite):
+    consultations = _consultations_du_mois(mois)
+    groupes = SageFemme.objects.groupes_facturation(consultations).bons_depot
+    comptes = dict(
+        consultations
+        .order_by()
+        .values('sage_femme_id')
+        .annotate(nombre=Count('id'))
+        .values_list('sage_femme_id', 'nombre')
+    )
+    libelles = dict(Consultation.TYPE_ACTE_CHOICES)
+
+    for titulaire, membres in sorted(groupes.values(), key=lambda g: (g[0].nom, g[0].prenom)):
+        noms = {sf.pk: sf.nom_complet for sf in membres}
+        nombre_feuilles = sum(comptes.get(pk, 0) for pk in noms)
+        if not nombre_feuilles:
+            continue
+
+        lignes = (
+            consultations
+            .filter(sage_femme_id__in=list(noms))
+            .order_by('date', 'id')
+            .values_list(
+                'date', 'sage_femme_id', 'patient__nom', 'patient__prenom',
+                'patient__numero_cafat', 'type_acte', 'montant',
+            )
+            .iterator(chunk_size=TAILLE_LOT_LECTURE)
+        )
+        feuilles = (
+            {
+                'date': date, 'sage_femme': noms[sage_femme_id],
+                'patiente': f"{nom} {prenom}", 'cafat': cafat or '',
+                'acte': libelles.get(type_acte, type_acte), 'montant': montant or Decimal('0'),
+            }
+            for date, sage_femme_id, nom, prenom, cafat, type_acte, montant in lignes
+        )
+        nombre_bordereaux = math.ceil(nombre_feuilles / limite)
+        for numero in range(1, nombre_bordereaux + 1):
+            lot = list(islice(feuilles, limite))
+            if not lot:
+                break
+            yield Bordereau(mois, titulaire, numero, nombre_bordereaux, lot)
+
+
+def rendre_bordereau(bordereau, cabinet=None):
+    """Une page PDF par bordereau"""
+    page = Page()
+    titulaire = bordereau.titulaire
+    y = HAUTEUR_A4 - MARGE
+    if cabinet is not None:
+        page.texte(MARGE, y, cabinet.titre, taille=9)
+    for i, ligne in enumerate([
+        titulaire.nom_complet, f"CAFAT {titulaire.numero_cafat}",
+        f"RIDET {titulaire.ridet}", f"{titulaire.banque} - {titulaire.rib}",
+    ]):
+        page.texte(LARGEUR_A4 - MARGE, y - 11 * i, ligne, taille=9, gras=i == 0, droite=True)
+
+    y -= 70
+    page.texte(MARGE, y, f"Bon de dépôt - {dateformat.format(bordereau.mois, 'F Y')}", taille=14, gras=True)
+    page.texte(
+        LARGEUR_A4 - MARGE, y,
+        f"Bordereau {bordereau.numero} / {bordereau.nombre_bordereaux}", taille=10, droite=True,
+    )
+    y -= 26
+    for x, entete in zip(COLONNES, ('Date', 'Patiente', 'N° CAFAT', 'Acte', 'Sage-femme')):
+        page.texte(x, y, entete, taille=8, gras=True)
+    page.texte(COLONNES[5], y, 'Montant', taille=8, gras=True, droite=True)
+    page.filet(MARGE, y - 4, LARGEUR_A4 - MARGE, y - 4)
+    y -= INTERLIGNE + 2
+
+    for feuille in bordereau.feuilles:
+        valeurs = (
+            f"{feuille['date']:%d/%m/%Y}", feuille['patiente'][:28], feuille['cafat'],
+            feuille['acte'][:22], feuille['sage_femme'][:22],
+        )
+        for x, valeur in zip(COLONNES, valeurs):
+            page.texte(x, y, valeur, taille=8)
+        page.texte(COLONNES[5], y, formater_montant(feuille['montant']), taille=8, droite=True)
+        y -= INTERLIGNE
+
+    page.filet(MARGE, y + INTERLIGNE - 6, LARGEUR_A4 - MARGE, y + INTERLIGNE - 6, epaisseur=1)
+    page.texte(COLONNES[3], y - 4, f"{len(bordereau.feuilles)} feuille(s) de soins", taille=9, gras=True)
+    page.texte(COLONNES[5], y - 4, formater_montant(bordereau.montant_total), taille=9, gras=True, droite=True)
+    return page
+
+
+def flux_pdf(mois, limite=None):
+    """Octets d'un PDF unique regroupant tous les bordereaux du mois"""
+    cabinet = Cabinet.get_cached()
+    pages = (rendre_bordereau(bordereau, cabinet) for bordereau in bordereaux(mois, limite))
+    return ecrire_pdf(pages, titre=f"Bons de dépôt {mois:%m/%Y}")
+
+
+def flux_zip(mois, limite=None):
+    """Octets d'une archive ZIP contenant un PDF de bordereaux par titulaire"""
+    cabinet = Cabinet.get_cached()
+    tampon = TamponFlux()
+    with zipfile.ZipFile(tampon, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for _, lots in groupby(bordereaux(mois, limite), key=lambda bordereau: bordereau.titulaire.pk):
+            premier = next(lots)
+            titulaire = premier.titulaire
+            nom = f"bons-depot-{mois:%Y-%m}-{titulaire.numero_cafat}-{slugify(titulaire.nom)}.pdf"
+            pages = (rendre_bordereau(bordereau, cabinet) for bordereau in chain([premier], lots))
+            with archive.open(nom, 'w') as fichier:
+                for morceau in ecrire_pdf(pages, titre=f"Bons de dépôt {mois:%m/%Y} - {titulaire.nom_complet}"):
+                    fichier.write(morceau)
+                    yield tampon.vider()
+            yield tampon.vider()
+    yield tampon.vider()
@@ -0,0 +1,44 @@
+"""
+Cache applicatif partagé entre les workers
+Tampons de version pour invalider les caches locaux des processus
+"""
+
+import uuid
+
+from django.core.cache import cache
+
+
+VERSION_KEY_PREFIX = 'maieutix:version:'
+
+
+def get_version(nom):
+    """
+    Retourne le tampon de version courant pour `nom`.
+    Le tampon est créé s'il n'existe pas encore dans le cache partagé.
+    """
+    key = VERSION_KEY_PREFIX + nom
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid.uuid4().hex, timeout=None)
+        version = cache.get(key)
+    return version
+
+
+async def aget_version(nom):
+    """Version asynchrone de get_version(), pour les vues async"""
+    key = VERSION_KEY_PREFIX + nom
+    version = await cache.aget(key)
+    if version is None:
+        await cache.aadd(key, uuid.uuid4().hex, timeout=None)
+        version = await cache.aget(key)
+    return version
+
+
+def bump_version(nom):
+    """
+    Change le tampon de version de `nom`.
+    Tous les workers verront la nouvelle version à leur prochaine lecture.
+    """
+    version = uuid.uuid4().hex
+    cache.set(VERSION_KEY_PREFIX + nom, version, timeout=None)
+    return version
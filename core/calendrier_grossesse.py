@@ -0,0 +1,165 @@
+"""
+Calendrier de grossesse vectorisé (NumPy)
+Âge gestationnel, terme et fenêtres des examens du suivi calculés pour toutes
+les grossesses en cours d'un seul passage sur des tableaux de dates : la
+calculatrice (une grossesse) et l'échéancier du cabinet (toutes) partagent
+le même moteur.
+"""
+
+import datetime
+from collections import namedtuple
+
+import numpy as np
+
+from core.models import Grossesse
+from core.models.grossesse import DUREE_TERME
+
+
+Jalon = namedtuple('Jalon', ['code', 'libelle', 'debut', 'fin'])
+
+
+def sa(semaines, jours=0):
+    """Âge gestationnel en jours depuis les dernières règles (semaines d'aménorrhée)"""
+    return 7 * semaines + jours
+
+
+# Examens du suivi : fenêtre [debut, fin[ en jours depuis la DDR (corrigée)
+JALONS = [
+    Jalon('declaration', "Déclaration de grossesse", sa(0), sa(15)),
+    Jalon('echographie_t1', "Échographie du 1er trimestre", sa(11), sa(14)),
+    Jalon('depistage_t21', "Dépistage combiné de la trisomie 21", sa(11), sa(14)),
+    Jalon('echographie_t2', "Échographie du 2e trimestre", sa(20), sa(26)),
+    Jalon('hgpo', "Dépistage du diabète gestationnel (HGPO)", sa(24), sa(29)),
+    Jalon('echographie_t3', "Échographie du 3e trimestre", sa(30), sa(36)),
+    Jalon('anesthesie', "Consultation d'anesthésie", sa(32), sa(37)),
+    Jalon('streptocoque_b', "Prélèvement vaginal (streptocoque B)", sa(34), sa(39)),
+    Jalon('terme', "Terme", DUREE_TERME, DUREE_TERME + 1),
+    Jalon('depassement', "Surveillance du dépassement de terme", DUREE_TERME, sa(42) + 1),
+]
+DEBUTS_JALONS = np.array([jalon.debut for jalon in JALONS], dtype='timedelta64[D]')
+FINS_JALONS = np.array([jalon.fin for jalon in JALONS], dtype='timedelta64[D]')
+
+# Au-delà, une grossesse sans fin de suivi saisie sort de l'échéancier
+AGE_MAX = sa(43)
+# Recul de la lecture de l'échéancier avant le début de la période (termes corrigés)
+RECUL_ECHEANCIER = AGE_MAX + 30
+
+
+def formater_age(jours):
+    """« 12 SA + 3 j »"""
+    semaines, jours = divmod(int(jours), 7)
+    return f"{semaines} SA + {jours} j" if jours else f"{semaines} SA"
+
+
+class Calendriers:
+    """Grossesses sous forme de tableaux alignés"""
+
+    def __init__(self, identifiants, dernieres_regles, termes_corriges):
+        self.identifiants = np.asarray(identifiants, dtype=np.int64)
+        dernieres_regles = np.asarray(dernieres_regles, dtype='datetime64[D]')
+        termes_corriges = np.asarray(termes_corriges, dtype='datetime64[D]')  # None devient NaT
+        # DDR de référence : recalculée depuis le terme corrigé à l'échographie
+        self.references = np.where(
+            np.isnat(termes_corriges), dernieres_regles, termes_corriges - np.timedelta64(DUREE_TERME, 'D')
+        )
+
+    def __len__(self):
+        return len(self.identifiants)
+
+    def ages(self, jour):
+        """Âge gestationnel au jour donné, en jours"""
+        return (np.datetime64(jour, 'D') - self.references).astype(np.int64)
+
+    def termes(self):
+        return self.references + np.timedelta64(DUREE_TERME, 'D')
+
+    def fenetres(self):
+        """Débuts et fins (exclues) des jalons : tableaux (grossesses × jalons)"""
+        references = self.references[:, np.newaxis]
+        return references + DEBUTS_JALONS, references + FINS_JALONS
+
+    def echeances(self, debut, fin):
+        """
+        Jalons dont la fenêtre recoupe [debut, fin[, pour les grossesses en cours
+        au début de la période. Retourne (indices des grossesses, indices des jalons),
+        triés par date d'ouverture de la fenêtre.
+        """
+        debuts, fins = self.fenetres()
+        ages = self.ages(debut)
+        en_cours = (ages >= 0) & (ages < AGE_MAX)
+        dues = (debuts < np.datetime64(fin, 'D')) & (fins > np.datetime64(debut, 'D')) & en_cours[:, np.newaxis]
+        grossesses, jalons = np.nonzero(dues)
+        ordre = np.argsort(debuts[grossesses, jalons], kind='stable')
+        return grossesses[ordre], jalons[ordre]
+
+
+def en_date(valeur):
+    return valeur.astype(object)
+
+
+def calendrier(date_dernieres_regles, jour, date_terme_echographique=None):
+    """Calendrier d'une grossesse : terme, âge gestationnel et jalons au jour donné"""
+    calendriers = Calendriers([0], [date_dernieres_regles], [date_terme_echographique])
+    age = int(calendriers.ages(jour)[0])
+    debuts, fins = calendriers.fenetres()
+    jalons = []
+    for jalon, debut, fin in zip(JALONS, en_date(debuts[0]), en_date(fins[0])):
+        if fin <= jour:
+            etat = 'passe'
+        elif debut <= jour:
+            etat = 'en_cours'
+        else:
+            etat = 'a_venir'
+        jalons.append({'jalon': jalon, 'debut': debut, 'fin': fin - datetime.timedelta(days=1), 'etat': etat})
+    return {
+        'reference': en_date(calendriers.references[0]),
+        'terme': en_date(calendriers.termes()[0]),
+        'age': age,
+        'age_texte': formater_age(age) if age >= 0 else None,
+        'jalons': jalons,
+    }
+
+
+def echeancier(debut, jours=7):
+    """
+    Examens dont la fenêtre recoupe les `jours` jours à partir de `debut`,
+    pour toutes les grossesses en cours : une requête, puis un calcul vectorisé.
+    """
+    fin = debut + datetime.timedelta(days=jours)
+    lignes = list(
+        Grossesse.objects
+        # Marge pour les termes corrigés ; le filtre exact est fait par Calendriers
+        .filter(date_fin__isnull=True, date_dernieres_regles__gt=debut - datetime.timedelta(days=RECUL_ECHEANCIER))
+        .order_by()
+        .values_list(
+            'id', 'date_dernieres_regles', 'date_terme_echographique',
+            'patient_id', 'patient__nom', 'patient__prenom', 'sage_femme__nom', 'sage_femme__prenom',
+        )
+    )
+    if not lignes:
+        return []
+    identifiants, dernieres_regles, termes_corriges, *_ = zip(*lignes)
+    calendriers = Calendriers(identifiants, dernieres_regles, termes_corriges)
+    grossesses, jalons = calendriers.echeances(debut, fin)
+    debuts, fins = calendriers.fenetres()
+    ages = calendriers.ages(debut)
+    termes = calendriers.termes()
+
+    resultats = []
+    for grossesse, indice_jalon, debut_fenetre, fin_fenetre in zip(
+        grossesses.tolist(), jalons.tolist(),
+        en_date(debuts[grossesses, jalons]).tolist(), en_date(fins[grossesses, jalons]).tolist(),
+    ):
+        pk, _, _, patient_id, nom, prenom, nom_sf, prenom_sf = lignes[grossesse]
+        resultats.append({
+            'grossesse_id': pk,
+            'patient_id': patient_id,
+            'patiente': f"{nom} {prenom}",
+            'sage_femme': f"{prenom_sf} {nom_sf}" if nom_sf else '',
+            'jalon': JALONS[indice_jalon],
+            'debut': debut_fenetre,
+            'fin': fin_fenetre - datetime.timedelta(days=1),
+            'age_texte': formater_age(ages[grossesse]),
+            'terme': en_date(termes[grossesse]),
+        })
+    return resultats
@@ -0,0 +1,234 @@
+"""
+Génération des états récapitulatifs mensuels
+
+Une requête par groupe de facturation (titulaire et remplaçantes à état commun)
+collecte les données ; les PDF sont rendus en parallèle dans un pool de
+processus. Un état dont l'empreinte des données n'a pas changé n'est pas rendu
+à nouveau. Depuis l'interface, la génération est une tâche de fond (core.taches).
+"""
+
+import datetime
+import hashlib
+import json
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.utils import dateformat
+
+from core.models import Cabinet, Consultation, EtatRecapitulatif, SageFemme
+from core.partitions import mois_suivant
+from core.pdf import HAUTEUR_A4, LARGEUR_A4, Page, document_pdf
+from core.taches import tache_de_fond
+
+
+# À incrémenter quand la mise en page change : tous les états seront rendus à nouveau
+VERSION_RENDU = 1
+
+MARGE = 40
+INTERLIGNE = 14
+COLONNES = (MARGE, MARGE + 70, MARGE + 270, LARGEUR_A4 - MARGE)
+
+
+def formater_montant(montant):
+    return f"{montant:,.2f}".replace(',', ' ').replace('.', ',')
+
+
+def collecter(cabinet, mois, titulaire, membres):
+    """
+    Données d'un état récapitulatif, en une requête pour tout le groupe.
+    Retourne (données à rendre, nombre de consultations, montant total).
+    Seules les consultations complètes sont facturées.
+    """
+    # Le titulaire en premier, puis les remplaçantes fusionnées
+    membres = sorted(membres, key=lambda sf: (sf.pk != titulaire.pk, sf.nom, sf.prenom))
+    libelles = dict(Consultation.TYPE_ACTE_CHOICES)
+    lignes = (
+        Consultation.objects
+        .filter(
+            sage_femme_id__in=[sf.pk for sf in membres],
+            date__gte=mois, date__lt=mois_suivant(mois),
+            statut='complete',
+        )
+        .order_by('date', 'id')
+        .values_list('sage_femme_id', 'date', 'patient__nom', 'patient__prenom', 'type_acte', 'montant')
+    )
+    sections = {
+        sf.pk: {
+            'nom': sf.nom_complet,
+            'mention': f"Remplaçante de {titulaire.nom_complet}" if sf.pk != titulaire.pk else '',
+            'lignes': [], 'nombre': 0, 'montant': Decimal('0'),
+        }
+        for sf in membres
+    }
+    for sage_femme_id, date, nom, prenom, type_acte, montant in lignes:
+        section = sections[sage_femme_id]
+        section['lignes'].append([
+            f"{date:%d/%m/%Y}", f"{nom} {prenom}", libelles.get(type_acte, type_acte),
+            formater_montant(montant or 0),
+        ])
+        section['nombre'] += 1
+        section['montant'] += montant or 0
+
+    nombre = sum(section['nombre'] for section in sections.values())
+    montant = sum((section['montant'] for section in sections.values()), Decimal('0'))
+    for section in sections.values():
+        section['montant'] = formater_montant(section['montant'])
+
+    donnees = {
+        'periode': dateformat.format(mois, 'F Y'),
+        'cabinet': [cabinet.titre, cabinet.rue, f"{cabinet.code_postal} {cabinet.ville}".strip(), cabinet.telephone]
+        if cabinet else [],
+        'titulaire': [
+            titulaire.nom_complet, titulaire.titre,
+            f"CAFAT {titulaire.numero_cafat}", f"RIDET {titulaire.ridet}",
+        ],
+        'sections': list(sections.values()),
+        'nombre': nombre,
+        'montant': formater_montant(montant),
+    }
+    return donnees, nombre, montant
+
+
+def calculer_empreinte(donnees):
+    contenu = json.dumps([VERSION_RENDU, donnees], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(contenu.encode()).hexdigest()
+
+
+def rendre_pdf(donnees):
+    """
+    Rendu PDF d'un état récapitulatif. Fonction pure, sans accès à la base :
+    exécutée dans les processus du pool.
+    """
+    pages = []
+
+    def nouvelle_page():
+        page = Page()
+        y = HAUTEUR_A4 - MARGE
+        for ligne in donnees['cabinet']:
+            page.texte(MARGE, y, ligne, taille=9)
+            y -= 11
+        for i, ligne in enumerate(donnees['titulaire']):
+            page.texte(LARGEUR_A4 - MARGE, HAUTEUR_A4 - MARGE - 11 * i, ligne, taille=9, gras=i == 0, droite=True)
+        y = min(y, HAUTEUR_A4 - MARGE - 44) - 20
+        page.texte(MARGE, y, f"État récapitulatif - {donnees['periode']}", taille=14, gras=True)
+        y -= 24
+        for x, entete in zip(COLONNES, ('Date', 'Patiente', 'Acte')):
+            page.texte(x, y, entete, taille=9, gras=True)
+        page.texte(COLONNES[3], y, 'Montant', taille=9, gras=True, droite=True)
+        page.filet(MARGE, y - 4, LARGEUR_A4 - MARGE, y - 4)
+        pages.append(page)
+        return page, y - INTERLIGNE - 4
+
+    page, y = nouvelle_page()
+    for section in donnees['sections']:
+        if y < MARGE + 4 * INTERLIGNE:
+            page, y = nouvelle_page()
+        titre = section['nom'] + (f" ({section['mention']})" if section['mention'] else '')
+        page.texte(MARGE, y, titre, taille=10, gras=True)
+        y -= INTERLIGNE
+        for ligne in section['lignes']:
+            if y < MARGE + 2 * INTERLIGNE:
+                page, y = nouvelle_page()
+            for x, valeur in zip(COLONNES, ligne[:3]):
+                page.texte(x, y, valeur[:45], taille=9)
+            page.texte(COLONNES[3], y, ligne[3], taille=9, droite=True)
+            y -= INTERLIGNE
+        page.texte(COLONNES[2], y, f"Sous-total : {section['nombre']} consultation(s)", taille=9, gras=True)
+        page.texte(COLONNES[3], y, section['montant'], taille=9, gras=True, droite=True)
+        y -= 2 * INTERLIGNE
+
+    if y < MARGE + 2 * INTERLIGNE:
+        page, y = nouvelle_page()
+    page.filet(MARGE, y + INTERLIGNE - 4, LARGEUR_A4 - MARGE, y + INTERLIGNE - 4, epaisseur=1)
+    page.texte(COLONNES[2], y, f"Total : {donnees['nombre']} consultation(s)", taille=10, gras=True)
+    page.texte(COLONNES[3], y, donnees['montant'], taille=10, gras=True, droite=True)
+
+    for numero, page in enumerate(pages, start=1):
+        page.texte(LARGEUR_A4 - MARGE, MARGE / 2, f"Page {numero} / {len(pages)}", taille=8, droite=True)
+    return document_pdf(pages, titre=f"État récapitulatif {donnees['periode']} - {donnees['titulaire'][0]}")
+
+
+def rendus(a_rendre, processus):
+    """
+    Itère sur (état, PDF) au fil des rendus, en parallèle si plusieurs processus.
+    Rendu séquentiel si d'autres threads tournent (bail entretenu par run_jobs) :
+    un fork n'en copie pas les verrous détenus.
+    """
+    if processus <= 1 or len(a_rendre) <= 1 or threading.active_count() > 1:
+        for etat, donnees in a_rendre:
+            yield etat, rendre_pdf(donnees)
+        return
+    # fork : les processus héritent du code chargé et n'ouvrent aucune connexion
+    contexte = multiprocessing.get_context('fork')
+    with ProcessPoolExecutor(max_workers=processus, mp_context=contexte) as pool:
+        futures = {pool.submit(rendre_pdf, donnees): etat for etat, donnees in a_rendre}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+
+def enregistrer(etat, pdf):
+    ancien = etat.fichier.name if etat.fichier else None
+    nom = f"{etat.mois:%Y-%m}/{etat.sage_femme_id}-{etat.empreinte[:16]}.pdf"
+    etat.fichier.save(nom, ContentFile(pdf), save=False)
+    etat.save()
+    if ancien and ancien != etat.fichier.name:
+        etat.fichier.storage.delete(ancien)
+
+
+def _sans_suivi(**valeurs):
+    pass
+
+
+def generer_etats_recapitulatifs(mois, processus=1, forcer=False, progression=_sans_suivi):
+    """
+    Génère les états récapitulatifs du mois pour toutes les sages-femmes actives
+    et celles, désactivées depuis, qui ont des consultations complètes ce mois-là.
+    Retourne (nombre d'états rendus, nombre d'états inchangés) ; l'avancement
+    est passé à `progression` au fil de la génération.
+    """
+    cabinet = Cabinet.get_cached()
+    consultations = Consultation.objects.filter(
+        date__gte=mois, date__lt=mois_suivant(mois), statut='complete'
+    )
+    groupes = SageFemme.objects.groupes_facturation(consultations).etats_recapitulatifs
+    existants = {
+        etat.sage_femme_id: etat
+        for etat in EtatRecapitulatif.objects.filter(mois=mois)
+    }
+    progression(total=len(groupes), faits=0, generes=0, inchanges=0)
+
+    a_rendre = []
+    inchanges = 0
+    for titulaire, membres in groupes.values():
+        donnees, nombre, montant = collecter(cabinet, mois, titulaire, membres)
+        empreinte = calculer_empreinte(donnees)
+        etat = existants.get(titulaire.pk) or EtatRecapitulatif(mois=mois, sage_femme=titulaire)
+        if not forcer and etat.empreinte == empreinte and etat.fichier:
+            inchanges += 1
+            continue
+        etat.empreinte = empreinte
+        etat.nombre_consultations = nombre
+        etat.montant_total = montant
+        a_rendre.append((etat, donnees))
+    progression(faits=inchanges, inchanges=inchanges)
+
+    generes = 0
+    for etat, pdf in rendus(a_rendre, processus):
+        enregistrer(etat, pdf)
+        generes += 1
+        progression(faits=inchanges + generes, generes=generes)
+    return generes, inchanges
+
+
+@tache_de_fond('etats_recapitulatifs')
+def generer_etats_recapitulatifs_tache(mois, forcer=False, progression=_sans_suivi):
+    """Génération lancée depuis l'interface, exécutée par `manage.py run_jobs`"""
+    generes, inchanges = generer_etats_recapitulatifs(
+        datetime.date.fromisoformat(mois), processus=settings.ETATS_RECAPITULATIFS_PROCESSUS,
+        forcer=forcer, progression=progression,
+    )
+    return {'generes': generes, 'inchanges': inchanges}
@@ -0,0 +1,98 @@
+"""
+Exports comptables des consultations et des sages-femmes
+Les lignes sont lues par lots sur un curseur côté serveur PostgreSQL
+(QuerySet.iterator) et écrites en flux en CSV ou XLSX : le téléchargement
+commence aussitôt et un worker ne garde jamais tout le résultat en mémoire.
+"""
+
+import csv
+import datetime
+from decimal import Decimal
+
+from core.models import Consultation, SageFemme
+
+
+TAILLE_LOT_EXPORT = 2000
+# Lignes CSV regroupées par morceau émis
+LIGNES_PAR_MORCEAU = 500
+
+ENTETES_CONSULTATIONS = [
+    'N°', 'Date', 'Sage-femme', 'N° CAFAT sage-femme', 'Patiente', 'N° CAFAT patiente',
+    "Type d'acte", 'Statut', 'Durée (minutes)', 'Montant',
+]
+ENTETES_SAGES_FEMMES = [
+    'Nom', 'Prénom', 'Titre', 'Situation', 'Remplacement de', 'N° CAFAT', 'RIDET',
+    'Banque', 'RIB', 'Téléphone', 'Mail', 'Actif',
+]
+
+
+def lignes_consultations(debut, fin):
+    """Consultations de [debut, fin[, dans l'ordre chronologique"""
+    actes = dict(Consultation.TYPE_ACTE_CHOICES)
+    statuts = dict(Consultation.STATUT_CHOICES)
+    lignes = (
+        Consultation.objects
+        .filter(date__gte=debut, date__lt=fin)
+        .order_by('date', 'id')
+        .values_list(
+            'id', 'date', 'sage_femme__nom', 'sage_femme__prenom', 'sage_femme__numero_cafat',
+            'patient__nom', 'patient__prenom', 'patient__numero_cafat',
+            'type_acte', 'statut', 'duree_minutes', 'montant',
+        )
+        .iterator(chunk_size=TAILLE_LOT_EXPORT)
+    )
+    for (pk, date, nom_sf, prenom_sf, cafat_sf, nom, prenom, cafat,
+         type_acte, statut, duree, montant) in lignes:
+        yield (
+            pk, date, f"{prenom_sf} {nom_sf}", cafat_sf, f"{nom} {prenom}", cafat or '',
+            actes.get(type_acte, type_acte), statuts.get(statut, statut), duree, montant,
+        )
+
+
+def lignes_sages_femmes():
+    situations = dict(SageFemme.SITUATION_CHOICES)
+    lignes = (
+        SageFemme.objects
+        .order_by('nom', 'prenom', 'id')
+        .values_list(
+            'nom', 'prenom', 'titre', 'situation', 'remplacement_de__nom', 'remplacement_de__prenom',
+            'numero_cafat', 'ridet', 'banque', 'rib', 'telephone', 'email', 'is_active',
+        )
+        .iterator(chunk_size=TAILLE_LOT_EXPORT)
+    )
+    for (nom, prenom, titre, situation, nom_remplace, prenom_remplace,
+         *coordonnees, actif) in lignes:
+        remplace = f"{prenom_remplace} {nom_remplace}" if nom_remplace else ''
+        yield (nom, prenom, titre, situations.get(situation, situation), remplace, *coordonnees, actif)
+
+
+class Echo:
+    """Pseudo-fichier pour csv.writer : write() rend la ligne au lieu de l'écrire"""
+
+    def write(self, valeur):
+        return valeur
+
+
+def valeur_csv(valeur):
+    """Format lu directement par un tableur en français"""
+    if valeur is None:
+        return ''
+    if isinstance(valeur, bool):
+        return 'oui' if valeur else 'non'
+    if isinstance(valeur, datetime.date):
+        return f"{valeur:%d/%m/%Y}"
+    if isinstance(valeur, Decimal):
+        return str(valeur).replace('.', ',')
+    return valeur
+
+
+def ecrire_csv(entetes, lignes):
+    """Générateur des octets d'un CSV séparé par des points-virgules (UTF-8 avec BOM pour Excel)"""
+    writer = csv.writer(Echo(), delimiter=';')
+    morceau = ['\ufeff', writer.writerow(entetes)]
+    for valeurs in lignes:
+        morceau.append(writer.writerow([valeur_csv(valeur) for valeur in valeurs]))
+        if len(morceau) >= LIGNES_PAR_MORCEAU:
+            yield ''.join(morceau).encode()
+            morceau.clear()
+    yield ''.join(morceau).encode()
@@ -0,0 +1,128 @@
+"""
+Impression des feuilles de soins
+Le PDF d'une consultation est rangé sous MEDIA_ROOT à un chemin dérivé de
+l'empreinte de son contenu et de la version du gabarit : une réimpression
+retrouve le fichier déjà rendu, une consultation modifiée obtient un nouveau
+fichier. Les fichiers sont servis par nginx (core.fichiers).
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+
+from django.core.files.storage import default_storage
+from django.utils import dateformat
+
+from core.etats_recapitulatifs import formater_montant
+from core.pdf import HAUTEUR_A4, LARGEUR_A4, Page, document_pdf
+
+
+# À incrémenter quand la mise en page change : les feuilles seront rendues à nouveau
+VERSION_GABARIT = 1
+DOSSIER_FEUILLES = 'feuilles_soins'
+
+MARGE = 50
+INTERLIGNE = 16
+
+
+def donnees_feuille(consultation, cabinet):
+    """Contenu imprimé de la feuille de soins, seule source de l'empreinte"""
+    sage_femme = consultation.sage_femme
+    patient = consultation.patient
+    praticien = [
+        sage_femme.nom_complet, sage_femme.titre,
+        f"CAFAT {sage_femme.numero_cafat}", f"RIDET {sage_femme.ridet}",
+    ]
+    if sage_femme.remplacement_de_id:
+        praticien.append(f"Remplaçante de {sage_femme.remplacement_de.nom_complet}")
+    return {
+        'cabinet': [cabinet.titre, cabinet.rue, f"{cabinet.code_postal} {cabinet.ville}".strip(), cabinet.telephone]
+        if cabinet else [],
+        'praticien': praticien,
+        'patiente': [
+            ('Nom', patient.nom_complet),
+            ('Né(e) le', f"{patient.date_naissance:%d/%m/%Y}" if patient.date_naissance else ''),
+            ('N° CAFAT', patient.numero_cafat or ''),
+        ],
+        'date': dateformat.format(consultation.date, 'j F Y'),
+        'acte': consultation.get_type_acte_display(),
+        'duree': f"{consultation.duree_minutes} min" if consultation.duree_minutes else '',
+        'montant': formater_montant(consultation.montant) if consultation.montant is not None else '',
+        'numero': consultation.pk,
+    }
+
+
+def calculer_empreinte(donnees):
+    contenu = json.dumps([VERSION_GABARIT, donnees], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(contenu.encode()).hexdigest()
+
+
+def chemin_feuille(empreinte):
+    """Chemin dans le stockage, réparti en sous-dossiers par les deux premiers caractères"""
+    return f"{DOSSIER_FEUILLES}/{empreinte[:2]}/{empreinte}.pdf"
+
+
+def rendre_feuille(donnees):
+    page = Page()
+    y = HAUTEUR_A4 - MARGE
+    for i, ligne in enumerate(donnees['cabinet']):
+        page.texte(MARGE, y - 11 * i, ligne, taille=9, gras=i == 0)
+    for i, ligne in enumerate(donnees['praticien']):
+        page.texte(LARGEUR_A4 - MARGE, y - 11 * i, ligne, taille=9, gras=i == 0, droite=True)
+
+    y -= 90
+    page.texte(MARGE, y, "Feuille de soins", taille=16, gras=True)
+    page.texte(LARGEUR_A4 - MARGE, y, f"N° {donnees['numero']}", taille=9, droite=True)
+    y -= 36
+    page.texte(MARGE, y, "Patiente", taille=11, gras=True)
+    page.filet(MARGE, y - 4, LARGEUR_A4 - MARGE, y - 4)
+    y -= INTERLIGNE + 4
+    for libelle, valeur in donnees['patiente']:
+        page.texte(MARGE, y, libelle, taille=10)
+        page.texte(MARGE + 110, y, valeur, taille=10)
+        y -= INTERLIGNE
+
+    y -= 20
+    page.texte(MARGE, y, "Acte", taille=11, gras=True)
+    page.filet(MARGE, y - 4, LARGEUR_A4 - MARGE, y - 4)
+    y -= INTERLIGNE + 4
+    for libelle, valeur in (('Date', donnees['date']), ('Acte', donnees['acte']), ('Durée', donnees['duree'])):
+        page.texte(MARGE, y, libelle, taille=10)
+        page.texte(MARGE + 110, y, valeur, taille=10)
+        y -= INTERLIGNE
+    page.filet(MARGE, y + 4, LARGEUR_A4 - MARGE, y + 4, epaisseur=1)
+    y -= 12
+    page.texte(MARGE, y, "Montant", taille=11, gras=True)
+    page.texte(LARGEUR_A4 - MARGE, y, donnees['montant'], taille=11, gras=True, droite=True)
+
+    page.texte(MARGE, MARGE + 60, "Signature de la sage-femme", taille=9)
+    page.texte(LARGEUR_A4 / 2 + 20, MARGE + 60, "Signature de la patiente", taille=9)
+    return document_pdf([page], titre=f"Feuille de soins {donnees['numero']}")
+
+
+def enregistrer_feuille(nom, pdf):
+    """
+    Écriture atomique (fichier temporaire puis renommage) : deux impressions
+    simultanées écrivent le même contenu au même chemin sans se gêner.
+    """
+    chemin = default_storage.path(nom)
+    os.makedirs(os.path.dirname(chemin), exist_ok=True)
+    descripteur, temporaire = tempfile.mkstemp(dir=os.path.dirname(chemin), suffix='.tmp')
+    try:
+        with os.fdopen(descripteur, 'wb') as fichier:
+            fichier.write(pdf)
+        os.chmod(temporaire, 0o644)
+        os.replace(temporaire, chemin)
+    except BaseException:
+        os.unlink(temporaire)
+        raise
+
+
+def feuille_pdf(consultation, cabinet):
+    """Chemin du PDF de la consultation dans le stockage, rendu seulement s'il n'existe pas"""
+    donnees = donnees_feuille(consultation, cabinet)
+    nom = chemin_feuille(calculer_empreinte(donnees))
+    if not default_storage.exists(nom):
+        enregistrer_feuille(nom, rendre_feuille(donnees))
+    return nom
@@ -0,0 +1,71 @@
+"""
+Téléchargement de fichiers
+Les fichiers de MEDIA_ROOT sont servis après contrôle des droits par Django :
+en production, la vue ne renvoie qu'un en-tête X-Accel-Redirect et nginx
+envoie le fichier lui-même (location internal de nginx.conf). Les fichiers
+produits à la volée (archives ZIP, classeurs XLSX) sont écrits en flux.
+"""
+
+from urllib.parse import quote
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils.http import content_disposition_header
+
+
+def servir_fichier(nom, nom_telechargement, content_type='application/pdf'):
+    """Réponse affichant le fichier `nom` du stockage (ouvert dans le navigateur pour impression)"""
+    if settings.MEDIA_X_ACCEL_REDIRECT:
+        response = HttpResponse(content_type=content_type)
+        response['X-Accel-Redirect'] = quote(f"{settings.MEDIA_URL}{nom}")
+        response['Content-Disposition'] = content_disposition_header(False, nom_telechargement)
+        return response
+    # Développement, sans nginx : Django envoie le fichier
+    return FileResponse(default_storage.open(nom, 'rb'), filename=nom_telechargement, content_type=content_type)
+
+
+async def flux_asynchrone(morceaux):
+    """
+    Itérateur asynchrone sur un générateur synchrone : chaque morceau est
+    produit dans le thread de l'ORM (curseurs côté serveur compris) et envoyé
+    avant que le suivant ne soit lu
+    """
+    iterateur = iter(morceaux)
+    fin = object()
+    while (morceau := await sync_to_async(next)(iterateur, fin)) is not fin:
+        yield morceau
+
+
+def reponse_en_flux(morceaux, content_type):
+    """
+    StreamingHttpResponse adaptée au serveur. Sous ASGI, Django transforme un
+    itérateur synchrone en liste avant d'envoyer le premier octet : le flux lui
+    est donc donné en itérateur asynchrone. Sous WSGI, c'est l'inverse.
+    """
+    if settings.SERVEUR == 'asgi':
+        morceaux = flux_asynchrone(morceaux)
+    return StreamingHttpResponse(morceaux, content_type=content_type)
+
+
+class TamponFlux:
+    """
+    Fichier en écriture seule pour zipfile : les octets écrits sont rendus par
+    vider(). Sans tell(), zipfile écrit en flux (descripteurs de données).
+    """
+
+    def __init__(self):
+        self.morceaux = []
+
+    def write(self, octets):
+        self.morceaux.append(bytes(octets))
+        return len(octets)
+
+    def flush(self):
+        pass
+
+    def vider(self):
+        octets = b''.join(self.morceaux)
+        self.morceaux.clear()
+        return octets
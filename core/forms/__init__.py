@@ -0,0 +1,5 @@
+from .consultation import RechercheConsultationForm
+from .tarif import CalculatriceForm
+from .grossesse import CalendrierGrossesseForm
+
+__all__ = ['RechercheConsultationForm', 'CalculatriceForm', 'CalendrierGrossesseForm']
@@ -0,0 +1,68 @@
+from django import forms
+from core.models.consultation import Consultation
+from core.models.sagefemme import SageFemme
+
+
+class RechercheConsultationForm(forms.Form):
+    """Formulaire de recherche plein texte dans les consultations"""
+    
+    q = forms.CharField(
+        required=False,
+        max_length=200,
+        label="Rechercher",
+        widget=forms.TextInput(attrs={
+            'class': 'form-input',
+            'placeholder': 'Motif, notes cliniques…',
+            'autocomplete': 'off',
+        })
+    )
+    sage_femme = forms.ModelChoiceField(
+        queryset=SageFemme.objects.none(),
+        required=False,
+        label="Sage-femme",
+        empty_label="Toutes",
+        widget=forms.Select(attrs={'class': 'form-input'})
+    )
+    type_acte = forms.ChoiceField(
+        choices=[('', 'Tous')] + Consultation.TYPE_ACTE_CHOICES,
+        required=False,
+        label="Type d'acte",
+        widget=forms.Select(attrs={'class': 'form-input'})
+    )
+    date_debut = forms.DateField(
+        required=False,
+        label="Du",
+        widget=forms.DateInput(attrs={'class': 'form-input', 'type': 'date'})
+    )
+    date_fin = forms.DateField(
+        required=False,
+        label="Au",
+        widget=forms.DateInput(attrs={'class': 'form-input', 'type': 'date'})
+    )
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields['sage_femme'].queryset = SageFemme.objects.actives()
+    
+    def clean(self):
+        cleaned_data = super().clean()
+        date_debut = cleaned_data.get('date_debut')
+        date_fin = cleaned_data.get('date_fin')
+        
+        if date_debut and date_fin and date_debut > date_fin:
+            self.add_error('date_fin', 'La date de fin doit être postérieure à la date de début.')
+        
+        return cleaned_data
+    
+    def filtrer(self, queryset):
+        """Applique la recherche et les filtres à un queryset de consultations"""
+        data = self.cleaned_data
+        if data.get('sage_femme'):
+            queryset = queryset.filter(sage_femme=data['sage_femme'])
+        if data.get('type_acte'):
+            queryset = queryset.filter(type_acte=data['type_acte'])
+        if data.get('date_debut'):
+            queryset = queryset.filter(date__gte=data['date_debut'])
+        if data.get('date_fin'):
+            queryset = queryset.filter(date__lte=data['date_fin'])
+        return queryset.recherche(data['q'])
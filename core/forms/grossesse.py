@@ -0,0 +1,47 @@
+import datetime
+
+from django import forms
+from django.core.validators import MaxValueValidator, MinValueValidator
+from django.utils import timezone
+
+from core.calendrier_grossesse import AGE_MAX
+from core.models.grossesse import DUREE_TERME
+
+
+# Les fenêtres des examens (jusqu'à AGE_MAX après la DDR de référence)
+# doivent rester dans les dates représentables
+DDR_MAX = datetime.date.max - datetime.timedelta(days=AGE_MAX)
+TERME_MIN = datetime.date.min + datetime.timedelta(days=DUREE_TERME)
+TERME_MAX = DDR_MAX + datetime.timedelta(days=DUREE_TERME)
+
+
+class CalendrierGrossesseForm(forms.Form):
+    """Datation d'une grossesse pour la calculatrice obstétricale"""
+    
+    date_dernieres_regles = forms.DateField(
+        label="Date des dernières règles",
+        validators=[MaxValueValidator(DDR_MAX)],
+        widget=forms.DateInput(attrs={'class': 'form-input', 'type': 'date'})
+    )
+    date_terme_echographique = forms.DateField(
+        required=False,
+        label="Terme corrigé (échographie)",
+        validators=[MinValueValidator(TERME_MIN), MaxValueValidator(TERME_MAX)],
+        widget=forms.DateInput(attrs={'class': 'form-input', 'type': 'date'})
+    )
+    date = forms.DateField(
+        required=False,
+        label="Au",
+        widget=forms.DateInput(attrs={'class': 'form-input', 'type': 'date'})
+    )
+    
+    def clean_date(self):
+        return self.cleaned_data['date'] or timezone.localdate()
+    
+    def clean(self):
+        cleaned_data = super().clean()
+        ddr = cleaned_data.get('date_dernieres_regles')
+        jour = cleaned_data.get('date')
+        if ddr and jour and ddr > jour:
+            self.add_error('date_dernieres_regles', "Les dernières règles sont postérieures à la date du calcul.")
+        return cleaned_data
@@ -0,0 +1,46 @@
+import re
+
+from django import forms
+from django.utils import timezone
+
+
+NOMBRE_MAX_LIGNES = 50
+# « SF 12 » ou « SF 12 x 2 » : code de l'acte, puis quantité facultative
+LIGNE_ACTE = re.compile(r'^(?P<code>.+?)(?:\s+[x×*]\s*(?P<quantite>\d+))?$')
+
+
+class CalculatriceForm(forms.Form):
+    """Actes à tarifer (un par ligne) et date de la feuille de soins"""
+    
+    date = forms.DateField(
+        required=False,
+        label="Date des soins",
+        widget=forms.DateInput(attrs={'class': 'form-input', 'type': 'date'})
+    )
+    lignes = forms.CharField(
+        required=False,
+        label="Actes",
+        widget=forms.Textarea(attrs={
+            'class': 'form-input',
+            'rows': 8,
+            'placeholder': 'Un code par ligne, quantité facultative : SF 12 x 2',
+        })
+    )
+    
+    def clean_date(self):
+        return self.cleaned_data['date'] or timezone.localdate()
+    
+    def clean_lignes(self):
+        lignes = []
+        for numero, texte in enumerate(self.cleaned_data['lignes'].splitlines(), start=1):
+            texte = texte.strip()
+            if not texte:
+                continue
+            correspondance = LIGNE_ACTE.match(texte)
+            quantite = int(correspondance['quantite'] or 1)
+            if quantite < 1:
+                raise forms.ValidationError(f"Ligne {numero} : la quantité doit être au moins 1.")
+            lignes.append((correspondance['code'].strip().upper(), quantite))
+        if len(lignes) > NOMBRE_MAX_LIGNES:
+            raise forms.ValidationError(f"{NOMBRE_MAX_LIGNES} actes au plus.")
+        return lignes
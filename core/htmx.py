@@ -0,0 +1,68 @@
+"""
+Rendu des pages selon la requête HTMX
+Les liens et formulaires des pages sont « boostés » (hx-boost, base.html) :
+une navigation ne reçoit que le bloc `content`, rendu dans le gabarit
+core/fragment.html, et HTMX le place dans <main id="contenu">. Une page
+chargée directement (ou rechargée par l'historique) reçoit base.html complet.
+
+Convention des gabarits : une page étend `gabarit_base` (processeur de
+contexte ci-dessous) plutôt que 'core/base.html'.
+"""
+
+from django.shortcuts import render
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+
+GABARIT_PAGE = 'core/base.html'
+GABARIT_FRAGMENT = 'core/fragment.html'
+# En-têtes HTMX qui changent la réponse d'une même URL
+ENTETES_VARY = ('HX-Request', 'HX-Boosted')
+
+
+def requete_htmx(request):
+    return request.headers.get('HX-Request') == 'true'
+
+
+def navigation_htmx(request):
+    """Lien ou formulaire boosté : la page sans la navigation ni les scripts"""
+    return requete_htmx(request) and request.headers.get('HX-Boosted') == 'true'
+
+
+def fragment_demande(request):
+    """
+    Requête HTMX propre à la page (hx-get d'une recherche, d'un résultat…).
+    Ni une navigation boostée, ni une restauration de l'historique : celle-ci
+    attend la page entière.
+    """
+    return (
+        requete_htmx(request)
+        and not navigation_htmx(request)
+        and request.headers.get('HX-History-Restore-Request') != 'true'
+    )
+
+
+def gabarit_base(request):
+    """Processeur de contexte : gabarit étendu par les pages"""
+    return {'gabarit_base': GABARIT_FRAGMENT if navigation_htmx(request) else GABARIT_PAGE}
+
+
+def rendre(request, gabarit, context=None, fragment=None):
+    """
+    render() pour les vues qui ont aussi un fragment : `fragment` est rendu
+    pour les requêtes HTMX de la page, `gabarit` sinon (page entière ou bloc
+    `content` d'une navigation)
+    """
+    return render(request, fragment if fragment and fragment_demande(request) else gabarit, context)
+
+
+class VaryHtmxMiddleware(MiddlewareMixin):
+    """
+    Une même URL donne une page, un bloc `content` ou un fragment : le cache
+    du navigateur (retour arrière) ne doit pas les confondre
+    """
+
+    def process_response(self, request, response):
+        if response.get('Content-Type', '').startswith('text/html'):
+            patch_vary_headers(response, ENTETES_VARY)
+        return response
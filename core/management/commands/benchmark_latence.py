@@ -0,0 +1,126 @@
+"""
+Banc de latence sous charge concurrente
+
+Envoie les mêmes requêtes, avec la même concurrence, à un ou plusieurs
+serveurs déjà démarrés (gunicorn WSGI, gunicorn + uvicorn ASGI…) et compare
+leurs latences (médiane, p95, p99) et leur débit. Des requêtes lentes
+(--lent : PDF, exports) peuvent tourner en parallèle pour mesurer ce qu'elles
+coûtent aux pages rapides.
+"""
+
+import statistics
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from itertools import cycle, islice
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+# Pages et fragments de lecture servis par les vues asynchrones
+CHEMINS_DEFAUT = [
+    '/feuille-soins/',
+    '/patients/',
+    '/patients/recherche/?q=dup',
+    '/feuille-soins/recherche/?q=suivi',
+]
+
+
+def centile(latences, rang):
+    """Centile (0-100) d'une liste triée"""
+    if not latences:
+        return 0.0
+    return latences[min(len(latences) - 1, int(len(latences) * rang / 100))]
+
+
+class Command(BaseCommand):
+    help = "Compare la latence de serveurs démarrés sous une même charge concurrente"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--cible', action='append', required=True, metavar='NOM=URL',
+            help="Serveur à mesurer, ex. wsgi=http://127.0.0.1:8001 (répétable)"
+        )
+        parser.add_argument(
+            '--chemin', action='append', default=None,
+            help="Chemin demandé, répartis à tour de rôle (répétable ; défaut : pages des vues async)"
+        )
+        parser.add_argument(
+            '--lent', action='append', default=[],
+            help="Chemin lent demandé en continu pendant la mesure (répétable)"
+        )
+        parser.add_argument('--concurrence', type=int, default=20, help="Clients simultanés (défaut : 20)")
+        parser.add_argument('--requetes', type=int, default=500, help="Requêtes mesurées par cible (défaut : 500)")
+        parser.add_argument('--echauffement', type=int, default=20, help="Requêtes non mesurées (défaut : 20)")
+        parser.add_argument('--timeout', type=float, default=30.0, help="Délai maximal d'une requête en secondes")
+        parser.add_argument('--cookie', default='', help="En-tête Cookie envoyé (ex. sessionid=…)")
+
+    def handle(self, *args, **options):
+        if options['concurrence'] < 1 or options['requetes'] < 1:
+            raise CommandError("--concurrence et --requetes doivent être supérieurs à zéro.")
+        cibles = []
+        for cible in options['cible']:
+            nom, _, url = cible.partition('=')
+            if not url.startswith(('http://', 'https://')):
+                raise CommandError(f"Cible invalide « {cible} » : attendu NOM=http://hôte:port")
+            cibles.append((nom, url.rstrip('/')))
+        self.timeout = options['timeout']
+        self.en_tetes = {'Cookie': options['cookie']} if options['cookie'] else {}
+        chemins = options['chemin'] or CHEMINS_DEFAUT
+
+        self.stdout.write(
+            f"{options['requetes']} requêtes, {options['concurrence']} clients simultanés"
+            + (f", {len(options['lent'])} requête(s) lente(s) en continu" if options['lent'] else "")
+        )
+        self.stdout.write(
+            f"{'cible':<12}{'req/s':>9}{'médiane':>10}{'p95':>10}{'p99':>10}{'max':>10}{'erreurs':>9}"
+        )
+        for nom, url in cibles:
+            resultat = self.mesurer(url, chemins, options)
+            self.stdout.write(
+                f"{nom:<12}{resultat['debit']:>9.1f}"
+                + ''.join(f"{resultat[cle] * 1000:>8.1f}ms" for cle in ('p50', 'p95', 'p99', 'max'))
+                + f"{resultat['erreurs']:>9}"
+            )
+
+    def requete(self, url):
+        """Durée d'une requête en secondes, None en cas d'erreur"""
+        debut = time.perf_counter()
+        try:
+            with urllib.request.urlopen(urllib.request.Request(url, headers=self.en_tetes), timeout=self.timeout) as reponse:
+                reponse.read()
+        except (urllib.error.URLError, OSError):
+            return None
+        return time.perf_counter() - debut
+
+    def mesurer(self, base, chemins, options):
+        urls = [base + chemin for chemin in chemins]
+        arret = threading.Event()
+
+        def charge_lente(url):
+            while not arret.is_set():
+                self.requete(url)
+
+        lents = [threading.Thread(target=charge_lente, args=(base + chemin,), daemon=True) for chemin in options['lent']]
+        for thread in lents:
+            thread.start()
+        try:
+            with ThreadPoolExecutor(max_workers=options['concurrence']) as pool:
+                list(pool.map(self.requete, islice(cycle(urls), options['echauffement'])))
+                debut = time.perf_counter()
+                durees = list(pool.map(self.requete, islice(cycle(urls), options['requetes'])))
+                duree_totale = time.perf_counter() - debut
+        finally:
+            arret.set()
+
+        latences = sorted(duree for duree in durees if duree is not None)
+        return {
+            'debit': len(latences) / duree_totale if duree_totale else 0.0,
+            'p50': statistics.median(latences) if latences else 0.0,
+            'p95': centile(latences, 95),
+            'p99': centile(latences, 99),
+            'max': latences[-1] if latences else 0.0,
+            'erreurs': len(durees) - len(latences),
+        }
@@ -0,0 +1,41 @@
+"""
+Compilation du corpus des références médicales en index plein texte
+
+Lit les documents Markdown de REFERENCES_DIR et écrit l'index binaire
+REFERENCES_INDEX, projeté en mémoire par les workers (core.references).
+Les workers en cours d'exécution rouvrent l'index dès qu'il est remplacé.
+"""
+
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.references import construire_index, lire_corpus
+
+
+class Command(BaseCommand):
+    help = "Compile les références médicales (Markdown) en index plein texte projeté en mémoire"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--source', default=None,
+            help="Dossier des documents Markdown (défaut : REFERENCES_DIR)"
+        )
+        parser.add_argument(
+            '--sortie', default=None,
+            help="Fichier d'index à écrire (défaut : REFERENCES_INDEX)"
+        )
+
+    def handle(self, *args, **options):
+        source = Path(options['source'] or settings.REFERENCES_DIR)
+        sortie = Path(options['sortie'] or settings.REFERENCES_INDEX)
+        if not source.is_dir():
+            raise CommandError(f"Dossier des références introuvable : {source}")
+
+        references = lire_corpus(source)
+        nombre_termes = construire_index(references, sortie)
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(references)} référence(s), {nombre_termes} terme(s) : {sortie} "
+            f"({sortie.stat().st_size / 1024:.1f} Kio)"
+        ))
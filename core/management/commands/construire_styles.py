@@ -0,0 +1,46 @@
+"""
+Compilation des styles Tailwind CSS
+
+Le compilateur autonome de Tailwind (binaire TAILWIND_CLI, sans Node) lit
+tailwind.config.js, ne génère que les classes présentes dans les gabarits et
+écrit une feuille minifiée dans les fichiers statiques de core. Lancée par
+docker-entrypoint.sh avant collectstatic ; --watch en développement.
+"""
+
+import shutil
+import subprocess
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+CONFIGURATION = Path(settings.BASE_DIR) / 'tailwind.config.js'
+SOURCE = Path(settings.BASE_DIR) / 'styles' / 'tailwind.css'
+SORTIE = Path(settings.BASE_DIR) / 'core' / 'static' / 'core' / 'css' / 'tailwind.css'
+
+
+class Command(BaseCommand):
+    help = "Compile les styles Tailwind d'après les gabarits (classes utilisées seulement, minifiés)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--watch', action='store_true',
+            help="Recompile à chaque modification des gabarits (développement, sans minification)"
+        )
+
+    def handle(self, *args, **options):
+        binaire = shutil.which(settings.TAILWIND_CLI)
+        if binaire is None:
+            raise CommandError(
+                f"Compilateur Tailwind introuvable ({settings.TAILWIND_CLI}) : installer le binaire "
+                f"autonome v{settings.TAILWIND_VERSION} ou renseigner TAILWIND_CLI (voir le README)."
+            )
+        commande = [binaire, '--config', str(CONFIGURATION), '--input', str(SOURCE), '--output', str(SORTIE)]
+        commande.append('--watch' if options['watch'] else '--minify')
+
+        # Le compilateur résout les chemins de `content` depuis la racine du projet
+        resultat = subprocess.run(commande, cwd=settings.BASE_DIR, capture_output=not options['watch'], text=True)
+        if resultat.returncode != 0:
+            raise CommandError(f"Échec de la compilation des styles :\n{resultat.stderr or ''}".rstrip())
+        self.stdout.write(self.style.SUCCESS(f"Styles compilés : {SORTIE} ({SORTIE.stat().st_size / 1024:.1f} Kio)"))
@@ -0,0 +1,51 @@
+"""
+Génération des états récapitulatifs mensuels du cabinet
+
+À lancer en fin de mois (cron) ; depuis l'interface, la génération est une
+tâche de fond exécutée par `manage.py run_jobs`. Les PDF sont rendus en
+parallèle ; un état dont les données n'ont pas changé n'est pas régénéré.
+"""
+
+import datetime
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from core.etats_recapitulatifs import generer_etats_recapitulatifs
+from core.management.commands.gerer_partitions import lire_mois
+from core.partitions import debut_mois
+
+
+class Command(BaseCommand):
+    help = "Génère les états récapitulatifs mensuels (PDF) de toutes les sages-femmes actives"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--mois', default=None,
+            help="Mois AAAA-MM à générer (défaut : mois précédent)"
+        )
+        parser.add_argument(
+            '--processus', type=int, default=os.cpu_count() or 1,
+            help="Nombre de processus de rendu PDF (défaut : nombre de processeurs)"
+        )
+        parser.add_argument(
+            '--forcer', action='store_true',
+            help="Régénère aussi les états dont les données n'ont pas changé"
+        )
+
+    def handle(self, *args, **options):
+        if options['mois']:
+            mois = lire_mois(options['mois'])
+        else:
+            mois = debut_mois(debut_mois(timezone.localdate()) - datetime.timedelta(days=1))
+        if options['processus'] < 1:
+            raise CommandError("--processus doit être supérieur à zéro.")
+
+        generes, inchanges = generer_etats_recapitulatifs(
+            mois, processus=options['processus'], forcer=options['forcer'],
+        )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{mois:%Y-%m} : {generes} état(s) généré(s), {inchanges} inchangé(s)."
+        ))
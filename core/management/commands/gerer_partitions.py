@@ -0,0 +1,73 @@
+"""
+Création et détachement des partitions mensuelles
+
+À lancer au déploiement puis régulièrement (cron) : crée les partitions des
+mois à venir, range les lignes tombées dans la partition par défaut et
+détache, sur demande, les partitions les plus anciennes.
+"""
+
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from core.partitions import (
+    TABLES_PARTITIONNEES, creer_partition, debut_mois, detacher_partition,
+    mois_dans_partition_defaut, mois_suivant, partitions_mensuelles,
+)
+
+
+def lire_mois(valeur):
+    try:
+        return datetime.datetime.strptime(valeur, '%Y-%m').date()
+    except ValueError:
+        raise CommandError(f"Mois invalide « {valeur} » (format attendu : AAAA-MM).")
+
+
+class Command(BaseCommand):
+    help = "Crée les partitions mensuelles à venir et détache les plus anciennes"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--mois-avance', type=int, default=3,
+            help="Nombre de mois à venir à préparer (défaut : 3)"
+        )
+        parser.add_argument(
+            '--depuis', default=None,
+            help="Crée aussi les partitions depuis ce mois AAAA-MM (reprise d'historique)"
+        )
+        parser.add_argument(
+            '--detacher-avant', default=None,
+            help="Détache les partitions antérieures à ce mois AAAA-MM"
+        )
+
+    def handle(self, *args, **options):
+        mois_courant = debut_mois(timezone.localdate())
+        debut = lire_mois(options['depuis']) if options['depuis'] else mois_courant
+        fin = mois_courant
+        for _ in range(options['mois_avance']):
+            fin = mois_suivant(fin)
+
+        for table in TABLES_PARTITIONNEES:
+            existantes = partitions_mensuelles(table)
+
+            a_creer = set(mois_dans_partition_defaut(table))
+            mois = min(debut, mois_courant)
+            while mois <= fin:
+                a_creer.add(mois)
+                mois = mois_suivant(mois)
+
+            for mois in sorted(a_creer - set(existantes)):
+                deplacees = creer_partition(table, mois)
+                self.stdout.write(
+                    f"{table} : partition {mois:%Y-%m} créée ({deplacees} ligne(s) déplacée(s))"
+                )
+
+            if options['detacher_avant']:
+                limite = lire_mois(options['detacher_avant'])
+                for mois, nom in sorted(existantes.items()):
+                    if mois < limite:
+                        detacher_partition(table, mois)
+                        self.stdout.write(f"{table} : partition {nom} détachée")
+
+        self.stdout.write(self.style.SUCCESS("Partitions à jour."))
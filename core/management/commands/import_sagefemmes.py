@@ -0,0 +1,246 @@
+"""
+Import en masse des sages-femmes depuis un fichier CSV ou XLSX
+
+Le fichier est lu en flux et traité par lots : les titulaires sont résolus
+par numéro CAFAT dans une table en mémoire, chaque ligne est validée avec
+les règles de SageFemme.clean, puis chaque lot est écrit avec
+bulk_create / bulk_update dans sa propre transaction, avec les versions
+correspondantes de l'historique.
+"""
+
+import csv
+from itertools import islice
+from pathlib import Path
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from core.models import SageFemme
+from core.models.historique import historiser
+
+
+CHAMPS_TEXTE = [
+    'nom', 'prenom', 'titre', 'telephone', 'email',
+    'rue', 'code_postal', 'ville',
+    'numero_cafat', 'ridet', 'rib', 'banque', 'situation',
+]
+CHAMPS_BOOLEENS = ['etat_recapitulatif_commun', 'bons_depot_communs', 'is_active']
+CHAMPS_OPTIONNELS = ['rue', 'code_postal', 'ville']
+COLONNE_TITULAIRE = 'titulaire_cafat'
+
+CHAMPS_MIS_A_JOUR = CHAMPS_TEXTE + CHAMPS_BOOLEENS + ['remplacement_de', 'updated_at']
+
+VALEURS_VRAIES = {'1', 'oui', 'o', 'vrai', 'true', 'yes', 'x'}
+VALEURS_FAUSSES = {'0', 'non', 'n', 'faux', 'false', 'no'}
+
+
+class LigneInvalide(Exception):
+    pass
+
+
+def lire_csv(chemin, delimiteur=None):
+    """Itère sur les lignes d'un CSV sous forme de dictionnaires (numéro de ligne, valeurs)"""
+    with open(chemin, newline='', encoding='utf-8-sig') as fichier:
+        if delimiteur is None:
+            echantillon = fichier.readline()
+            fichier.seek(0)
+            delimiteur = ';' if echantillon.count(';') > echantillon.count(',') else ','
+        lecteur = csv.DictReader(fichier, delimiter=delimiteur)
+        for numero, ligne in enumerate(lecteur, start=2):
+            yield numero, ligne
+
+
+def lire_xlsx(chemin):
+    """Itère sur les lignes de la première feuille d'un classeur XLSX"""
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise CommandError("Le paquet openpyxl est requis pour importer un fichier XLSX.")
+
+    classeur = load_workbook(chemin, read_only=True, data_only=True)
+    try:
+        lignes = classeur.worksheets[0].iter_rows(values_only=True)
+        entetes = [str(valeur or '') for valeur in next(lignes, ())]
+        for numero, valeurs in enumerate(lignes, start=2):
+            if not any(valeur not in (None, '') for valeur in valeurs):
+                continue
+            yield numero, {
+                entete: '' if valeur is None else str(valeur)
+                for entete, valeur in zip(entetes, valeurs)
+            }
+    finally:
+        classeur.close()
+
+
+def convertir_booleen(valeur, champ):
+    valeur = valeur.strip().lower()
+    if valeur in VALEURS_VRAIES:
+        return True
+    if valeur in VALEURS_FAUSSES:
+        return False
+    raise LigneInvalide(f"{champ}: valeur booléenne invalide « {valeur} »")
+
+
+def formater_erreur(erreur):
+    if hasattr(erreur, 'message_dict'):
+        return '; '.join(
+            f"{champ}: {' '.join(messages)}" for champ, messages in erreur.message_dict.items()
+        )
+    return ' '.join(erreur.messages)
+
+
+class Command(BaseCommand):
+    help = "Importe des sages-femmes depuis un fichier CSV ou XLSX (mise à jour par numéro CAFAT)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('fichier', help="Fichier .csv ou .xlsx à importer")
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help="Nombre de lignes validées et écrites par transaction (défaut : 500)"
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help="Valide le fichier sans rien écrire en base"
+        )
+        parser.add_argument(
+            '--delimiter', default=None,
+            help="Séparateur CSV (détecté automatiquement entre ',' et ';' par défaut)"
+        )
+        parser.add_argument(
+            '--rapport', default=None,
+            help="Écrit les erreurs ligne par ligne dans ce fichier CSV"
+        )
+
+    def handle(self, *args, **options):
+        chemin = Path(options['fichier'])
+        if not chemin.exists():
+            raise CommandError(f"Fichier introuvable : {chemin}")
+        if options['batch_size'] < 1:
+            raise CommandError("--batch-size doit être supérieur à zéro.")
+
+        if chemin.suffix.lower() == '.xlsx':
+            lignes = lire_xlsx(chemin)
+        else:
+            lignes = lire_csv(chemin, options['delimiter'])
+
+        self.dry_run = options['dry_run']
+        # Table en mémoire des sages-femmes par numéro CAFAT : existantes puis importées
+        self.par_cafat = {sf.numero_cafat: sf for sf in SageFemme.objects.all()}
+        self.par_pk = {sf.pk: sf for sf in self.par_cafat.values()}
+        self.vus = set()
+        self.erreurs = []
+        self.creees = 0
+        self.mises_a_jour = 0
+
+        while True:
+            lot = list(islice(lignes, options['batch_size']))
+            if not lot:
+                break
+            self.traiter_lot(lot)
+
+        if options['rapport']:
+            self.ecrire_rapport(options['rapport'])
+        for numero, cafat, message in self.erreurs:
+            self.stderr.write(f"Ligne {numero} ({cafat or 'sans CAFAT'}) : {message}")
+
+        prefixe = "[simulation] " if self.dry_run else ""
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefixe}{self.creees} créée(s), {self.mises_a_jour} mise(s) à jour, "
+            f"{len(self.erreurs)} erreur(s)."
+        ))
+
+    def traiter_lot(self, lot):
+        nouvelles, modifiees = [], []
+        for numero, ligne in lot:
+            cafat = (ligne.get('numero_cafat') or '').strip()
+            try:
+                sage_femme, creation = self.construire(ligne, cafat)
+            except LigneInvalide as erreur:
+                self.erreurs.append((numero, cafat, str(erreur)))
+                continue
+            except ValidationError as erreur:
+                self.erreurs.append((numero, cafat, formater_erreur(erreur)))
+                continue
+
+            self.vus.add(cafat)
+            self.par_cafat[cafat] = sage_femme
+            if not creation:
+                self.par_pk[sage_femme.pk] = sage_femme
+            (nouvelles if creation else modifiees).append(sage_femme)
+
+        if not self.dry_run:
+            self.ecrire(nouvelles, modifiees)
+        self.creees += len(nouvelles)
+        self.mises_a_jour += len(modifiees)
+
+    def construire(self, ligne, cafat):
+        """Construit et valide l'instance d'une ligne, sans requête en base"""
+        if not cafat:
+            raise LigneInvalide("numero_cafat: ce champ est obligatoire.")
+        if cafat in self.vus:
+            raise LigneInvalide("numero_cafat: numéro présent plusieurs fois dans le fichier.")
+
+        existante = self.par_cafat.get(cafat)
+        if existante is None:
+            sage_femme = SageFemme()
+        else:
+            # Copie de travail : une ligne invalide ne doit pas altérer la table en mémoire
+            sage_femme = SageFemme(**{
+                champ.attname: getattr(existante, champ.attname)
+                for champ in SageFemme._meta.concrete_fields
+            })
+            sage_femme._state.adding = False
+            sage_femme._state.db = existante._state.db
+
+        for champ in CHAMPS_TEXTE:
+            if champ not in ligne:
+                continue
+            valeur = (ligne[champ] or '').strip()
+            if champ in CHAMPS_OPTIONNELS and not valeur:
+                valeur = None
+            setattr(sage_femme, champ, valeur)
+        for champ in CHAMPS_BOOLEENS:
+            valeur = (ligne.get(champ) or '').strip()
+            if valeur:
+                setattr(sage_femme, champ, convertir_booleen(valeur, champ))
+
+        titulaire_cafat = (ligne.get(COLONNE_TITULAIRE) or '').strip()
+        titulaire = None
+        if COLONNE_TITULAIRE not in ligne and sage_femme.remplacement_de_id:
+            # Colonne absente du fichier : le titulaire actuel est conservé
+            titulaire = self.par_pk.get(sage_femme.remplacement_de_id)
+        elif titulaire_cafat:
+            titulaire = self.par_cafat.get(titulaire_cafat)
+            if titulaire is None:
+                raise LigneInvalide(
+                    f"{COLONNE_TITULAIRE}: aucune sage-femme avec le numéro CAFAT {titulaire_cafat}."
+                )
+        # Toujours affecter l'objet pour que clean() ne relise pas la clé étrangère en base
+        sage_femme.remplacement_de = titulaire
+
+        sage_femme.reinitialiser_champs_remplacant()
+        sage_femme.full_clean(exclude=['remplacement_de'], validate_unique=False)
+        return sage_femme, existante is None
+
+    def ecrire(self, nouvelles, modifiees):
+        # Les titulaires sont créés en premier pour que les remplaçants du même lot aient leur clé
+        titulaires = [sf for sf in nouvelles if sf.situation != 'remplacant']
+        remplacants = [sf for sf in nouvelles if sf.situation == 'remplacant']
+        maintenant = timezone.now()
+        for sage_femme in modifiees:
+            sage_femme.updated_at = maintenant
+
+        with transaction.atomic():
+            SageFemme.objects.bulk_create(titulaires)
+            SageFemme.objects.bulk_create(remplacants)
+            SageFemme.objects.bulk_update(modifiees, CHAMPS_MIS_A_JOUR)
+            # bulk_* n'émet pas post_save : versions du lot en un seul INSERT
+            historiser(titulaires + remplacants + modifiees, maintenant)
+
+    def ecrire_rapport(self, chemin):
+        with open(chemin, 'w', newline='', encoding='utf-8') as fichier:
+            writer = csv.writer(fichier, delimiter=';')
+            writer.writerow(['ligne', 'numero_cafat', 'erreur'])
+            writer.writerows(self.erreurs)
@@ -0,0 +1,84 @@
+"""
+Recalcul et vérification des cumuls mensuels (CumulMensuel)
+
+Les cumuls sont tenus à jour par trigger ; cette commande les recalcule
+entièrement depuis les consultations (reprise d'historique, correction) ou,
+avec --verify, compare sans rien écrire et signale les écarts.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from core.management.commands.gerer_partitions import lire_mois
+from core.models import Consultation, CumulMensuel
+from core.partitions import mois_suivant
+
+
+CHAMPS_CUMUL = ('nombre', 'montant_total', 'duree_totale')
+
+
+class Command(BaseCommand):
+    help = "Recalcule les cumuls mensuels depuis les consultations, ou les vérifie (--verify)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--verify', action='store_true',
+            help="Compare les cumuls aux consultations sans rien écrire"
+        )
+        parser.add_argument(
+            '--mois', default=None,
+            help="Limite le traitement à ce mois AAAA-MM"
+        )
+
+    def handle(self, *args, **options):
+        consultations = Consultation.objects.all()
+        cumuls = CumulMensuel.objects.all()
+        if options['mois']:
+            mois = lire_mois(options['mois'])
+            consultations = consultations.filter(date__gte=mois, date__lt=mois_suivant(mois))
+            cumuls = cumuls.filter(mois=mois)
+
+        if options['verify']:
+            self.verifier(consultations, cumuls)
+        else:
+            self.reconstruire(consultations, cumuls)
+
+    def reconstruire(self, consultations, cumuls):
+        with transaction.atomic():
+            # Bloque les écritures de consultations (leur trigger écrit dans les cumuls)
+            # jusqu'au commit : le recalcul ne peut pas manquer de modification
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"LOCK TABLE {connection.ops.quote_name(CumulMensuel._meta.db_table)} "
+                    "IN SHARE ROW EXCLUSIVE MODE"
+                )
+            cumuls.delete()
+            crees = CumulMensuel.objects.bulk_create(
+                CumulMensuel(**valeurs) for valeurs in CumulMensuel.calculer(consultations)
+            )
+        self.stdout.write(self.style.SUCCESS(f"{len(crees)} cumul(s) recalculé(s)."))
+
+    def verifier(self, consultations, cumuls):
+        attendus = {
+            (c['mois'], c['sage_femme_id'], c['type_acte']): tuple(c[champ] for champ in CHAMPS_CUMUL)
+            for c in CumulMensuel.calculer(consultations)
+        }
+        enregistres = {
+            (c['mois'], c['sage_femme_id'], c['type_acte']): tuple(c[champ] for champ in CHAMPS_CUMUL)
+            for c in cumuls.values('mois', 'sage_femme_id', 'type_acte', *CHAMPS_CUMUL)
+        }
+
+        ecarts = 0
+        for cle in sorted(attendus.keys() | enregistres.keys()):
+            attendu, enregistre = attendus.get(cle), enregistres.get(cle)
+            if attendu != enregistre:
+                ecarts += 1
+                mois, sage_femme_id, type_acte = cle
+                self.stderr.write(
+                    f"{mois:%Y-%m} sage-femme {sage_femme_id} {type_acte} : "
+                    f"attendu {attendu or 'aucun cumul'}, enregistré {enregistre or 'aucun cumul'}"
+                )
+
+        if ecarts:
+            raise CommandError(f"{ecarts} cumul(s) incorrect(s) : lancer rebuild_rollups sans --verify.")
+        self.stdout.write(self.style.SUCCESS(f"{len(attendus)} cumul(s) vérifié(s), aucun écart."))
@@ -0,0 +1,161 @@
+"""
+Worker des tâches de fond (core.taches)
+
+Tourne dans son propre conteneur, à côté de gunicorn : les traitements lourds
+(génération de PDF en lot…) n'occupent plus les workers web. Les tâches sont
+exécutées en parallèle dans un pool de --concurrency processus.
+"""
+
+import multiprocessing
+import signal
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError, connections
+
+from core.taches import DUREE_BAIL, charger_taches, executer, reclamer, renouveler_bail
+
+
+# Renouvellement du bail d'une tâche exécutée par --concurrency 1 (secondes)
+INTERVALLE_BAIL = DUREE_BAIL.total_seconds() / 5
+
+
+class Command(BaseCommand):
+    help = "Exécute les tâches de fond planifiées en base (file PostgreSQL, sans courtier)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concurrency', type=int, default=2,
+            help="Nombre de tâches exécutées en parallèle (défaut : 2)"
+        )
+        parser.add_argument(
+            '--intervalle', type=float, default=1.0,
+            help="Secondes entre deux consultations de la file (défaut : 1)"
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help="S'arrête dès que la file est vide (maintenance, tests)"
+        )
+
+    def handle(self, *args, **options):
+        if options['concurrency'] < 1:
+            raise CommandError("--concurrency doit être supérieur à zéro.")
+        charger_taches()
+        self.arret = False
+        precedents = {numero: signal.signal(numero, self.arreter) for numero in (signal.SIGTERM, signal.SIGINT)}
+        try:
+            if options['concurrency'] == 1:
+                executees = self.boucle_simple(options)
+            else:
+                executees = self.boucle_pool(options)
+        finally:
+            for numero, gestionnaire in precedents.items():
+                signal.signal(numero, gestionnaire)
+        self.stdout.write(self.style.SUCCESS(f"{executees} tâche(s) exécutée(s)."))
+
+    def arreter(self, *args):
+        # Plus aucune réclamation ; les tâches en cours se terminent
+        self.arret = True
+
+    def boucle_simple(self, options):
+        """Une tâche à la fois, dans le processus du worker"""
+        executees = 0
+        while not self.arret:
+            identifiants = self.reclamer(1)
+            if identifiants:
+                with self.bail_entretenu(identifiants):
+                    executer(identifiants[0])
+                executees += 1
+            elif options['once']:
+                break
+            else:
+                time.sleep(options['intervalle'])
+        return executees
+
+    @contextmanager
+    def bail_entretenu(self, identifiants):
+        """
+        Renouvelle le bail depuis un thread pendant que la tâche occupe le
+        processus : une tâche plus longue que DUREE_BAIL n'est pas réclamée
+        par un autre worker
+        """
+        fin = threading.Event()
+
+        def entretenir():
+            try:
+                while not fin.wait(INTERVALLE_BAIL):
+                    self.renouveler(identifiants)
+            finally:
+                # Connexion propre à ce thread
+                connections.close_all()
+
+        thread = threading.Thread(target=entretenir, name='run_jobs-bail', daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            fin.set()
+            thread.join()
+
+    def boucle_pool(self, options):
+        concurrence = options['concurrency']
+        executees = 0
+        en_cours = {}
+        pool = None
+        try:
+            while en_cours or not self.arret:
+                identifiants = [] if self.arret else self.reclamer(concurrence - len(en_cours))
+                if identifiants:
+                    # Les processus forkés ne doivent pas hériter de la connexion du worker
+                    connections.close_all()
+                    if pool is None:
+                        pool = ProcessPoolExecutor(
+                            max_workers=concurrence, mp_context=multiprocessing.get_context('fork'),
+                        )
+                    for identifiant in identifiants:
+                        en_cours[pool.submit(executer, identifiant)] = identifiant
+                elif not en_cours:
+                    if options['once']:
+                        break
+                    time.sleep(options['intervalle'])
+                    continue
+
+                terminees, _ = wait(en_cours, timeout=options['intervalle'], return_when=FIRST_COMPLETED)
+                for future in terminees:
+                    identifiant = en_cours.pop(future)
+                    executees += 1
+                    try:
+                        future.result()
+                    except BrokenProcessPool:
+                        # Processus tué : la tâche sera réclamée à nouveau à l'expiration du bail
+                        self.stderr.write(f"Tâche {identifiant} interrompue (processus arrêté).")
+                        if pool is not None:
+                            pool.shutdown(wait=False, cancel_futures=True)
+                            pool = None
+                    except Exception as erreur:
+                        # Erreur hors de la tâche (base indisponible…) : même reprise par le bail
+                        self.stderr.write(f"Tâche {identifiant} interrompue : {erreur}")
+                self.renouveler(list(en_cours.values()))
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=True)
+        return executees
+
+    def reclamer(self, nombre):
+        try:
+            return reclamer(nombre)
+        except DatabaseError as erreur:
+            # Base indisponible ou pas encore migrée au démarrage du conteneur
+            self.stderr.write(f"File des tâches inaccessible : {erreur}")
+            connections.close_all()
+            return []
+
+    def renouveler(self, identifiants):
+        try:
+            renouveler_bail(identifiants)
+        except DatabaseError:
+            connections.close_all()
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.5 on 2026-10-18 10:39
+
+import core.models.functions
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension, UnaccentExtension
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        UnaccentExtension(),
+        migrations.RunSQL(
+            sql="""
+                CREATE OR REPLACE FUNCTION core_immutable_unaccent(text) RETURNS text
+                AS $$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$
+                LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT;
+            """,
+            reverse_sql="DROP FUNCTION IF EXISTS core_immutable_unaccent(text);",
+        ),
+        migrations.AlterModelOptions(
+            name='sagefemme',
+            options={'ordering': ['nom', 'prenom'], 'verbose_name': '2. Sage-femme', 'verbose_name_plural': '2. Sages-femmes'},
+        ),
+        migrations.AddIndex(
+            model_name='sagefemme',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(core.models.functions.ImmutableUnaccent(django.db.models.functions.text.Lower(core.models.functions.ConcatTexte('nom', 'prenom', 'titre', 'telephone', 'email', 'numero_cafat', 'ridet'))), name='gin_trgm_ops'), name='core_sagefemme_recherche_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='sagefemme',
+            index=models.Index(fields=['numero_cafat'], name='core_sagefemme_cafat_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sagefemme',
+            index=models.Index(fields=['ridet'], name='core_sagefemme_ridet_idx'),
+        ),
+    ]
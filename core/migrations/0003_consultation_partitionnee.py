@@ -0,0 +1,109 @@
+# Generated by Django 5.2.5 on 2026-10-18 10:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+CREATE_CONSULTATION_SQL = """
+CREATE SEQUENCE core_consultation_id_seq;
+CREATE TABLE core_consultation (
+    id bigint NOT NULL DEFAULT nextval('core_consultation_id_seq'),
+    date date NOT NULL,
+    type_acte varchar(30) NOT NULL,
+    statut varchar(20) NOT NULL,
+    motif varchar(255) NOT NULL,
+    notes text NOT NULL,
+    duree_minutes smallint NULL CHECK (duree_minutes >= 0),
+    montant numeric(10, 2) NULL,
+    created_at timestamp with time zone NOT NULL,
+    updated_at timestamp with time zone NOT NULL,
+    sage_femme_id bigint NOT NULL
+        REFERENCES core_sagefemme (id) DEFERRABLE INITIALLY DEFERRED,
+    patient_id bigint NOT NULL
+        REFERENCES core_patient (id) DEFERRABLE INITIALLY DEFERRED,
+    PRIMARY KEY (id, date)
+) PARTITION BY RANGE (date);
+ALTER SEQUENCE core_consultation_id_seq OWNED BY core_consultation.id;
+-- Reçoit les lignes hors des partitions mensuelles (voir manage.py gerer_partitions)
+CREATE TABLE core_consultation_defaut PARTITION OF core_consultation DEFAULT;
+"""
+
+DROP_CONSULTATION_SQL = "DROP TABLE core_consultation;"
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_sagefemme_recherche'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Patient',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nom', models.CharField(max_length=100, verbose_name='Nom')),
+                ('prenom', models.CharField(max_length=100, verbose_name='Prénom')),
+                ('date_naissance', models.DateField(verbose_name='Date de naissance')),
+                ('telephone', models.CharField(blank=True, max_length=20, verbose_name='Téléphone')),
+                ('email', models.EmailField(blank=True, max_length=254, verbose_name='Mail')),
+                ('rue', models.CharField(blank=True, max_length=255, null=True, verbose_name='Rue')),
+                ('code_postal', models.CharField(blank=True, max_length=10, null=True, verbose_name='Code postal')),
+                ('ville', models.CharField(blank=True, max_length=100, null=True, verbose_name='Ville')),
+                ('numero_cafat', models.CharField(blank=True, max_length=50, verbose_name='Numéro CAFAT')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Créé le')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Modifié le')),
+            ],
+            options={
+                'verbose_name': '3. Patiente',
+                'verbose_name_plural': '3. Patientes',
+                'ordering': ['nom', 'prenom'],
+            },
+        ),
+        # La table est créée à la main : Django ne sait pas déclarer une table partitionnée.
+        # La clé primaire inclut la clé de partition (id, date) ; id reste unique par sa séquence.
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name='Consultation',
+                    fields=[
+                        ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                        ('date', models.DateField(verbose_name='Date de consultation')),
+                        ('type_acte', models.CharField(choices=[('prenatale', 'Consultation prénatale'), ('suivi_grossesse', 'Suivi grossesse'), ('postnatale', 'Consultation postnatale'), ('preparation', 'Préparation à la naissance'), ('reeducation', 'Rééducation périnéale'), ('gynecologie', 'Suivi gynécologique')], max_length=30, verbose_name="Type d'acte")),
+                        ('statut', models.CharField(choices=[('en_cours', 'En cours'), ('complete', 'Complète')], default='en_cours', max_length=20, verbose_name='Statut')),
+                        ('motif', models.CharField(blank=True, max_length=255, verbose_name='Motif')),
+                        ('notes', models.TextField(blank=True, verbose_name='Notes cliniques')),
+                        ('duree_minutes', models.PositiveSmallIntegerField(blank=True, null=True, verbose_name='Durée (minutes)')),
+                        ('montant', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True, verbose_name='Montant')),
+                        ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Créé le')),
+                        ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Modifié le')),
+                        ('sage_femme', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.PROTECT, related_name='consultations', to='core.sagefemme', verbose_name='Sage-femme')),
+                        ('patient', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.PROTECT, related_name='consultations', to='core.patient', verbose_name='Patiente')),
+                    ],
+                    options={
+                        'verbose_name': '4. Consultation',
+                        'verbose_name_plural': '4. Consultations',
+                        'ordering': ['-date', '-id'],
+                    },
+                ),
+            ],
+            database_operations=[
+                migrations.RunSQL(
+                    sql=CREATE_CONSULTATION_SQL,
+                    reverse_sql=DROP_CONSULTATION_SQL,
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='consultation',
+            index=models.Index(fields=['-date', '-id'], include=('patient', 'sage_femme', 'type_acte', 'statut'), name='core_consult_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='consultation',
+            index=models.Index(fields=['sage_femme', '-date', '-id'], include=('patient', 'type_acte', 'statut'), name='core_consult_sf_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='consultation',
+            index=models.Index(fields=['patient', '-date', '-id'], name='core_consult_patient_date_idx'),
+        ),
+    ]
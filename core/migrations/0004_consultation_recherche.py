@@ -0,0 +1,59 @@
+# Generated by Django 5.2.5 on 2026-10-18 10:43
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+CONFIGURATION_SQL = """
+CREATE TEXT SEARCH CONFIGURATION french_unaccent (COPY = pg_catalog.french);
+ALTER TEXT SEARCH CONFIGURATION french_unaccent
+    ALTER MAPPING FOR hword, hword_part, word WITH unaccent, french_stem;
+"""
+
+TRIGGER_SQL = """
+CREATE FUNCTION core_consultation_recherche_trigger() RETURNS trigger AS $$
+BEGIN
+    NEW.recherche :=
+        setweight(to_tsvector('french_unaccent', coalesce(NEW.motif, '')), 'A') ||
+        setweight(to_tsvector('french_unaccent', coalesce(NEW.notes, '')), 'B');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER core_consultation_recherche_maj
+    BEFORE INSERT OR UPDATE OF motif, notes ON core_consultation
+    FOR EACH ROW EXECUTE FUNCTION core_consultation_recherche_trigger();
+
+-- Calcul initial pour les consultations existantes
+UPDATE core_consultation SET motif = motif;
+"""
+
+DROP_TRIGGER_SQL = """
+DROP TRIGGER core_consultation_recherche_maj ON core_consultation;
+DROP FUNCTION core_consultation_recherche_trigger();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_consultation_partitionnee'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=CONFIGURATION_SQL,
+            reverse_sql="DROP TEXT SEARCH CONFIGURATION french_unaccent;",
+        ),
+        migrations.AddField(
+            model_name='consultation',
+            name='recherche',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='consultation',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['recherche'], name='core_consult_recherche_gin'),
+        ),
+        migrations.RunSQL(sql=TRIGGER_SQL, reverse_sql=DROP_TRIGGER_SQL),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.5 on 2026-10-18 10:47
+
+import core.models.functions
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_consultation_recherche'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='patient',
+            index=models.Index(django.contrib.postgres.indexes.OpClass(core.models.functions.ImmutableUnaccent(django.db.models.functions.text.Lower(core.models.functions.ConcatTexte('nom', 'prenom'))), name='text_pattern_ops'), models.F('date_naissance'), name='core_patient_nom_naiss_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='patient',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(core.models.functions.ImmutableUnaccent(django.db.models.functions.text.Lower(core.models.functions.ConcatTexte('nom', 'prenom'))), name='gin_trgm_ops'), name='core_patient_recherche_trgm'),
+        ),
+    ]
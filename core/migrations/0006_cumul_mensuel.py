@@ -0,0 +1,94 @@
+# Generated by Django 5.2.5 on 2026-10-18 10:49
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+TRIGGER_SQL = """
+CREATE FUNCTION core_cumul_mensuel_ajouter(
+    jour date, id_sage_femme bigint, acte varchar, increment integer, montant numeric, duree integer
+) RETURNS void AS $$
+BEGIN
+    INSERT INTO core_cumulmensuel (mois, sage_femme_id, type_acte, nombre, montant_total, duree_totale)
+    VALUES (date_trunc('month', jour)::date, id_sage_femme, acte, increment, montant, duree)
+    ON CONFLICT (mois, sage_femme_id, type_acte) DO UPDATE SET
+        nombre = core_cumulmensuel.nombre + EXCLUDED.nombre,
+        montant_total = core_cumulmensuel.montant_total + EXCLUDED.montant_total,
+        duree_totale = core_cumulmensuel.duree_totale + EXCLUDED.duree_totale;
+    DELETE FROM core_cumulmensuel
+    WHERE mois = date_trunc('month', jour)::date
+      AND sage_femme_id = id_sage_femme AND type_acte = acte AND core_cumulmensuel.nombre = 0;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE FUNCTION core_consultation_cumul_trigger() RETURNS trigger AS $$
+BEGIN
+    -- Lignes déplacées vers une nouvelle partition (core.partitions.creer_partition)
+    IF current_setting('maieutix.deplacement_partition', true) = 'on' THEN
+        RETURN NULL;
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM core_cumul_mensuel_ajouter(
+            OLD.date, OLD.sage_femme_id, OLD.type_acte,
+            -1, -coalesce(OLD.montant, 0), -coalesce(OLD.duree_minutes, 0)
+        );
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM core_cumul_mensuel_ajouter(
+            NEW.date, NEW.sage_femme_id, NEW.type_acte,
+            1, coalesce(NEW.montant, 0), coalesce(NEW.duree_minutes, 0)
+        );
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+-- Un changement de mois déplace la ligne de partition : PostgreSQL déclenche
+-- alors DELETE puis INSERT, ce qui met aussi les deux cumuls à jour
+CREATE TRIGGER core_consultation_cumul_maj
+    AFTER INSERT OR DELETE OR UPDATE OF date, sage_femme_id, type_acte, montant, duree_minutes
+    ON core_consultation
+    FOR EACH ROW EXECUTE FUNCTION core_consultation_cumul_trigger();
+
+-- Calcul initial pour les consultations existantes
+INSERT INTO core_cumulmensuel (mois, sage_femme_id, type_acte, nombre, montant_total, duree_totale)
+SELECT date_trunc('month', date)::date, sage_femme_id, type_acte,
+       count(*), coalesce(sum(montant), 0), coalesce(sum(duree_minutes), 0)
+FROM core_consultation
+GROUP BY 1, 2, 3;
+"""
+
+DROP_TRIGGER_SQL = """
+DROP TRIGGER core_consultation_cumul_maj ON core_consultation;
+DROP FUNCTION core_consultation_cumul_trigger();
+DROP FUNCTION core_cumul_mensuel_ajouter(date, bigint, varchar, integer, numeric, integer);
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_patient_recherche'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CumulMensuel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('mois', models.DateField(verbose_name='Mois')),
+                ('type_acte', models.CharField(choices=[('prenatale', 'Consultation prénatale'), ('suivi_grossesse', 'Suivi grossesse'), ('postnatale', 'Consultation postnatale'), ('preparation', 'Préparation à la naissance'), ('reeducation', 'Rééducation périnéale'), ('gynecologie', 'Suivi gynécologique')], max_length=30, verbose_name="Type d'acte")),
+                ('nombre', models.IntegerField(default=0, verbose_name='Nombre de consultations')),
+                ('montant_total', models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='Montant total')),
+                ('duree_totale', models.IntegerField(default=0, verbose_name='Durée totale (minutes)')),
+                ('sage_femme', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='cumuls_mensuels', to='core.sagefemme', verbose_name='Sage-femme')),
+            ],
+            options={
+                'verbose_name': 'Cumul mensuel',
+                'verbose_name_plural': 'Cumuls mensuels',
+                'ordering': ['-mois', 'sage_femme', 'type_acte'],
+                'constraints': [models.UniqueConstraint(fields=('mois', 'sage_femme', 'type_acte'), name='core_cumul_mensuel_unique')],
+            },
+        ),
+        migrations.RunSQL(sql=TRIGGER_SQL, reverse_sql=DROP_TRIGGER_SQL),
+    ]
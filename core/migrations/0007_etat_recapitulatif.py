@@ -0,0 +1,34 @@
+# Generated by Django 5.2.5 on 2026-10-18 10:54
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_cumul_mensuel'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EtatRecapitulatif',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('mois', models.DateField(verbose_name='Mois')),
+                ('empreinte', models.CharField(max_length=64, verbose_name='Empreinte du contenu')),
+                ('fichier', models.FileField(upload_to='etats_recapitulatifs/', verbose_name='Fichier PDF')),
+                ('nombre_consultations', models.PositiveIntegerField(default=0, verbose_name='Nombre de consultations')),
+                ('montant_total', models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='Montant total')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Créé le')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Généré le')),
+                ('sage_femme', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='etats_recapitulatifs', to='core.sagefemme', verbose_name='Sage-femme titulaire')),
+            ],
+            options={
+                'verbose_name': 'État récapitulatif',
+                'verbose_name_plural': 'États récapitulatifs',
+                'ordering': ['-mois', 'sage_femme__nom', 'sage_femme__prenom'],
+                'constraints': [models.UniqueConstraint(fields=('mois', 'sage_femme'), name='core_etat_recap_unique')],
+            },
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.5 on 2026-10-18 11:00
+
+import core.models.tarif
+import django.contrib.postgres.constraints
+from django.contrib.postgres.operations import BtreeGistExtension
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_etat_recapitulatif'),
+    ]
+
+    operations = [
+        BtreeGistExtension(),
+        migrations.CreateModel(
+            name='Tarif',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('code', models.CharField(max_length=20, verbose_name='Code acte')),
+                ('libelle', models.CharField(max_length=200, verbose_name='Libellé')),
+                ('montant', models.DecimalField(decimal_places=2, max_digits=10, verbose_name='Montant')),
+                ('date_debut', models.DateField(verbose_name='Applicable du')),
+                ('date_fin', models.DateField(blank=True, help_text='Laisser vide pour le tarif en vigueur', null=True, verbose_name="Applicable jusqu'au (exclu)")),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Tarif',
+                'verbose_name_plural': '5. Tarifs',
+                'ordering': ['code', '-date_debut'],
+                'constraints': [models.CheckConstraint(condition=models.Q(('date_fin__isnull', True), ('date_fin__gt', models.F('date_debut')), _connector='OR'), name='core_tarif_periode_valide', violation_error_message='La date de fin doit être postérieure à la date de début.'), django.contrib.postgres.constraints.ExclusionConstraint(expressions=[('code', '='), (core.models.tarif.PeriodeValidite('date_debut', 'date_fin'), '&&')], name='core_tarif_sans_chevauchement', violation_error_message='Un tarif de ce code est déjà applicable sur cette période.')],
+            },
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.5 on 2026-10-18 11:09
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_tarif'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tache',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nom', models.CharField(max_length=100, verbose_name='Tâche')),
+                ('arguments', models.JSONField(blank=True, default=dict, verbose_name='Arguments')),
+                ('statut', models.CharField(choices=[('en_attente', 'En attente'), ('en_cours', 'En cours'), ('terminee', 'Terminée'), ('echouee', 'Échouée')], default='en_attente', max_length=20, verbose_name='Statut')),
+                ('tentatives', models.PositiveSmallIntegerField(default=0, verbose_name='Tentatives')),
+                ('tentatives_max', models.PositiveSmallIntegerField(default=3, verbose_name='Tentatives maximum')),
+                ('executer_apres', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Exécuter après')),
+                ('bail_expire', models.DateTimeField(blank=True, null=True, verbose_name='Fin du bail')),
+                ('progression', models.JSONField(blank=True, default=dict, verbose_name='Avancement')),
+                ('resultat', models.JSONField(blank=True, null=True, verbose_name='Résultat')),
+                ('erreur', models.TextField(blank=True, verbose_name='Erreur')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Créée le')),
+                ('debut', models.DateTimeField(blank=True, null=True, verbose_name='Démarrée le')),
+                ('fin', models.DateTimeField(blank=True, null=True, verbose_name='Terminée le')),
+            ],
+            options={
+                'verbose_name': 'Tâche de fond',
+                'verbose_name_plural': 'Tâches de fond',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(condition=models.Q(('statut', 'en_attente')), fields=['executer_apres', 'id'], name='core_tache_a_executer_idx'), models.Index(condition=models.Q(('statut', 'en_cours')), fields=['bail_expire'], name='core_tache_bail_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.5 on 2026-10-18 11:13
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_tache'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Grossesse',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date_dernieres_regles', models.DateField(verbose_name='Date des dernières règles')),
+                ('date_terme_echographique', models.DateField(blank=True, help_text="Terme fixé par l'échographie du premier trimestre, s'il diffère du terme calculé", null=True, verbose_name='Terme corrigé')),
+                ('date_fin', models.DateField(blank=True, help_text='Accouchement ou interruption : la grossesse sort des échéanciers', null=True, verbose_name='Fin du suivi')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Créé le')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Modifié le')),
+                ('patient', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='grossesses', to='core.patient', verbose_name='Patiente')),
+                ('sage_femme', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='grossesses', to='core.sagefemme', verbose_name='Suivie par')),
+            ],
+            options={
+                'verbose_name': 'Grossesse',
+                'verbose_name_plural': '6. Grossesses',
+                'ordering': ['-date_dernieres_regles'],
+                'indexes': [models.Index(condition=models.Q(('date_fin__isnull', True)), fields=['date_dernieres_regles'], name='core_grossesse_en_cours_idx')],
+                'constraints': [models.CheckConstraint(condition=models.Q(('date_fin__isnull', True), ('date_fin__gte', models.F('date_dernieres_regles')), _connector='OR'), name='core_grossesse_fin_valide', violation_error_message='La fin du suivi doit être postérieure aux dernières règles.')],
+            },
+        ),
+    ]
@@ -0,0 +1,91 @@
+# Generated by Django 5.2.5 on 2026-10-18 11:23
+
+import django.core.serializers.json
+import django.utils.timezone
+from django.db import migrations, models
+
+
+CREATE_JOURNAL_SQL = """
+CREATE SEQUENCE core_journalaudit_id_seq;
+CREATE TABLE core_journalaudit (
+    id bigint NOT NULL DEFAULT nextval('core_journalaudit_id_seq'),
+    horodatage timestamp with time zone NOT NULL,
+    modele varchar(50) NOT NULL,
+    objet_id bigint NOT NULL,
+    objet varchar(200) NOT NULL,
+    action varchar(20) NOT NULL,
+    changements jsonb NOT NULL,
+    utilisateur_id integer NULL,
+    utilisateur varchar(150) NOT NULL,
+    PRIMARY KEY (id, horodatage)
+) PARTITION BY RANGE (horodatage);
+ALTER SEQUENCE core_journalaudit_id_seq OWNED BY core_journalaudit.id;
+-- Reçoit les lignes hors des partitions mensuelles (voir manage.py gerer_partitions)
+CREATE TABLE core_journalaudit_defaut PARTITION OF core_journalaudit DEFAULT;
+
+-- Ajout seul : une entrée ne peut être ni modifiée ni supprimée. L'archivage
+-- se fait en détachant les partitions anciennes (gerer_partitions --detacher-avant).
+CREATE FUNCTION core_journalaudit_ajout_seul() RETURNS trigger AS $$
+BEGIN
+    -- Lignes déplacées vers une nouvelle partition (core.partitions.creer_partition)
+    IF current_setting('maieutix.deplacement_partition', true) = 'on' THEN
+        RETURN OLD;
+    END IF;
+    RAISE EXCEPTION 'Le journal d''audit est en ajout seul (% refusé)', TG_OP
+        USING ERRCODE = 'insufficient_privilege';
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER core_journalaudit_ajout_seul
+    BEFORE UPDATE OR DELETE ON core_journalaudit
+    FOR EACH ROW EXECUTE FUNCTION core_journalaudit_ajout_seul();
+"""
+
+DROP_JOURNAL_SQL = """
+DROP TABLE core_journalaudit;
+DROP FUNCTION core_journalaudit_ajout_seul();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_grossesse'),
+    ]
+
+    operations = [
+        # Table partitionnée créée à la main, comme core_consultation (migration 0003)
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name='JournalAudit',
+                    fields=[
+                        ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                        ('horodatage', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Date')),
+                        ('modele', models.CharField(max_length=50, verbose_name='Type de fiche')),
+                        ('objet_id', models.BigIntegerField(verbose_name='Identifiant')),
+                        ('objet', models.CharField(max_length=200, verbose_name='Fiche')),
+                        ('action', models.CharField(choices=[('creation', 'Création'), ('modification', 'Modification'), ('suppression', 'Suppression')], max_length=20, verbose_name='Action')),
+                        ('changements', models.JSONField(default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder, verbose_name='Changements')),
+                        ('utilisateur_id', models.IntegerField(blank=True, null=True, verbose_name='Identifiant utilisateur')),
+                        ('utilisateur', models.CharField(blank=True, max_length=150, verbose_name='Utilisateur')),
+                    ],
+                    options={
+                        'verbose_name': "Entrée du journal d'audit",
+                        'verbose_name_plural': "Journal d'audit",
+                        'ordering': ['-horodatage', '-id'],
+                    },
+                ),
+            ],
+            database_operations=[
+                migrations.RunSQL(
+                    sql=CREATE_JOURNAL_SQL,
+                    reverse_sql=DROP_JOURNAL_SQL,
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='journalaudit',
+            index=models.Index(fields=['modele', 'objet_id', '-horodatage'], name='core_audit_objet_idx'),
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.5 on 2026-10-18 11:27
+
+import django.core.serializers.json
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+CHAMPS_HISTORISES = [
+    'nom', 'prenom', 'titre', 'telephone', 'email', 'rue', 'code_postal', 'ville',
+    'numero_cafat', 'ridet', 'rib', 'banque', 'situation', 'remplacement_de_id',
+    'etat_recapitulatif_commun', 'bons_depot_communs', 'is_active',
+]
+
+
+def versions_initiales(apps, schema_editor):
+    # Version 1 des fiches existantes : leur état actuel, daté de leur création
+    # (les modifications antérieures à l'historique ne sont pas connues)
+    SageFemme = apps.get_model('core', 'SageFemme')
+    HistoriqueSageFemme = apps.get_model('core', 'HistoriqueSageFemme')
+    HistoriqueSageFemme.objects.bulk_create(
+        HistoriqueSageFemme(
+            sage_femme_id=sage_femme.pk,
+            version=1,
+            date_effet=sage_femme.created_at,
+            instantane=True,
+            donnees={champ: getattr(sage_femme, champ) for champ in CHAMPS_HISTORISES},
+        )
+        for sage_femme in SageFemme.objects.iterator()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_journal_audit'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HistoriqueSageFemme',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.PositiveIntegerField(verbose_name='Version')),
+                ('date_effet', models.DateTimeField(verbose_name='En vigueur depuis')),
+                ('instantane', models.BooleanField(default=False, verbose_name='Instantané complet')),
+                ('donnees', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder, verbose_name='Données')),
+                ('sage_femme', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='historique', to='core.sagefemme', verbose_name='Sage-femme')),
+            ],
+            options={
+                'verbose_name': 'Version de sage-femme',
+                'verbose_name_plural': 'Historique des sages-femmes',
+                'ordering': ['sage_femme', '-version'],
+                'indexes': [models.Index(condition=models.Q(('instantane', True)), fields=['sage_femme', '-version'], name='core_historique_instantane_idx')],
+                'constraints': [models.UniqueConstraint(fields=('sage_femme', 'version'), name='core_historique_sf_version_unique')],
+            },
+        ),
+        migrations.RunPython(versions_initiales, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,43 @@
+from django.db import migrations
+
+
+# Version des consultations tenue par la base : toute instruction qui modifie
+# la table (save, bulk_create, update, delete, SQL direct) l'incrémente dans sa
+# propre transaction, visible à la validation en même temps que les données.
+# Les caches qui en dépendent (core.analyse_activite) la lisent dans leur clé.
+TRIGGER_SQL = """
+CREATE TABLE core_version_donnees (
+    nom varchar(50) PRIMARY KEY,
+    valeur bigint NOT NULL DEFAULT 0
+);
+INSERT INTO core_version_donnees (nom) VALUES ('consultations');
+
+CREATE FUNCTION core_version_donnees_trigger() RETURNS trigger AS $$
+BEGIN
+    UPDATE core_version_donnees SET valeur = valeur + 1 WHERE nom = TG_ARGV[0];
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+-- Une fois par instruction, pas par ligne : un import en lot n'écrit la version qu'une fois
+CREATE TRIGGER core_consultation_version_maj
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON core_consultation
+    FOR EACH STATEMENT EXECUTE FUNCTION core_version_donnees_trigger('consultations');
+"""
+
+DROP_TRIGGER_SQL = """
+DROP TRIGGER core_consultation_version_maj ON core_consultation;
+DROP FUNCTION core_version_donnees_trigger();
+DROP TABLE core_version_donnees;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_historique_sagefemme'),
+    ]
+
+    operations = [
+        migrations.RunSQL(sql=TRIGGER_SQL, reverse_sql=DROP_TRIGGER_SQL),
+    ]
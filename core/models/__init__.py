@@ -1,4 +1,13 @@
 from .cabinet import Cabinet
 from .sagefemme import SageFemme
+from .patient import Patient
+from .consultation import Consultation
+from .cumul import CumulMensuel
+from .etat_recapitulatif import EtatRecapitulatif
+from .tarif import Tarif
+from .tache import Tache
+from .grossesse import Grossesse
+from .audit import JournalAudit
+from .historique import HistoriqueSageFemme
 
-__all__ = ['Cabinet', 'SageFemme']
\ No newline at end of file
+__all__ = ['Cabinet', 'SageFemme', 'Patient', 'Consultation', 'CumulMensuel', 'EtatRecapitulatif', 'Tarif', 'Tache', 'Grossesse', 'JournalAudit', 'HistoriqueSageFemme']
@@ -0,0 +1,39 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils import timezone
+
+
+class JournalAudit(models.Model):
+    """
+    Entrée du journal d'audit : valeurs modifiées d'une fiche (sage-femme,
+    cabinet), avant et après, avec l'auteur de la modification.
+    La table est en ajout seul (trigger) et partitionnée par mois sur
+    `horodatage` (migration 0011) ; les entrées sont écrites par core.audit.
+    """
+    ACTION_CHOICES = [
+        ('creation', 'Création'),
+        ('modification', 'Modification'),
+        ('suppression', 'Suppression'),
+    ]
+    
+    horodatage = models.DateTimeField(default=timezone.now, verbose_name="Date")
+    modele = models.CharField(max_length=50, verbose_name="Type de fiche")
+    objet_id = models.BigIntegerField(verbose_name="Identifiant")
+    objet = models.CharField(max_length=200, verbose_name="Fiche")
+    action = models.CharField(max_length=20, choices=ACTION_CHOICES, verbose_name="Action")
+    # {champ: [avant, après]}
+    changements = models.JSONField(default=dict, encoder=DjangoJSONEncoder, verbose_name="Changements")
+    # Pas de clé étrangère : une entrée survit à la suppression de l'utilisateur
+    utilisateur_id = models.IntegerField(blank=True, null=True, verbose_name="Identifiant utilisateur")
+    utilisateur = models.CharField(max_length=150, blank=True, verbose_name="Utilisateur")
+    
+    class Meta:
+        verbose_name = "Entrée du journal d'audit"
+        verbose_name_plural = "Journal d'audit"
+        ordering = ['-horodatage', '-id']
+        indexes = [
+            models.Index(fields=['modele', 'objet_id', '-horodatage'], name='core_audit_objet_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.objet} : {self.get_action_display()} ({self.horodatage:%d/%m/%Y %H:%M})"
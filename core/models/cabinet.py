@@ -1,6 +1,16 @@
-from django.db import models
+from django.db import models, connection, transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
 from django.core.exceptions import ValidationError
 
+from core.cache import get_version, bump_version
+
+
+CABINET_CACHE_VERSION = 'cabinet'
+
+# Cache local au processus : (tampon de version, instance)
+_cabinet_cache = {'version': None, 'instance': None}
+
 class Cabinet(models.Model):
     titre = models.CharField(max_length=200, verbose_name="Titre")
     rue = models.CharField(max_length=255, verbose_name="Rue")
@@ -27,13 +37,30 @@ class Cabinet(models.Model):
         # Prevent deletion if it's the only cabinet
         raise ValidationError("Le cabinet ne peut pas être supprimé.")
     
+    @classmethod
+    def get_cached(cls):
+        """
+        Retourne l'instance unique du cabinet depuis le cache du processus,
+        ou None si aucun cabinet n'existe.
+        Le cache est revalidé via le tampon de version partagé entre workers.
+        """
+        version = get_version(CABINET_CACHE_VERSION)
+        if version == _cabinet_cache['version'] and _cabinet_cache['instance'] is not None:
+            return _cabinet_cache['instance']
+        
+        instance = cls.objects.first()
+        # Une lecture faite dans une transaction peut être annulée : pas de mise en cache
+        if instance is not None and not connection.in_atomic_block:
+            _cabinet_cache['version'] = version
+            _cabinet_cache['instance'] = instance
+        return instance
+    
     @classmethod
     def get_instance(cls):
         """Get the single Cabinet instance or create it if it doesn't exist"""
-        try:
-            return cls.objects.get()
-        except cls.DoesNotExist:
-            return cls.objects.create(
+        instance = cls.get_cached()
+        if instance is None:
+            instance = cls.objects.create(
                 titre="Mon Cabinet",
                 rue="",
                 code_postal="",
@@ -41,6 +68,23 @@ class Cabinet(models.Model):
                 telephone="",
                 email=""
             )
+        return instance
     
     def __str__(self):
-        return self.titre
\ No newline at end of file
+        return self.titre
+
+
+def invalidate_cabinet_cache():
+    """
+    Vide le cache local et publie une nouvelle version aux autres workers.
+    La version n'est publiée qu'au commit, pour qu'aucun worker ne remette
+    en cache l'ancienne ligne sous la nouvelle version.
+    """
+    _cabinet_cache['version'] = None
+    _cabinet_cache['instance'] = None
+    transaction.on_commit(lambda: bump_version(CABINET_CACHE_VERSION))
+
+
+@receiver(post_save, sender=Cabinet)
+def cabinet_post_save(sender, instance, **kwargs):
+    invalidate_cabinet_cache()
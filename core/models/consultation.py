@@ -0,0 +1,138 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank, SearchVectorField
+from django.db import models
+from django.db.models import F, Value
+from django.db.models.functions import Concat
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from .patient import Patient
+from .sagefemme import SageFemme
+
+
+# Configuration plein texte française insensible aux accents (migration 0004)
+CONFIG_RECHERCHE = 'french_unaccent'
+# Délimiteurs des termes surlignés : caractères de contrôle absents des notes
+DEBUT_SURLIGNAGE = '\x02'
+FIN_SURLIGNAGE = '\x03'
+
+
+def surligner(extrait):
+    """Échappe un extrait de ts_headline puis remplace les délimiteurs par <mark>"""
+    html = escape(extrait or '')
+    html = html.replace(DEBUT_SURLIGNAGE, '<mark>').replace(FIN_SURLIGNAGE, '</mark>')
+    return mark_safe(html)
+
+
+class ConsultationQuerySet(models.QuerySet):
+    
+    def recherche(self, texte):
+        """
+        Recherche plein texte dans le motif et les notes cliniques.
+        Utilise la colonne `recherche` maintenue par trigger et son index GIN ;
+        les résultats sont classés par pertinence (ts_rank) avec un extrait surligné.
+        """
+        requete = SearchQuery(texte, config=CONFIG_RECHERCHE, search_type='websearch')
+        return (
+            self.filter(recherche=requete)
+            .annotate(
+                rang=SearchRank(F('recherche'), requete),
+                extrait=SearchHeadline(
+                    Concat('motif', Value(' — '), 'notes', output_field=models.TextField()),
+                    requete,
+                    config=CONFIG_RECHERCHE,
+                    start_sel=DEBUT_SURLIGNAGE,
+                    stop_sel=FIN_SURLIGNAGE,
+                    max_words=30,
+                    min_words=10,
+                ),
+            )
+            .order_by('-rang', '-date', '-id')
+        )
+
+
+class Consultation(models.Model):
+    """
+    Feuille de soins d'une consultation.
+    La table est partitionnée par mois sur `date` (migration 0003) : sa clé
+    primaire réelle est (id, date), `id` restant unique via sa séquence.
+    """
+    TYPE_ACTE_CHOICES = [
+        ('prenatale', 'Consultation prénatale'),
+        ('suivi_grossesse', 'Suivi grossesse'),
+        ('postnatale', 'Consultation postnatale'),
+        ('preparation', 'Préparation à la naissance'),
+        ('reeducation', 'Rééducation périnéale'),
+        ('gynecologie', 'Suivi gynécologique'),
+    ]
+    STATUT_CHOICES = [
+        ('en_cours', 'En cours'),
+        ('complete', 'Complète'),
+    ]
+    
+    # Les index composites ci-dessous commencent par ces colonnes :
+    # pas d'index simple sur les clés étrangères
+    sage_femme = models.ForeignKey(
+        SageFemme,
+        on_delete=models.PROTECT,
+        db_index=False,
+        related_name='consultations',
+        verbose_name="Sage-femme"
+    )
+    patient = models.ForeignKey(
+        Patient,
+        on_delete=models.PROTECT,
+        db_index=False,
+        related_name='consultations',
+        verbose_name="Patiente"
+    )
+    date = models.DateField(verbose_name="Date de consultation")
+    
+    # Acte
+    type_acte = models.CharField(max_length=30, choices=TYPE_ACTE_CHOICES, verbose_name="Type d'acte")
+    statut = models.CharField(max_length=20, choices=STATUT_CHOICES, default='en_cours', verbose_name="Statut")
+    motif = models.CharField(max_length=255, blank=True, verbose_name="Motif")
+    notes = models.TextField(blank=True, verbose_name="Notes cliniques")
+    duree_minutes = models.PositiveSmallIntegerField(blank=True, null=True, verbose_name="Durée (minutes)")
+    montant = models.DecimalField(max_digits=10, decimal_places=2, blank=True, null=True, verbose_name="Montant")
+    
+    # Vecteur plein texte (motif + notes), calculé par le trigger core_consultation_recherche_maj
+    recherche = SearchVectorField(null=True, editable=False)
+    
+    # Métadonnées
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Créé le")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Modifié le")
+    
+    objects = ConsultationQuerySet.as_manager()
+    
+    class Meta:
+        verbose_name = "4. Consultation"
+        verbose_name_plural = "4. Consultations"
+        ordering = ['-date', '-id']
+        indexes = [
+            # Tableau de bord : consultations récentes du cabinet (parcours d'index seul)
+            models.Index(
+                fields=['-date', '-id'],
+                include=['patient', 'sage_femme', 'type_acte', 'statut'],
+                name='core_consult_date_idx',
+            ),
+            models.Index(
+                fields=['sage_femme', '-date', '-id'],
+                include=['patient', 'type_acte', 'statut'],
+                name='core_consult_sf_date_idx',
+            ),
+            models.Index(
+                fields=['patient', '-date', '-id'],
+                name='core_consult_patient_date_idx',
+            ),
+            GinIndex(fields=['recherche'], name='core_consult_recherche_gin'),
+        ]
+    
+    def __str__(self):
+        return f"{self.date:%d/%m/%Y} - {self.patient} - {self.get_type_acte_display()}"
+    
+    @property
+    def extrait_surligne(self):
+        """Extrait HTML des résultats de recherche(), termes trouvés entre <mark>"""
+        return surligner(getattr(self, 'extrait', ''))
+
@@ -0,0 +1,62 @@
+from django.db import models
+from django.db.models import Count, Sum, Value
+from django.db.models.functions import Coalesce, TruncMonth
+
+from .consultation import Consultation
+from .sagefemme import SageFemme
+
+
+class CumulMensuel(models.Model):
+    """
+    Cumul mensuel des consultations par sage-femme et type d'acte.
+    Tenu à jour par le trigger core_consultation_cumul_maj (migration 0006) à
+    chaque création, modification ou suppression de consultation ; recalculable
+    avec `manage.py rebuild_rollups`.
+    """
+    mois = models.DateField(verbose_name="Mois")
+    sage_femme = models.ForeignKey(
+        SageFemme,
+        on_delete=models.CASCADE,
+        db_index=False,
+        related_name='cumuls_mensuels',
+        verbose_name="Sage-femme"
+    )
+    type_acte = models.CharField(max_length=30, choices=Consultation.TYPE_ACTE_CHOICES, verbose_name="Type d'acte")
+    nombre = models.IntegerField(default=0, verbose_name="Nombre de consultations")
+    montant_total = models.DecimalField(max_digits=12, decimal_places=2, default=0, verbose_name="Montant total")
+    duree_totale = models.IntegerField(default=0, verbose_name="Durée totale (minutes)")
+    
+    class Meta:
+        verbose_name = "Cumul mensuel"
+        verbose_name_plural = "Cumuls mensuels"
+        ordering = ['-mois', 'sage_femme', 'type_acte']
+        constraints = [
+            # Cible du INSERT ... ON CONFLICT du trigger ; sert aussi d'index par mois
+            models.UniqueConstraint(
+                fields=['mois', 'sage_femme', 'type_acte'],
+                name='core_cumul_mensuel_unique',
+            ),
+        ]
+    
+    @staticmethod
+    def calculer(consultations=None):
+        """
+        Cumuls recalculés depuis les consultations (GROUP BY complet).
+        Retourne des dictionnaires mois, sage_femme_id, type_acte, nombre, montant_total, duree_totale.
+        """
+        if consultations is None:
+            consultations = Consultation.objects.all()
+        return (
+            consultations
+            .order_by()
+            .annotate(mois=TruncMonth('date'))
+            .values('mois', 'sage_femme_id', 'type_acte')
+            .annotate(
+                nombre=Count('id'),
+                montant_total=Coalesce(Sum('montant'), Value(0), output_field=models.DecimalField()),
+                duree_totale=Coalesce(Sum('duree_minutes'), Value(0)),
+            )
+        )
+    
+    def __str__(self):
+        return f"{self.mois:%m/%Y} - {self.sage_femme} - {self.get_type_acte_display()}"
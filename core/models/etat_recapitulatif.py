@@ -0,0 +1,38 @@
+from django.db import models
+
+from .sagefemme import SageFemme
+
+
+class EtatRecapitulatif(models.Model):
+    """
+    État récapitulatif mensuel d'une sage-femme titulaire (PDF généré).
+    Les remplaçantes à état commun y sont fusionnées. L'empreinte des données
+    rendues permet de ne pas régénérer un état inchangé.
+    """
+    mois = models.DateField(verbose_name="Mois")
+    sage_femme = models.ForeignKey(
+        SageFemme,
+        on_delete=models.CASCADE,
+        db_index=False,
+        related_name='etats_recapitulatifs',
+        verbose_name="Sage-femme titulaire"
+    )
+    empreinte = models.CharField(max_length=64, verbose_name="Empreinte du contenu")
+    fichier = models.FileField(upload_to='etats_recapitulatifs/', verbose_name="Fichier PDF")
+    nombre_consultations = models.PositiveIntegerField(default=0, verbose_name="Nombre de consultations")
+    montant_total = models.DecimalField(max_digits=12, decimal_places=2, default=0, verbose_name="Montant total")
+    
+    # Métadonnées
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Créé le")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Généré le")
+    
+    class Meta:
+        verbose_name = "État récapitulatif"
+        verbose_name_plural = "États récapitulatifs"
+        ordering = ['-mois', 'sage_femme__nom', 'sage_femme__prenom']
+        constraints = [
+            models.UniqueConstraint(fields=['mois', 'sage_femme'], name='core_etat_recap_unique'),
+        ]
+    
+    def __str__(self):
+        return f"État récapitulatif {self.mois:%m/%Y} - {self.sage_femme.nom_complet}"
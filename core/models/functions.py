@@ -0,0 +1,41 @@
+"""
+Fonctions de base de données partagées par les modèles
+Recherche insensible aux accents (extensions PostgreSQL unaccent et pg_trgm)
+"""
+
+import unicodedata
+
+from django.db.models import Func, TextField
+from django.db.models.functions import Lower
+
+
+class ImmutableUnaccent(Func):
+    """
+    unaccent() déclarée IMMUTABLE (migration 0002), utilisable dans un index.
+    La fonction unaccent() d'origine est STABLE et refusée par PostgreSQL
+    dans une expression d'index.
+    """
+    function = 'core_immutable_unaccent'
+    output_field = TextField()
+
+
+class ConcatTexte(Func):
+    """
+    Concaténation `a || ' ' || b` : contrairement à CONCAT(), l'opérateur
+    est IMMUTABLE et peut donc être indexé. Les champs doivent être non nuls.
+    """
+    template = '(%(expressions)s)'
+    arg_joiner = " || ' ' || "
+    output_field = TextField()
+
+
+def texte_normalise(*champs):
+    """Expression minuscule et sans accents de la concaténation des champs"""
+    return ImmutableUnaccent(Lower(ConcatTexte(*champs)))
+
+
+def normaliser_recherche(texte):
+    """Équivalent Python de texte_normalise pour les termes recherchés"""
+    texte = texte.lower().replace('œ', 'oe').replace('æ', 'ae')
+    decompose = unicodedata.normalize('NFKD', texte)
+    return ''.join(c for c in decompose if not unicodedata.combining(c))
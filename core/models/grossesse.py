@@ -0,0 +1,75 @@
+import datetime
+
+from django.db import models
+from django.db.models import Q
+
+from .patient import Patient
+from .sagefemme import SageFemme
+
+
+# Terme à 41 SA (DDR + 14 jours + 9 mois), en jours depuis la date des dernières règles
+DUREE_TERME = 287
+
+
+class Grossesse(models.Model):
+    """
+    Grossesse suivie au cabinet, datée par la date des dernières règles (DDR).
+    Un terme corrigé à l'échographie du premier trimestre remplace le terme
+    calculé. Âge gestationnel et examens à venir : core.calendrier_grossesse.
+    """
+    patient = models.ForeignKey(
+        Patient,
+        on_delete=models.PROTECT,
+        related_name='grossesses',
+        verbose_name="Patiente"
+    )
+    sage_femme = models.ForeignKey(
+        SageFemme,
+        on_delete=models.SET_NULL,
+        blank=True,
+        null=True,
+        related_name='grossesses',
+        verbose_name="Suivie par"
+    )
+    date_dernieres_regles = models.DateField(verbose_name="Date des dernières règles")
+    date_terme_echographique = models.DateField(
+        blank=True, null=True, verbose_name="Terme corrigé",
+        help_text="Terme fixé par l'échographie du premier trimestre, s'il diffère du terme calculé"
+    )
+    date_fin = models.DateField(
+        blank=True, null=True, verbose_name="Fin du suivi",
+        help_text="Accouchement ou interruption : la grossesse sort des échéanciers"
+    )
+    
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Créé le")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Modifié le")
+    
+    class Meta:
+        verbose_name = "Grossesse"
+        verbose_name_plural = "6. Grossesses"
+        ordering = ['-date_dernieres_regles']
+        indexes = [
+            # Échéancier : seules les grossesses en cours sont parcourues
+            models.Index(
+                fields=['date_dernieres_regles'],
+                condition=Q(date_fin__isnull=True),
+                name='core_grossesse_en_cours_idx',
+            ),
+        ]
+        constraints = [
+            models.CheckConstraint(
+                condition=Q(date_fin__isnull=True) | Q(date_fin__gte=models.F('date_dernieres_regles')),
+                name='core_grossesse_fin_valide',
+                violation_error_message="La fin du suivi doit être postérieure aux dernières règles.",
+            ),
+        ]
+    
+    def __str__(self):
+        return f"{self.patient.nom_complet} : terme le {self.terme:%d/%m/%Y}"
+    
+    @property
+    def terme(self):
+        """Terme corrigé s'il est saisi, sinon DDR + 287 jours"""
+        return self.date_terme_echographique or (
+            self.date_dernieres_regles + datetime.timedelta(days=DUREE_TERME)
+        )
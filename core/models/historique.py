@@ -0,0 +1,145 @@
+import datetime
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.db.models import F, OuterRef, Q, Subquery
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .sagefemme import SageFemme
+
+
+# Une version sur INTERVALLE_INSTANTANES est une copie complète, les autres ne
+# portent que les champs modifiés : une lecture rejoue au plus N - 1 différences
+INTERVALLE_INSTANTANES = 20
+
+CHAMPS_HISTORISES = [
+    'nom', 'prenom', 'titre', 'telephone', 'email', 'rue', 'code_postal', 'ville',
+    'numero_cafat', 'ridet', 'rib', 'banque', 'situation', 'remplacement_de_id',
+    'etat_recapitulatif_commun', 'bons_depot_communs', 'is_active',
+]
+
+
+def etat_historise(sage_femme):
+    return {champ: getattr(sage_femme, champ) for champ in CHAMPS_HISTORISES}
+
+
+def limite_moment(moment):
+    """Versions en vigueur au moment donné ; une date couvre toute la journée"""
+    if isinstance(moment, datetime.datetime):
+        return Q(date_effet__lte=moment)
+    fin_journee = datetime.datetime.combine(moment + datetime.timedelta(days=1), datetime.time.min)
+    return Q(date_effet__lt=timezone.make_aware(fin_journee))
+
+
+class HistoriqueQuerySet(models.QuerySet):
+
+    def etats(self, moment=None):
+        """
+        États reconstitués {sage_femme_id: (version, état)} au moment donné
+        (dernière version si None), en une requête : pour chaque sage-femme,
+        le dernier instantané puis les différences qui le suivent.
+        """
+        versions = self.filter(limite_moment(moment)) if moment is not None else self
+        dernier_instantane = (
+            versions
+            .filter(sage_femme=OuterRef('sage_femme'), instantane=True)
+            .order_by('-version')
+            .values('version')[:1]
+        )
+        lignes = (
+            versions
+            .annotate(depuis=Subquery(dernier_instantane))
+            .filter(version__gte=F('depuis'), version__lt=F('depuis') + INTERVALLE_INSTANTANES)
+            .order_by('sage_femme_id', 'version')
+            .values_list('sage_femme_id', 'version', 'donnees')
+        )
+        etats = {}
+        for sage_femme_id, version, donnees in lignes:
+            etat = etats[sage_femme_id][1] if sage_femme_id in etats else {}
+            etat.update(donnees)
+            etats[sage_femme_id] = (version, etat)
+        return etats
+
+    def as_of(self, moment):
+        """État d'une sage-femme au moment donné (sur sage_femme.historique), None avant sa création"""
+        etats = self.etats(moment)
+        return next(iter(etats.values()))[1] if etats else None
+
+
+class HistoriqueSageFemme(models.Model):
+    """
+    Version d'une fiche sage-femme (RIB, situation, titulaire…) : instantané
+    complet toutes les INTERVALLE_INSTANTANES versions, sinon seulement les
+    champs modifiés. Lecture à une date : SageFemme.as_of().
+    """
+    sage_femme = models.ForeignKey(
+        SageFemme,
+        on_delete=models.CASCADE,
+        related_name='historique',
+        verbose_name="Sage-femme"
+    )
+    version = models.PositiveIntegerField(verbose_name="Version")
+    date_effet = models.DateTimeField(verbose_name="En vigueur depuis")
+    instantane = models.BooleanField(default=False, verbose_name="Instantané complet")
+    donnees = models.JSONField(encoder=DjangoJSONEncoder, verbose_name="Données")
+
+    objects = HistoriqueQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = "Version de sage-femme"
+        verbose_name_plural = "Historique des sages-femmes"
+        ordering = ['sage_femme', '-version']
+        constraints = [
+            # Deux enregistrements concurrents ne peuvent pas écrire la même version
+            models.UniqueConstraint(fields=['sage_femme', 'version'], name='core_historique_sf_version_unique'),
+        ]
+        indexes = [
+            models.Index(
+                fields=['sage_femme', '-version'],
+                condition=Q(instantane=True),
+                name='core_historique_instantane_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.sage_femme_id} v{self.version} ({self.date_effet:%d/%m/%Y %H:%M})"
+
+
+def historiser(sages_femmes, date_effet=None):
+    """
+    Enregistre une version pour chaque sage-femme modifiée depuis sa dernière
+    version : une lecture des états courants, puis un seul INSERT. Un
+    enregistrement sans changement n'écrit rien.
+    """
+    sages_femmes = [sage_femme for sage_femme in sages_femmes if sage_femme.pk]
+    if not sages_femmes:
+        return []
+    date_effet = date_effet or timezone.now()
+    etats = HistoriqueSageFemme.objects.filter(sage_femme__in=[sf.pk for sf in sages_femmes]).etats()
+
+    versions = []
+    for sage_femme in sages_femmes:
+        etat = etat_historise(sage_femme)
+        version, precedent = etats.get(sage_femme.pk, (0, None))
+        differences = etat if precedent is None else {
+            champ: valeur for champ, valeur in etat.items() if precedent.get(champ) != valeur
+        }
+        if not differences:
+            continue
+        instantane = version % INTERVALLE_INSTANTANES == 0
+        versions.append(HistoriqueSageFemme(
+            sage_femme=sage_femme,
+            version=version + 1,
+            date_effet=date_effet,
+            instantane=instantane,
+            donnees=etat if instantane else differences,
+        ))
+    return HistoriqueSageFemme.objects.bulk_create(versions)
+
+
+@receiver(post_save, sender=SageFemme)
+def sage_femme_enregistree(sender, instance, raw=False, **kwargs):
+    if not raw:
+        historiser([instance])
@@ -0,0 +1,143 @@
+import datetime
+
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db import models, transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.cache import bump_version
+
+from .functions import normaliser_recherche, texte_normalise
+
+
+PATIENTS_CACHE_VERSION = 'patients'
+
+# Champs couverts par la recherche de patientes, dans l'ordre de saisie attendu
+CHAMPS_RECHERCHE = ['nom', 'prenom']
+FORMATS_DATE_RECHERCHE = ['%d/%m/%Y', '%Y-%m-%d']
+
+
+def lire_date(terme):
+    for format_date in FORMATS_DATE_RECHERCHE:
+        try:
+            return datetime.datetime.strptime(terme, format_date).date()
+        except ValueError:
+            continue
+    return None
+
+
+class PatientQuerySet(models.QuerySet):
+    
+    def requetes_recherche(self, texte, limite=10):
+        """
+        Requêtes de recherche() : (préfixes, similarité) ; la seconde, None
+        si la saisie ne contient qu'une date, ne sert que sans résultat de la première
+        """
+        queryset = self.alias(texte_recherche=Patient.texte_recherche())
+        mots = []
+        for terme in normaliser_recherche(texte).split():
+            date = lire_date(terme)
+            if date is None:
+                mots.append(terme)
+            else:
+                queryset = queryset.filter(date_naissance=date)
+        
+        if not mots:
+            return queryset.order_by('nom', 'prenom')[:limite], None
+        
+        saisie = ' '.join(mots)
+        similaires = (
+            queryset
+            .filter(texte_recherche__trigram_word_similar=saisie)
+            .annotate(similarite=TrigramWordSimilarity(saisie, F('texte_recherche')))
+            .order_by('-similarite', 'nom', 'prenom')
+        )
+        return (
+            queryset.filter(texte_recherche__startswith=saisie).order_by('nom', 'prenom')[:limite],
+            similaires[:limite],
+        )
+    
+    def recherche(self, texte, limite=10):
+        """
+        Recherche rapide par nom, prénom et date de naissance (jj/mm/aaaa).
+        Les préfixes « nom prénom » passent par l'index core_patient_nom_naiss_idx ;
+        sans résultat, la recherche se rabat sur la similarité de trigrammes
+        (fautes de frappe, prénom saisi en premier). Retourne une liste.
+        """
+        prefixes, similaires = self.requetes_recherche(texte, limite)
+        resultats = list(prefixes)
+        if resultats or similaires is None:
+            return resultats
+        return list(similaires)
+    
+    async def arecherche(self, texte, limite=10):
+        """Version asynchrone de recherche() (ORM asynchrone)"""
+        prefixes, similaires = self.requetes_recherche(texte, limite)
+        resultats = [patient async for patient in prefixes]
+        if resultats or similaires is None:
+            return resultats
+        return [patient async for patient in similaires]
+
+
+class Patient(models.Model):
+    # Identité
+    nom = models.CharField(max_length=100, verbose_name="Nom")
+    prenom = models.CharField(max_length=100, verbose_name="Prénom")
+    date_naissance = models.DateField(verbose_name="Date de naissance")
+    
+    # Contact
+    telephone = models.CharField(max_length=20, blank=True, verbose_name="Téléphone")
+    email = models.EmailField(blank=True, verbose_name="Mail")
+    
+    # Adresse (optionnelle)
+    rue = models.CharField(max_length=255, blank=True, null=True, verbose_name="Rue")
+    code_postal = models.CharField(max_length=10, blank=True, null=True, verbose_name="Code postal")
+    ville = models.CharField(max_length=100, blank=True, null=True, verbose_name="Ville")
+    
+    # Assurance
+    numero_cafat = models.CharField(max_length=50, blank=True, verbose_name="Numéro CAFAT")
+    
+    # Métadonnées
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Créé le")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Modifié le")
+    
+    objects = PatientQuerySet.as_manager()
+    
+    class Meta:
+        verbose_name = "3. Patiente"
+        verbose_name_plural = "3. Patientes"
+        ordering = ['nom', 'prenom']
+        indexes = [
+            # Préfixes (LIKE 'dup%') quelle que soit la collation, puis date de naissance
+            models.Index(
+                OpClass(texte_normalise(*CHAMPS_RECHERCHE), name='text_pattern_ops'),
+                F('date_naissance'),
+                name='core_patient_nom_naiss_idx',
+            ),
+            GinIndex(
+                OpClass(texte_normalise(*CHAMPS_RECHERCHE), name='gin_trgm_ops'),
+                name='core_patient_recherche_trgm',
+            ),
+        ]
+    
+    @classmethod
+    def texte_recherche(cls):
+        """Expression indexée « nom prénom » sans accents ni majuscules"""
+        return texte_normalise(*CHAMPS_RECHERCHE)
+    
+    def __str__(self):
+        return f"{self.nom} {self.prenom} ({self.date_naissance:%d/%m/%Y})"
+    
+    @property
+    def nom_complet(self):
+        """Retourne le nom complet"""
+        return f"{self.prenom} {self.nom}"
+
+
+@receiver(post_save, sender=Patient)
+@receiver(post_delete, sender=Patient)
+def patient_modifie(sender, instance, **kwargs):
+    # Invalide les réponses de recherche en cache, une fois la modification validée
+    transaction.on_commit(lambda: bump_version(PATIENTS_CACHE_VERSION))
@@ -1,6 +1,69 @@
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
+from django.db.models import Q
 from django.core.exceptions import ValidationError
 
+from .functions import texte_normalise
+
+
+# Champs couverts par la recherche plein texte de l'administration
+CHAMPS_RECHERCHE = ['nom', 'prenom', 'titre', 'telephone', 'email', 'numero_cafat', 'ridet']
+
+
+class GroupesFacturation:
+    """
+    Regroupement des sages-femmes par titulaire effectif des documents
+    de facturation (état récapitulatif et bons de dépôt).
+    Un remplaçant dont le document est commun est rattaché à son titulaire.
+    """
+    
+    def __init__(self, sages_femmes):
+        self.sages_femmes = {sf.pk: sf for sf in sages_femmes}
+        self.etats_recapitulatifs = self._grouper('titulaire_etat_recapitulatif')
+        self.bons_depot = self._grouper('titulaire_bons_depot')
+    
+    def _grouper(self, attribut):
+        groupes = {}
+        for sage_femme in self.sages_femmes.values():
+            titulaire = getattr(sage_femme, attribut)
+            groupes.setdefault(titulaire.pk, (titulaire, []))[1].append(sage_femme)
+        return groupes
+    
+    def titulaire_etat_recapitulatif(self, sage_femme_id):
+        """Retourne le titulaire de l'état récapitulatif d'une sage-femme"""
+        return self.sages_femmes[sage_femme_id].titulaire_etat_recapitulatif
+    
+    def titulaire_bons_depot(self, sage_femme_id):
+        """Retourne le titulaire des bons de dépôt d'une sage-femme"""
+        return self.sages_femmes[sage_femme_id].titulaire_bons_depot
+
+
+class SageFemmeQuerySet(models.QuerySet):
+    
+    def actives(self):
+        return self.filter(is_active=True)
+    
+    def groupes_facturation(self, consultations=None):
+        """
+        Résout en une seule requête le titulaire effectif de chaque sage-femme active
+        et, si `consultations` est donné, de chaque sage-femme qui en a : une
+        sage-femme désactivée en cours de mois reste à facturer pour ce mois.
+        """
+        sages_femmes = Q(is_active=True)
+        if consultations is not None:
+            sages_femmes |= Q(pk__in=consultations.order_by().values('sage_femme_id'))
+        return GroupesFacturation(self.filter(sages_femmes).select_related('remplacement_de'))
+    
+    def groupes_facturation_pour(self, request):
+        """
+        Comme groupes_facturation(), mémorisé pour la durée de la requête HTTP
+        """
+        groupes = getattr(request, '_groupes_facturation', None)
+        if groupes is None:
+            groupes = self.groupes_facturation()
+            request._groupes_facturation = groupes
+        return groupes
+
 
 class SageFemme(models.Model):
     SITUATION_CHOICES = [
@@ -64,10 +127,25 @@ class SageFemme(models.Model):
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Créé le")
     updated_at = models.DateTimeField(auto_now=True, verbose_name="Modifié le")
     
+    objects = SageFemmeQuerySet.as_manager()
+    
     class Meta:
         verbose_name = "2. Sage-femme"
         verbose_name_plural = "2. Sages-femmes"
         ordering = ['nom', 'prenom']
+        indexes = [
+            GinIndex(
+                OpClass(texte_normalise(*CHAMPS_RECHERCHE), name='gin_trgm_ops'),
+                name='core_sagefemme_recherche_trgm',
+            ),
+            models.Index(fields=['numero_cafat'], name='core_sagefemme_cafat_idx'),
+            models.Index(fields=['ridet'], name='core_sagefemme_ridet_idx'),
+        ]
+    
+    @classmethod
+    def texte_recherche(cls):
+        """Expression indexée (trigrammes) utilisée par la recherche de l'administration"""
+        return texte_normalise(*CHAMPS_RECHERCHE)
     
     def __str__(self):
         return f"{self.nom} {self.prenom} ({self.get_situation_display()})"
@@ -96,16 +174,29 @@ class SageFemme(models.Model):
                     'remplacement_de': 'Seuls les remplaçants peuvent avoir ce champ renseigné.'
                 })
     
-    def save(self, *args, **kwargs):
-        # Réinitialiser les champs spécifiques aux remplaçants si ce n'est pas un remplaçant
+    def reinitialiser_champs_remplacant(self):
+        """Réinitialise les champs spécifiques aux remplaçants si ce n'est pas un remplaçant"""
         if self.situation != 'remplacant':
             self.remplacement_de = None
             self.etat_recapitulatif_commun = False
             self.bons_depot_communs = False
-        
+    
+    def save(self, *args, **kwargs):
+        self.reinitialiser_champs_remplacant()
         self.full_clean()
         super().save(*args, **kwargs)
     
+    def as_of(self, moment):
+        """
+        Fiche telle qu'elle était au moment donné (une date couvre toute la
+        journée), reconstituée depuis l'historique ; None si elle n'existait pas.
+        L'objet retourné n'est pas destiné à être enregistré.
+        """
+        etat = self.historique.as_of(moment)
+        if etat is None:
+            return None
+        return SageFemme(pk=self.pk, created_at=self.created_at, **etat)
+    
     @property
     def nom_complet(self):
         """Retourne le nom complet"""
@@ -116,4 +207,18 @@ class SageFemme(models.Model):
         """Retourne l'adresse complète si disponible"""
         if self.rue and self.code_postal and self.ville:
             return f"{self.rue}, {self.code_postal} {self.ville}"
-        return "Adresse non renseignée"
\ No newline at end of file
+        return "Adresse non renseignée"
+    
+    @property
+    def titulaire_etat_recapitulatif(self):
+        """Retourne la sage-femme au nom de laquelle est établi l'état récapitulatif"""
+        if self.situation == 'remplacant' and self.etat_recapitulatif_commun and self.remplacement_de:
+            return self.remplacement_de
+        return self
+    
+    @property
+    def titulaire_bons_depot(self):
+        """Retourne la sage-femme au nom de laquelle sont établis les bons de dépôt"""
+        if self.situation == 'remplacant' and self.bons_depot_communs and self.remplacement_de:
+            return self.remplacement_de
+        return self
\ No newline at end of file
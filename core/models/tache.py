@@ -0,0 +1,60 @@
+from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+
+
+class Tache(models.Model):
+    """
+    Tâche de fond, exécutée hors des workers web par `manage.py run_jobs`.
+    File d'attente en base (core.taches) : réclamée avec FOR UPDATE SKIP LOCKED,
+    sans courtier externe.
+    """
+    STATUT_CHOICES = [
+        ('en_attente', 'En attente'),
+        ('en_cours', 'En cours'),
+        ('terminee', 'Terminée'),
+        ('echouee', 'Échouée'),
+    ]
+    
+    nom = models.CharField(max_length=100, verbose_name="Tâche")
+    arguments = models.JSONField(default=dict, blank=True, verbose_name="Arguments")
+    statut = models.CharField(max_length=20, choices=STATUT_CHOICES, default='en_attente', verbose_name="Statut")
+    
+    tentatives = models.PositiveSmallIntegerField(default=0, verbose_name="Tentatives")
+    tentatives_max = models.PositiveSmallIntegerField(default=3, verbose_name="Tentatives maximum")
+    executer_apres = models.DateTimeField(default=timezone.now, verbose_name="Exécuter après")
+    # En cours : le worker renouvelle le bail ; expiré, la tâche est réclamée à nouveau
+    bail_expire = models.DateTimeField(blank=True, null=True, verbose_name="Fin du bail")
+    
+    progression = models.JSONField(default=dict, blank=True, verbose_name="Avancement")
+    resultat = models.JSONField(blank=True, null=True, verbose_name="Résultat")
+    erreur = models.TextField(blank=True, verbose_name="Erreur")
+    
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Créée le")
+    debut = models.DateTimeField(blank=True, null=True, verbose_name="Démarrée le")
+    fin = models.DateTimeField(blank=True, null=True, verbose_name="Terminée le")
+    
+    class Meta:
+        verbose_name = "Tâche de fond"
+        verbose_name_plural = "Tâches de fond"
+        ordering = ['-created_at']
+        indexes = [
+            # Réclamation par les workers : seules les tâches à exécuter sont indexées
+            models.Index(
+                fields=['executer_apres', 'id'],
+                condition=Q(statut='en_attente'),
+                name='core_tache_a_executer_idx',
+            ),
+            models.Index(
+                fields=['bail_expire'],
+                condition=Q(statut='en_cours'),
+                name='core_tache_bail_idx',
+            ),
+        ]
+    
+    def __str__(self):
+        return f"{self.nom} #{self.pk} ({self.get_statut_display()})"
+    
+    @property
+    def termine(self):
+        return self.statut in ('terminee', 'echouee')
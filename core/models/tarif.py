@@ -0,0 +1,68 @@
+from django.contrib.postgres.constraints import ExclusionConstraint
+from django.contrib.postgres.fields import DateRangeField, RangeOperators
+from django.db import models, transaction
+from django.db.models import Func, Q
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.cache import bump_version
+
+
+TARIFS_CACHE_VERSION = 'tarifs'
+
+
+class PeriodeValidite(Func):
+    """daterange [date_debut, date_fin[ ; sans date de fin, la période est ouverte"""
+    function = 'DATERANGE'
+    output_field = DateRangeField()
+
+
+class Tarif(models.Model):
+    """
+    Tarif d'un acte de la nomenclature CAFAT sur une période de validité.
+    Une revalorisation clôt le tarif en cours (date_fin) et en ouvre un nouveau :
+    une feuille de soins est toujours tarifée à la date de la consultation.
+    Les lectures passent par l'index en mémoire de core.tarifs.
+    """
+    code = models.CharField(max_length=20, verbose_name="Code acte")
+    libelle = models.CharField(max_length=200, verbose_name="Libellé")
+    montant = models.DecimalField(max_digits=10, decimal_places=2, verbose_name="Montant")
+    date_debut = models.DateField(verbose_name="Applicable du")
+    date_fin = models.DateField(
+        blank=True, null=True, verbose_name="Applicable jusqu'au (exclu)",
+        help_text="Laisser vide pour le tarif en vigueur"
+    )
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = "Tarif"
+        verbose_name_plural = "5. Tarifs"
+        ordering = ['code', '-date_debut']
+        constraints = [
+            models.CheckConstraint(
+                condition=Q(date_fin__isnull=True) | Q(date_fin__gt=models.F('date_debut')),
+                name='core_tarif_periode_valide',
+                violation_error_message="La date de fin doit être postérieure à la date de début.",
+            ),
+            # Deux tarifs d'un même code ne peuvent pas se chevaucher (btree_gist)
+            ExclusionConstraint(
+                name='core_tarif_sans_chevauchement',
+                expressions=[
+                    ('code', RangeOperators.EQUAL),
+                    (PeriodeValidite('date_debut', 'date_fin'), RangeOperators.OVERLAPS),
+                ],
+                violation_error_message="Un tarif de ce code est déjà applicable sur cette période.",
+            ),
+        ]
+    
+    def __str__(self):
+        return f"{self.code} - {self.libelle} ({self.montant})"
+
+
+@receiver(post_save, sender=Tarif)
+@receiver(post_delete, sender=Tarif)
+def tarif_modifie(sender, instance, **kwargs):
+    # Les workers rechargeront leur index au prochain accès, une fois la modification validée
+    transaction.on_commit(lambda: bump_version(TARIFS_CACHE_VERSION))
@@ -0,0 +1,46 @@
+"""
+Pagination par curseur (keyset) sur (date, id) décroissants
+Coût constant quelle que soit la profondeur, contrairement à OFFSET
+"""
+
+import datetime
+
+from django.db.models import Q
+
+
+def encoder_curseur(date, pk):
+    return f"{date.isoformat()}.{pk}"
+
+
+def decoder_curseur(curseur):
+    """Retourne (date, id) ou None si le curseur est absent ou invalide"""
+    if not curseur:
+        return None
+    try:
+        date, pk = curseur.split('.')
+        return datetime.date.fromisoformat(date), int(pk)
+    except ValueError:
+        return None
+
+
+def page_par_curseur(queryset, curseur=None, taille=50, champ_date='date'):
+    """
+    Retourne (lignes, curseur suivant) pour une page triée par date puis id décroissants.
+    Le curseur suivant vaut None sur la dernière page.
+    """
+    position = decoder_curseur(curseur)
+    if position is not None:
+        date, pk = position
+        # La borne date <= curseur permet le parcours d'index et l'élagage des partitions
+        queryset = queryset.filter(
+            Q(**{f'{champ_date}__lt': date}) | Q(**{champ_date: date, 'pk__lt': pk}),
+            **{f'{champ_date}__lte': date},
+        )
+    lignes = list(queryset.order_by(f'-{champ_date}', '-pk')[:taille + 1])
+
+    suivant = None
+    if len(lignes) > taille:
+        lignes = lignes[:taille]
+        derniere = lignes[-1]
+        suivant = encoder_curseur(getattr(derniere, champ_date), derniere.pk)
+    return lignes, suivant
@@ -0,0 +1,113 @@
+"""
+Gestion des partitions mensuelles PostgreSQL
+Tables partitionnées par plage (RANGE) sur une colonne date
+"""
+
+import datetime
+
+from django.db import connection, transaction
+
+
+# Table partitionnée -> colonne de partitionnement
+TABLES_PARTITIONNEES = {
+    'core_consultation': 'date',
+    'core_journalaudit': 'horodatage',
+}
+
+
+def debut_mois(jour):
+    return jour.replace(day=1)
+
+
+def mois_suivant(mois):
+    if mois.month == 12:
+        return mois.replace(year=mois.year + 1, month=1)
+    return mois.replace(month=mois.month + 1)
+
+
+def nom_partition(table, mois):
+    return f"{table}_{mois:%Y_%m}"
+
+
+def nom_partition_defaut(table):
+    return f"{table}_defaut"
+
+
+def partitions_mensuelles(table):
+    """Retourne {premier jour du mois: nom de partition} des partitions attachées"""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT c.relname FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = %s::regclass
+            """,
+            [table],
+        )
+        noms = [row[0] for row in cursor.fetchall()]
+
+    partitions = {}
+    for nom in noms:
+        suffixe = nom[len(table) + 1:]
+        try:
+            mois = datetime.datetime.strptime(suffixe, '%Y_%m').date()
+        except ValueError:
+            continue
+        partitions[mois] = nom
+    return partitions
+
+
+def mois_dans_partition_defaut(table):
+    """Mois présents dans la partition par défaut (lignes à ranger)"""
+    colonne = connection.ops.quote_name(TABLES_PARTITIONNEES[table])
+    defaut = connection.ops.quote_name(nom_partition_defaut(table))
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT DISTINCT date_trunc('month', {colonne})::date FROM {defaut}")
+        return sorted(row[0] for row in cursor.fetchall())
+
+
+def creer_partition(table, mois):
+    """
+    Crée et attache la partition du mois.
+    Les lignes de ce mois déjà rangées dans la partition par défaut y sont déplacées ;
+    les triggers de cumul ignorent ce déplacement (maieutix.deplacement_partition).
+    """
+    quote = connection.ops.quote_name
+    colonne = quote(TABLES_PARTITIONNEES[table])
+    partition = quote(nom_partition(table, mois))
+    defaut = quote(nom_partition_defaut(table))
+    bornes = [mois, mois_suivant(mois)]
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f"CREATE TABLE {partition} (LIKE {quote(table)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+        )
+        cursor.execute("SET LOCAL maieutix.deplacement_partition = 'on'")
+        cursor.execute(
+            f"""
+            WITH deplacees AS (
+                DELETE FROM {defaut} WHERE {colonne} >= %s AND {colonne} < %s RETURNING *
+            )
+            INSERT INTO {partition} SELECT * FROM deplacees
+            """,
+            bornes,
+        )
+        deplacees = cursor.rowcount
+        cursor.execute(
+            f"ALTER TABLE {quote(table)} ATTACH PARTITION {partition} FOR VALUES FROM (%s) TO (%s)",
+            bornes,
+        )
+        cursor.execute("SET LOCAL maieutix.deplacement_partition = 'off'")
+    return deplacees
+
+
+def detacher_partition(table, mois):
+    """
+    Détache la partition du mois : la table reste en base (archivage ou DROP manuel)
+    et les requêtes sur la table partitionnée ne la parcourent plus.
+    """
+    quote = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"ALTER TABLE {quote(table)} DETACH PARTITION {quote(nom_partition(table, mois))}"
+        )
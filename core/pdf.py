@@ -0,0 +1,152 @@
+"""
+Écriture de documents PDF simples (texte et filets), sans dépendance
+Les pages sont émises au fur et à mesure : un document de plusieurs
+milliers de pages s'écrit en mémoire constante.
+"""
+
+import zlib
+
+
+LARGEUR_A4 = 595
+HAUTEUR_A4 = 842
+
+# Polices standard PDF (aucune police à embarquer), encodage Windows-1252
+POLICES = {
+    False: (b'F1', b'Helvetica'),
+    True: (b'F2', b'Helvetica-Bold'),
+}
+# Chasses Helvetica en millièmes de corps ; les autres caractères sont estimés
+CHASSES = {' ': 278, ',': 278, '.': 278, '-': 333, '/': 278, ':': 278, 'i': 222, 'l': 222, 'I': 278}
+CHASSE_CHIFFRE = 556
+CHASSE_DEFAUT = 556
+
+
+def largeur_texte(texte, taille):
+    """Largeur approximative d'un texte en points (alignement à droite des montants)"""
+    return sum(
+        CHASSE_CHIFFRE if c.isdigit() else CHASSES.get(c, CHASSE_DEFAUT) for c in texte
+    ) * taille / 1000
+
+
+def echapper(texte):
+    octets = str(texte).encode('cp1252', errors='replace')
+    return octets.replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)')
+
+
+class Page:
+    """Contenu d'une page A4 : coordonnées en points depuis le coin inférieur gauche"""
+
+    def __init__(self):
+        self.operations = []
+
+    def texte(self, x, y, texte, taille=10, gras=False, droite=False):
+        """Écrit un texte ; avec droite=True, x est la position du bord droit"""
+        if droite:
+            x -= largeur_texte(str(texte), taille)
+        police = POLICES[gras][0]
+        self.operations.append(
+            b'BT /%s %d Tf %.2f %.2f Td (%s) Tj ET' % (police, taille, x, y, echapper(texte))
+        )
+
+    def filet(self, x1, y1, x2, y2, epaisseur=0.5):
+        self.operations.append(b'%.2f w %.2f %.2f m %.2f %.2f l S' % (epaisseur, x1, y1, x2, y2))
+
+    def contenu(self):
+        return b'\n'.join(self.operations)
+
+
+class EcrivainPDF:
+    """
+    Écrit un PDF par morceaux : debut(), puis page() pour chaque page, puis fin().
+    Chaque appel retourne les octets à émettre ; seuls les décalages des objets
+    sont conservés pour la table de références finale.
+    """
+    CATALOGUE = 1
+    ARBRE_PAGES = 2
+
+    def __init__(self, titre=''):
+        self.titre = titre
+        self.position = 0
+        self.decalages = {}
+        self.pages = []
+        self.prochain_objet = 3
+
+    def _numero(self):
+        numero = self.prochain_objet
+        self.prochain_objet += 1
+        return numero
+
+    def _objet(self, numero, corps):
+        self.decalages[numero] = self.position
+        octets = b'%d 0 obj\n%s\nendobj\n' % (numero, corps)
+        self.position += len(octets)
+        return octets
+
+    def _emettre(self, octets):
+        self.position += len(octets)
+        return octets
+
+    def debut(self):
+        morceaux = [self._emettre(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')]
+        self.polices = {}
+        for police, nom in POLICES.values():
+            numero = self._numero()
+            self.polices[police] = numero
+            morceaux.append(self._objet(
+                numero,
+                b'<< /Type /Font /Subtype /Type1 /BaseFont /%s /Encoding /WinAnsiEncoding >>' % nom,
+            ))
+        return b''.join(morceaux)
+
+    def page(self, page):
+        flux = zlib.compress(page.contenu())
+        numero_contenu = self._numero()
+        numero_page = self._numero()
+        self.pages.append(numero_page)
+        ressources = b' '.join(
+            b'/%s %d 0 R' % (police, numero) for police, numero in self.polices.items()
+        )
+        return self._objet(
+            numero_contenu,
+            b'<< /Length %d /Filter /FlateDecode >>\nstream\n%s\nendstream' % (len(flux), flux),
+        ) + self._objet(
+            numero_page,
+            b'<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %d %d] '
+            b'/Resources << /Font << %s >> >> /Contents %d 0 R >>'
+            % (self.ARBRE_PAGES, LARGEUR_A4, HAUTEUR_A4, ressources, numero_contenu),
+        )
+
+    def fin(self):
+        enfants = b' '.join(b'%d 0 R' % numero for numero in self.pages)
+        info = self._numero()
+        morceaux = [
+            self._objet(
+                self.ARBRE_PAGES,
+                b'<< /Type /Pages /Kids [%s] /Count %d >>' % (enfants, len(self.pages)),
+            ),
+            self._objet(self.CATALOGUE, b'<< /Type /Catalog /Pages %d 0 R >>' % self.ARBRE_PAGES),
+            self._objet(info, b'<< /Title (%s) /Producer (Maieutix) >>' % echapper(self.titre)),
+        ]
+
+        debut_xref = self.position
+        entrees = [b'xref\n0 %d\n0000000000 65535 f \n' % self.prochain_objet]
+        entrees += [b'%010d 00000 n \n' % self.decalages[numero] for numero in range(1, self.prochain_objet)]
+        morceaux.append(b''.join(entrees))
+        morceaux.append(
+            b'trailer\n<< /Size %d /Root %d 0 R /Info %d 0 R >>\nstartxref\n%d\n%%%%EOF\n'
+            % (self.prochain_objet, self.CATALOGUE, info, debut_xref)
+        )
+        return self._emettre(b''.join(morceaux))
+
+
+def ecrire_pdf(pages, titre=''):
+    """Générateur des octets d'un PDF à partir d'un itérable de Page"""
+    ecrivain = EcrivainPDF(titre)
+    yield ecrivain.debut()
+    for page in pages:
+        yield ecrivain.page(page)
+    yield ecrivain.fin()
+
+
+def document_pdf(pages, titre=''):
+    return b''.join(ecrire_pdf(pages, titre))
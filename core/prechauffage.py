@@ -0,0 +1,96 @@
+"""
+Préchauffage des processus gunicorn (gunicorn.conf.py)
+Ce que la première requête de chaque worker paierait sinon : import des vues
+et table des URL, compilation des gabarits, métadonnées des modèles. Fait une
+fois dans le processus maître quand l'application est préchargée, les workers
+forkés en héritent (copie à l'écriture).
+"""
+
+import time
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+from django.db import DatabaseError, connections
+from django.template import engines
+from django.urls import get_resolver
+
+
+def dossiers_de_gabarits(moteur):
+    """
+    Dossiers lus par les chargeurs du moteur : avec des chargeurs explicites
+    (chargeur en cache), template_dirs n'inclut pas ceux des applications
+    """
+    chargeurs = getattr(getattr(moteur, 'engine', None), 'template_loaders', None)
+    if chargeurs is None:
+        return list(moteur.template_dirs)
+    return list(dict.fromkeys(
+        dossier for chargeur in chargeurs if hasattr(chargeur, 'get_dirs') for dossier in chargeur.get_dirs()
+    ))
+
+
+def gabarits_du_projet(moteur):
+    """Noms des gabarits .html des dossiers du projet (l'administration de Django est exclue)"""
+    racine = Path(settings.BASE_DIR).resolve()
+    for dossier in dossiers_de_gabarits(moteur):
+        dossier = Path(dossier).resolve()
+        if not dossier.is_relative_to(racine):
+            continue
+        for chemin in sorted(dossier.rglob('*.html')):
+            yield chemin.relative_to(dossier).as_posix()
+
+
+def prechauffer():
+    """
+    Charge la table des URL, compile les gabarits (mis en cache par le
+    chargeur) et les métadonnées des modèles. Sans accès à la base.
+    Retourne le décompte et la durée pour le journal.
+    """
+    debut = time.monotonic()
+    resolver = get_resolver()
+    resolver.reverse_dict  # importe les vues et construit la table inverse
+    nombre_urls = len(resolver.url_patterns)
+
+    nombre_gabarits = 0
+    for moteur in engines.all():
+        for nom in gabarits_du_projet(moteur):
+            moteur.get_template(nom)
+            nombre_gabarits += 1
+
+    modeles = apps.get_models()
+    for modele in modeles:
+        modele._meta.get_fields()
+
+    return {
+        'urls': nombre_urls,
+        'gabarits': nombre_gabarits,
+        'modeles': len(modeles),
+        'duree': time.monotonic() - debut,
+    }
+
+
+def ouvrir_connexions():
+    """
+    Ouvre la connexion du worker avant le premier client. Avec le pool
+    (ASGI), la connexion est rendue aussitôt : le pool reste ouvert.
+    """
+    for connexion in connections.all():
+        try:
+            connexion.ensure_connection()
+        except DatabaseError:
+            # Base indisponible : la connexion sera ouverte par la première requête
+            continue
+        if connexion.settings_dict['CONN_MAX_AGE'] == 0:
+            connexion.close()
+
+
+def fermer_connexions():
+    """
+    Ferme connexions et pools du processus maître avant de forker : un
+    socket ou les threads d'un pool ne survivent pas au fork.
+    """
+    for connexion in connections.all():
+        connexion.close()
+        # `pool` créerait le pool s'il n'existe pas : seuls les pools ouverts sont fermés
+        if connexion.alias in getattr(connexion, '_connection_pools', {}):
+            connexion.close_pool()
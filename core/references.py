@@ -0,0 +1,302 @@
+"""
+Index plein texte des références médicales (protocoles, recommandations HAS
+et CAFAT, tables de posologie)
+Le corpus Markdown de settings.REFERENCES_DIR est compilé par
+`manage.py construire_index_references` en un index inversé binaire. Chaque
+worker le projette en mémoire (mmap, lecture seule) : les pages sont partagées
+par le système entre tous les workers et une recherche ne touche pas la base.
+"""
+
+import json
+import math
+import mmap
+import os
+import re
+import struct
+import tempfile
+import unicodedata
+from array import array
+from bisect import bisect_left
+from collections import Counter, namedtuple
+from pathlib import Path
+
+from django.conf import settings
+
+from core.models.functions import normaliser_recherche
+
+
+MAGIC = b'MXREF\x00\x00\x01'
+# En-tête : magic, nombre de termes, nombre de documents, longueur moyenne, puis les sections
+EN_TETE = struct.Struct('<8sIId')
+SECTION = struct.Struct('<II')  # position, longueur en octets
+SECTIONS = [
+    'termes',               # termes concaténés (UTF-8, triés par octets)
+    'positions_termes',     # uint32[termes + 1] : début de chaque terme
+    'positions_postings',   # uint32[termes + 1] : première entrée de chaque terme
+    'postings_documents',   # uint32 : numéros de documents, croissants par terme
+    'postings_frequences',  # uint32 : occurrences du terme dans le document
+    'longueurs',            # uint32[documents] : nombre de termes de chaque document
+    'textes',               # textes concaténés (UTF-8)
+    'positions_textes',     # uint32[documents + 1]
+    'documents',            # JSON : [slug, titre, source] par document
+]
+
+# Paramètres BM25
+K1 = 1.2
+B = 0.75
+# Termes couverts au plus par le dernier mot, complété comme un préfixe
+EXPANSIONS_MAX = 50
+LONGUEUR_EXTRAIT = 200
+
+MOTS_VIDES = frozenset(
+    'au aux avec ce ces dans de des du en et la le les leur par pas pour qui que sa se ses '
+    'sur son un une ou ne est sont il elle on a'.split()
+)
+MOT = re.compile(r'[a-z0-9]+')
+SOURCE = re.compile(r'^source\s*:\s*(?P<source>.+)$', re.IGNORECASE)
+
+Reference = namedtuple('Reference', ['slug', 'titre', 'source', 'texte'])
+Resultat = namedtuple('Resultat', ['slug', 'titre', 'source', 'score', 'extrait'])
+
+
+def mots(texte):
+    """Termes indexés d'un texte : minuscules, sans accents ni mots vides"""
+    return [mot for mot in MOT.findall(normaliser_recherche(texte)) if mot not in MOTS_VIDES]
+
+
+def replier(texte):
+    """
+    Minuscules ASCII sans accents, en une passe C : pour localiser l'extrait.
+    Les autres caractères non ASCII sont supprimés, les fins de ligne conservées.
+    """
+    texte = texte.lower().replace('œ', 'oe').replace('æ', 'ae')
+    return unicodedata.normalize('NFKD', texte).encode('ascii', 'ignore').decode('ascii')
+
+
+def premier_debut_de_mot(texte, mot):
+    """Position du premier mot du texte commençant par `mot`, -1 si aucun (str.find plutôt qu'une regex)"""
+    position = texte.find(mot)
+    while position > 0 and texte[position - 1].isalnum():
+        position = texte.find(mot, position + 1)
+    return position
+
+
+def lire_reference(chemin):
+    """
+    Document Markdown : « # Titre » en première ligne, « Source : … »
+    facultatif en deuxième ligne, puis le texte
+    """
+    lignes = chemin.read_text(encoding='utf-8').strip().splitlines()
+    titre = lignes[0].lstrip('#').strip() if lignes else chemin.stem
+    source = ''
+    if len(lignes) > 1 and SOURCE.match(lignes[1].strip()):
+        source = SOURCE.match(lignes[1].strip())['source']
+    return Reference(chemin.stem, titre, source, '\n'.join(lignes))
+
+
+def lire_corpus(dossier):
+    return [
+        lire_reference(chemin) for chemin in sorted(Path(dossier).glob('*.md'))
+        if chemin.name.lower() != 'readme.md'
+    ]
+
+
+def construire_index(references, chemin):
+    """Écrit l'index des références ; le fichier est remplacé d'un bloc (os.replace)"""
+    postings = {}
+    longueurs = array('I')
+    for numero, reference in enumerate(references):
+        termes = mots(reference.texte)
+        longueurs.append(len(termes))
+        for terme, frequence in Counter(termes).items():
+            postings.setdefault(terme.encode(), []).append((numero, frequence))
+
+    termes = sorted(postings)
+    positions_termes, positions_postings = array('I', [0]), array('I', [0])
+    documents, frequences = array('I'), array('I')
+    for terme in termes:
+        positions_termes.append(positions_termes[-1] + len(terme))
+        for numero, frequence in postings[terme]:
+            documents.append(numero)
+            frequences.append(frequence)
+        positions_postings.append(len(documents))
+    textes = [reference.texte.encode() for reference in references]
+    positions_textes = array('I', [0])
+    for texte in textes:
+        positions_textes.append(positions_textes[-1] + len(texte))
+
+    contenus = {
+        'termes': b''.join(termes),
+        'positions_termes': positions_termes.tobytes(),
+        'positions_postings': positions_postings.tobytes(),
+        'postings_documents': documents.tobytes(),
+        'postings_frequences': frequences.tobytes(),
+        'longueurs': longueurs.tobytes(),
+        'textes': b''.join(textes),
+        'positions_textes': positions_textes.tobytes(),
+        'documents': json.dumps(
+            [[reference.slug, reference.titre, reference.source] for reference in references]
+        ).encode(),
+    }
+    longueur_moyenne = sum(longueurs) / len(longueurs) if longueurs else 0.0
+
+    # Sections alignées sur 4 octets pour les vues uint32
+    position = EN_TETE.size + SECTION.size * len(SECTIONS)
+    table, corps = [], []
+    for nom in SECTIONS:
+        contenu = contenus[nom]
+        table.append(SECTION.pack(position, len(contenu)))
+        bourrage = b'\x00' * (-len(contenu) % 4)
+        corps.append(contenu + bourrage)
+        position += len(contenu) + len(bourrage)
+
+    chemin = Path(chemin)
+    chemin.parent.mkdir(parents=True, exist_ok=True)
+    descripteur, temporaire = tempfile.mkstemp(dir=chemin.parent, prefix='.references-')
+    try:
+        with os.fdopen(descripteur, 'wb') as fichier:
+            fichier.write(EN_TETE.pack(MAGIC, len(termes), len(references), longueur_moyenne))
+            fichier.write(b''.join(table))
+            fichier.write(b''.join(corps))
+        os.chmod(temporaire, 0o644)
+        os.replace(temporaire, chemin)
+    except BaseException:
+        os.unlink(temporaire)
+        raise
+    return len(termes)
+
+
+class Termes:
+    """Séquence triée des termes de l'index, lue dans le fichier projeté (pour bisect)"""
+    __slots__ = ('octets', 'positions')
+
+    def __init__(self, octets, positions):
+        self.octets = octets
+        self.positions = positions
+
+    def __len__(self):
+        return len(self.positions) - 1
+
+    def __getitem__(self, i):
+        return bytes(self.octets[self.positions[i]:self.positions[i + 1]])
+
+
+class IndexReferences:
+    """
+    Index projeté en mémoire : les sections sont des vues sur le fichier,
+    seule la liste des documents (slug, titre, source) est décodée au chargement.
+    """
+
+    def __init__(self, chemin, cle=None):
+        self.cle = cle
+        with open(chemin, 'rb') as fichier:
+            self._mmap = mmap.mmap(fichier.fileno(), 0, access=mmap.ACCESS_READ)
+        vue = memoryview(self._mmap)
+        magic, _, nombre_documents, self.longueur_moyenne = EN_TETE.unpack_from(vue)
+        if magic != MAGIC:
+            raise ValueError(f"{chemin} n'est pas un index de références (version attendue {MAGIC!r}).")
+        sections = {}
+        for i, nom in enumerate(SECTIONS):
+            position, longueur = SECTION.unpack_from(vue, EN_TETE.size + i * SECTION.size)
+            sections[nom] = vue[position:position + longueur]
+        entiers = {nom: sections[nom].cast('I') for nom in SECTIONS if nom not in ('termes', 'textes', 'documents')}
+
+        self.termes = Termes(sections['termes'], entiers['positions_termes'])
+        self.positions_postings = entiers['positions_postings']
+        self.postings_documents = entiers['postings_documents']
+        self.postings_frequences = entiers['postings_frequences']
+        self.longueurs = entiers['longueurs']
+        self.textes = sections['textes']
+        self.positions_textes = entiers['positions_textes']
+        self.documents = [tuple(document) for document in json.loads(bytes(sections['documents']))]
+        self.numeros = {slug: numero for numero, (slug, _, _) in enumerate(self.documents)}
+        self.nombre_documents = nombre_documents
+
+    def __len__(self):
+        return self.nombre_documents
+
+    def texte(self, numero):
+        return bytes(self.textes[self.positions_textes[numero]:self.positions_textes[numero + 1]]).decode()
+
+    def reference(self, slug):
+        """Document complet, None si le slug est inconnu"""
+        numero = self.numeros.get(slug)
+        if numero is None:
+            return None
+        slug, titre, source = self.documents[numero]
+        return Reference(slug, titre, source, self.texte(numero))
+
+    def termes_du_mot(self, mot, prefixe=False):
+        """Indices des termes égaux au mot (ou qui le prolongent)"""
+        cle = mot.encode()
+        debut = bisect_left(self.termes, cle)
+        if not prefixe:
+            return [debut] if debut < len(self.termes) and self.termes[debut] == cle else []
+        # 0xff n'apparaît jamais en UTF-8 : borne supérieure de tous les termes préfixés
+        fin = bisect_left(self.termes, cle + b'\xff', debut)
+        return range(debut, min(fin, debut + EXPANSIONS_MAX))
+
+    def scores_du_mot(self, mot, prefixe=False):
+        """Score BM25 de chaque document contenant le mot"""
+        scores = {}
+        for terme in self.termes_du_mot(mot, prefixe):
+            debut, fin = self.positions_postings[terme], self.positions_postings[terme + 1]
+            idf = math.log(1 + (self.nombre_documents - (fin - debut) + 0.5) / (fin - debut + 0.5))
+            for numero, frequence in zip(self.postings_documents[debut:fin], self.postings_frequences[debut:fin]):
+                normalisation = 1 - B + B * self.longueurs[numero] / (self.longueur_moyenne or 1)
+                score = idf * frequence * (K1 + 1) / (frequence + K1 * normalisation)
+                scores[numero] = max(scores.get(numero, 0.0), score)
+        return scores
+
+    def rechercher(self, texte, limite=20, prefixe=True):
+        """
+        Documents contenant tous les mots recherchés, classés par score BM25.
+        Le dernier mot est complété comme un préfixe (recherche pendant la saisie).
+        """
+        recherches = mots(texte)
+        if not recherches:
+            return []
+        scores = None
+        for i, mot in enumerate(recherches):
+            scores_mot = self.scores_du_mot(mot, prefixe=prefixe and i == len(recherches) - 1)
+            if scores is None:
+                scores = scores_mot
+            else:
+                scores = {numero: score + scores_mot[numero] for numero, score in scores.items() if numero in scores_mot}
+            if not scores:
+                return []
+        meilleurs = sorted(scores.items(), key=lambda element: (-element[1], element[0]))[:limite]
+        return [
+            Resultat(*self.documents[numero], round(score, 3), self.extrait(numero, recherches))
+            for numero, score in meilleurs
+        ]
+
+    def extrait(self, numero, recherches):
+        """Première ligne du texte (hors titre) où commence un des mots recherchés"""
+        lignes = self.texte(numero).split('\n')
+        repli = replier('\n'.join(lignes[1:]))
+        positions = [premier_debut_de_mot(repli, mot) for mot in recherches]
+        positions = [position for position in positions if position >= 0]
+        if positions:
+            # Le repli conserve les fins de ligne : le numéro de ligne se retrouve dans l'original
+            return lignes[1 + repli.count('\n', 0, min(positions))].strip()[:LONGUEUR_EXTRAIT]
+        return next((ligne.strip()[:LONGUEUR_EXTRAIT] for ligne in lignes[1:] if ligne.strip()), '')
+
+
+# Index courant du processus, remplacé quand le fichier est reconstruit
+_index = None
+
+
+def index_references():
+    """Index du processus, rouvert si le fichier a été remplacé ; None s'il n'est pas construit"""
+    global _index
+    chemin = settings.REFERENCES_INDEX
+    try:
+        etat = os.stat(chemin)
+    except FileNotFoundError:
+        return None
+    cle = (str(chemin), etat.st_ino, etat.st_mtime_ns)
+    index = _index
+    if index is None or index.cle != cle:
+        index = _index = IndexReferences(chemin, cle)
+    return index
@@ -50,6 +50,14 @@ window.Maieutix.utils = {
         }
     },
     
+    // Numéro croissant des requêtes de la page (recherche des patientes)
+    sequence: (function() {
+        let numero = 0;
+        return function() {
+            return ++numero;
+        };
+    })(),
+    
     // Format date
     formatDate: function(date) {
         return new Intl.DateTimeFormat('fr-FR').format(new Date(date));
@@ -0,0 +1,74 @@
+"""
+Stockage des fichiers statiques de production
+collectstatic écrit les noms empreints (ManifestStaticFilesStorage) puis, pour
+chaque fichier compressible, ses versions précompressées `.gz` et `.br` :
+nginx les sert telles quelles (gzip_static), sans compresser à chaque requête.
+"""
+
+import gzip
+import os
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli est dans requirements.txt
+    brotli = None
+
+
+EXTENSIONS_COMPRESSIBLES = frozenset({
+    '.css', '.js', '.mjs', '.map', '.json', '.svg', '.txt', '.html', '.xml', '.ico', '.ttf', '.otf', '.eot',
+})
+# En dessous, l'en-tête de compression coûte plus qu'il ne rapporte
+TAILLE_MIN = 256
+# Une version compressée n'est gardée que si elle gagne au moins 5 %
+RATIO_MAX = 0.95
+
+
+def compresser(contenu):
+    """Versions compressées qui valent la peine, par extension : {'.gz': …, '.br': …}"""
+    versions = {'.gz': gzip.compress(contenu, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        versions['.br'] = brotli.compress(contenu, mode=brotli.MODE_TEXT, quality=11)
+    return {
+        extension: compresse for extension, compresse in versions.items()
+        if len(compresse) <= len(contenu) * RATIO_MAX
+    }
+
+
+class StockageStatiqueCompresse(ManifestStaticFilesStorage):
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        # Noms d'origine copiés par collectstatic et noms empreints référencés par les pages
+        for nom in sorted(set(paths) | set(self.hashed_files.values())):
+            if os.path.splitext(nom)[1].lower() in EXTENSIONS_COMPRESSIBLES:
+                self.ecrire_versions_compressees(nom)
+
+    def ecrire_versions_compressees(self, nom):
+        chemin = self.path(nom)
+        try:
+            etat = os.stat(chemin)
+        except FileNotFoundError:
+            return
+        if etat.st_size < TAILLE_MIN:
+            return
+        # Déjà à jour : un nom empreint ne change jamais de contenu
+        extensions = ['.gz', '.br'] if brotli is not None else ['.gz']
+        if all(
+            os.path.exists(chemin + extension) and os.stat(chemin + extension).st_mtime >= etat.st_mtime
+            for extension in extensions
+        ):
+            return
+        with open(chemin, 'rb') as fichier:
+            contenu = fichier.read()
+        versions = compresser(contenu)
+        for extension in extensions:
+            if extension in versions:
+                with open(chemin + extension, 'wb') as fichier:
+                    fichier.write(versions[extension])
+            elif os.path.exists(chemin + extension):
+                # Version d'un contenu précédent : nginx la servirait à la place du fichier
+                os.remove(chemin + extension)
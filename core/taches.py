@@ -0,0 +1,132 @@
+"""
+File de tâches de fond en base PostgreSQL
+Une vue planifie une tâche (une ligne de core_tache) et rend la main ; le
+worker `manage.py run_jobs` la réclame avec SELECT ... FOR UPDATE SKIP LOCKED,
+l'exécute dans un pool de processus et publie son avancement, lu par HTMX.
+Une tâche en échec est retentée avec un délai croissant.
+"""
+
+import datetime
+import importlib
+import traceback
+
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from core.models import Tache
+
+
+# Modules déclarant des tâches (@tache_de_fond), importés par le worker
+MODULES_TACHES = ['core.etats_recapitulatifs']
+
+# Un worker arrêté brutalement libère ses tâches à l'expiration du bail
+DUREE_BAIL = datetime.timedelta(minutes=5)
+DELAI_REESSAI = datetime.timedelta(seconds=30)
+DELAI_REESSAI_MAX = datetime.timedelta(hours=1)
+
+# Registre nom -> fonction
+TACHES = {}
+
+
+def tache_de_fond(nom):
+    """
+    Déclare une fonction exécutable par le worker. Elle reçoit les arguments
+    planifiés (sérialisables en JSON) et `progression`, à appeler avec les
+    valeurs d'avancement à publier ; sa valeur de retour est le résultat.
+    """
+    def enregistrer(fonction):
+        TACHES[nom] = fonction
+        return fonction
+    return enregistrer
+
+
+def charger_taches():
+    for module in MODULES_TACHES:
+        importlib.import_module(module)
+
+
+def planifier(nom, tentatives_max=3, **arguments):
+    """Ajoute une tâche à la file ; elle sera exécutée par le prochain worker libre"""
+    return Tache.objects.create(nom=nom, arguments=arguments, tentatives_max=tentatives_max)
+
+
+def delai_reessai(tentatives):
+    """Délai avant la tentative suivante : 30 s, 1 min, 2 min… plafonné à une heure"""
+    return min(DELAI_REESSAI * 2 ** (tentatives - 1), DELAI_REESSAI_MAX)
+
+
+def reclamer(nombre):
+    """
+    Réclame jusqu'à `nombre` tâches à exécuter et retourne leurs identifiants.
+    Les lignes verrouillées par un autre worker sont sautées (SKIP LOCKED) :
+    plusieurs workers se partagent la file sans jamais prendre la même tâche.
+    """
+    if nombre <= 0:
+        return []
+    maintenant = timezone.now()
+    with transaction.atomic():
+        identifiants = list(
+            Tache.objects
+            .select_for_update(skip_locked=True)
+            .filter(
+                Q(statut='en_attente', executer_apres__lte=maintenant)
+                | Q(statut='en_cours', bail_expire__lt=maintenant)
+            )
+            .order_by('executer_apres', 'id')
+            .values_list('id', flat=True)[:nombre]
+        )
+        Tache.objects.filter(pk__in=identifiants).update(
+            statut='en_cours', tentatives=F('tentatives') + 1,
+            bail_expire=maintenant + DUREE_BAIL, debut=maintenant, erreur='',
+        )
+    return identifiants
+
+
+def renouveler_bail(identifiants):
+    """Prolonge le bail des tâches en cours d'exécution par ce worker"""
+    if identifiants:
+        Tache.objects.filter(pk__in=identifiants, statut='en_cours').update(
+            bail_expire=timezone.now() + DUREE_BAIL
+        )
+
+
+class Suivi:
+    """Publie l'avancement d'une tâche (champ progression) ; appelé par la tâche"""
+
+    def __init__(self, tache):
+        self.tache = tache
+        self.valeurs = dict(tache.progression)
+
+    def __call__(self, **valeurs):
+        self.valeurs.update(valeurs)
+        Tache.objects.filter(pk=self.tache.pk, tentatives=self.tache.tentatives).update(progression=self.valeurs)
+
+
+def executer(identifiant):
+    """
+    Exécute une tâche réclamée (dans un processus du pool du worker).
+    Retourne True si elle a réussi. Seule la tentative courante peut conclure :
+    un exécutant dont le bail a expiré entre-temps n'écrase rien.
+    """
+    tache = Tache.objects.get(pk=identifiant)
+    courante = Tache.objects.filter(pk=identifiant, tentatives=tache.tentatives, statut='en_cours')
+    fonction = TACHES.get(tache.nom)
+    try:
+        if fonction is None:
+            raise LookupError(f"Tâche inconnue : {tache.nom}")
+        if tache.tentatives > tache.tentatives_max:
+            raise RuntimeError("Nombre maximum de tentatives atteint (worker interrompu).")
+        resultat = fonction(progression=Suivi(tache), **tache.arguments)
+    except Exception:
+        erreur = traceback.format_exc()
+        if fonction is not None and tache.tentatives < tache.tentatives_max:
+            courante.update(
+                statut='en_attente', erreur=erreur, bail_expire=None,
+                executer_apres=timezone.now() + delai_reessai(tache.tentatives),
+            )
+        else:
+            courante.update(statut='echouee', erreur=erreur, bail_expire=None, fin=timezone.now())
+        return False
+    courante.update(statut='terminee', resultat=resultat, bail_expire=None, fin=timezone.now())
+    return True
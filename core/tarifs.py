@@ -0,0 +1,126 @@
+"""
+Index en mémoire de la nomenclature des tarifs CAFAT
+L'index est construit en une requête et n'est jamais modifié : quand un tarif
+change, le tampon de version partagé fait reconstruire un nouvel index qui
+remplace l'ancien d'un bloc. Tarifer une feuille de soins ne touche pas la base.
+"""
+
+from array import array
+from bisect import bisect_right
+from collections import namedtuple
+from datetime import date
+from decimal import Decimal
+from itertools import groupby
+from operator import itemgetter
+from types import MappingProxyType
+
+from django.db import DatabaseError, connection
+
+from core.cache import get_version
+from core.models import Tarif
+from core.models.tarif import TARIFS_CACHE_VERSION
+
+
+# Date de fin des tarifs en vigueur (sans date de fin)
+FIN_OUVERTE = date.max.toordinal() + 1
+
+TarifApplicable = namedtuple('TarifApplicable', ['code', 'libelle', 'montant'])
+
+
+class IndexTarifs:
+    """
+    Tarifs par code : débuts et fins de validité en tableaux d'ordinaux triés,
+    recherchés par dichotomie. Lecture seule, partageable entre threads.
+    """
+    __slots__ = ('version', '_codes')
+
+    def __init__(self, lignes, version=None):
+        """lignes : (code, libelle, montant, date_debut, date_fin) triées par code puis date_debut"""
+        codes = {}
+        for code, periodes in groupby(lignes, key=itemgetter(0)):
+            periodes = list(periodes)
+            codes[code] = (
+                array('q', [debut.toordinal() for _, _, _, debut, _ in periodes]),
+                array('q', [fin.toordinal() if fin else FIN_OUVERTE for _, _, _, _, fin in periodes]),
+                tuple(TarifApplicable(code, libelle, montant) for _, libelle, montant, _, _ in periodes),
+            )
+        self.version = version
+        self._codes = MappingProxyType(codes)
+
+    def __len__(self):
+        return len(self._codes)
+
+    def tarif(self, code, jour):
+        """Tarif applicable au code à la date donnée, None si aucun"""
+        entree = self._codes.get(code)
+        if entree is None:
+            return None
+        debuts, fins, tarifs = entree
+        jour = jour.toordinal()
+        i = bisect_right(debuts, jour) - 1
+        if i < 0 or jour >= fins[i]:
+            return None
+        return tarifs[i]
+
+    def en_vigueur(self, jour):
+        """Tarifs applicables à la date donnée, par code"""
+        tarifs = (self.tarif(code, jour) for code in sorted(self._codes))
+        return [tarif for tarif in tarifs if tarif is not None]
+
+    def tarifer(self, lignes, jour):
+        """
+        Tarife des lignes (code, quantité) à la date de la feuille de soins.
+        Retourne (lignes détaillées, total) ; une ligne sans tarif applicable
+        a un tarif None et n'entre pas dans le total.
+        """
+        detail = []
+        total = Decimal('0')
+        for code, quantite in lignes:
+            tarif = self.tarif(code, jour)
+            montant = tarif.montant * quantite if tarif else None
+            if montant is not None:
+                total += montant
+            detail.append({'code': code, 'quantite': quantite, 'tarif': tarif, 'montant': montant})
+        return detail, total
+
+
+def charger_index(version=None):
+    lignes = (
+        Tarif.objects
+        .order_by('code', 'date_debut')
+        .values_list('code', 'libelle', 'montant', 'date_debut', 'date_fin')
+    )
+    return IndexTarifs(lignes, version)
+
+
+# Index courant du processus, remplacé d'un bloc (jamais modifié en place)
+_index = None
+
+
+def index_tarifs():
+    """
+    Index des tarifs du processus, reconstruit si le tampon de version a changé.
+    À appeler une fois par requête puis interroger l'index retourné.
+    """
+    global _index
+    version = get_version(TARIFS_CACHE_VERSION)
+    index = _index
+    if index is not None and index.version == version:
+        return index
+    index = charger_index(version)
+    # Une lecture faite dans une transaction peut être annulée : pas de mise en cache
+    if not connection.in_atomic_block:
+        _index = index
+    return index
+
+
+def precharger_index():
+    """Construit l'index au démarrage du worker plutôt qu'à la première requête"""
+    try:
+        index_tarifs()
+    except DatabaseError:
+        # Base indisponible ou pas encore migrée : l'index sera construit à la demande
+        pass
+    finally:
+        # La connexion ne doit pas être héritée si le processus est ensuite forké
+        connection.close()
@@ -0,0 +1,118 @@
+"""
+Tests pour le journal d'audit des sages-femmes et du cabinet.
+"""
+from django.contrib.auth.models import User
+from django.db import DatabaseError, connection, transaction
+from django.forms.models import model_to_dict
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from core.audit import journaliser
+from core.models import Cabinet, JournalAudit, SageFemme
+
+
+def donnees_formulaire(objet, **modifications):
+    """Données POST du formulaire d'administration de l'objet"""
+    donnees = {champ: valeur for champ, valeur in model_to_dict(objet).items() if valeur not in (None, False)}
+    donnees.update(modifications)
+    return donnees
+
+
+def insertions_journal(requetes):
+    return [requete for requete in requetes if requete['sql'].startswith('INSERT INTO "core_journalaudit"')]
+
+
+class JournalAuditTest(TestCase):
+    """Tests de l'écriture du journal depuis l'administration"""
+
+    def setUp(self):
+        self.admin = User.objects.create_superuser(username='admin', email='admin@test.nc', password='admin123')
+        self.client = Client()
+        self.client.force_login(self.admin)
+        self.sage_femme = SageFemme.objects.create(
+            nom='Dupont', prenom='Marie', titre='Sage-femme', telephone='687123456',
+            email='marie.dupont@test.nc', numero_cafat='123456789', ridet='RIDET123456',
+            rib='FR1234567890123456789012345', banque='BCI', situation='gerant'
+        )
+        self.url = f'/admin/core/sagefemme/{self.sage_femme.pk}/change/'
+
+    def test_changement_de_rib(self):
+        """Test que le RIB et la banque sont journalisés avant/après, à la validation"""
+        donnees = donnees_formulaire(self.sage_femme, rib='FR9999999999999999999999999', banque='BNC')
+        with CaptureQueriesContext(connection) as requetes, \
+                self.captureOnCommitCallbacks(execute=True) as callbacks:
+            response = self.client.post(self.url, donnees)
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(len(insertions_journal(requetes.captured_queries)), 1)
+        entree = JournalAudit.objects.get()
+        self.assertEqual((entree.modele, entree.objet_id, entree.action), ('sagefemme', self.sage_femme.pk, 'modification'))
+        self.assertEqual(entree.changements, {
+            'rib': ['FR1234567890123456789012345', 'FR9999999999999999999999999'],
+            'banque': ['BCI', 'BNC'],
+        })
+        self.assertEqual((entree.utilisateur, entree.utilisateur_id), ('admin', self.admin.pk))
+
+    def test_sans_changement(self):
+        """Test qu'un enregistrement sans modification n'écrit rien"""
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(self.url, donnees_formulaire(self.sage_femme))
+
+        self.assertFalse(JournalAudit.objects.exists())
+
+    def test_creation_et_suppression(self):
+        donnees = donnees_formulaire(self.sage_femme, nom='Martin', numero_cafat='987654321', ridet='RIDET987654')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post('/admin/core/sagefemme/add/', donnees)
+        creee = SageFemme.objects.get(nom='Martin')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(f'/admin/core/sagefemme/{creee.pk}/delete/', {'post': 'yes'})
+
+        self.assertEqual(
+            list(JournalAudit.objects.filter(objet_id=creee.pk).values_list('action', flat=True)),
+            ['suppression', 'creation'],
+        )
+        self.assertEqual(JournalAudit.objects.get(action='creation').changements['numero_cafat'], [None, '987654321'])
+
+    def test_cabinet(self):
+        cabinet = Cabinet.objects.create(
+            titre='Cabinet', rue='1 rue', code_postal='98800', ville='Nouméa',
+            telephone='687000000', email='cabinet@test.nc'
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(f'/admin/core/cabinet/{cabinet.pk}/change/', donnees_formulaire(cabinet, ville='Dumbéa'))
+
+        self.assertEqual(JournalAudit.objects.get(modele='cabinet').changements, {'ville': ['Nouméa', 'Dumbéa']})
+
+    def test_insert_unique_par_transaction(self):
+        """Test que les entrées d'une transaction sont écrites par un seul INSERT"""
+        with self.captureOnCommitCallbacks() as callbacks:
+            with transaction.atomic():
+                for numero in range(5):
+                    journaliser(self.admin, self.sage_femme, 'modification', {'telephone': [numero, numero + 1]})
+
+        self.assertEqual(len(callbacks), 1)
+        with self.assertNumQueries(1):
+            callbacks[0]()
+        self.assertEqual(JournalAudit.objects.count(), 5)
+
+    def test_transaction_annulee(self):
+        """Test qu'une modification annulée n'est pas journalisée"""
+        with self.captureOnCommitCallbacks() as callbacks:
+            with self.assertRaises(ValueError), transaction.atomic():
+                journaliser(self.admin, self.sage_femme, 'modification', {'rib': ['a', 'b']})
+                raise ValueError
+
+        self.assertEqual(callbacks, [])
+
+    def test_ajout_seul(self):
+        """Test qu'une entrée ne peut être ni modifiée ni supprimée"""
+        with self.captureOnCommitCallbacks(execute=True):
+            journaliser(self.admin, self.sage_femme, 'modification')
+        entree = JournalAudit.objects.get()
+
+        with self.assertRaises(DatabaseError), transaction.atomic():
+            JournalAudit.objects.filter(pk=entree.pk).update(objet='Autre')
+        with self.assertRaises(DatabaseError), transaction.atomic():
+            JournalAudit.objects.filter(pk=entree.pk).delete()
+        self.assertEqual(JournalAudit.objects.get().objet, str(self.sage_femme))
@@ -1,7 +1,7 @@
 """
 Tests pour l'administration du modèle SageFemme.
 """
-from django.test import TestCase, Client
+from django.test import TestCase, Client, RequestFactory
 from django.contrib.auth.models import User
 from django.urls import reverse
 from django.contrib.admin.sites import AdminSite
@@ -214,6 +214,36 @@ class SageFemmeAdminTest(TestCase):
         self.assertContains(response, 'Julie Collaborateur')
         self.assertNotContains(response, 'Pierre Gerant')
 
+    def test_admin_search_sans_accents(self):
+        """Test que la recherche ignore les accents et la casse"""
+        SageFemme.objects.create(
+            nom='Dubois', prenom='Léa', titre='Sage-femme', telephone='687444444',
+            email='lea.dubois@test.nc', numero_cafat='444444444', ridet='RIDET444444',
+            rib='FR4444444444444444444444444', banque='BCI', situation='collaborateur'
+        )
+        request = RequestFactory().get('/')
+        
+        for terme in ['lea', 'LÉA', 'Léa dubois']:
+            queryset, may_have_duplicates = self.admin.get_search_results(
+                request, SageFemme.objects.all(), terme
+            )
+            self.assertEqual([sf.nom for sf in queryset], ['Dubois'])
+            self.assertFalse(may_have_duplicates)
+
+    def test_admin_search_numero_exact(self):
+        """Test du chemin rapide sur numéro CAFAT et RIDET"""
+        request = RequestFactory().get('/')
+        
+        queryset, _ = self.admin.get_search_results(request, SageFemme.objects.all(), '222222222')
+        self.assertEqual(list(queryset), [self.collaborateur])
+        
+        queryset, _ = self.admin.get_search_results(request, SageFemme.objects.all(), 'RIDET333333')
+        self.assertEqual(list(queryset), [self.remplacant])
+        
+        # Numéro partiel : repli sur la recherche par trigrammes
+        queryset, _ = self.admin.get_search_results(request, SageFemme.objects.all(), 'RIDET33')
+        self.assertEqual(list(queryset), [self.remplacant])
+
     def test_admin_filter_by_situation(self):
         """Test du filtrage par situation"""
         self.client.login(username='admin', password='admin123')
@@ -0,0 +1,64 @@
+"""
+Tests pour la commande benchmark_latence.
+"""
+from io import StringIO
+
+from django.contrib.auth.models import Permission, User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import LiveServerTestCase, SimpleTestCase
+
+from core.management.commands.benchmark_latence import centile
+
+
+class BenchmarkLatenceTest(LiveServerTestCase):
+    """Tests du banc de latence contre le serveur de test"""
+
+    def test_mesure(self):
+        """Test du tableau comparatif de deux cibles"""
+        # Pages réservées : session d'un utilisateur autorisé passée par --cookie
+        utilisateur = User.objects.create_user('secretaire')
+        utilisateur.user_permissions.add(Permission.objects.get(codename='view_patient'))
+        self.client.force_login(utilisateur)
+        stdout = StringIO()
+        call_command(
+            'benchmark_latence',
+            '--cible', f'a={self.live_server_url}', '--cible', f'b={self.live_server_url}/',
+            '--chemin', '/patients/', '--chemin', '/patients/recherche/?q=du',
+            '--requetes', '10', '--concurrence', '2', '--echauffement', '2',
+            '--cookie', f"sessionid={self.client.cookies['sessionid'].value}",
+            stdout=stdout,
+        )
+        lignes = stdout.getvalue().splitlines()
+
+        self.assertIn('10 requêtes, 2 clients simultanés', lignes[0])
+        self.assertEqual([ligne.split()[0] for ligne in lignes[2:]], ['a', 'b'])
+        # Aucune erreur
+        self.assertEqual([ligne.split()[-1] for ligne in lignes[2:]], ['0', '0'])
+
+    def test_erreurs_comptees(self):
+        """Test que les réponses en erreur sont comptées et exclues des latences"""
+        stdout = StringIO()
+        call_command(
+            'benchmark_latence', '--cible', f'a={self.live_server_url}', '--chemin', '/inexistant/',
+            '--requetes', '4', '--concurrence', '2', '--echauffement', '0', stdout=stdout,
+        )
+
+        self.assertEqual(stdout.getvalue().splitlines()[-1].split()[-1], '4')
+
+
+class BenchmarkLatenceOptionsTest(SimpleTestCase):
+    """Tests des options et des centiles"""
+
+    def test_cible_invalide(self):
+        """Test du refus d'une cible sans URL"""
+        with self.assertRaises(CommandError):
+            call_command('benchmark_latence', '--cible', 'wsgi', stdout=StringIO())
+
+    def test_centile(self):
+        """Test des centiles sur une liste triée"""
+        latences = [i / 100 for i in range(1, 101)]
+
+        self.assertEqual(centile(latences, 95), 0.96)
+        self.assertEqual(centile(latences, 100), 1.0)
+        self.assertEqual(centile([], 99), 0.0)
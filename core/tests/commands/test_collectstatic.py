@@ -0,0 +1,74 @@
+"""
+Tests des versions précompressées écrites par collectstatic.
+"""
+import gzip
+import os
+import shutil
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+import brotli
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+
+from core.stockage import TAILLE_MIN, compresser
+
+
+STOCKAGE = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'core.stockage.StockageStatiqueCompresse'},
+}
+
+
+class CollectstaticCompresseTest(SimpleTestCase):
+    """Tests du stockage des fichiers statiques de production"""
+
+    def setUp(self):
+        self.racine = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.racine)
+
+    def collecter(self):
+        with override_settings(STATIC_ROOT=self.racine, STORAGES=STOCKAGE):
+            call_command('collectstatic', '--noinput', '-i', 'admin', stdout=StringIO())
+
+    def test_versions_compressees(self):
+        """Test que les fichiers empreints ont des versions .gz et .br identiques une fois décompressées"""
+        self.collecter()
+        scripts = list(self.racine.glob('core/vendor/htmx-1.9.10.min.*.js'))
+        self.assertEqual(len(scripts), 1)
+        script = scripts[0]
+
+        contenu = script.read_bytes()
+        self.assertEqual(gzip.decompress(Path(f'{script}.gz').read_bytes()), contenu)
+        self.assertEqual(brotli.decompress(Path(f'{script}.br').read_bytes()), contenu)
+        # Le nom d'origine aussi
+        self.assertTrue((self.racine / 'core/vendor/htmx-1.9.10.min.js.gz').exists())
+
+    def test_fichiers_exclus(self):
+        """Test que les fichiers non compressibles n'ont pas de version compressée"""
+        self.collecter()
+
+        self.assertFalse(list(self.racine.rglob('*.png.gz')))
+        self.assertFalse(list(self.racine.rglob('staticfiles.json.gz')))
+        for compresse in self.racine.rglob('*.gz'):
+            self.assertGreaterEqual(Path(str(compresse)[:-3]).stat().st_size, TAILLE_MIN)
+
+    def test_version_perimee_supprimee(self):
+        """Test qu'une version qui ne vaut plus la peine est supprimée au lieu d'être servie"""
+        self.collecter()
+        licences = self.racine / 'core/vendor/LICENCES.txt'
+        # Contenu incompressible, plus récent que la version existante
+        licences.write_bytes(os.urandom(1024))
+        os.utime(f'{licences}.gz', (0, 0))
+
+        with override_settings(STATIC_ROOT=self.racine, STORAGES=STOCKAGE):
+            from django.contrib.staticfiles.storage import staticfiles_storage
+            staticfiles_storage.ecrire_versions_compressees('core/vendor/LICENCES.txt')
+
+        self.assertFalse(Path(f'{licences}.gz').exists())
+
+    def test_compresser(self):
+        """Test que seules les versions qui gagnent de la place sont gardées"""
+        self.assertEqual(set(compresser(b'a' * 1000)), {'.gz', '.br'})
+        self.assertEqual(compresser(os.urandom(1000)), {})
@@ -0,0 +1,100 @@
+"""
+Tests pour la commande construire_index_references et l'index des références.
+"""
+import os
+import shutil
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, override_settings
+
+from core import references
+from core.references import IndexReferences, index_references
+
+
+DOCUMENTS = {
+    'diabete.md': (
+        "# Diabète gestationnel\nSource : HAS, 2010\n"
+        "Dépistage du diabète par HGPO entre 24 et 28 SA.\nGlycémie à jeun au premier trimestre."
+    ),
+    'streptocoque.md': (
+        "# Streptocoque B\n"
+        "Prélèvement vaginal entre 34 et 38 SA.\nAntibioprophylaxie pendant le travail si positif."
+    ),
+    'posologie.md': (
+        "# Posologies courantes\n"
+        "Paracétamol : 1 g toutes les 6 heures.\nFer : en cas d'anémie au deuxième trimestre.\n"
+        "Voir aussi le protocole diabète gestationnel."
+    ),
+    'README.md': "# Pas une référence",
+}
+
+
+class IndexReferencesTest(SimpleTestCase):
+    """Tests de la compilation et de la recherche"""
+
+    def setUp(self):
+        self.dossier = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.dossier)
+        for nom, texte in DOCUMENTS.items():
+            (self.dossier / nom).write_text(texte, encoding='utf-8')
+        self.chemin = self.dossier / 'var' / 'references.idx'
+        sortie = StringIO()
+        call_command('construire_index_references', '--source', str(self.dossier), '--sortie', str(self.chemin), stdout=sortie)
+        self.assertIn('3 référence(s)', sortie.getvalue())
+        self.index = IndexReferences(self.chemin)
+
+    def test_recherche_sans_accents(self):
+        """Test que la recherche ignore accents et majuscules"""
+        resultats = self.index.rechercher('PRELEVEMENT')
+
+        self.assertEqual([resultat.slug for resultat in resultats], ['streptocoque'])
+        self.assertEqual(resultats[0].extrait, 'Prélèvement vaginal entre 34 et 38 SA.')
+
+    def test_tous_les_mots(self):
+        """Test que les documents doivent contenir tous les mots, le dernier en préfixe"""
+        self.assertEqual([r.slug for r in self.index.rechercher('trimestre')], ['diabete', 'posologie'])
+        self.assertEqual([r.slug for r in self.index.rechercher('trimestre anem')], ['posologie'])
+        self.assertEqual(self.index.rechercher('trimestre anem', prefixe=False), [])
+        self.assertEqual(self.index.rechercher('de la'), [])
+
+    def test_classement(self):
+        """Test du classement BM25 : le document consacré au sujet passe en premier"""
+        resultats = self.index.rechercher('diabète')
+
+        self.assertEqual([resultat.slug for resultat in resultats], ['diabete', 'posologie'])
+        self.assertEqual((resultats[0].titre, resultats[0].source), ('Diabète gestationnel', 'HAS, 2010'))
+        self.assertGreater(resultats[0].score, resultats[1].score)
+
+    def test_reference(self):
+        reference = self.index.reference('posologie')
+
+        self.assertEqual(reference.titre, 'Posologies courantes')
+        self.assertIn('Paracétamol : 1 g', reference.texte)
+        self.assertIsNone(self.index.reference('readme'))
+
+    def test_rechargement(self):
+        """Test que les workers rouvrent l'index quand il est reconstruit"""
+        self.addCleanup(setattr, references, '_index', None)
+        with override_settings(REFERENCES_INDEX=self.chemin):
+            premier = index_references()
+            self.assertIs(index_references(), premier)
+
+            (self.dossier / 'fer.md').write_text("# Fer\nSupplémentation martiale.", encoding='utf-8')
+            call_command('construire_index_references', '--source', str(self.dossier), '--sortie', str(self.chemin), stdout=StringIO())
+            # Horodatage forcé : deux compilations dans la même tick d'horloge
+            os.utime(self.chemin, ns=(0, 0))
+
+            self.assertEqual(len(index_references()), 4)
+            self.assertEqual([r.slug for r in index_references().rechercher('martiale')], ['fer'])
+
+    def test_index_absent(self):
+        with override_settings(REFERENCES_INDEX=self.dossier / 'absent.idx'):
+            self.assertIsNone(index_references())
+
+    def test_dossier_introuvable(self):
+        with self.assertRaises(CommandError):
+            call_command('construire_index_references', '--source', str(self.dossier / 'absent'), stdout=StringIO())
@@ -0,0 +1,74 @@
+"""
+Tests pour la commande construire_styles.
+"""
+import os
+import shutil
+import stat
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, override_settings
+
+from core.management.commands import construire_styles
+
+
+# Compilateur de substitution : note ses arguments et écrit la sortie demandée
+COMPILATEUR = """#!/bin/sh
+echo "$@" > "$(dirname "$0")/arguments"
+while [ $# -gt 0 ]; do
+  if [ "$1" = "--output" ]; then echo ".text-primary{color:#2d4b73}" > "$2"; fi
+  shift
+done
+"""
+
+
+class ConstruireStylesTest(SimpleTestCase):
+    """Tests de l'appel au compilateur Tailwind"""
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.sortie = self.tmp / 'tailwind.css'
+        patcher = mock.patch.object(construire_styles, 'SORTIE', self.sortie)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def compilateur(self, script=COMPILATEUR):
+        chemin = self.tmp / 'tailwindcss'
+        chemin.write_text(script)
+        chemin.chmod(chemin.stat().st_mode | stat.S_IEXEC)
+        return str(chemin)
+
+    def test_compilation_minifiee(self):
+        """Test des arguments passés au compilateur et de la feuille écrite"""
+        stdout = StringIO()
+        with override_settings(TAILWIND_CLI=self.compilateur()):
+            call_command('construire_styles', stdout=stdout)
+
+        arguments = (self.tmp / 'arguments').read_text().split()
+        self.assertEqual(arguments[arguments.index('--config') + 1], str(construire_styles.CONFIGURATION))
+        self.assertEqual(arguments[arguments.index('--input') + 1], str(construire_styles.SOURCE))
+        self.assertIn('--minify', arguments)
+        self.assertIn('.text-primary', self.sortie.read_text())
+        self.assertIn('Styles compilés', stdout.getvalue())
+
+    def test_echec_compilation(self):
+        """Test qu'une erreur du compilateur arrête la commande"""
+        with override_settings(TAILWIND_CLI=self.compilateur("#!/bin/sh\necho 'syntaxe' >&2\nexit 1\n")):
+            with self.assertRaisesMessage(CommandError, 'syntaxe'):
+                call_command('construire_styles', stdout=StringIO())
+
+    def test_compilateur_introuvable(self):
+        """Test du message quand le binaire Tailwind n'est pas installé"""
+        with override_settings(TAILWIND_CLI=os.path.join(self.tmp, 'absent')):
+            with self.assertRaisesMessage(CommandError, 'Compilateur Tailwind introuvable'):
+                call_command('construire_styles', stdout=StringIO())
+
+    def test_fichiers_du_projet(self):
+        """Test que la configuration et la source existent et que la configuration couvre les gabarits"""
+        self.assertTrue(construire_styles.SOURCE.is_file())
+        self.assertIn("'./core/templates/**/*.html'", construire_styles.CONFIGURATION.read_text())
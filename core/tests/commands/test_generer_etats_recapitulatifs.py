@@ -0,0 +1,181 @@
+"""
+Tests pour la génération des états récapitulatifs.
+"""
+import datetime
+import re
+import shutil
+import tempfile
+import threading
+import zlib
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from core.etats_recapitulatifs import collecter
+from core.models import Cabinet, Consultation, EtatRecapitulatif, Patient, SageFemme
+from core.pdf import Page, document_pdf
+from core.taches import executer, planifier, reclamer
+
+
+MEDIA_TEMPORAIRE = tempfile.mkdtemp()
+CACHE_LOCAL = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+def textes_pdf(pdf):
+    """Textes des flux de contenu d'un PDF produit par core.pdf"""
+    flux = re.findall(rb'stream\n(.*?)\nendstream', pdf, re.S)
+    return b' '.join(zlib.decompress(contenu) for contenu in flux).decode('cp1252')
+
+
+class DocumentPDFTest(TestCase):
+    """Tests de l'écriture PDF sans dépendance"""
+
+    def test_structure(self):
+        """Test que la table de références pointe sur chaque objet"""
+        page = Page()
+        page.texte(40, 800, 'État (récapitulatif) \\ août', gras=True)
+        page.filet(40, 790, 555, 790)
+        pdf = document_pdf([page, page], titre='Test')
+
+        self.assertTrue(pdf.startswith(b'%PDF-1.4'))
+        self.assertTrue(pdf.endswith(b'%%EOF\n'))
+        debut_xref = int(re.search(rb'startxref\n(\d+)', pdf).group(1))
+        self.assertTrue(pdf[debut_xref:].startswith(b'xref'))
+        decalages = re.findall(rb'(\d{10}) 00000 n', pdf[debut_xref:])
+        for numero, decalage in enumerate(decalages, start=1):
+            self.assertTrue(pdf[int(decalage):].startswith(b'%d 0 obj' % numero))
+        self.assertIn(b'/Count 2', pdf)
+        self.assertIn('(État \\(récapitulatif\\) \\\\ août)', textes_pdf(pdf))
+
+
+@override_settings(MEDIA_ROOT=MEDIA_TEMPORAIRE, CACHES=CACHE_LOCAL)
+class GenererEtatsRecapitulatifsTest(TestCase):
+    """Tests de la génération des états récapitulatifs"""
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_TEMPORAIRE, ignore_errors=True)
+
+    def setUp(self):
+        """Un gérant, sa remplaçante à état commun et une collaboratrice"""
+        cache.clear()
+        Cabinet.get_instance()
+        base = {
+            'titre': 'Sage-femme', 'telephone': '687000000',
+            'rib': 'FR0000000000000000000000000', 'banque': 'BCI',
+        }
+        self.gerant = SageFemme.objects.create(
+            **base, nom='Gerant', prenom='Pierre', email='gerant@test.nc',
+            numero_cafat='111111111', ridet='RIDET111111', situation='gerant'
+        )
+        self.remplacante = SageFemme.objects.create(
+            **base, nom='Remplacante', prenom='Sophie', email='sophie@test.nc',
+            numero_cafat='333333333', ridet='RIDET333333', situation='remplacant',
+            remplacement_de=self.gerant, etat_recapitulatif_commun=True
+        )
+        self.collaboratrice = SageFemme.objects.create(
+            **base, nom='Collaboratrice', prenom='Julie', email='julie@test.nc',
+            numero_cafat='222222222', ridet='RIDET222222', situation='collaborateur'
+        )
+        self.patient = Patient.objects.create(nom='Martin', prenom='Léa', date_naissance=datetime.date(1990, 1, 1))
+        for sage_femme, jour in [(self.gerant, 4), (self.remplacante, 5), (self.collaboratrice, 6)]:
+            self.consultation(sage_femme, datetime.date(2025, 8, jour))
+        # Hors état : en cours, ou d'un autre mois
+        self.consultation(self.gerant, datetime.date(2025, 8, 7), statut='en_cours')
+        self.consultation(self.gerant, datetime.date(2025, 9, 1))
+
+    def consultation(self, sage_femme, date, statut='complete'):
+        return Consultation.objects.create(
+            sage_femme=sage_femme, patient=self.patient, date=date, type_acte='prenatale',
+            statut=statut, montant=Decimal('4500.00')
+        )
+
+    def generer(self, *arguments):
+        sortie = StringIO()
+        call_command('generer_etats_recapitulatifs', '--mois', '2025-08', *arguments, stdout=sortie)
+        return sortie.getvalue()
+
+    def test_collecte_une_requete_par_groupe(self):
+        """Test que la remplaçante à état commun est fusionnée, en une requête"""
+        groupes = SageFemme.objects.groupes_facturation().etats_recapitulatifs
+        titulaire, membres = groupes[self.gerant.pk]
+
+        with self.assertNumQueries(1):
+            donnees, nombre, montant = collecter(None, datetime.date(2025, 8, 1), titulaire, membres)
+
+        self.assertEqual(nombre, 2)
+        self.assertEqual(montant, Decimal('9000.00'))
+        self.assertEqual([s['nom'] for s in donnees['sections']], ['Pierre Gerant', 'Sophie Remplacante'])
+        self.assertEqual(donnees['sections'][1]['mention'], 'Remplaçante de Pierre Gerant')
+        self.assertEqual(donnees['sections'][0]['lignes'], [['04/08/2025', 'Martin Léa', 'Consultation prénatale', '4 500,00']])
+
+    def test_generation(self):
+        """Test de la génération d'un état par titulaire, en parallèle"""
+        sortie = self.generer('--processus', '2')
+
+        self.assertIn('2 état(s) généré(s), 0 inchangé(s)', sortie)
+        etat = EtatRecapitulatif.objects.get(sage_femme=self.gerant)
+        self.assertEqual(etat.mois, datetime.date(2025, 8, 1))
+        self.assertEqual(etat.nombre_consultations, 2)
+        self.assertFalse(EtatRecapitulatif.objects.filter(sage_femme=self.remplacante).exists())
+        with etat.fichier.open('rb') as fichier:
+            texte = textes_pdf(fichier.read())
+        self.assertIn('Sophie Remplacante', texte)
+        self.assertIn('9 000,00', texte)
+
+    def test_rendu_sequentiel_avec_threads(self):
+        """Test qu'aucun processus n'est forké tant qu'un autre thread tourne (bail de run_jobs)"""
+        fin = threading.Event()
+        thread = threading.Thread(target=fin.wait)
+        thread.start()
+        try:
+            with mock.patch('core.etats_recapitulatifs.ProcessPoolExecutor') as pool:
+                sortie = self.generer('--processus', '2')
+        finally:
+            fin.set()
+            thread.join()
+
+        pool.assert_not_called()
+        self.assertIn('2 état(s) généré(s), 0 inchangé(s)', sortie)
+
+    def test_sage_femme_desactivee(self):
+        """Test qu'une sage-femme désactivée depuis a encore l'état du mois où elle a consulté"""
+        SageFemme.objects.filter(pk=self.collaboratrice.pk).update(is_active=False)
+
+        self.assertIn('2 état(s) généré(s), 0 inchangé(s)', self.generer('--processus', '1'))
+        self.assertTrue(EtatRecapitulatif.objects.filter(sage_femme=self.collaboratrice).exists())
+
+    def test_etats_inchanges_non_regeneres(self):
+        """Test qu'un état dont les données n'ont pas changé n'est pas rendu à nouveau"""
+        self.generer('--processus', '1')
+        fichier = EtatRecapitulatif.objects.get(sage_femme=self.gerant).fichier.name
+        self.consultation(self.collaboratrice, datetime.date(2025, 8, 20))
+
+        sortie = self.generer('--processus', '1')
+
+        self.assertIn('1 état(s) généré(s), 1 inchangé(s)', sortie)
+        self.assertEqual(EtatRecapitulatif.objects.get(sage_femme=self.gerant).fichier.name, fichier)
+        self.assertEqual(EtatRecapitulatif.objects.get(sage_femme=self.collaboratrice).nombre_consultations, 2)
+
+    def test_forcer(self):
+        """Test que --forcer régénère tous les états"""
+        self.generer('--processus', '1')
+
+        self.assertIn('2 état(s) généré(s), 0 inchangé(s)', self.generer('--processus', '1', '--forcer'))
+
+    def test_tache_de_fond(self):
+        """Test de la génération planifiée depuis l'interface, avec son avancement"""
+        tache = planifier('etats_recapitulatifs', mois='2025-08-01')
+        self.assertEqual(reclamer(1), [tache.pk])
+
+        self.assertTrue(executer(tache.pk))
+
+        tache.refresh_from_db()
+        self.assertEqual(tache.statut, 'terminee')
+        self.assertEqual(tache.resultat, {'generes': 2, 'inchanges': 0})
+        self.assertEqual(tache.progression['total'], 2)
+        self.assertEqual(tache.progression['faits'], 2)
@@ -0,0 +1,62 @@
+"""
+Tests pour la commande gerer_partitions.
+"""
+import datetime
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from core.models import Consultation, Patient, SageFemme
+from core.partitions import partitions_mensuelles
+
+
+class GererPartitionsTest(TestCase):
+    """Tests de la création et du détachement des partitions mensuelles"""
+
+    def setUp(self):
+        """Une consultation rangée dans la partition par défaut"""
+        sage_femme = SageFemme.objects.create(
+            nom='Dupont', prenom='Marie', titre='Sage-femme', telephone='687123456',
+            email='marie.dupont@test.nc', numero_cafat='123456789', ridet='RIDET123456',
+            rib='FR1234567890123456789012345', banque='BCI', situation='gerant'
+        )
+        patient = Patient.objects.create(nom='Dubois', prenom='Léa', date_naissance=datetime.date(1992, 4, 12))
+        self.consultation = Consultation.objects.create(
+            sage_femme=sage_femme, patient=patient, date=datetime.date(2024, 3, 15), type_acte='prenatale'
+        )
+
+    def partition_de(self, consultation):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT tableoid::regclass::text FROM core_consultation WHERE id = %s", [consultation.pk]
+            )
+            return cursor.fetchone()[0]
+
+    def test_creation_partitions_et_rangement(self):
+        """Test que les partitions sont créées et que les lignes de la partition par défaut y sont déplacées"""
+        sortie = StringIO()
+        call_command('gerer_partitions', '--mois-avance', '1', stdout=sortie)
+        
+        partitions = partitions_mensuelles('core_consultation')
+        self.assertIn(datetime.date(2024, 3, 1), partitions)
+        self.assertIn('1 ligne(s) déplacée(s)', sortie.getvalue())
+        self.assertEqual(self.partition_de(self.consultation), 'core_consultation_2024_03')
+        # Les index de la table partitionnée s'appliquent à la nouvelle partition
+        self.assertEqual(Consultation.objects.get(pk=self.consultation.pk).date, datetime.date(2024, 3, 15))
+
+    def test_commande_idempotente(self):
+        """Test qu'un second passage ne recrée rien"""
+        call_command('gerer_partitions', stdout=StringIO())
+        sortie = StringIO()
+        call_command('gerer_partitions', stdout=sortie)
+        
+        self.assertNotIn('créée', sortie.getvalue())
+
+    def test_detacher_partitions_anciennes(self):
+        """Test que les partitions antérieures au mois donné sont détachées"""
+        call_command('gerer_partitions', stdout=StringIO())
+        call_command('gerer_partitions', '--detacher-avant', '2024-04', stdout=StringIO())
+        
+        self.assertNotIn(datetime.date(2024, 3, 1), partitions_mensuelles('core_consultation'))
+        self.assertFalse(Consultation.objects.filter(pk=self.consultation.pk).exists())
@@ -0,0 +1,156 @@
+"""
+Tests pour la commande import_sagefemmes.
+"""
+import csv
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from core.models import HistoriqueSageFemme
+from core.models.sagefemme import SageFemme
+
+
+ENTETES = [
+    'nom', 'prenom', 'titre', 'telephone', 'email', 'numero_cafat', 'ridet',
+    'rib', 'banque', 'situation', 'titulaire_cafat', 'etat_recapitulatif_commun',
+    'bons_depot_communs'
+]
+
+
+def ligne(numero, situation='gerant', titulaire='', **kwargs):
+    valeurs = {
+        'nom': f'Nom{numero}',
+        'prenom': f'Prenom{numero}',
+        'titre': 'Sage-femme',
+        'telephone': '687000000',
+        'email': f'sf{numero}@test.nc',
+        'numero_cafat': f'CAFAT{numero:04d}',
+        'ridet': f'RIDET{numero:04d}',
+        'rib': 'FR0000000000000000000000000',
+        'banque': 'BCI',
+        'situation': situation,
+        'titulaire_cafat': titulaire,
+        'etat_recapitulatif_commun': '',
+        'bons_depot_communs': '',
+    }
+    valeurs.update(kwargs)
+    return valeurs
+
+
+class ImportSageFemmesTest(TestCase):
+    """Tests de l'import en masse des sages-femmes"""
+
+    def setUp(self):
+        """Répertoire temporaire pour les fichiers d'import"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def ecrire_csv(self, lignes, delimiteur=';'):
+        chemin = Path(self.tmp.name) / 'import.csv'
+        with open(chemin, 'w', newline='', encoding='utf-8') as fichier:
+            writer = csv.DictWriter(fichier, fieldnames=ENTETES, delimiter=delimiteur)
+            writer.writeheader()
+            writer.writerows(lignes)
+        return chemin
+
+    def importer(self, chemin, *args):
+        stdout, stderr = StringIO(), StringIO()
+        call_command('import_sagefemmes', str(chemin), *args, stdout=stdout, stderr=stderr)
+        return stdout.getvalue(), stderr.getvalue()
+
+    def test_import_avec_titulaires_du_meme_fichier(self):
+        """Test de la création de titulaires et de leurs remplaçants dans le même fichier"""
+        chemin = self.ecrire_csv([
+            ligne(1),
+            ligne(2, situation='remplacant', titulaire='CAFAT0001', etat_recapitulatif_commun='oui'),
+        ])
+        sortie, _ = self.importer(chemin)
+        
+        self.assertIn('2 créée(s)', sortie)
+        remplacant = SageFemme.objects.get(numero_cafat='CAFAT0002')
+        self.assertEqual(remplacant.remplacement_de.numero_cafat, 'CAFAT0001')
+        self.assertTrue(remplacant.etat_recapitulatif_commun)
+
+    def test_nombre_de_requetes_constant(self):
+        """Test que le nombre de requêtes ne dépend pas du nombre de lignes"""
+        lignes = [ligne(i) for i in range(1, 41)]
+        lignes += [ligne(i, situation='remplacant', titulaire='CAFAT0001') for i in range(41, 81)]
+        chemin = self.ecrire_csv(lignes)
+        
+        # Chargement initial, puis par lot : savepoint, 2 bulk_create,
+        # lecture et écriture de l'historique, libération
+        with self.assertNumQueries(7):
+            self.importer(chemin, '--batch-size', '100')
+        self.assertEqual(SageFemme.objects.count(), 80)
+        self.assertEqual(HistoriqueSageFemme.objects.filter(version=1, instantane=True).count(), 80)
+
+    def test_mise_a_jour_par_numero_cafat(self):
+        """Test qu'une sage-femme existante est mise à jour via son numéro CAFAT"""
+        self.importer(self.ecrire_csv([ligne(1)]))
+        sortie, _ = self.importer(self.ecrire_csv([ligne(1, banque='SGCB')]))
+        
+        self.assertIn('1 mise(s) à jour', sortie)
+        self.assertEqual(SageFemme.objects.get().banque, 'SGCB')
+        self.assertEqual(HistoriqueSageFemme.objects.get(version=2).donnees, {'banque': 'SGCB'})
+
+    def test_rapport_erreurs_par_ligne(self):
+        """Test que les lignes invalides sont rapportées sans bloquer les autres"""
+        chemin = self.ecrire_csv([
+            ligne(1),
+            ligne(2, situation='remplacant'),
+            ligne(3, situation='remplacant', titulaire='INCONNU'),
+            ligne(4, email='invalide'),
+            ligne(5, situation='remplacant', titulaire='CAFAT0001'),
+        ])
+        rapport = Path(self.tmp.name) / 'rapport.csv'
+        sortie, erreurs = self.importer(chemin, '--rapport', str(rapport))
+        
+        self.assertIn('2 créée(s)', sortie)
+        self.assertIn('3 erreur(s)', sortie)
+        self.assertIn('Ligne 3', erreurs)
+        self.assertIn('Un remplaçant doit indiquer qui il remplace.', erreurs)
+        with open(rapport, encoding='utf-8') as fichier:
+            lignes_rapport = list(csv.reader(fichier, delimiter=';'))
+        self.assertEqual([l[0] for l in lignes_rapport[1:]], ['3', '4', '5'])
+
+    def test_remplacant_de_remplacant_refuse(self):
+        """Test que les règles de SageFemme.clean sont appliquées"""
+        chemin = self.ecrire_csv([
+            ligne(1),
+            ligne(2, situation='remplacant', titulaire='CAFAT0001'),
+            ligne(3, situation='remplacant', titulaire='CAFAT0002'),
+        ])
+        _, erreurs = self.importer(chemin)
+        
+        self.assertIn('Un remplaçant ne peut pas remplacer un autre remplaçant.', erreurs)
+        self.assertEqual(SageFemme.objects.count(), 2)
+
+    def test_dry_run_sans_ecriture(self):
+        """Test que le mode simulation n'écrit rien"""
+        chemin = self.ecrire_csv([ligne(1), ligne(2, situation='remplacant', titulaire='CAFAT0001')])
+        sortie, _ = self.importer(chemin, '--dry-run')
+        
+        self.assertIn('[simulation] 2 créée(s)', sortie)
+        self.assertEqual(SageFemme.objects.count(), 0)
+
+    def test_import_xlsx(self):
+        """Test de l'import d'un classeur XLSX"""
+        from openpyxl import Workbook
+        
+        classeur = Workbook()
+        feuille = classeur.active
+        feuille.append(ENTETES)
+        feuille.append([ligne(1)[entete] for entete in ENTETES])
+        chemin = Path(self.tmp.name) / 'import.xlsx'
+        classeur.save(chemin)
+        
+        self.importer(chemin)
+        self.assertTrue(SageFemme.objects.filter(numero_cafat='CAFAT0001').exists())
+
+    def test_fichier_introuvable(self):
+        """Test d'un fichier inexistant"""
+        with self.assertRaises(CommandError):
+            self.importer(Path(self.tmp.name) / 'absent.csv')
@@ -0,0 +1,65 @@
+"""
+Tests pour la commande rebuild_rollups.
+"""
+import datetime
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from core.models import Consultation, CumulMensuel, Patient, SageFemme
+
+
+class RebuildRollupsTest(TestCase):
+    """Tests du recalcul et de la vérification des cumuls mensuels"""
+
+    def setUp(self):
+        """Consultations sur deux mois"""
+        sage_femme = SageFemme.objects.create(
+            nom='Dupont', prenom='Marie', titre='Sage-femme', telephone='687123456',
+            email='marie.dupont@test.nc', numero_cafat='123456789', ridet='RIDET123456',
+            rib='FR1234567890123456789012345', banque='BCI', situation='gerant'
+        )
+        patient = Patient.objects.create(nom='Dubois', prenom='Léa', date_naissance=datetime.date(1992, 4, 12))
+        for jour in (datetime.date(2025, 7, 3), datetime.date(2025, 8, 4), datetime.date(2025, 8, 5)):
+            Consultation.objects.create(
+                sage_femme=sage_femme, patient=patient, date=jour,
+                type_acte='prenatale', montant=Decimal('4500.00'), duree_minutes=45
+            )
+
+    def test_verification_sans_ecart(self):
+        """Test que les cumuls tenus par trigger sont vérifiés sans écart"""
+        sortie = StringIO()
+        call_command('rebuild_rollups', '--verify', stdout=sortie)
+
+        self.assertIn('2 cumul(s) vérifié(s), aucun écart', sortie.getvalue())
+
+    def test_verification_avec_ecart(self):
+        """Test que la vérification signale un cumul faux ou manquant"""
+        CumulMensuel.objects.filter(mois=datetime.date(2025, 8, 1)).update(nombre=7)
+        CumulMensuel.objects.filter(mois=datetime.date(2025, 7, 1)).delete()
+        erreurs = StringIO()
+
+        with self.assertRaisesMessage(CommandError, '2 cumul(s) incorrect(s)'):
+            call_command('rebuild_rollups', '--verify', stdout=StringIO(), stderr=erreurs)
+        self.assertIn('2025-07', erreurs.getvalue())
+        self.assertIn('aucun cumul', erreurs.getvalue())
+
+    def test_reconstruction(self):
+        """Test que la reconstruction corrige les cumuls"""
+        CumulMensuel.objects.update(nombre=0, montant_total=0)
+        sortie = StringIO()
+        call_command('rebuild_rollups', stdout=sortie)
+
+        self.assertIn('2 cumul(s) recalculé(s)', sortie.getvalue())
+        aout = CumulMensuel.objects.get(mois=datetime.date(2025, 8, 1))
+        self.assertEqual((aout.nombre, aout.montant_total, aout.duree_totale), (2, Decimal('9000.00'), 90))
+        call_command('rebuild_rollups', '--verify', stdout=StringIO())
+
+    def test_reconstruction_d_un_mois(self):
+        """Test que --mois limite la reconstruction au mois demandé"""
+        CumulMensuel.objects.update(nombre=0)
+        call_command('rebuild_rollups', '--mois', '2025-08', stdout=StringIO())
+
+        self.assertEqual(CumulMensuel.objects.get(mois=datetime.date(2025, 8, 1)).nombre, 2)
+        self.assertEqual(CumulMensuel.objects.get(mois=datetime.date(2025, 7, 1)).nombre, 0)
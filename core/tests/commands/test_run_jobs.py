@@ -0,0 +1,181 @@
+"""
+Tests pour la file de tâches de fond et le worker run_jobs.
+"""
+import datetime
+import threading
+import time
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.db.models import F
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+from core.management.commands import run_jobs
+from core.models import Tache
+from core.taches import delai_reessai, executer, planifier, reclamer, tache_de_fond
+
+
+@tache_de_fond('test_addition')
+def addition(a, b, progression):
+    progression(faits=1, total=1)
+    return a + b
+
+
+@tache_de_fond('test_echec')
+def echec(progression):
+    raise ValueError("boum")
+
+
+@tache_de_fond('test_reclamee')
+def reclamee_ailleurs(pk, progression):
+    # Bail expiré pendant l'exécution : un autre worker a réclamé la tâche
+    Tache.objects.filter(pk=pk).update(tentatives=F('tentatives') + 1)
+    return 'périmé'
+
+
+@tache_de_fond('test_longue')
+def longue(pk, progression):
+    # Attend que le bail pris à la réclamation soit renouvelé
+    bail = Tache.objects.get(pk=pk).bail_expire
+    for _ in range(100):
+        if Tache.objects.get(pk=pk).bail_expire > bail:
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def lancer_worker(*arguments):
+    sortie = StringIO()
+    call_command('run_jobs', '--once', *arguments, stdout=sortie, stderr=StringIO())
+    return sortie.getvalue()
+
+
+class RunJobsTest(TestCase):
+    """Tests de l'exécution des tâches et des nouvelles tentatives"""
+
+    def test_execution(self):
+        """Test qu'une tâche planifiée est exécutée et son résultat conservé"""
+        tache = planifier('test_addition', a=2, b=3)
+
+        sortie = lancer_worker('--concurrency', '1')
+
+        tache.refresh_from_db()
+        self.assertIn('1 tâche(s) exécutée(s)', sortie)
+        self.assertEqual((tache.statut, tache.resultat, tache.tentatives), ('terminee', 5, 1))
+        self.assertEqual(tache.progression, {'faits': 1, 'total': 1})
+        self.assertIsNotNone(tache.fin)
+
+    def test_nouvelle_tentative_differee(self):
+        """Test qu'une tâche en échec est retentée plus tard, puis abandonnée"""
+        tache = planifier('test_echec', tentatives_max=2)
+
+        lancer_worker('--concurrency', '1')
+
+        tache.refresh_from_db()
+        self.assertEqual((tache.statut, tache.tentatives), ('en_attente', 1))
+        self.assertIn('ValueError: boum', tache.erreur)
+        self.assertGreater(tache.executer_apres, timezone.now() + datetime.timedelta(seconds=25))
+        # Pas encore l'heure : le worker n'y touche pas
+        self.assertIn('0 tâche(s) exécutée(s)', lancer_worker('--concurrency', '1'))
+
+        Tache.objects.filter(pk=tache.pk).update(executer_apres=timezone.now())
+        lancer_worker('--concurrency', '1')
+
+        tache.refresh_from_db()
+        self.assertEqual((tache.statut, tache.tentatives), ('echouee', 2))
+
+    def test_tache_inconnue(self):
+        """Test qu'une tâche non déclarée échoue sans nouvelle tentative"""
+        tache = planifier('inexistante')
+
+        lancer_worker('--concurrency', '1')
+
+        tache.refresh_from_db()
+        self.assertEqual(tache.statut, 'echouee')
+        self.assertIn('Tâche inconnue', tache.erreur)
+
+    def test_bail_expire(self):
+        """Test qu'une tâche dont le worker a disparu est réclamée à nouveau"""
+        maintenant = timezone.now()
+        abandonnee = Tache.objects.create(
+            nom='test_addition', statut='en_cours', tentatives=1,
+            bail_expire=maintenant - datetime.timedelta(seconds=1),
+        )
+        Tache.objects.create(
+            nom='test_addition', statut='en_cours', tentatives=1,
+            bail_expire=maintenant + datetime.timedelta(minutes=1),
+        )
+
+        self.assertEqual(reclamer(5), [abandonnee.pk])
+        abandonnee.refresh_from_db()
+        self.assertEqual(abandonnee.tentatives, 2)
+
+    def test_tentative_perimee_sans_effet(self):
+        """Test qu'un exécutant dont la tâche a été réclamée à nouveau n'écrase rien"""
+        tache = planifier('test_reclamee')
+        Tache.objects.filter(pk=tache.pk).update(arguments={'pk': tache.pk})
+        reclamer(1)
+
+        self.assertTrue(executer(tache.pk))
+
+        tache.refresh_from_db()
+        self.assertEqual((tache.statut, tache.tentatives, tache.resultat), ('en_cours', 2, None))
+
+    def test_delai_croissant(self):
+        """Test du délai entre deux tentatives"""
+        self.assertEqual(delai_reessai(1), datetime.timedelta(seconds=30))
+        self.assertEqual(delai_reessai(3), datetime.timedelta(minutes=2))
+        self.assertEqual(delai_reessai(20), datetime.timedelta(hours=1))
+
+
+class RunJobsConcurrenceTest(TransactionTestCase):
+    """Tests du partage de la file entre workers"""
+
+    def test_skip_locked(self):
+        """Test qu'une tâche verrouillée par un autre worker est sautée"""
+        verrouillee = planifier('test_addition', a=1, b=1)
+        libre = planifier('test_addition', a=2, b=2)
+        verrou_pris = threading.Event()
+        fin = threading.Event()
+
+        def autre_worker():
+            with transaction.atomic():
+                Tache.objects.select_for_update().get(pk=verrouillee.pk)
+                verrou_pris.set()
+                fin.wait(5)
+            connection.close()
+
+        thread = threading.Thread(target=autre_worker)
+        thread.start()
+        try:
+            verrou_pris.wait(5)
+            self.assertEqual(reclamer(2), [libre.pk])
+        finally:
+            fin.set()
+            thread.join()
+
+    def test_pool_de_processus(self):
+        """Test de l'exécution parallèle dans un pool de processus"""
+        taches = [planifier('test_addition', a=i, b=i) for i in range(4)]
+
+        sortie = lancer_worker('--concurrency', '2', '--intervalle', '0.05')
+
+        self.assertIn('4 tâche(s) exécutée(s)', sortie)
+        self.assertEqual(
+            sorted(Tache.objects.filter(statut='terminee').values_list('resultat', flat=True)),
+            [2 * i for i in range(len(taches))],
+        )
+
+    def test_bail_renouvele_sans_pool(self):
+        """Test que le bail d'une tâche longue est renouvelé avec --concurrency 1"""
+        tache = planifier('test_longue')
+        tache.arguments = {'pk': tache.pk}
+        tache.save()
+
+        with mock.patch.object(run_jobs, 'INTERVALLE_BAIL', 0.05):
+            lancer_worker('--concurrency', '1')
+
+        tache.refresh_from_db()
+        self.assertEqual((tache.statut, tache.resultat), ('terminee', True))
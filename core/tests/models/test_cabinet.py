@@ -1,6 +1,9 @@
-from django.test import TestCase
+from django.test import TestCase, TransactionTestCase, override_settings
 from django.core.exceptions import ValidationError
+from django.db import transaction
+from core.cache import bump_version
 from core.models import Cabinet
+from core.models.cabinet import CABINET_CACHE_VERSION, invalidate_cabinet_cache
 
 
 class CabinetModelTest(TestCase):
@@ -163,4 +166,53 @@ class CabinetModelTest(TestCase):
         """Test model meta configuration"""
         self.assertEqual(Cabinet._meta.verbose_name, "1. Cabinet")
         self.assertEqual(Cabinet._meta.verbose_name_plural, "1. Cabinet")
-        self.assertEqual(Cabinet._meta.ordering, ['titre'])
\ No newline at end of file
+        self.assertEqual(Cabinet._meta.ordering, ['titre'])
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class CabinetCacheTest(TransactionTestCase):
+    """Tests du cache process-local du singleton Cabinet"""
+    
+    def setUp(self):
+        """Cabinet de test et cache vide"""
+        invalidate_cabinet_cache()
+        self.cabinet = Cabinet.objects.create(
+            titre="Cabinet Cache",
+            rue="123 Rue",
+            code_postal="98800",
+            ville="Nouméa",
+            telephone="05 05 05 05 05",
+            email="cache@cabinet.nc"
+        )
+    
+    def test_get_cached_sans_requete(self):
+        """Test que les appels suivants ne touchent pas la base"""
+        Cabinet.get_cached()
+        with self.assertNumQueries(0):
+            cabinet = Cabinet.get_cached()
+            Cabinet.get_instance()
+        self.assertEqual(cabinet.id, self.cabinet.id)
+    
+    def test_get_cached_invalide_apres_modification(self):
+        """Test que la modification du cabinet invalide le cache"""
+        Cabinet.get_cached()
+        self.cabinet.titre = "Cabinet Modifié"
+        self.cabinet.save()
+        
+        self.assertEqual(Cabinet.get_cached().titre, "Cabinet Modifié")
+    
+    def test_get_cached_nouvelle_version_autre_worker(self):
+        """Test qu'un changement de version publié par un autre worker recharge le cabinet"""
+        Cabinet.get_cached()
+        # Modification hors ORM, puis publication de version comme le ferait un autre worker
+        Cabinet.objects.filter(pk=self.cabinet.pk).update(titre="Cabinet Distant")
+        bump_version(CABINET_CACHE_VERSION)
+        
+        with self.assertNumQueries(1):
+            self.assertEqual(Cabinet.get_cached().titre, "Cabinet Distant")
+    
+    def test_get_cached_pas_de_cache_en_transaction(self):
+        """Test qu'une lecture dans une transaction n'est pas mise en cache"""
+        with transaction.atomic():
+            Cabinet.get_cached()
+        with self.assertNumQueries(1):
+            Cabinet.get_cached()
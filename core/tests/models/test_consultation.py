@@ -0,0 +1,184 @@
+"""
+Tests pour les modèles Patient et Consultation.
+"""
+import datetime
+
+from django.db import connection
+from django.test import TestCase
+from core.models import Consultation, Patient, SageFemme
+
+
+class ConsultationModelTest(TestCase):
+    """Tests du modèle Consultation (table partitionnée par mois)"""
+
+    def setUp(self):
+        """Une sage-femme et une patiente"""
+        self.sage_femme = SageFemme.objects.create(
+            nom='Dupont', prenom='Marie', titre='Sage-femme', telephone='687123456',
+            email='marie.dupont@test.nc', numero_cafat='123456789', ridet='RIDET123456',
+            rib='FR1234567890123456789012345', banque='BCI', situation='gerant'
+        )
+        self.patient = Patient.objects.create(
+            nom='Dubois', prenom='Léa', date_naissance=datetime.date(1992, 4, 12)
+        )
+
+    def creer(self, date, **kwargs):
+        return Consultation.objects.create(
+            sage_femme=self.sage_femme, patient=self.patient, date=date,
+            type_acte=kwargs.pop('type_acte', 'prenatale'), **kwargs
+        )
+
+    def test_creation_consultation(self):
+        """Test de création d'une consultation"""
+        consultation = self.creer(datetime.date(2025, 8, 15), montant=5000)
+        
+        self.assertIsNotNone(consultation.pk)
+        self.assertEqual(consultation.statut, 'en_cours')
+        self.assertEqual(str(consultation), "15/08/2025 - Dubois Léa (12/04/1992) - Consultation prénatale")
+
+    def test_str_patient(self):
+        """Test de la représentation string et du nom complet d'une patiente"""
+        self.assertEqual(str(self.patient), "Dubois Léa (12/04/1992)")
+        self.assertEqual(self.patient.nom_complet, "Léa Dubois")
+
+    def test_ordre_par_date_decroissante(self):
+        """Test de l'ordre par défaut (date puis id décroissants)"""
+        ancienne = self.creer(datetime.date(2024, 1, 10))
+        recente = self.creer(datetime.date(2025, 8, 15))
+        meme_jour = self.creer(datetime.date(2025, 8, 15))
+        
+        self.assertEqual(list(Consultation.objects.all()), [meme_jour, recente, ancienne])
+
+    def test_table_partitionnee(self):
+        """Test que la table est partitionnée par plage de dates avec une partition par défaut"""
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT partstrat FROM pg_partitioned_table WHERE partrelid = 'core_consultation'::regclass"
+            )
+            self.assertEqual(cursor.fetchone(), ('r',))
+        
+        consultation = self.creer(datetime.date(2025, 8, 15))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT tableoid::regclass::text FROM core_consultation WHERE id = %s",
+                [consultation.pk]
+            )
+            self.assertEqual(cursor.fetchone(), ('core_consultation_defaut',))
+
+    def test_modification_et_suppression(self):
+        """Test que la clé (id, date) n'empêche pas les mises à jour par id"""
+        consultation = self.creer(datetime.date(2025, 8, 15))
+        consultation.statut = 'complete'
+        consultation.save()
+        
+        self.assertEqual(Consultation.objects.get(pk=consultation.pk).statut, 'complete')
+        consultation.delete()
+        self.assertFalse(Consultation.objects.exists())
+
+
+class ConsultationRechercheTest(TestCase):
+    """Tests de la recherche plein texte en français"""
+
+    def setUp(self):
+        """Consultations avec notes cliniques"""
+        self.sage_femme = SageFemme.objects.create(
+            nom='Dupont', prenom='Marie', titre='Sage-femme', telephone='687123456',
+            email='marie.dupont@test.nc', numero_cafat='123456789', ridet='RIDET123456',
+            rib='FR1234567890123456789012345', banque='BCI', situation='gerant'
+        )
+        patient = Patient.objects.create(nom='Dubois', prenom='Léa', date_naissance=datetime.date(1992, 4, 12))
+        base = {'sage_femme': self.sage_femme, 'patient': patient, 'type_acte': 'suivi_grossesse'}
+        self.echographie = Consultation.objects.create(
+            **base, date=datetime.date(2025, 8, 1), motif='Échographie du 2e trimestre',
+            notes='Biométrie fœtale normale. Placenta antérieur.'
+        )
+        self.contractions = Consultation.objects.create(
+            **base, date=datetime.date(2025, 8, 2), motif='Contractions',
+            notes="Patiente inquiète : contractions irrégulières depuis hier soir. Pas d'échographie prévue."
+        )
+        self.autre = Consultation.objects.create(
+            **base, date=datetime.date(2025, 8, 3), motif='Préparation', notes='Séance de respiration.'
+        )
+
+    def test_vecteur_maintenu_par_trigger(self):
+        """Test que le vecteur est calculé à l'insertion et recalculé à la modification des notes"""
+        self.assertEqual(list(Consultation.objects.recherche('respiration')), [self.autre])
+        
+        self.autre.notes = 'Séance de relaxation.'
+        self.autre.save()
+        self.assertEqual(list(Consultation.objects.recherche('respiration')), [])
+        self.assertEqual(list(Consultation.objects.recherche('relaxation')), [self.autre])
+
+    def test_insensible_aux_accents_et_aux_flexions(self):
+        """Test de la racinisation française et de l'insensibilité aux accents"""
+        self.assertEqual(list(Consultation.objects.recherche('contraction')), [self.contractions])
+        self.assertEqual(list(Consultation.objects.recherche('foetale')), [self.echographie])
+
+    def test_classement_par_pertinence(self):
+        """Test qu'un terme du motif pèse plus qu'un terme des notes"""
+        resultats = list(Consultation.objects.recherche('echographie'))
+        
+        self.assertEqual(resultats, [self.echographie, self.contractions])
+        self.assertGreater(resultats[0].rang, resultats[1].rang)
+
+    def test_extrait_surligne_echappe(self):
+        """Test que l'extrait surligne les termes et échappe le reste du texte"""
+        self.autre.notes = 'Respiration & détente, durée < 5 min'
+        self.autre.save()
+        
+        consultation = Consultation.objects.recherche('respiration').get()
+        self.assertIn('<mark>Respiration</mark>', consultation.extrait_surligne)
+        self.assertIn('&amp; détente', consultation.extrait_surligne)
+        self.assertIn('&lt; 5', consultation.extrait_surligne)
+
+    def test_syntaxe_websearch(self):
+        """Test de la syntaxe de recherche web (guillemets, exclusion)"""
+        self.assertEqual(list(Consultation.objects.recherche('echographie -contractions')), [self.echographie])
+        self.assertEqual(list(Consultation.objects.recherche('"placenta anterieur"')), [self.echographie])
+
+
+class PatientRechercheTest(TestCase):
+    """Tests de la recherche rapide de patientes"""
+
+    def setUp(self):
+        """Quelques patientes aux noms proches"""
+        for nom, prenom, naissance in [
+            ('Dupont', 'Marie', datetime.date(1990, 3, 12)),
+            ('Dupont', 'Élodie', datetime.date(1985, 7, 1)),
+            ('Duponcel', 'Anne', datetime.date(1992, 11, 30)),
+            ('Wamytan', 'Léa', datetime.date(1995, 5, 5)),
+        ]:
+            Patient.objects.create(nom=nom, prenom=prenom, date_naissance=naissance)
+
+    def noms(self, texte, **kwargs):
+        return [f"{p.nom} {p.prenom}" for p in Patient.objects.recherche(texte, **kwargs)]
+
+    def test_prefixe_nom(self):
+        """Test de la recherche par préfixe du nom, triée par nom puis prénom"""
+        self.assertEqual(self.noms('dupon'), ['Duponcel Anne', 'Dupont Marie', 'Dupont Élodie'])
+
+    def test_prefixe_nom_prenom_sans_accent(self):
+        """Test que le prénom peut suivre le nom, sans accents"""
+        self.assertEqual(self.noms('DUPONT elo'), ['Dupont Élodie'])
+
+    def test_date_naissance(self):
+        """Test du filtre sur la date de naissance"""
+        self.assertEqual(self.noms('dupont 12/03/1990'), ['Dupont Marie'])
+        self.assertEqual(self.noms('01/07/1985'), ['Dupont Élodie'])
+
+    def test_repli_trigrammes(self):
+        """Test du repli par similarité : prénom en premier ou faute de frappe"""
+        self.assertEqual(self.noms('lea wamytan'), ['Wamytan Léa'])
+        self.assertEqual(self.noms('wamytann'), ['Wamytan Léa'])
+
+    def test_limite(self):
+        """Test que le nombre de résultats est limité"""
+        self.assertEqual(len(self.noms('dupon', limite=2)), 2)
+
+    def test_index_prefixe(self):
+        """Test que l'index de préfixe est déclaré avec text_pattern_ops"""
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT indexdef FROM pg_indexes WHERE indexname = 'core_patient_nom_naiss_idx'")
+            definition = cursor.fetchone()[0]
+        self.assertIn('text_pattern_ops', definition)
+        self.assertIn('date_naissance', definition)
@@ -0,0 +1,108 @@
+"""
+Tests pour le modèle CumulMensuel (cumuls tenus à jour par trigger).
+"""
+import datetime
+from decimal import Decimal
+
+from django.test import TestCase
+from core.models import Consultation, CumulMensuel, Patient, SageFemme
+from core.partitions import creer_partition
+
+
+class CumulMensuelTest(TestCase):
+    """Tests de la mise à jour incrémentale des cumuls mensuels"""
+
+    def setUp(self):
+        """Une sage-femme et une patiente"""
+        self.sage_femme = SageFemme.objects.create(
+            nom='Dupont', prenom='Marie', titre='Sage-femme', telephone='687123456',
+            email='marie.dupont@test.nc', numero_cafat='123456789', ridet='RIDET123456',
+            rib='FR1234567890123456789012345', banque='BCI', situation='gerant'
+        )
+        self.patient = Patient.objects.create(
+            nom='Martin', prenom='Sophie', date_naissance=datetime.date(1990, 1, 1)
+        )
+
+    def consultation(self, **kwargs):
+        valeurs = {
+            'sage_femme': self.sage_femme, 'patient': self.patient,
+            'date': datetime.date(2025, 8, 10), 'type_acte': 'prenatale',
+            'montant': Decimal('5000.00'), 'duree_minutes': 30,
+        }
+        valeurs.update(kwargs)
+        return Consultation.objects.create(**valeurs)
+
+    def cumuls(self):
+        return {
+            (c.mois, c.type_acte): (c.nombre, c.montant_total, c.duree_totale)
+            for c in CumulMensuel.objects.all()
+        }
+
+    def test_creation(self):
+        """Test que les créations incrémentent le cumul du mois"""
+        self.consultation()
+        self.consultation(date=datetime.date(2025, 8, 20), montant=None, duree_minutes=None)
+
+        self.assertEqual(self.cumuls(), {
+            (datetime.date(2025, 8, 1), 'prenatale'): (2, Decimal('5000.00'), 30),
+        })
+
+    def test_modification_montant_et_acte(self):
+        """Test qu'une modification retire l'ancienne valeur et ajoute la nouvelle"""
+        consultation = self.consultation()
+        self.consultation()
+        consultation.type_acte = 'postnatale'
+        consultation.montant = Decimal('3000.00')
+        consultation.save()
+
+        self.assertEqual(self.cumuls(), {
+            (datetime.date(2025, 8, 1), 'prenatale'): (1, Decimal('5000.00'), 30),
+            (datetime.date(2025, 8, 1), 'postnatale'): (1, Decimal('3000.00'), 30),
+        })
+
+    def test_changement_de_mois(self):
+        """Test du déplacement d'une consultation vers un autre mois (autre partition)"""
+        creer_partition('core_consultation', datetime.date(2025, 8, 1))
+        consultation = self.consultation()
+        consultation.date = datetime.date(2025, 9, 2)
+        consultation.save()
+
+        self.assertEqual(self.cumuls(), {
+            (datetime.date(2025, 9, 1), 'prenatale'): (1, Decimal('5000.00'), 30),
+        })
+
+    def test_suppression(self):
+        """Test que le cumul vide est supprimé"""
+        consultation = self.consultation()
+        consultation.delete()
+
+        self.assertFalse(CumulMensuel.objects.exists())
+
+    def test_modification_sans_effet(self):
+        """Test que la modification des notes ne touche pas aux cumuls"""
+        consultation = self.consultation()
+        cumul = CumulMensuel.objects.get()
+        consultation.notes = 'Tension normale'
+        consultation.save(update_fields=['notes'])
+
+        self.assertEqual(CumulMensuel.objects.get().pk, cumul.pk)
+
+    def test_creation_partition_sans_effet(self):
+        """Test que le rangement des lignes dans une nouvelle partition ne compte pas deux fois"""
+        self.consultation()
+        creer_partition('core_consultation', datetime.date(2025, 8, 1))
+
+        self.assertEqual(self.cumuls(), {
+            (datetime.date(2025, 8, 1), 'prenatale'): (1, Decimal('5000.00'), 30),
+        })
+
+    def test_calculer(self):
+        """Test que le recalcul complet correspond aux cumuls incrémentaux"""
+        self.consultation()
+        self.consultation(type_acte='postnatale', date=datetime.date(2025, 7, 31))
+
+        calcules = {
+            (c['mois'], c['type_acte']): (c['nombre'], c['montant_total'], c['duree_totale'])
+            for c in CumulMensuel.calculer()
+        }
+        self.assertEqual(calcules, self.cumuls())
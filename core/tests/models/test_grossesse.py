@@ -0,0 +1,105 @@
+import datetime
+
+from django.db import IntegrityError
+from django.test import TestCase
+
+from core.calendrier_grossesse import JALONS, Calendriers, calendrier, echeancier, formater_age
+from core.models import Grossesse, Patient, SageFemme
+
+
+class CalendrierGrossesseTest(TestCase):
+    """Tests du moteur de calendrier de grossesse"""
+    
+    def test_terme_et_age(self):
+        """Test du terme à 41 SA et de l'âge gestationnel"""
+        resultat = calendrier(datetime.date(2025, 3, 1), datetime.date(2025, 6, 1))
+        
+        self.assertEqual(resultat['terme'], datetime.date(2025, 12, 13))
+        self.assertEqual(resultat['age_texte'], '13 SA + 1 j')
+        echographie = next(ligne for ligne in resultat['jalons'] if ligne['jalon'].code == 'echographie_t1')
+        # 11 SA à 13 SA + 6 j
+        self.assertEqual(
+            (echographie['debut'], echographie['fin'], echographie['etat']),
+            (datetime.date(2025, 5, 17), datetime.date(2025, 6, 6), 'en_cours'),
+        )
+    
+    def test_terme_corrige(self):
+        """Test qu'un terme corrigé à l'échographie recale tout le calendrier"""
+        resultat = calendrier(
+            datetime.date(2025, 3, 1), datetime.date(2025, 6, 1), datetime.date(2025, 12, 20)
+        )
+        
+        self.assertEqual(resultat['terme'], datetime.date(2025, 12, 20))
+        self.assertEqual(resultat['reference'], datetime.date(2025, 3, 8))
+        self.assertEqual(resultat['age_texte'], '12 SA + 1 j')
+    
+    def test_vectorisation(self):
+        """Test que le calcul groupé donne le calcul grossesse par grossesse"""
+        jour = datetime.date(2025, 6, 1)
+        dernieres_regles = [jour - datetime.timedelta(days=jours) for jours in range(0, 300, 3)]
+        termes = [None if i % 4 else ddr + datetime.timedelta(days=280) for i, ddr in enumerate(dernieres_regles)]
+        calendriers = Calendriers(range(len(dernieres_regles)), dernieres_regles, termes)
+        
+        debuts, fins = calendriers.fenetres()
+        self.assertEqual(debuts.shape, (len(dernieres_regles), len(JALONS)))
+        for i, (ddr, terme) in enumerate(zip(dernieres_regles, termes)):
+            unitaire = calendrier(ddr, jour, terme)
+            self.assertEqual(calendriers.ages(jour)[i], unitaire['age'])
+            self.assertEqual(debuts[i].astype(object).tolist(), [ligne['debut'] for ligne in unitaire['jalons']])
+    
+    def test_formater_age(self):
+        self.assertEqual(formater_age(84), '12 SA')
+        self.assertEqual(formater_age(87), '12 SA + 3 j')
+
+
+class EcheancierTest(TestCase):
+    """Tests de l'échéancier des grossesses en cours"""
+    
+    def setUp(self):
+        """Une grossesse à 23 SA + 5 j, une terminée et une trop ancienne au 01/06/2025"""
+        self.jour = datetime.date(2025, 6, 1)
+        sage_femme = SageFemme.objects.create(
+            nom='Durand', prenom='Claire', titre='Sage-femme', telephone='687123456',
+            email='claire.durand@test.nc', numero_cafat='123456789', ridet='RIDET123456',
+            rib='FR1234567890123456789012345', banque='BCI', situation='gerant'
+        )
+        patients = [
+            Patient.objects.create(nom=nom, prenom='Marie', date_naissance=datetime.date(1990, 1, 1))
+            for nom in ('Dupont', 'Martin', 'Bernard')
+        ]
+        self.grossesse = Grossesse.objects.create(
+            patient=patients[0], sage_femme=sage_femme,
+            date_dernieres_regles=self.jour - datetime.timedelta(days=7 * 23 + 5),
+        )
+        Grossesse.objects.create(
+            patient=patients[1], date_dernieres_regles=self.jour - datetime.timedelta(days=7 * 24),
+            date_fin=self.jour - datetime.timedelta(days=1),
+        )
+        Grossesse.objects.create(
+            patient=patients[2], date_dernieres_regles=self.jour - datetime.timedelta(days=7 * 45),
+        )
+    
+    def test_examens_de_la_semaine(self):
+        """Test que seuls les examens des grossesses en cours sont listés, en une requête"""
+        with self.assertNumQueries(1):
+            echeances = echeancier(self.jour, 7)
+        
+        self.assertEqual(
+            [(echeance['patiente'], echeance['jalon'].code) for echeance in echeances],
+            [('Dupont Marie', 'echographie_t2'), ('Dupont Marie', 'hgpo')],
+        )
+        self.assertEqual(echeances[0]['sage_femme'], 'Claire Durand')
+        self.assertEqual(echeances[0]['age_texte'], '23 SA + 5 j')
+        self.assertEqual(echeances[1]['debut'], self.jour + datetime.timedelta(days=2))
+    
+    def test_aucune_grossesse(self):
+        Grossesse.objects.all().delete()
+        
+        self.assertEqual(echeancier(self.jour), [])
+    
+    def test_fin_avant_ddr_refusee(self):
+        """Test de la contrainte sur la fin du suivi"""
+        with self.assertRaises(IntegrityError):
+            Grossesse.objects.filter(pk=self.grossesse.pk).update(
+                date_fin=self.grossesse.date_dernieres_regles - datetime.timedelta(days=1)
+            )
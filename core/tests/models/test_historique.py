@@ -0,0 +1,110 @@
+"""
+Tests pour l'historique des sages-femmes.
+"""
+import datetime
+
+from django.test import TestCase
+from django.utils import timezone
+
+from core.models import HistoriqueSageFemme, SageFemme
+from core.models.historique import INTERVALLE_INSTANTANES, historiser
+
+
+def sage_femme(**kwargs):
+    donnees = {
+        'nom': 'Dupont',
+        'prenom': 'Marie',
+        'titre': 'Sage-femme',
+        'telephone': '687123456',
+        'email': 'marie.dupont@test.nc',
+        'numero_cafat': '123456789',
+        'ridet': 'RIDET123456',
+        'rib': 'FR0000000000000000000000001',
+        'banque': 'BCI',
+        'situation': 'gerant',
+    }
+    donnees.update(kwargs)
+    return SageFemme.objects.create(**donnees)
+
+
+class HistoriqueSageFemmeTest(TestCase):
+    """Tests des versions compactes et de la lecture à une date"""
+
+    def setUp(self):
+        self.sage_femme = sage_femme()
+
+    def dater(self, version, moment):
+        HistoriqueSageFemme.objects.filter(sage_femme=self.sage_femme, version=version).update(date_effet=moment)
+
+    def test_creation_instantane(self):
+        """Test que la création enregistre un instantané complet"""
+        version = self.sage_femme.historique.get()
+
+        self.assertEqual(version.version, 1)
+        self.assertTrue(version.instantane)
+        self.assertEqual(version.donnees['rib'], 'FR0000000000000000000000001')
+        self.assertTrue(version.donnees['is_active'])
+
+    def test_difference_compacte(self):
+        """Test qu'une modification n'enregistre que les champs modifiés"""
+        self.sage_femme.is_active = False
+        self.sage_femme.save()
+
+        version = self.sage_femme.historique.get(version=2)
+        self.assertFalse(version.instantane)
+        self.assertEqual(version.donnees, {'is_active': False})
+
+    def test_enregistrement_sans_changement(self):
+        """Test qu'un enregistrement sans changement n'écrit pas de version"""
+        self.sage_femme.save()
+
+        self.assertEqual(self.sage_femme.historique.count(), 1)
+
+    def test_instantane_periodique(self):
+        """Test qu'une version sur INTERVALLE_INSTANTANES est un instantané"""
+        for i in range(INTERVALLE_INSTANTANES + 1):
+            self.sage_femme.is_active = not self.sage_femme.is_active
+            self.sage_femme.save()
+
+        instantanes = list(self.sage_femme.historique.filter(instantane=True).values_list('version', flat=True))
+        self.assertEqual(sorted(instantanes), [1, INTERVALLE_INSTANTANES + 1])
+
+    def test_as_of(self):
+        """Test de la fiche reconstituée à une date"""
+        self.dater(1, timezone.make_aware(datetime.datetime(2025, 1, 10, 9)))
+        self.sage_femme.rib = 'FR0000000000000000000000002'
+        self.sage_femme.save()
+        self.dater(2, timezone.make_aware(datetime.datetime(2025, 3, 1, 14)))
+        self.sage_femme.banque = 'SGCB'
+        self.sage_femme.save()
+
+        self.assertIsNone(self.sage_femme.as_of(datetime.date(2025, 1, 9)))
+        ancienne = self.sage_femme.as_of(datetime.date(2025, 2, 28))
+        self.assertEqual((ancienne.rib, ancienne.banque), ('FR0000000000000000000000001', 'BCI'))
+        # Une date couvre toute la journée
+        du_jour = self.sage_femme.as_of(datetime.date(2025, 3, 1))
+        self.assertEqual((du_jour.rib, du_jour.banque), ('FR0000000000000000000000002', 'BCI'))
+        courante = self.sage_femme.as_of(timezone.now())
+        self.assertEqual((courante.pk, courante.banque), (self.sage_femme.pk, 'SGCB'))
+
+    def test_as_of_une_requete_bornee(self):
+        """Test que la lecture se fait en une requête sur au plus un intervalle de versions"""
+        for i in range(2 * INTERVALLE_INSTANTANES + 5):
+            self.sage_femme.ville = f'Ville {i}'
+            self.sage_femme.save()
+
+        etats = HistoriqueSageFemme.objects.filter(sage_femme=self.sage_femme).etats()
+        with self.assertNumQueries(1):
+            etat = self.sage_femme.as_of(timezone.now())
+        self.assertEqual(etat.ville, f'Ville {2 * INTERVALLE_INSTANTANES + 4}')
+        self.assertEqual(etats[self.sage_femme.pk][0], 2 * INTERVALLE_INSTANTANES + 6)
+
+    def test_historiser_en_lot(self):
+        """Test de l'historisation groupée (import) : une lecture, un INSERT"""
+        autre = sage_femme(numero_cafat='987654321', email='autre@test.nc')
+        SageFemme.objects.filter(pk__in=[self.sage_femme.pk, autre.pk]).update(banque='BNC')
+        self.sage_femme.banque = autre.banque = 'BNC'
+
+        with self.assertNumQueries(2):
+            versions = historiser([self.sage_femme, autre])
+        self.assertEqual([version.donnees for version in versions], [{'banque': 'BNC'}, {'banque': 'BNC'}])
@@ -1,7 +1,7 @@
 """
 Tests pour le modèle SageFemme.
 """
-from django.test import TestCase
+from django.test import TestCase, RequestFactory
 from django.core.exceptions import ValidationError
 from django.db import IntegrityError
 from core.models.sagefemme import SageFemme
@@ -338,4 +338,73 @@ class SageFemmeRemplacantTest(TestCase):
         
         self.assertFalse(sage_femme.etat_recapitulatif_commun)
         self.assertFalse(sage_femme.bons_depot_communs)
-        self.assertIsNone(sage_femme.remplacement_de)
\ No newline at end of file
+        self.assertIsNone(sage_femme.remplacement_de)
+
+class SageFemmeGroupesFacturationTest(TestCase):
+    """Tests de la résolution groupée des titulaires de facturation"""
+
+    def setUp(self):
+        """Un gérant, un collaborateur et deux remplaçants du gérant"""
+        base = {
+            'titre': 'Sage-femme',
+            'telephone': '687000000',
+            'rib': 'FR0000000000000000000000000',
+            'banque': 'BCI',
+        }
+        self.gerant = SageFemme.objects.create(
+            **base, nom='Gerant', prenom='Pierre', email='gerant@test.nc',
+            numero_cafat='111111111', ridet='RIDET111111', situation='gerant'
+        )
+        self.collaborateur = SageFemme.objects.create(
+            **base, nom='Collaborateur', prenom='Julie', email='collab@test.nc',
+            numero_cafat='222222222', ridet='RIDET222222', situation='collaborateur'
+        )
+        self.remplacant_commun = SageFemme.objects.create(
+            **base, nom='Remplacant', prenom='Sophie', email='sophie@test.nc',
+            numero_cafat='333333333', ridet='RIDET333333', situation='remplacant',
+            remplacement_de=self.gerant, etat_recapitulatif_commun=True, bons_depot_communs=False
+        )
+        self.remplacant_separe = SageFemme.objects.create(
+            **base, nom='Remplacant', prenom='Claire', email='claire@test.nc',
+            numero_cafat='444444444', ridet='RIDET444444', situation='remplacant',
+            remplacement_de=self.gerant
+        )
+
+    def test_une_seule_requete(self):
+        """Test que la résolution ne fait qu'une requête, quel que soit le nombre de remplaçants"""
+        with self.assertNumQueries(1):
+            groupes = SageFemme.objects.groupes_facturation()
+            groupes.titulaire_etat_recapitulatif(self.remplacant_commun.pk).nom
+
+    def test_etats_recapitulatifs_communs(self):
+        """Test du regroupement des états récapitulatifs"""
+        groupes = SageFemme.objects.groupes_facturation()
+        
+        titulaire, membres = groupes.etats_recapitulatifs[self.gerant.pk]
+        self.assertEqual(titulaire, self.gerant)
+        self.assertCountEqual(membres, [self.gerant, self.remplacant_commun])
+        self.assertIn(self.remplacant_separe.pk, groupes.etats_recapitulatifs)
+        self.assertIn(self.collaborateur.pk, groupes.etats_recapitulatifs)
+
+    def test_bons_depot_separes(self):
+        """Test que les bons de dépôt restent séparés sans l'option commune"""
+        groupes = SageFemme.objects.groupes_facturation()
+        
+        self.assertEqual(groupes.titulaire_bons_depot(self.remplacant_commun.pk), self.remplacant_commun)
+        self.assertEqual(len(groupes.bons_depot), 4)
+
+    def test_sages_femmes_inactives_exclues(self):
+        """Test que les sages-femmes inactives sont ignorées"""
+        self.collaborateur.is_active = False
+        self.collaborateur.save()
+        
+        groupes = SageFemme.objects.groupes_facturation()
+        self.assertNotIn(self.collaborateur.pk, groupes.etats_recapitulatifs)
+
+    def test_memo_par_requete(self):
+        """Test que le regroupement est mémorisé sur la requête HTTP"""
+        request = RequestFactory().get('/')
+        groupes = SageFemme.objects.groupes_facturation_pour(request)
+        
+        with self.assertNumQueries(0):
+            self.assertIs(SageFemme.objects.groupes_facturation_pour(request), groupes)
@@ -0,0 +1,142 @@
+import datetime
+from decimal import Decimal
+
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+
+from core import tarifs
+from core.models import Tarif
+from core.tarifs import IndexTarifs, charger_index, index_tarifs
+
+
+class TarifModelTest(TestCase):
+    """Tests des périodes de validité des tarifs"""
+    
+    def setUp(self):
+        """Tarif clos au 01/07/2025 puis revalorisé"""
+        Tarif.objects.create(
+            code='SF 12', libelle='Consultation', montant=Decimal('3000.00'),
+            date_debut=datetime.date(2024, 1, 1), date_fin=datetime.date(2025, 7, 1)
+        )
+        Tarif.objects.create(
+            code='SF 12', libelle='Consultation', montant=Decimal('3300.00'),
+            date_debut=datetime.date(2025, 7, 1)
+        )
+    
+    def test_chevauchement_refuse(self):
+        """Test que deux tarifs d'un même code ne peuvent pas se chevaucher"""
+        tarif = Tarif(
+            code='SF 12', libelle='Consultation', montant=Decimal('3500.00'),
+            date_debut=datetime.date(2026, 1, 1)
+        )
+        with self.assertRaises(ValidationError):
+            tarif.full_clean()
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            tarif.save()
+    
+    def test_autre_code_accepte(self):
+        """Test que les périodes de codes différents sont indépendantes"""
+        tarif = Tarif(
+            code='SF 15', libelle='Préparation', montant=Decimal('2500.00'),
+            date_debut=datetime.date(2024, 1, 1)
+        )
+        tarif.full_clean()
+    
+    def test_fin_avant_debut_refusee(self):
+        """Test qu'une période vide est refusée"""
+        tarif = Tarif(
+            code='SF 20', libelle='Rééducation', montant=Decimal('2000.00'),
+            date_debut=datetime.date(2025, 1, 1), date_fin=datetime.date(2025, 1, 1)
+        )
+        with self.assertRaises(ValidationError):
+            tarif.full_clean()
+
+
+class IndexTarifsTest(TestCase):
+    """Tests de la recherche dans l'index en mémoire"""
+    
+    def setUp(self):
+        """Deux périodes consécutives, puis une interruption pour SF 15"""
+        Tarif.objects.bulk_create([
+            Tarif(code='SF 12', libelle='Consultation', montant=Decimal('3000.00'),
+                  date_debut=datetime.date(2024, 1, 1), date_fin=datetime.date(2025, 7, 1)),
+            Tarif(code='SF 12', libelle='Consultation revalorisée', montant=Decimal('3300.00'),
+                  date_debut=datetime.date(2025, 7, 1)),
+            Tarif(code='SF 15', libelle='Préparation', montant=Decimal('2500.00'),
+                  date_debut=datetime.date(2024, 1, 1), date_fin=datetime.date(2024, 6, 1)),
+        ])
+        self.index = charger_index()
+    
+    def test_tarif_a_la_date(self):
+        """Test que chaque date est tarifée à la période qui la couvre"""
+        self.assertIsNone(self.index.tarif('SF 12', datetime.date(2023, 12, 31)))
+        self.assertEqual(self.index.tarif('SF 12', datetime.date(2024, 1, 1)).montant, Decimal('3000.00'))
+        self.assertEqual(self.index.tarif('SF 12', datetime.date(2025, 6, 30)).montant, Decimal('3000.00'))
+        self.assertEqual(self.index.tarif('SF 12', datetime.date(2025, 7, 1)).montant, Decimal('3300.00'))
+        self.assertEqual(self.index.tarif('SF 12', datetime.date(2040, 1, 1)).montant, Decimal('3300.00'))
+        self.assertIsNone(self.index.tarif('SF 15', datetime.date(2024, 6, 1)))
+        self.assertIsNone(self.index.tarif('SF 99', datetime.date(2025, 1, 1)))
+    
+    def test_tarifer_sans_requete(self):
+        """Test qu'une feuille de 20 lignes est tarifée sans requête"""
+        lignes = [('SF 12', 1), ('SF 15', 2)] * 10
+        with self.assertNumQueries(0):
+            detail, total = self.index.tarifer(lignes, datetime.date(2024, 3, 1))
+        self.assertEqual(len(detail), 20)
+        self.assertEqual(detail[1]['montant'], Decimal('5000.00'))
+        self.assertEqual(total, Decimal('80000.00'))
+    
+    def test_tarifer_code_inconnu(self):
+        """Test qu'une ligne sans tarif applicable n'entre pas dans le total"""
+        detail, total = self.index.tarifer([('SF 12', 1), ('SF 15', 1)], datetime.date(2025, 8, 1))
+        self.assertIsNone(detail[1]['tarif'])
+        self.assertEqual(total, Decimal('3300.00'))
+    
+    def test_en_vigueur(self):
+        """Test de la liste des tarifs applicables à une date"""
+        self.assertEqual(
+            [tarif.libelle for tarif in self.index.en_vigueur(datetime.date(2024, 3, 1))],
+            ['Consultation', 'Préparation'],
+        )
+    
+    def test_index_vide(self):
+        """Test d'un index sans tarif"""
+        self.assertIsNone(IndexTarifs([]).tarif('SF 12', datetime.date(2025, 1, 1)))
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class IndexTarifsCacheTest(TransactionTestCase):
+    """Tests du rechargement de l'index des tarifs du processus"""
+    
+    def setUp(self):
+        """Index vide et un tarif en vigueur"""
+        tarifs._index = None
+        self.tarif = Tarif.objects.create(
+            code='SF 12', libelle='Consultation', montant=Decimal('3000.00'),
+            date_debut=datetime.date(2024, 1, 1)
+        )
+    
+    def test_index_partage_sans_requete(self):
+        """Test que l'index est construit une fois puis réutilisé"""
+        index = index_tarifs()
+        with self.assertNumQueries(0):
+            self.assertIs(index_tarifs(), index)
+    
+    def test_rechargement_apres_modification(self):
+        """Test qu'une modification en administration remplace l'index"""
+        ancien = index_tarifs()
+        self.tarif.montant = Decimal('3300.00')
+        self.tarif.save()
+        
+        nouveau = index_tarifs()
+        self.assertIsNot(nouveau, ancien)
+        self.assertEqual(nouveau.tarif('SF 12', datetime.date(2025, 1, 1)).montant, Decimal('3300.00'))
+        # L'ancien index n'est pas modifié : les requêtes en cours restent cohérentes
+        self.assertEqual(ancien.tarif('SF 12', datetime.date(2025, 1, 1)).montant, Decimal('3000.00'))
+    
+    def test_pas_de_cache_dans_une_transaction(self):
+        """Test qu'un index lu dans une transaction n'est pas conservé"""
+        with transaction.atomic():
+            index_tarifs()
+        self.assertIsNone(tarifs._index)
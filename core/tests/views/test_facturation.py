@@ -0,0 +1,371 @@
+"""
+Tests pour les vues de facturation.
+"""
+import datetime
+import io
+import shutil
+import tempfile
+import zipfile
+from decimal import Decimal
+from unittest import mock
+
+import openpyxl
+from django.contrib.auth.models import Permission, User
+from django.core.files.base import ContentFile
+from django.http import StreamingHttpResponse
+from django.test import TestCase, Client, override_settings
+from core.bons_depot import bordereaux
+from core.fichiers import flux_asynchrone
+from core.models import Consultation, EtatRecapitulatif, Patient, SageFemme, Tache
+from core.tests.commands.test_generer_etats_recapitulatifs import textes_pdf
+
+
+MEDIA_TEMPORAIRE = tempfile.mkdtemp()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_TEMPORAIRE)
+class EtatsRecapitulatifsViewTest(TestCase):
+    """Tests de la page des états récapitulatifs et du suivi de génération"""
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_TEMPORAIRE, ignore_errors=True)
+
+    def setUp(self):
+        self.client = Client()
+        utilisateur = User.objects.create_user('secretaire')
+        utilisateur.user_permissions.add(*Permission.objects.filter(codename__in=['add_etatrecapitulatif', 'view_etatrecapitulatif']))
+        self.client.force_login(utilisateur)
+        self.sage_femme = SageFemme.objects.create(
+            nom='Dupont', prenom='Marie', titre='Sage-femme', telephone='687123456',
+            email='marie.dupont@test.nc', numero_cafat='123456789', ridet='RIDET123456',
+            rib='FR1234567890123456789012345', banque='BCI', situation='gerant'
+        )
+        self.etat = EtatRecapitulatif(
+            mois=datetime.date(2025, 8, 1), sage_femme=self.sage_femme,
+            empreinte='0' * 64, nombre_consultations=3,
+        )
+        self.etat.fichier.save('test.pdf', ContentFile(b'%PDF-1.4 test'))
+
+    def test_liste_du_mois(self):
+        """Test de la liste des états du mois demandé"""
+        response = self.client.get('/facturation/etats-recapitulatifs/', {'mois': '2025-08'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Marie Dupont')
+        self.assertContains(response, f'/facturation/etats-recapitulatifs/{self.etat.pk}/pdf/')
+
+    def test_lancement_hors_requete(self):
+        """Test que le POST planifie la génération en tâche de fond et renvoie le suivi"""
+        response = self.client.post('/facturation/etats-recapitulatifs/', {'mois': '2025-07'})
+
+        tache = Tache.objects.get()
+        self.assertEqual((tache.nom, tache.statut), ('etats_recapitulatifs', 'en_attente'))
+        self.assertEqual(tache.arguments, {'mois': '2025-07-01'})
+        self.assertContains(response, f'/facturation/etats-recapitulatifs/progression/{tache.pk}/')
+        self.assertContains(response, 'hx-trigger="every 1s"')
+
+    def test_lancement_permission_requise(self):
+        """Test qu'une génération ne peut pas être lancée sans la permission"""
+        self.client.logout()
+        self.assertEqual(self.client.post('/facturation/etats-recapitulatifs/', {'mois': '2025-07'}).status_code, 403)
+
+        self.client.force_login(User.objects.create_user('invite'))
+        self.assertEqual(self.client.post('/facturation/etats-recapitulatifs/', {'mois': '2025-07'}).status_code, 403)
+        self.assertFalse(Tache.objects.exists())
+
+    def test_mois_hors_limites(self):
+        """Test qu'un mois sans mois suivant est ramené au dernier mois générable"""
+        self.client.post('/facturation/etats-recapitulatifs/', {'mois': '9999-12'})
+
+        self.assertEqual(Tache.objects.get().arguments, {'mois': '9999-11-01'})
+
+    def test_consultation_permission_requise(self):
+        """Test que la liste des états et le suivi des générations sont réservés"""
+        tache = Tache.objects.create(nom='etats_recapitulatifs', arguments={'mois': '2025-08-01'})
+        self.client.logout()
+
+        self.assertEqual(self.client.get('/facturation/etats-recapitulatifs/').status_code, 403)
+        self.assertEqual(
+            self.client.get(f'/facturation/etats-recapitulatifs/progression/{tache.pk}/').status_code, 403
+        )
+
+    def test_progression(self):
+        """Test du fragment d'avancement, puis de fin de génération"""
+        tache = Tache.objects.create(
+            nom='etats_recapitulatifs', arguments={'mois': '2025-08-01'},
+            statut='en_cours', tentatives=1, progression={'total': 4, 'faits': 1},
+        )
+        response = self.client.get(f'/facturation/etats-recapitulatifs/progression/{tache.pk}/')
+        self.assertContains(response, '1 / 4')
+
+        tache.statut = 'terminee'
+        tache.resultat = {'generes': 3, 'inchanges': 1}
+        tache.save()
+        response = self.client.get(f'/facturation/etats-recapitulatifs/progression/{tache.pk}/')
+        self.assertContains(response, '3 état(s) généré(s), 1 inchangé(s)')
+        self.assertContains(response, '?mois=2025-08')
+        self.assertNotContains(response, 'every 1s')
+
+    def test_progression_echec(self):
+        """Test du fragment d'une génération en échec"""
+        tache = Tache.objects.create(nom='etats_recapitulatifs', statut='echouee', tentatives=3)
+        response = self.client.get(f'/facturation/etats-recapitulatifs/progression/{tache.pk}/')
+
+        self.assertContains(response, 'a échoué après 3 tentative(s)')
+
+    def test_progression_inconnue(self):
+        """Test d'un identifiant de génération inconnu"""
+        response = self.client.get('/facturation/etats-recapitulatifs/progression/999999/')
+
+        self.assertEqual(response.status_code, 404)
+
+    @override_settings(MEDIA_X_ACCEL_REDIRECT=False)
+    def test_telechargement_pdf(self):
+        """Test du téléchargement du PDF"""
+        response = self.client.get(f'/facturation/etats-recapitulatifs/{self.etat.pk}/pdf/')
+
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+        self.assertIn('etat-recapitulatif-2025-08-Dupont.pdf', response['Content-Disposition'])
+        self.assertEqual(b''.join(response.streaming_content), b'%PDF-1.4 test')
+
+    @override_settings(MEDIA_X_ACCEL_REDIRECT=True)
+    def test_telechargement_par_nginx(self):
+        """Test que le fichier est délégué à nginx"""
+        response = self.client.get(f'/facturation/etats-recapitulatifs/{self.etat.pk}/pdf/')
+
+        self.assertEqual(response['X-Accel-Redirect'], f'/media/{self.etat.fichier.name}')
+        self.assertEqual(response.content, b'')
+
+    @override_settings(MEDIA_X_ACCEL_REDIRECT=True)
+    def test_telechargement_permission_requise(self):
+        """Test qu'un état récapitulatif n'est pas délégué à nginx sans la permission"""
+        self.client.logout()
+        response = self.client.get(f'/facturation/etats-recapitulatifs/{self.etat.pk}/pdf/')
+
+        self.assertEqual(response.status_code, 403)
+        self.assertNotIn('X-Accel-Redirect', response)
+
+
+class BonsDepotTest(TestCase):
+    """Tests des bons de dépôt regroupés par titulaire et servis en flux"""
+
+    def setUp(self):
+        """Un gérant et sa remplaçante à bons communs, une collaboratrice"""
+        base = {
+            'titre': 'Sage-femme', 'telephone': '687000000',
+            'rib': 'FR0000000000000000000000000', 'banque': 'BCI',
+        }
+        self.gerant = SageFemme.objects.create(
+            **base, nom='Gerant', prenom='Pierre', email='gerant@test.nc',
+            numero_cafat='111111111', ridet='RIDET111111', situation='gerant'
+        )
+        self.remplacante = SageFemme.objects.create(
+            **base, nom='Remplacante', prenom='Sophie', email='sophie@test.nc',
+            numero_cafat='333333333', ridet='RIDET333333', situation='remplacant',
+            remplacement_de=self.gerant, bons_depot_communs=True
+        )
+        self.collaboratrice = SageFemme.objects.create(
+            **base, nom='Collaboratrice', prenom='Julie', email='julie@test.nc',
+            numero_cafat='222222222', ridet='RIDET222222', situation='collaborateur'
+        )
+        patient = Patient.objects.create(
+            nom='Martin', prenom='Léa', date_naissance=datetime.date(1990, 1, 1), numero_cafat='CAFAT-PAT'
+        )
+        consultations = [(self.gerant, jour) for jour in range(1, 4)]
+        consultations += [(self.remplacante, jour) for jour in range(4, 6)]
+        consultations += [(self.collaboratrice, 10)]
+        for sage_femme, jour in consultations:
+            Consultation.objects.create(
+                sage_femme=sage_femme, patient=patient, date=datetime.date(2025, 8, jour),
+                type_acte='postnatale', statut='complete', montant=Decimal('3000.00')
+            )
+        Consultation.objects.create(
+            sage_femme=self.gerant, patient=patient, date=datetime.date(2025, 8, 20),
+            type_acte='postnatale', statut='en_cours'
+        )
+        utilisateur = User.objects.create_user('secretaire')
+        utilisateur.user_permissions.add(Permission.objects.get(codename='view_consultation'))
+        self.client.force_login(utilisateur)
+
+    def test_regroupement_et_pagination(self):
+        """Test du regroupement par titulaire des bons et du découpage en bordereaux"""
+        resultat = [
+            (b.titulaire.nom, b.numero, b.nombre_bordereaux, [f['date'].day for f in b.feuilles])
+            for b in bordereaux(datetime.date(2025, 8, 1), limite=2)
+        ]
+
+        self.assertEqual(resultat, [
+            ('Collaboratrice', 1, 1, [10]),
+            ('Gerant', 1, 3, [1, 2]),
+            ('Gerant', 2, 3, [3, 4]),
+            ('Gerant', 3, 3, [5]),
+        ])
+
+    def test_sage_femme_desactivee(self):
+        """Test que les feuilles du mois d'une sage-femme désactivée depuis restent facturées"""
+        SageFemme.objects.filter(pk=self.collaboratrice.pk).update(is_active=False)
+
+        titulaires = [b.titulaire.nom for b in bordereaux(datetime.date(2025, 8, 1), limite=2)]
+
+        self.assertIn('Collaboratrice', titulaires)
+
+    def test_requetes(self):
+        """Test qu'il n'y a qu'une lecture par titulaire, quel que soit le nombre de bordereaux"""
+        # Savepoint et sa libération (transaction de lecture), groupes, comptes, deux lectures
+        with self.assertNumQueries(6):
+            list(bordereaux(datetime.date(2025, 8, 1), limite=1))
+
+    @override_settings(CAFAT_FEUILLES_PAR_BORDEREAU=2)
+    def test_telechargement_pdf(self):
+        """Test du PDF unique servi en flux"""
+        response = self.client.get('/facturation/bons-depot/telechargement/', {'mois': '2025-08'})
+
+        self.assertIsInstance(response, StreamingHttpResponse)
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+        self.assertIn('bons-depot-2025-08.pdf', response['Content-Disposition'])
+        pdf = b''.join(response.streaming_content)
+        self.assertIn(b'/Count 4', pdf)
+        texte = textes_pdf(pdf)
+        self.assertIn('Bordereau 3 / 3', texte)
+        self.assertIn('Sophie Remplacante', texte)
+        self.assertIn('CAFAT-PAT', texte)
+
+    def test_telechargement_zip(self):
+        """Test de l'archive ZIP d'un PDF par titulaire"""
+        response = self.client.get(
+            '/facturation/bons-depot/telechargement/', {'mois': '2025-08', 'format': 'zip'}
+        )
+
+        self.assertEqual(response['Content-Type'], 'application/zip')
+        archive = zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
+        self.assertEqual(archive.namelist(), [
+            'bons-depot-2025-08-222222222-collaboratrice.pdf',
+            'bons-depot-2025-08-111111111-gerant.pdf',
+        ])
+        self.assertIsNone(archive.testzip())
+        self.assertIn('15 000,00', textes_pdf(archive.read('bons-depot-2025-08-111111111-gerant.pdf')))
+
+    def test_telechargement_mois_hors_limites(self):
+        """Test qu'un mois au-delà de novembre 9999 est ramené à celui-ci"""
+        response = self.client.get('/facturation/bons-depot/telechargement/', {'mois': '9999-12'})
+
+        self.assertIn('bons-depot-9999-11.pdf', response['Content-Disposition'])
+        self.assertTrue(b''.join(response.streaming_content).startswith(b'%PDF'))
+
+    def test_telechargement_permission_requise(self):
+        """Test que les bons de dépôt ne sont pas servis sans la permission"""
+        self.client.logout()
+        response = self.client.get('/facturation/bons-depot/telechargement/', {'mois': '2025-08'})
+
+        self.assertEqual(response.status_code, 403)
+
+    def test_page_bons_depot(self):
+        """Test de la page de téléchargement"""
+        response = self.client.get('/facturation/bons-depot/', {'mois': '2025-08'})
+
+        self.assertContains(response, 'value="2025-08"')
+        self.assertContains(response, 'value="zip"')
+
+
+class ExportsTest(TestCase):
+    """Tests des exports comptables en flux"""
+
+    def setUp(self):
+        self.utilisateur = User.objects.create_user('comptable')
+        self.utilisateur.user_permissions.add(*Permission.objects.filter(
+            codename__in=['view_consultation', 'view_sagefemme']
+        ))
+        self.client.force_login(self.utilisateur)
+        self.sage_femme = SageFemme.objects.create(
+            nom='Dupont', prenom='Marie', titre='Sage-femme', telephone='687123456',
+            email='marie.dupont@test.nc', numero_cafat='123456789', ridet='RIDET123456',
+            rib='FR1234567890123456789012345', banque='BCI', situation='gerant'
+        )
+        patient = Patient.objects.create(
+            nom='Martin', prenom='Léa', date_naissance=datetime.date(1990, 1, 1), numero_cafat='CAFAT-PAT'
+        )
+        for date in [datetime.date(2024, 12, 31), datetime.date(2025, 1, 2), datetime.date(2025, 8, 4)]:
+            Consultation.objects.create(
+                sage_femme=self.sage_femme, patient=patient, date=date,
+                type_acte='postnatale', statut='complete', montant=Decimal('3300.50')
+            )
+
+    def test_export_csv(self):
+        """Test du CSV des consultations de l'année"""
+        response = self.client.get('/facturation/exports/consultations/', {'annee': '2025'})
+
+        self.assertIsInstance(response, StreamingHttpResponse)
+        self.assertIn('consultations-2025.csv', response['Content-Disposition'])
+        lignes = b''.join(response.streaming_content).decode('utf-8-sig').splitlines()
+        self.assertEqual(len(lignes), 3)
+        self.assertTrue(lignes[0].startswith('N°;Date;Sage-femme'))
+        self.assertIn(';02/01/2025;Marie Dupont;123456789;Martin Léa;CAFAT-PAT;Consultation postnatale;', lignes[1])
+        self.assertTrue(lignes[1].endswith(';3300,50'))
+
+    def test_export_xlsx(self):
+        """Test du classeur des consultations, lisible par openpyxl"""
+        with mock.patch('core.xlsx.LIGNES_PAR_MORCEAU', 1):
+            response = self.client.get('/facturation/exports/consultations/', {'annee': '2025', 'format': 'xlsx'})
+            morceaux = list(response.streaming_content)
+
+        self.assertGreater(len(morceaux), 3)
+        classeur = openpyxl.load_workbook(io.BytesIO(b''.join(morceaux)), read_only=True)
+        lignes = list(classeur.active.values)
+        self.assertEqual(lignes[0][:3], ('N°', 'Date', 'Sage-femme'))
+        self.assertEqual(len(lignes), 3)
+        self.assertEqual(lignes[2][1], datetime.datetime(2025, 8, 4))
+        self.assertEqual(lignes[2][-1], 3300.5)
+
+    @override_settings(SERVEUR='asgi')
+    async def test_export_asgi(self):
+        """Test que sous ASGI l'export est un flux asynchrone, pas une liste construite avant l'envoi"""
+        await self.async_client.aforce_login(self.utilisateur)
+        with mock.patch('core.xlsx.LIGNES_PAR_MORCEAU', 1):
+            response = await self.async_client.get(
+                '/facturation/exports/consultations/', {'annee': '2025', 'format': 'xlsx'}
+            )
+            self.assertTrue(response.is_async)
+            morceaux = [morceau async for morceau in response.streaming_content]
+
+        self.assertGreater(len(morceaux), 3)
+        classeur = openpyxl.load_workbook(io.BytesIO(b''.join(morceaux)), read_only=True)
+        self.assertEqual(len(list(classeur.active.values)), 3)
+
+    async def test_flux_asynchrone(self):
+        """Test que chaque morceau est envoyé avant que le suivant ne soit produit"""
+        produits = []
+
+        def generateur():
+            for numero in range(3):
+                produits.append(numero)
+                yield numero
+
+        flux = flux_asynchrone(generateur())
+        self.assertEqual(await anext(flux), 0)
+        self.assertEqual(produits, [0])
+        self.assertEqual([morceau async for morceau in flux], [1, 2])
+
+    def test_export_sages_femmes(self):
+        """Test de la liste des sages-femmes"""
+        response = self.client.get('/facturation/exports/sages-femmes/', {'format': 'xlsx'})
+
+        classeur = openpyxl.load_workbook(io.BytesIO(b''.join(response.streaming_content)), read_only=True)
+        lignes = list(classeur.active.values)
+        self.assertEqual(lignes[1][:4], ('Dupont', 'Marie', 'Sage-femme', 'Gérant'))
+        self.assertIs(lignes[1][-1], True)
+
+    def test_annee_hors_limites(self):
+        """Test qu'une année hors du calendrier est ramenée dans les limites"""
+        response = self.client.get('/facturation/exports/consultations/', {'annee': '9999'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('consultations-9998.csv', response['Content-Disposition'])
+
+    def test_permission_requise(self):
+        """Test qu'un utilisateur sans droit ne peut pas exporter"""
+        self.client.force_login(User.objects.create_user('invite'))
+
+        self.assertEqual(self.client.get('/facturation/exports/consultations/').status_code, 403)
+        self.assertEqual(self.client.get('/facturation/exports/sages-femmes/').status_code, 403)
@@ -0,0 +1,347 @@
+"""
+Tests pour les vues de la feuille de soins.
+"""
+import datetime
+import shutil
+import tempfile
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth.models import Permission, User
+from django.core.files.storage import default_storage
+from django.db import connection
+from django.test import TestCase, Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from core.models import Consultation, Patient, SageFemme
+from core.tests.commands.test_generer_etats_recapitulatifs import textes_pdf
+
+
+MEDIA_TEMPORAIRE = tempfile.mkdtemp()
+
+
+class FeuilleSoinsViewTest(TestCase):
+    """Tests du tableau de bord des consultations"""
+
+    def setUp(self):
+        """Données de test"""
+        self.client = Client()
+        self.sage_femme = SageFemme.objects.create(
+            nom='Dupont', prenom='Marie', titre='Sage-femme', telephone='687123456',
+            email='marie.dupont@test.nc', numero_cafat='123456789', ridet='RIDET123456',
+            rib='FR1234567890123456789012345', banque='BCI', situation='gerant'
+        )
+        self.patient = Patient.objects.create(
+            nom='Martin', prenom='Sophie', date_naissance=datetime.date(1990, 1, 1)
+        )
+        self.utilisateur = User.objects.create_user('secretaire')
+        self.utilisateur.user_permissions.add(Permission.objects.get(codename='view_consultation'))
+
+    def test_aucune_consultation(self):
+        """Test du message affiché sans consultation"""
+        response = self.client.get('/feuille-soins/')
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Aucune consultation récente')
+
+    def test_ressources_locales(self):
+        """Test que styles et scripts sont servis par l'application, sans CDN"""
+        response = self.client.get('/feuille-soins/')
+        
+        self.assertContains(response, '/static/core/css/tailwind.css')
+        self.assertContains(response, '/static/core/vendor/htmx-1.9.10.min.js')
+        self.assertContains(response, '/static/core/vendor/alpine-3.14.7.min.js')
+        for cdn in ('cdn.tailwindcss.com', 'unpkg.com', 'cdn.jsdelivr.net'):
+            self.assertNotContains(response, cdn)
+
+    def test_consultations_recentes(self):
+        """Test que les dernières consultations sont listées, la plus récente en premier"""
+        for jour in range(1, 13):
+            Consultation.objects.create(
+                sage_femme=self.sage_femme, patient=self.patient,
+                date=datetime.date(2025, 8, jour), type_acte='suivi_grossesse', statut='complete'
+            )
+        
+        self.client.force_login(self.utilisateur)
+        
+        # Session, utilisateur, ses permissions (2) et une seule lecture des consultations
+        with self.assertNumQueries(5):
+            response = self.client.get('/feuille-soins/')
+        
+        consultations = response.context['consultations_recentes']
+        self.assertEqual(len(consultations), 10)
+        self.assertEqual(consultations[0].date, datetime.date(2025, 8, 12))
+        self.assertContains(response, 'Sophie Martin')
+        self.assertContains(response, 'Suivi grossesse')
+        self.assertNotContains(response, 'Aucune consultation récente')
+
+    def test_consultations_recentes_sans_permission(self):
+        """Test que les consultations récentes ne sont pas listées sans la permission"""
+        Consultation.objects.create(
+            sage_femme=self.sage_femme, patient=self.patient,
+            date=datetime.date(2025, 8, 1), type_acte='suivi_grossesse', statut='complete'
+        )
+        
+        response = self.client.get('/feuille-soins/')
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['consultations_recentes'], [])
+        self.assertNotContains(response, 'Sophie Martin')
+
+
+class HistoriqueConsultationViewTest(TestCase):
+    """Tests de l'historique paginé par curseur"""
+
+    def setUp(self):
+        """120 consultations sur deux sages-femmes, plusieurs par jour"""
+        self.client = Client()
+        utilisateur = User.objects.create_user('secretaire')
+        utilisateur.user_permissions.add(Permission.objects.get(codename='view_consultation'))
+        self.client.force_login(utilisateur)
+        base = {
+            'titre': 'Sage-femme', 'telephone': '687123456', 'rib': 'FR1234567890123456789012345',
+            'banque': 'BCI', 'situation': 'collaborateur',
+        }
+        self.sage_femme = SageFemme.objects.create(
+            **base, nom='Dupont', prenom='Marie', email='marie@test.nc',
+            numero_cafat='111111111', ridet='RIDET111111'
+        )
+        self.autre = SageFemme.objects.create(
+            **base, nom='Martin', prenom='Julie', email='julie@test.nc',
+            numero_cafat='222222222', ridet='RIDET222222'
+        )
+        patient = Patient.objects.create(nom='Martin', prenom='Sophie', date_naissance=datetime.date(1990, 1, 1))
+        debut = datetime.date(2024, 1, 1)
+        Consultation.objects.bulk_create([
+            Consultation(
+                sage_femme=self.sage_femme if i % 4 else self.autre, patient=patient,
+                date=debut + datetime.timedelta(days=i // 3), type_acte='prenatale'
+            )
+            for i in range(120)
+        ])
+
+    def parcourir(self, parametres=''):
+        """Suit les curseurs jusqu'à la dernière page et retourne les consultations vues"""
+        response = self.client.get(f'/feuille-soins/historique/?{parametres}')
+        vues = list(response.context['consultations'])
+        curseur = response.context['curseur_suivant']
+        while curseur:
+            response = self.client.get(
+                f'/feuille-soins/historique/page/?{parametres}&apres={curseur}', HTTP_HX_REQUEST='true'
+            )
+            self.assertTemplateUsed(response, 'core/feuille_soins/historique_lignes.html')
+            self.assertTemplateNotUsed(response, 'core/base.html')
+            vues += response.context['consultations']
+            curseur = response.context['curseur_suivant']
+        return vues
+
+    def test_parcours_complet_sans_doublon(self):
+        """Test que le défilement parcourt tout l'historique dans l'ordre, sans doublon ni trou"""
+        vues = self.parcourir()
+        attendues = list(Consultation.objects.order_by('-date', '-id').values_list('id', flat=True))
+        
+        self.assertEqual([c.pk for c in vues], attendues)
+
+    def test_filtre_par_sage_femme(self):
+        """Test que le filtre par sage-femme est conservé d'une page à l'autre"""
+        vues = self.parcourir(f'sage_femme={self.sage_femme.pk}')
+        
+        self.assertEqual(len(vues), 90)
+        self.assertTrue(all(c.sage_femme_id == self.sage_femme.pk for c in vues))
+
+    def test_page_a_cout_constant(self):
+        """Test qu'une page profonde ne coûte qu'une requête"""
+        derniere = Consultation.objects.order_by('date', 'id').first()
+        curseur = f'{derniere.date.isoformat()}.{derniere.pk + 1}'
+        
+        # Session, utilisateur et ses permissions (2), puis une seule lecture des consultations
+        with self.assertNumQueries(5):
+            response = self.client.get(f'/feuille-soins/historique/page/?apres={curseur}')
+        self.assertIsNone(response.context['curseur_suivant'])
+
+    def test_sentinelle_page_suivante(self):
+        """Test que la première page contient la sentinelle de chargement"""
+        response = self.client.get('/feuille-soins/historique/')
+        
+        self.assertEqual(len(response.context['consultations']), 50)
+        self.assertContains(response, 'hx-trigger="revealed"')
+
+    def test_curseur_invalide(self):
+        """Test qu'un curseur invalide renvoie la première page"""
+        response = self.client.get('/feuille-soins/historique/page/?apres=nimportequoi')
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['consultations']), 50)
+
+    def test_filtre_invalide(self):
+        """Test qu'un identifiant non numérique est ignoré"""
+        response = self.client.get('/feuille-soins/historique/', {'sage_femme': '²', 'patient': 'x'})
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['consultations']), 50)
+
+    def test_permission_requise(self):
+        """Test que l'historique n'est pas servi sans la permission"""
+        self.client.logout()
+        
+        self.assertEqual(self.client.get('/feuille-soins/historique/').status_code, 403)
+        self.assertEqual(self.client.get('/feuille-soins/historique/page/').status_code, 403)
+
+    def test_requete_htmx_renvoie_le_contenu(self):
+        """Test que la page chargée par HTMX n'inclut pas le gabarit de base"""
+        response = self.client.get('/feuille-soins/historique/', HTTP_HX_REQUEST='true')
+        
+        self.assertTemplateUsed(response, 'core/feuille_soins/historique_contenu.html')
+        self.assertTemplateNotUsed(response, 'core/base.html')
+
+
+class RechercheConsultationViewTest(TestCase):
+    """Tests de la vue de recherche des consultations"""
+
+    def setUp(self):
+        """Deux sages-femmes et leurs consultations"""
+        self.client = Client()
+        utilisateur = User.objects.create_user('secretaire')
+        utilisateur.user_permissions.add(Permission.objects.get(codename='view_consultation'))
+        self.client.force_login(utilisateur)
+        base = {
+            'titre': 'Sage-femme', 'telephone': '687123456', 'rib': 'FR1234567890123456789012345',
+            'banque': 'BCI', 'situation': 'collaborateur',
+        }
+        self.sage_femme = SageFemme.objects.create(
+            **base, nom='Dupont', prenom='Marie', email='marie@test.nc',
+            numero_cafat='111111111', ridet='RIDET111111'
+        )
+        self.autre = SageFemme.objects.create(
+            **base, nom='Martin', prenom='Julie', email='julie@test.nc',
+            numero_cafat='222222222', ridet='RIDET222222'
+        )
+        patient = Patient.objects.create(nom='Martin', prenom='Sophie', date_naissance=datetime.date(1990, 1, 1))
+        Consultation.objects.create(
+            sage_femme=self.sage_femme, patient=patient, date=datetime.date(2025, 7, 1),
+            type_acte='prenatale', notes='Tension artérielle élevée'
+        )
+        Consultation.objects.create(
+            sage_femme=self.autre, patient=patient, date=datetime.date(2025, 8, 1),
+            type_acte='postnatale', notes='Tension normale'
+        )
+
+    def test_page_sans_recherche(self):
+        """Test de l'affichage initial"""
+        response = self.client.get('/feuille-soins/recherche/')
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(response.context['resultats'])
+        self.assertTemplateUsed(response, 'core/base.html')
+
+    def test_recherche_et_filtres(self):
+        """Test des filtres par sage-femme, type d'acte et période"""
+        url = '/feuille-soins/recherche/'
+        
+        self.assertEqual(len(self.client.get(url, {'q': 'tension'}).context['resultats']), 2)
+        self.assertEqual(
+            len(self.client.get(url, {'q': 'tension', 'sage_femme': self.autre.pk}).context['resultats']), 1
+        )
+        self.assertEqual(
+            len(self.client.get(url, {'q': 'tension', 'type_acte': 'prenatale'}).context['resultats']), 1
+        )
+        response = self.client.get(url, {'q': 'tension', 'date_debut': '2025-07-15', 'date_fin': '2025-08-31'})
+        self.assertEqual(len(response.context['resultats']), 1)
+
+    def test_resultats_htmx(self):
+        """Test que la saisie HTMX ne renvoie que la liste des résultats, surlignée"""
+        response = self.client.get(
+            '/feuille-soins/recherche/', {'q': 'arterielle'},
+            HTTP_HX_REQUEST='true', HTTP_HX_TARGET='resultats-recherche'
+        )
+        
+        self.assertTemplateUsed(response, 'core/feuille_soins/recherche_resultats.html')
+        self.assertTemplateNotUsed(response, 'core/feuille_soins/recherche_contenu.html')
+        self.assertContains(response, '<mark>artérielle</mark>')
+
+    def test_periode_invalide(self):
+        """Test qu'une période inversée est signalée"""
+        response = self.client.get(
+            '/feuille-soins/recherche/', {'q': 'tension', 'date_debut': '2025-09-01', 'date_fin': '2025-08-01'}
+        )
+        
+        self.assertIsNone(response.context['resultats'])
+        self.assertContains(response, 'La date de fin doit être postérieure à la date de début.')
+
+    def test_permission_requise(self):
+        """Test que les notes des consultations ne sont pas cherchables sans la permission"""
+        self.client.logout()
+
+        self.assertEqual(self.client.get('/feuille-soins/recherche/', {'q': 'tension'}).status_code, 403)
+
+
+@override_settings(MEDIA_ROOT=MEDIA_TEMPORAIRE, MEDIA_X_ACCEL_REDIRECT=True)
+class FeuilleSoinsPdfTest(TestCase):
+    """Tests de l'impression des feuilles de soins"""
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_TEMPORAIRE, ignore_errors=True)
+
+    def setUp(self):
+        """Consultation et utilisateur autorisé à consulter les feuilles"""
+        self.client = Client()
+        utilisateur = User.objects.create_user('secretariat', password='secret')
+        utilisateur.user_permissions.add(Permission.objects.get(codename='view_consultation'))
+        self.client.force_login(utilisateur)
+        sage_femme = SageFemme.objects.create(
+            nom='Dupont', prenom='Marie', titre='Sage-femme', telephone='687123456',
+            email='marie.dupont@test.nc', numero_cafat='123456789', ridet='RIDET123456',
+            rib='FR1234567890123456789012345', banque='BCI', situation='gerant'
+        )
+        patient = Patient.objects.create(
+            nom='Martin', prenom='Sophie', date_naissance=datetime.date(1990, 1, 1), numero_cafat='CAFAT-PAT'
+        )
+        self.consultation = Consultation.objects.create(
+            sage_femme=sage_femme, patient=patient, date=datetime.date(2025, 8, 4),
+            type_acte='postnatale', statut='complete', montant=Decimal('3300.00'), notes='Confidentiel'
+        )
+        self.url = f'/feuille-soins/{self.consultation.pk}/pdf/'
+
+    def test_rendu_puis_reimpression(self):
+        """Test qu'une réimpression retrouve le PDF rendu, en une requête"""
+        response = self.client.get(self.url)
+        nom = response['X-Accel-Redirect'].removeprefix('/media/')
+        self.assertTrue(nom.startswith('feuilles_soins/'))
+        self.assertIn('feuille-soins-2025-08-04', response['Content-Disposition'])
+
+        with open(default_storage.path(nom), 'rb') as fichier:
+            texte = textes_pdf(fichier.read())
+        self.assertIn('Sophie Martin', texte)
+        self.assertIn('CAFAT-PAT', texte)
+        self.assertIn('3 300,00', texte)
+        self.assertNotIn('Confidentiel', texte)
+
+        with mock.patch('core.feuilles_soins.rendre_feuille') as rendre, \
+                CaptureQueriesContext(connection) as requetes:
+            response = self.client.get(self.url)
+        rendre.assert_not_called()
+        # Une seule lecture de la consultation
+        self.assertEqual(len([requete for requete in requetes if 'core_consultation' in requete['sql']]), 1)
+        self.assertEqual(response['X-Accel-Redirect'], f'/media/{nom}')
+
+    def test_nouveau_fichier_apres_modification(self):
+        """Test qu'une consultation modifiée est rendue dans un nouveau fichier"""
+        premier = self.client.get(self.url)['X-Accel-Redirect']
+        self.consultation.montant = Decimal('3500.00')
+        self.consultation.save()
+
+        self.assertNotEqual(self.client.get(self.url)['X-Accel-Redirect'], premier)
+
+    def test_sans_nginx(self):
+        """Test qu'en développement Django envoie le fichier"""
+        with self.settings(MEDIA_X_ACCEL_REDIRECT=False):
+            response = self.client.get(self.url)
+
+        self.assertTrue(b''.join(response.streaming_content).startswith(b'%PDF'))
+
+    def test_permission_requise(self):
+        """Test qu'un utilisateur sans droit sur les consultations est refusé"""
+        self.client.force_login(User.objects.create_user('invite'))
+
+        self.assertEqual(self.client.get(self.url).status_code, 403)
@@ -0,0 +1,61 @@
+"""
+Tests du rendu selon la requête HTMX (core.htmx).
+"""
+from django.template import engines
+from django.test import TestCase, Client
+
+
+class NavigationHtmxTest(TestCase):
+    """Tests des pages complètes et des navigations boostées"""
+
+    def setUp(self):
+        self.client = Client()
+
+    def test_page_complete(self):
+        """Test qu'un chargement direct reçoit la page avec la navigation et les scripts"""
+        response = self.client.get('/outils/')
+
+        self.assertTemplateUsed(response, 'core/base.html')
+        self.assertContains(response, '<nav')
+        self.assertContains(response, 'id="contenu"')
+        self.assertContains(response, 'hx-boost="true"')
+
+    def test_navigation_boostee(self):
+        """Test qu'une navigation boostée ne reçoit que le contenu et le titre"""
+        response = self.client.get('/outils/', HTTP_HX_REQUEST='true', HTTP_HX_BOOSTED='true')
+
+        self.assertTemplateUsed(response, 'core/outils/index.html')
+        self.assertTemplateUsed(response, 'core/fragment.html')
+        self.assertTemplateNotUsed(response, 'core/base.html')
+        self.assertNotContains(response, '<nav')
+        self.assertNotContains(response, '<script')
+        self.assertContains(response, '<title>Outils - Maieutix</title>', html=True)
+
+    def test_navigation_vers_page_a_fragment(self):
+        """Test qu'une navigation boostée reçoit la page, pas le fragment de ses requêtes HTMX"""
+        response = self.client.get('/outils/calculatrice/', HTTP_HX_REQUEST='true', HTTP_HX_BOOSTED='true')
+
+        self.assertTemplateUsed(response, 'core/outils/calculatrice.html')
+        self.assertTemplateUsed(response, 'core/fragment.html')
+
+    def test_restauration_historique(self):
+        """Test que la restauration de l'historique reçoit la page entière"""
+        response = self.client.get(
+            '/outils/calculatrice/', HTTP_HX_REQUEST='true', HTTP_HX_HISTORY_RESTORE_REQUEST='true'
+        )
+
+        self.assertTemplateUsed(response, 'core/outils/calculatrice.html')
+        self.assertTemplateUsed(response, 'core/base.html')
+
+    def test_vary(self):
+        """Test que les réponses HTML varient selon les en-têtes HTMX"""
+        response = self.client.get('/outils/')
+
+        self.assertIn('HX-Request', response['Vary'])
+        self.assertIn('HX-Boosted', response['Vary'])
+
+    def test_chargeur_en_cache(self):
+        """Test que les gabarits sont compilés une fois par le chargeur en cache"""
+        chargeur = engines['django'].engine.template_loaders[0]
+
+        self.assertEqual(type(chargeur).__module__, 'django.template.loaders.cached')
@@ -0,0 +1,133 @@
+import datetime
+import shutil
+import tempfile
+from decimal import Decimal
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.test import TestCase, Client
+from core.models import Tarif
+
+
+class CalculatriceViewTest(TestCase):
+    """Tests de la calculatrice de tarifs"""
+    
+    def setUp(self):
+        """Tarif revalorisé au 01/07/2025"""
+        self.client = Client()
+        Tarif.objects.create(
+            code='SF 12', libelle='Consultation', montant=Decimal('3000.00'),
+            date_debut=datetime.date(2024, 1, 1), date_fin=datetime.date(2025, 7, 1)
+        )
+        Tarif.objects.create(
+            code='SF 12', libelle='Consultation', montant=Decimal('3300.00'),
+            date_debut=datetime.date(2025, 7, 1)
+        )
+    
+    def test_page_calculatrice(self):
+        """Test de la page avec les tarifs en vigueur"""
+        response = self.client.get('/outils/calculatrice/', {'date': '2025-08-01'})
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'core/outils/calculatrice.html')
+        self.assertContains(response, 'SF 12')
+        self.assertContains(response, '3300')
+    
+    def test_tarification_historique(self):
+        """Test qu'une feuille ancienne est tarifée au tarif de sa date"""
+        response = self.client.get(
+            '/outils/calculatrice/',
+            {'date': '2025-03-01', 'lignes': 'sf 12 x 2\nSF 99'},
+            HTTP_HX_REQUEST='true',
+        )
+        
+        self.assertTemplateUsed(response, 'core/outils/calculatrice_resultat.html')
+        self.assertEqual(response.context['total'], Decimal('6000.00'))
+        self.assertEqual(response.context['detail'][0]['code'], 'SF 12')
+        self.assertContains(response, 'Aucun tarif applicable au 01/03/2025')
+    
+    def test_date_par_defaut(self):
+        """Test que les soins sont tarifés à la date du jour par défaut"""
+        response = self.client.get('/outils/calculatrice/', {'lignes': 'SF 12'})
+        
+        self.assertEqual(response.context['total'], Decimal('3300.00'))
+
+
+class CalendrierGrossesseViewTest(TestCase):
+    """Tests du calendrier de grossesse"""
+    
+    def test_calendrier(self):
+        """Test du terme et des examens à partir de la DDR"""
+        response = Client().get(
+            '/outils/grossesse/', {'date_dernieres_regles': '2025-03-01', 'date': '2025-06-01'}
+        )
+        
+        self.assertTemplateUsed(response, 'core/outils/calendrier_grossesse.html')
+        self.assertContains(response, '13/12/2025')
+        self.assertContains(response, '13 SA + 1 j')
+        self.assertContains(response, 'Échographie du 2e trimestre')
+    
+    def test_ddr_posterieure(self):
+        """Test que des dernières règles après la date du calcul sont refusées"""
+        response = Client().get(
+            '/outils/grossesse/', {'date_dernieres_regles': '2025-07-01', 'date': '2025-06-01'},
+            HTTP_HX_REQUEST='true',
+        )
+        
+        self.assertTemplateUsed(response, 'core/outils/calendrier_grossesse_resultat.html')
+        self.assertIsNone(response.context['resultat'])
+        self.assertContains(response, 'postérieures à la date du calcul')
+    
+    def test_dates_hors_limites(self):
+        """Test que des dates dont les fenêtres dépassent l'an 9999 sont refusées"""
+        for parametres in (
+            {'date_dernieres_regles': '9999-06-01', 'date': '9999-12-31'},
+            {'date_dernieres_regles': '2025-03-01', 'date_terme_echographique': '9999-12-31'},
+            {'date_dernieres_regles': '0001-01-01', 'date_terme_echographique': '0001-06-01'},
+        ):
+            with self.subTest(**parametres):
+                response = Client().get('/outils/grossesse/', parametres, HTTP_HX_REQUEST='true')
+                
+                self.assertEqual(response.status_code, 200)
+                self.assertIsNone(response.context['resultat'])
+
+
+class ReferencesViewTest(TestCase):
+    """Tests des références médicales"""
+    
+    def setUp(self):
+        """Index compilé depuis un corpus d'une référence"""
+        dossier = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, dossier)
+        (dossier / 'streptocoque.md').write_text(
+            "# Streptocoque B\nPrélèvement vaginal entre 34 et 38 SA.", encoding='utf-8'
+        )
+        self.reglages = self.settings(REFERENCES_DIR=dossier, REFERENCES_INDEX=dossier / 'references.idx')
+        self.reglages.enable()
+        self.addCleanup(self.reglages.disable)
+        call_command('construire_index_references', stdout=StringIO())
+    
+    def test_recherche_sans_requete(self):
+        """Test que la recherche pendant la saisie ne touche pas la base"""
+        client = Client()
+        client.get('/outils/references/')
+        with self.assertNumQueries(0):
+            response = client.get('/outils/references/', {'q': 'strepto'}, HTTP_HX_REQUEST='true')
+        
+        self.assertTemplateUsed(response, 'core/outils/references_resultats.html')
+        self.assertContains(response, 'href="/outils/references/streptocoque/"')
+        self.assertContains(response, 'Prélèvement vaginal')
+    
+    def test_reference(self):
+        response = Client().get('/outils/references/streptocoque/')
+        
+        self.assertTemplateUsed(response, 'core/outils/reference.html')
+        self.assertContains(response, 'Streptocoque B')
+        self.assertEqual(Client().get('/outils/references/inconnue/').status_code, 404)
+    
+    def test_index_non_construit(self):
+        with self.settings(REFERENCES_INDEX=Path('/nonexistent/references.idx')):
+            response = Client().get('/outils/references/', {'q': 'strepto'})
+        
+        self.assertContains(response, 'construire_index_references')
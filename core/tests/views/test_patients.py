@@ -0,0 +1,194 @@
+"""
+Tests pour les vues de gestion des patientes.
+"""
+import datetime
+
+from django.contrib.auth.models import Permission, User
+from django.core.cache import cache
+from django.test import TestCase, TransactionTestCase, Client, override_settings
+from core.models import Grossesse, Patient
+
+
+JETON = '0123456789abcdef'
+# Contrôle des droits : session, utilisateur et ses permissions (2)
+REQUETES_DROITS = 4
+CACHE_LOCAL = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+def utilisateur_patients():
+    utilisateur = User.objects.create_user('secretaire')
+    utilisateur.user_permissions.add(Permission.objects.get(codename='view_patient'))
+    return utilisateur
+
+
+@override_settings(CACHES=CACHE_LOCAL)
+class RecherchePatientViewTest(TestCase):
+    """Tests du fragment de recherche de patientes"""
+
+    def setUp(self):
+        """Deux patientes"""
+        cache.clear()
+        self.client = Client()
+        self.utilisateur = utilisateur_patients()
+        self.client.force_login(self.utilisateur)
+        Patient.objects.create(nom='Dupont', prenom='Marie', date_naissance=datetime.date(1990, 3, 12))
+        Patient.objects.create(nom='Martin', prenom='Sophie', date_naissance=datetime.date(1988, 6, 2))
+
+    def test_page_patients(self):
+        """Test que la page patients contient le champ de recherche HTMX"""
+        response = self.client.get('/patients/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'hx-get="/patients/recherche/"')
+        self.assertContains(response, 'hx-sync="this:replace"')
+        self.assertRegex(response.context['jeton_recherche'], r'^[0-9a-f]{16}$')
+        self.assertContains(response, f'jeton: "{response.context["jeton_recherche"]}"')
+        # Sans view_grossesse, l'échéancier n'est pas chargé
+        self.assertNotContains(response, 'hx-get="/patients/echeancier/"')
+
+    def test_saisie_trop_courte(self):
+        """Test qu'une saisie d'une lettre ne lance aucune requête"""
+        with self.assertNumQueries(REQUETES_DROITS):
+            response = self.client.get('/patients/recherche/', {'q': 'd'})
+
+        self.assertContains(response, 'au moins deux lettres')
+
+    def test_resultats(self):
+        """Test du fragment de résultats"""
+        response = self.client.get('/patients/recherche/', {'q': 'dup'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Dupont Marie')
+        self.assertContains(response, '12/03/1990')
+        self.assertNotContains(response, 'Martin')
+        self.assertNotContains(response, '<html')
+
+    def test_aucun_resultat(self):
+        """Test du message sans résultat"""
+        response = self.client.get('/patients/recherche/', {'q': 'zzzz'})
+
+        self.assertContains(response, 'Aucune patiente trouvée')
+
+    def test_requete_remplacee(self):
+        """Test qu'une requête dépassée par une saisie plus récente de la même page n'est pas exécutée"""
+        self.client.get('/patients/recherche/', {'q': 'dupon', 'jeton': JETON, 'seq': 20})
+
+        with self.assertNumQueries(REQUETES_DROITS):
+            response = self.client.get('/patients/recherche/', {'q': 'dup', 'jeton': JETON, 'seq': 10})
+
+        self.assertEqual(response.status_code, 204)
+
+    def test_requete_suivante_executee(self):
+        """Test qu'une requête plus récente est exécutée"""
+        self.client.get('/patients/recherche/', {'q': 'dup', 'jeton': JETON, 'seq': 10})
+        response = self.client.get('/patients/recherche/', {'q': 'mar', 'jeton': JETON, 'seq': 20})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Martin Sophie')
+
+    def test_pages_independantes(self):
+        """Test qu'une autre page (autre jeton) ou une requête sans jeton n'est jamais écartée"""
+        self.client.get('/patients/recherche/', {'q': 'dup', 'jeton': JETON, 'seq': 10 ** 15})
+
+        response = self.client.get('/patients/recherche/', {'q': 'mar', 'jeton': 'fedcba9876543210', 'seq': 1})
+        self.assertContains(response, 'Martin Sophie')
+        response = self.client.get('/patients/recherche/', {'q': 'mar', 'seq': 1})
+        self.assertContains(response, 'Martin Sophie')
+
+    def test_permission_requise(self):
+        """Test que les patientes ne sont ni listées ni mises en cache sans la permission"""
+        self.client.logout()
+
+        self.assertEqual(self.client.get('/patients/').status_code, 403)
+        self.assertEqual(self.client.get('/patients/recherche/', {'q': 'dup'}).status_code, 403)
+        self.client.force_login(User.objects.create_user('invite'))
+        self.assertEqual(self.client.get('/patients/recherche/', {'q': 'dup'}).status_code, 403)
+
+    async def test_client_asynchrone(self):
+        """Test de la vue asynchrone servie comme sous ASGI"""
+        await self.async_client.aforce_login(self.utilisateur)
+        response = await self.async_client.get('/patients/recherche/', {'q': 'mar', 'seq': 1})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Martin Sophie')
+        self.assertNotContains(response, 'Dupont')
+
+
+@override_settings(CACHES=CACHE_LOCAL)
+class RecherchePatientCacheTest(TransactionTestCase):
+    """Tests du cache des réponses de recherche"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.client.force_login(utilisateur_patients())
+        self.patient = Patient.objects.create(
+            nom='Dupont', prenom='Marie', date_naissance=datetime.date(1990, 3, 12)
+        )
+
+    def test_reponse_en_cache(self):
+        """Test qu'une même saisie est servie depuis le cache"""
+        self.client.get('/patients/recherche/', {'q': 'dup'})
+
+        with self.assertNumQueries(REQUETES_DROITS):
+            response = self.client.get('/patients/recherche/', {'q': 'Dup '})
+
+        self.assertContains(response, 'Dupont Marie')
+
+    def test_cache_invalide_apres_modification(self):
+        """Test que la modification d'une patiente invalide les réponses en cache"""
+        self.client.get('/patients/recherche/', {'q': 'dup'})
+        self.patient.prenom = 'Élodie'
+        self.patient.save()
+
+        response = self.client.get('/patients/recherche/', {'q': 'dup'})
+
+        self.assertContains(response, 'Dupont Élodie')
+
+
+class EcheancierGrossessesViewTest(TestCase):
+    """Tests de l'échéancier des grossesses"""
+
+    def setUp(self):
+        """Une grossesse à 23 SA + 5 j au 01/06/2025"""
+        self.client = Client()
+        utilisateur = User.objects.create_user('sage-femme')
+        utilisateur.user_permissions.add(Permission.objects.get(codename='view_grossesse'))
+        self.client.force_login(utilisateur)
+        patient = Patient.objects.create(nom='Dupont', prenom='Marie', date_naissance=datetime.date(1990, 3, 12))
+        Grossesse.objects.create(patient=patient, date_dernieres_regles=datetime.date(2024, 12, 17))
+
+    def test_page_echeancier(self):
+        """Test des examens de la période"""
+        response = self.client.get('/patients/echeancier/', {'debut': '2025-06-01', 'jours': '7'})
+
+        self.assertTemplateUsed(response, 'core/patients/echeancier.html')
+        self.assertEqual(response.context['fin'], datetime.date(2025, 6, 7))
+        self.assertContains(response, 'Dupont Marie')
+        self.assertContains(response, 'Dépistage du diabète gestationnel')
+
+    def test_fragment_htmx(self):
+        """Test du fragment chargé par la page patients, période bornée"""
+        response = self.client.get(
+            '/patients/echeancier/', {'debut': '2025-01-01', 'jours': '1000'}, HTTP_HX_REQUEST='true'
+        )
+
+        self.assertTemplateUsed(response, 'core/patients/echeancier_lignes.html')
+        self.assertEqual(response.context['jours'], 62)
+
+    def test_debut_hors_limites(self):
+        """Test que le début de la période est borné aux dates calculables"""
+        for debut in ('9999-12-31', '0001-01-01'):
+            with self.subTest(debut=debut):
+                response = self.client.get('/patients/echeancier/', {'debut': debut, 'jours': '62'})
+
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.context['echeances'], [])
+
+    def test_permission_requise(self):
+        """Test que l'échéancier n'est pas servi sans la permission"""
+        self.client.force_login(utilisateur_patients())
+
+        response = self.client.get('/patients/echeancier/')
+
+        self.assertEqual(response.status_code, 403)
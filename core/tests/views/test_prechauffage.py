@@ -0,0 +1,72 @@
+"""
+Tests du préchauffage des workers et de la configuration gunicorn.
+"""
+import os
+import runpy
+from pathlib import Path
+from unittest import mock
+
+from django.conf import settings
+from django.template import engines
+from django.test import SimpleTestCase
+
+from core.prechauffage import gabarits_du_projet, prechauffer
+
+
+CONFIGURATION_GUNICORN = Path(settings.BASE_DIR) / 'gunicorn.conf.py'
+
+
+class PrechauffageTest(SimpleTestCase):
+    """Tests du préchauffage fait avant d'accepter des requêtes"""
+
+    def test_gabarits_du_projet(self):
+        """Test que seuls les gabarits du projet sont compilés, pas ceux de l'administration de Django"""
+        gabarits = list(gabarits_du_projet(engines['django']))
+
+        self.assertIn('core/patients/recherche_resultats.html', gabarits)
+        self.assertNotIn('admin/base.html', gabarits)
+
+    def test_prechauffer(self):
+        """Test du bilan du préchauffage"""
+        bilan = prechauffer()
+
+        self.assertGreater(bilan['urls'], 0)
+        self.assertEqual(bilan['gabarits'], len(list(gabarits_du_projet(engines['django']))))
+        self.assertGreaterEqual(bilan['modeles'], 10)
+
+
+class ConfigurationGunicornTest(SimpleTestCase):
+    """Tests du dimensionnement lu dans l'environnement"""
+
+    def charger(self, **environnement):
+        with mock.patch.dict(os.environ, environnement):
+            return runpy.run_path(str(CONFIGURATION_GUNICORN))
+
+    def test_wsgi_par_defaut(self):
+        """Test des workers gthread dimensionnés sur les CPU"""
+        configuration = self.charger(SERVEUR='wsgi')
+
+        self.assertEqual(configuration['wsgi_app'], 'maieutix.wsgi:application')
+        self.assertEqual(configuration['worker_class'], 'gthread')
+        self.assertEqual(configuration['threads'], 4)
+        self.assertEqual(configuration['workers'], min(configuration['CPU'] + 1, 8))
+        self.assertTrue(configuration['preload_app'])
+        self.assertEqual(configuration['max_requests_jitter'], configuration['max_requests'] // 10)
+
+    def test_asgi(self):
+        """Test du mode ASGI (workers uvicorn)"""
+        configuration = self.charger(SERVEUR='asgi', GUNICORN_WORKERS='4')
+
+        self.assertEqual(configuration['wsgi_app'], 'maieutix.asgi:application')
+        self.assertEqual(configuration['worker_class'], 'uvicorn_worker.UvicornWorker')
+        self.assertEqual(configuration['workers'], 4)
+
+    def test_variables(self):
+        """Test des réglages par variables d'environnement"""
+        configuration = self.charger(
+            SERVEUR='wsgi', GUNICORN_THREADS='1', GUNICORN_MAX_REQUESTS='500', GUNICORN_PRELOAD='False'
+        )
+
+        self.assertEqual((configuration['worker_class'], configuration['threads']), ('sync', 1))
+        self.assertEqual((configuration['max_requests'], configuration['max_requests_jitter']), (500, 50))
+        self.assertFalse(configuration['preload_app'])
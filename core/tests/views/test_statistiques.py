@@ -0,0 +1,241 @@
+"""
+Tests pour les vues de statistiques.
+"""
+import datetime
+from decimal import Decimal
+
+from django.contrib.auth.models import Permission, User
+from django.core.cache import cache
+from django.test import TestCase, TransactionTestCase, Client, override_settings
+from core.analyse_activite import analyse_activite, analyser, charger_colonnes
+from core.models import Cabinet, Consultation, Patient, SageFemme
+
+
+def utilisateur_facturation():
+    utilisateur = User.objects.create_user('comptable')
+    utilisateur.user_permissions.add(Permission.objects.get(codename='view_etatrecapitulatif'))
+    return utilisateur
+
+
+class RapportMensuelViewTest(TestCase):
+    """Tests du rapport mensuel lu depuis les cumuls"""
+
+    def setUp(self):
+        """Deux sages-femmes et leurs consultations d'août 2025"""
+        self.client = Client()
+        self.client.force_login(utilisateur_facturation())
+        base = {
+            'titre': 'Sage-femme', 'telephone': '687123456', 'rib': 'FR1234567890123456789012345',
+            'banque': 'BCI', 'situation': 'collaborateur',
+        }
+        marie = SageFemme.objects.create(
+            nom='Dupont', prenom='Marie', email='marie@test.nc',
+            numero_cafat='111111111', ridet='RIDET111111', **base
+        )
+        claire = SageFemme.objects.create(
+            nom='Bernard', prenom='Claire', email='claire@test.nc',
+            numero_cafat='222222222', ridet='RIDET222222', **base
+        )
+        patient = Patient.objects.create(nom='Martin', prenom='Sophie', date_naissance=datetime.date(1990, 1, 1))
+        for sage_femme, type_acte, jour in [
+            (marie, 'prenatale', 4), (marie, 'prenatale', 5), (marie, 'postnatale', 6),
+            (claire, 'reeducation', 7), (claire, 'reeducation', 31),
+        ]:
+            Consultation.objects.create(
+                sage_femme=sage_femme, patient=patient, date=datetime.date(2025, 8, jour),
+                type_acte=type_acte, montant=Decimal('1000.00'), duree_minutes=30
+            )
+        Consultation.objects.create(
+            sage_femme=marie, patient=patient, date=datetime.date(2025, 9, 1), type_acte='prenatale'
+        )
+
+    def test_rapport_mensuel(self):
+        """Test que le rapport est lu en une requête et regroupé par sage-femme"""
+        # Session, utilisateur et ses permissions (2), puis une seule lecture des cumuls
+        with self.assertNumQueries(5):
+            response = self.client.get('/statistiques/rapport-mensuel/', {'mois': '2025-08'})
+
+        self.assertEqual(response.status_code, 200)
+        groupes = response.context['sages_femmes']
+        self.assertEqual([g['sage_femme'].nom for g in groupes], ['Bernard', 'Dupont'])
+        self.assertEqual(groupes[1]['nombre'], 3)
+        self.assertEqual(len(groupes[1]['cumuls']), 2)
+        self.assertEqual(response.context['total']['nombre'], 5)
+        self.assertEqual(response.context['total']['montant_total'], Decimal('5000.00'))
+        self.assertContains(response, 'Rééducation périnéale')
+
+    def test_mois_sans_consultation(self):
+        """Test du message affiché pour un mois vide"""
+        response = self.client.get('/statistiques/rapport-mensuel/', {'mois': '2025-01'})
+
+        self.assertContains(response, 'Aucune consultation enregistrée ce mois-ci')
+        self.assertEqual(response.context['mois_precedent'], datetime.date(2024, 12, 1))
+
+    def test_mois_invalide(self):
+        """Test qu'un mois invalide affiche le mois courant"""
+        response = self.client.get('/statistiques/rapport-mensuel/', {'mois': 'août'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['mois'].day, 1)
+
+    def test_mois_hors_limites(self):
+        """Test que le mois est borné pour que les mois précédent et suivant existent"""
+        response = self.client.get('/statistiques/rapport-mensuel/', {'mois': '9999-12'})
+        self.assertEqual(response.context['mois'], datetime.date(9999, 11, 1))
+
+        response = self.client.get('/statistiques/rapport-mensuel/', {'mois': '0001-01'})
+        self.assertEqual(response.context['mois_precedent'], datetime.date(1, 1, 1))
+
+    def test_permission_requise(self):
+        """Test que les montants par sage-femme ne sont pas affichés sans la permission"""
+        self.client.logout()
+
+        self.assertEqual(self.client.get('/statistiques/rapport-mensuel/').status_code, 403)
+
+
+class AnalyseActiviteTest(TestCase):
+    """Tests du moteur d'analyse d'activité vectorisé"""
+
+    def setUp(self):
+        base = {
+            'titre': 'Sage-femme', 'telephone': '687123456', 'rib': 'FR1234567890123456789012345',
+            'banque': 'BCI', 'situation': 'collaborateur',
+        }
+        self.marie = SageFemme.objects.create(
+            nom='Dupont', prenom='Marie', email='marie@test.nc',
+            numero_cafat='111111111', ridet='RIDET111111', **base
+        )
+        self.claire = SageFemme.objects.create(
+            nom='Bernard', prenom='Claire', email='claire@test.nc',
+            numero_cafat='222222222', ridet='RIDET222222', **base
+        )
+        self.patient = Patient.objects.create(nom='Martin', prenom='Sophie', date_naissance=datetime.date(1990, 1, 1))
+
+    def consultation(self, sage_femme, date, type_acte='prenatale', duree=None, montant=None):
+        return Consultation.objects.create(
+            sage_femme=sage_femme, patient=self.patient, date=date,
+            type_acte=type_acte, duree_minutes=duree, montant=montant
+        )
+
+    def test_analyse(self):
+        """Test des séries hebdomadaires, de la saisonnalité, des durées et de la charge"""
+        # Semaine du lundi 6 janvier 2025
+        self.consultation(self.marie, datetime.date(2025, 1, 6), duree=30, montant=Decimal('1000'))
+        self.consultation(self.marie, datetime.date(2025, 1, 12), duree=50, montant=Decimal('2000'))
+        self.consultation(self.claire, datetime.date(2025, 1, 13), type_acte='reeducation', duree=45)
+        self.consultation(self.claire, datetime.date(2025, 2, 3), type_acte='reeducation')
+
+        analyse = analyser(charger_colonnes(datetime.date(2025, 1, 1), datetime.date(2025, 3, 1)))
+
+        self.assertEqual(analyse['nombre_total'], 4)
+        self.assertEqual(analyse['montant_total'], 3000.0)
+        self.assertEqual(analyse['duree_moyenne'], 41.67)
+
+        semaines = analyse['semaines']
+        self.assertEqual(semaines[0]['debut'], datetime.date(2024, 12, 30))
+        self.assertEqual(semaines[-1]['debut'], datetime.date(2025, 2, 24))
+        self.assertEqual([s['nombre'] for s in semaines[:3]], [0, 2, 1])
+        self.assertEqual(semaines[2]['moyenne_mobile'], 1.0)
+        self.assertEqual(semaines[5]['moyenne_mobile'], 0.5)
+
+        saisonnalite = {mois['mois']: mois for mois in analyse['saisonnalite']}
+        self.assertEqual(saisonnalite[1]['moyenne'], 3.0)
+        self.assertEqual(saisonnalite[1]['indice'], 1.5)
+        self.assertIsNone(saisonnalite[6]['moyenne'])
+
+        durees = {acte['type_acte']: acte for acte in analyse['durees_par_acte']}
+        self.assertEqual(durees['prenatale']['duree_moyenne'], 40.0)
+        self.assertEqual(durees['reeducation']['nombre'], 2)
+        self.assertEqual(durees['reeducation']['libelle'], 'Rééducation périnéale')
+
+        charge = analyse['sages_femmes']
+        self.assertEqual([ligne['nom'] for ligne in charge], ['Dupont', 'Bernard'])
+        self.assertEqual(charge[0]['montant_total'], 3000.0)
+        self.assertEqual(charge[1]['duree_moyenne'], 45.0)
+
+    def test_periode_vide(self):
+        """Test qu'une période sans consultation donne des séries vides"""
+        analyse = analyser(charger_colonnes(datetime.date(2025, 1, 1), datetime.date(2025, 2, 1)))
+
+        self.assertEqual(analyse['nombre_total'], 0)
+        self.assertIsNone(analyse['duree_moyenne'])
+        self.assertEqual(sum(s['nombre'] for s in analyse['semaines']), 0)
+        self.assertEqual(analyse['sages_femmes'], [])
+
+    def test_vue_analyse(self):
+        """Test de la page d'analyse d'activité"""
+        self.consultation(self.marie, datetime.date.today(), duree=30)
+
+        self.client.force_login(utilisateur_facturation())
+        response = self.client.get('/statistiques/analyse/', {'annees': '1'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['analyse']['nombre_total'], 1)
+        self.assertContains(response, 'Charge par sage-femme')
+
+    def test_vue_analyse_annees_invalides(self):
+        """Test qu'un nombre d'années invalide donne la période par défaut"""
+        self.client.force_login(utilisateur_facturation())
+        for annees in ('²', '-3', '0', 'x'):
+            response = self.client.get('/statistiques/analyse/', {'annees': annees})
+            self.assertEqual(response.context['annees'], 2)
+
+    def test_vue_analyse_permission_requise(self):
+        """Test que le chiffre d'affaires par sage-femme n'est pas affiché sans la permission"""
+        self.assertEqual(self.client.get('/statistiques/analyse/').status_code, 403)
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class AnalyseActiviteCacheTest(TransactionTestCase):
+    """Tests du cache de l'analyse d'activité"""
+
+    def setUp(self):
+        cache.clear()
+        Cabinet.get_instance()
+        self.sage_femme = SageFemme.objects.create(
+            nom='Dupont', prenom='Marie', titre='Sage-femme', telephone='687123456',
+            email='marie.dupont@test.nc', numero_cafat='123456789', ridet='RIDET123456',
+            rib='FR1234567890123456789012345', banque='BCI', situation='gerant'
+        )
+        self.patient = Patient.objects.create(nom='Martin', prenom='Sophie', date_naissance=datetime.date(1990, 1, 1))
+        self.periode = (datetime.date(2025, 1, 1), datetime.date(2026, 1, 1))
+
+    def consultation(self):
+        Consultation.objects.create(
+            sage_femme=self.sage_femme, patient=self.patient,
+            date=datetime.date(2025, 5, 5), type_acte='prenatale'
+        )
+
+    def test_resultat_en_cache(self):
+        """Test qu'une même période est servie depuis le cache"""
+        self.consultation()
+        analyse_activite(*self.periode)
+
+        # Seule la version des consultations est lue
+        with self.assertNumQueries(1):
+            analyse = analyse_activite(*self.periode)
+        self.assertEqual(analyse['nombre_total'], 1)
+
+    def test_cache_invalide_par_nouvelle_consultation(self):
+        """Test qu'une nouvelle consultation invalide l'analyse en cache"""
+        self.consultation()
+        analyse_activite(*self.periode)
+        self.consultation()
+
+        self.assertEqual(analyse_activite(*self.periode)['nombre_total'], 2)
+
+    def test_cache_invalide_par_modification_en_lot(self):
+        """Test que bulk_create et update() invalident aussi l'analyse en cache"""
+        self.consultation()
+        analyse_activite(*self.periode)
+        Consultation.objects.bulk_create([
+            Consultation(
+                sage_femme=self.sage_femme, patient=self.patient,
+                date=datetime.date(2025, 6, 2), type_acte='postnatale'
+            )
+        ])
+        self.assertEqual(analyse_activite(*self.periode)['nombre_total'], 2)
+
+        Consultation.objects.update(duree_minutes=45)
+        durees = [acte['duree_moyenne'] for acte in analyse_activite(*self.periode)['durees_par_acte']]
+        self.assertEqual(durees, [45, 45])
@@ -3,17 +3,46 @@ Views package pour Maieutix
 Structure modulaire suivant l'architecture définie
 """
 
-from .feuille_soins import feuille_soins_view, home_view
-from .patients import patients_view
-from .outils import outils_view
-from .statistiques import statistiques_view
+from .feuille_soins import (
+    feuille_soins_view, home_view,
+    historique_consultation_view, historique_consultation_page_view,
+    recherche_consultation_view, feuille_soins_pdf_view,
+)
+from .patients import patients_view, recherche_patient_view, echeancier_grossesses_view
+from .outils import outils_view, calculatrice_view, calendrier_grossesse_view, references_view, reference_view
+from .statistiques import statistiques_view, rapport_mensuel_view, analyse_activite_view
 from .administration import administration_sages_femmes_view
+from .facturation import (
+    etats_recapitulatifs_view, etats_recapitulatifs_progression_view, etat_recapitulatif_pdf_view,
+    bons_depot_view, bons_depot_telechargement_view,
+    exports_view, export_consultations_view, export_sages_femmes_view,
+)
 
 __all__ = [
     'feuille_soins_view',
     'home_view', 
+    'historique_consultation_view',
+    'historique_consultation_page_view',
+    'recherche_consultation_view',
+    'feuille_soins_pdf_view',
     'patients_view',
+    'recherche_patient_view',
+    'echeancier_grossesses_view',
     'outils_view',
+    'calculatrice_view',
+    'calendrier_grossesse_view',
+    'references_view',
+    'reference_view',
     'statistiques_view',
+    'rapport_mensuel_view',
+    'analyse_activite_view',
     'administration_sages_femmes_view',
+    'etats_recapitulatifs_view',
+    'etats_recapitulatifs_progression_view',
+    'etat_recapitulatif_pdf_view',
+    'bons_depot_view',
+    'bons_depot_telechargement_view',
+    'exports_view',
+    'export_consultations_view',
+    'export_sages_femmes_view',
 ]
\ No newline at end of file
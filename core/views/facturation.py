@@ -0,0 +1,161 @@
+"""
+Views pour la facturation
+États récapitulatifs mensuels, bons de dépôt et exports comptables
+"""
+
+import datetime
+
+from django.contrib.auth.decorators import permission_required
+from django.core.exceptions import PermissionDenied
+from django.http import Http404
+from django.shortcuts import get_object_or_404, render
+from django.utils import timezone
+from django.views.decorators.http import require_http_methods
+
+from core.bons_depot import flux_pdf, flux_zip
+from core.exports import (
+    ENTETES_CONSULTATIONS, ENTETES_SAGES_FEMMES, ecrire_csv, lignes_consultations, lignes_sages_femmes,
+)
+from core.fichiers import reponse_en_flux, servir_fichier
+from core.models import EtatRecapitulatif, Tache
+from core.partitions import debut_mois
+from core.taches import planifier
+from core.xlsx import CONTENT_TYPE_XLSX, ecrire_xlsx
+
+
+# Les états et les bons lisent le mois jusqu'au 1er du mois suivant : il doit exister
+MOIS_MAX = datetime.date(datetime.MAXYEAR, 11, 1)
+
+def _mois_demande(valeur):
+    """Mois AAAA-MM demandé, mois précédent par défaut (génération de fin de mois)"""
+    try:
+        mois = datetime.datetime.strptime(valeur or '', '%Y-%m').date()
+    except ValueError:
+        return debut_mois(debut_mois(timezone.localdate()) - datetime.timedelta(days=1))
+    return min(mois, MOIS_MAX)
+
+
+@require_http_methods(['GET', 'POST'])
+@permission_required('core.view_etatrecapitulatif', raise_exception=True)
+def etats_recapitulatifs_view(request):
+    """
+    Vue des états récapitulatifs du mois
+    En POST, planifie la génération en tâche de fond et renvoie le suivi d'avancement
+    """
+    mois = _mois_demande(request.POST.get('mois') or request.GET.get('mois'))
+    
+    if request.method == 'POST':
+        if not request.user.has_perm('core.add_etatrecapitulatif'):
+            raise PermissionDenied
+        tache = planifier('etats_recapitulatifs', mois=mois.isoformat())
+        return render(request, 'core/facturation/progression.html', {'tache': tache})
+    
+    context = {
+        'page_title': 'États récapitulatifs',
+        'mois': mois,
+        'etats': EtatRecapitulatif.objects.filter(mois=mois).select_related('sage_femme'),
+    }
+    return render(request, 'core/facturation/etats_recapitulatifs.html', context)
+
+
+@permission_required('core.view_etatrecapitulatif', raise_exception=True)
+def etats_recapitulatifs_progression_view(request, pk):
+    """
+    Fragment HTMX : avancement d'une génération, interrogé chaque seconde
+    jusqu'à la fin
+    """
+    tache = get_object_or_404(Tache, pk=pk, nom='etats_recapitulatifs')
+    return render(request, 'core/facturation/progression.html', {'tache': tache})
+
+
+@permission_required('core.view_etatrecapitulatif', raise_exception=True)
+def etat_recapitulatif_pdf_view(request, pk):
+    """
+    Téléchargement du PDF d'un état récapitulatif
+    Les PDF contiennent les patientes et les montants : nginx ne les sert
+    qu'après ce contrôle (X-Accel-Redirect)
+    """
+    etat = get_object_or_404(EtatRecapitulatif.objects.select_related('sage_femme'), pk=pk)
+    if not etat.fichier:
+        raise Http404("État récapitulatif non généré.")
+    return servir_fichier(etat.fichier.name, f"etat-recapitulatif-{etat.mois:%Y-%m}-{etat.sage_femme.nom}.pdf")
+
+
+def bons_depot_view(request):
+    """
+    Vue des bons de dépôt du mois
+    """
+    context = {
+        'page_title': 'Bons de dépôt',
+        'mois': _mois_demande(request.GET.get('mois')),
+    }
+    return render(request, 'core/facturation/bons_depot.html', context)
+
+
+@permission_required('core.view_consultation', raise_exception=True)
+def bons_depot_telechargement_view(request):
+    """
+    Téléchargement en flux des bons de dépôt du mois :
+    un PDF unique (format=pdf) ou un PDF par titulaire dans une archive (format=zip)
+    """
+    mois = _mois_demande(request.GET.get('mois'))
+    if request.GET.get('format') == 'zip':
+        response = reponse_en_flux(flux_zip(mois), 'application/zip')
+        extension = 'zip'
+    else:
+        response = reponse_en_flux(flux_pdf(mois), 'application/pdf')
+        extension = 'pdf'
+    response['Content-Disposition'] = f'attachment; filename="bons-depot-{mois:%Y-%m}.{extension}"'
+    return response
+
+
+def _annee_demandee(valeur):
+    """Année AAAA demandée, année en cours par défaut"""
+    try:
+        annee = int(valeur)
+    except (TypeError, ValueError):
+        annee = timezone.localdate().year
+    # L'export lit jusqu'au 1er janvier suivant : il doit exister
+    return datetime.date(min(max(annee, datetime.MINYEAR), datetime.MAXYEAR - 1), 1, 1)
+
+
+def _reponse_export(request, nom, entetes, lignes):
+    """Export en flux au format demandé : xlsx, ou csv par défaut"""
+    if request.GET.get('format') == 'xlsx':
+        response = reponse_en_flux(ecrire_xlsx(entetes, lignes, nom), CONTENT_TYPE_XLSX)
+        extension = 'xlsx'
+    else:
+        response = reponse_en_flux(ecrire_csv(entetes, lignes), 'text/csv; charset=utf-8')
+        extension = 'csv'
+    response['Content-Disposition'] = f'attachment; filename="{nom}.{extension}"'
+    return response
+
+
+def exports_view(request):
+    """
+    Vue des exports comptables
+    """
+    context = {
+        'page_title': 'Exports',
+        'annee': _annee_demandee(request.GET.get('annee')).year,
+    }
+    return render(request, 'core/facturation/exports.html', context)
+
+
+@permission_required('core.view_consultation', raise_exception=True)
+def export_consultations_view(request):
+    """
+    Export des consultations d'une année, lu sur un curseur côté serveur
+    et envoyé au fil de la lecture
+    """
+    debut = _annee_demandee(request.GET.get('annee'))
+    lignes = lignes_consultations(debut, debut.replace(year=debut.year + 1))
+    return _reponse_export(request, f"consultations-{debut.year}", ENTETES_CONSULTATIONS, lignes)
+
+
+@permission_required('core.view_sagefemme', raise_exception=True)
+def export_sages_femmes_view(request):
+    """
+    Export de la liste des sages-femmes (coordonnées professionnelles et bancaires)
+    """
+    return _reponse_export(request, 'sages-femmes', ENTETES_SAGES_FEMMES, lignes_sages_femmes())
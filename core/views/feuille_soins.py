@@ -3,46 +3,50 @@ Views pour la gestion des feuilles de soins
 Logique métier et interactions pour les consultations
 """
 
-from django.shortcuts import render
+from asgiref.sync import sync_to_async
+from django.contrib.auth.decorators import permission_required
+from django.shortcuts import get_object_or_404, render
 
+from core.feuilles_soins import feuille_pdf
+from core.fichiers import servir_fichier
+from core.forms import RechercheConsultationForm
+from core.htmx import rendre
+from core.models import Cabinet, Consultation
+from core.pagination import page_par_curseur
 
-def home_view(request):
+
+NOMBRE_CONSULTATIONS_RECENTES = 10
+TAILLE_PAGE_HISTORIQUE = 50
+NOMBRE_RESULTATS_RECHERCHE = 50
+
+
+async def home_view(request):
     """
     Vue pour la page d'accueil - redirige vers feuille de soins
     """
-    return feuille_soins_view(request)
+    return await feuille_soins_view(request)
 
 
-def feuille_soins_view(request):
+async def feuille_soins_view(request):
     """
     Vue principale pour la gestion des feuilles de soins
     Affiche le tableau de bord des consultations
+    Les consultations récentes (noms des patientes) ne sont listées qu'avec
+    la permission de consulter les consultations
     """
+    consultations_recentes = []
+    utilisateur = await request.auser()
+    if await utilisateur.ahas_perm('core.view_consultation'):
+        queryset = (
+            Consultation.objects
+            .select_related('patient')
+            .only('date', 'type_acte', 'statut', 'patient__nom', 'patient__prenom')
+            [:NOMBRE_CONSULTATIONS_RECENTES]
+        )
+        consultations_recentes = [consultation async for consultation in queryset]
     context = {
         'page_title': 'Feuille de Soins',
-        'consultations_recentes': [
-            {
-                'date': '15/08/2025',
-                'patiente': 'Marie Dupont',
-                'type': 'Consultation prénatale',
-                'statut': 'complete',
-                'statut_label': 'Complète'
-            },
-            {
-                'date': '14/08/2025', 
-                'patiente': 'Sophie Martin',
-                'type': 'Suivi grossesse',
-                'statut': 'en_cours',
-                'statut_label': 'En cours'
-            },
-            {
-                'date': '13/08/2025',
-                'patiente': 'Léa Dubois', 
-                'type': 'Consultation postnatale',
-                'statut': 'complete',
-                'statut_label': 'Complète'
-            }
-        ]
+        'consultations_recentes': consultations_recentes,
     }
     return render(request, 'core/feuille_soins.html', context)
 
@@ -57,21 +61,100 @@ def nouvelle_consultation_view(request):
     return render(request, 'core/feuille_soins/nouvelle.html', context)
 
 
-def recherche_consultation_view(request):
+@permission_required('core.view_consultation', raise_exception=True)
+async def recherche_consultation_view(request):
     """
     Vue pour rechercher dans les consultations
+    Recherche plein texte (motif, notes) filtrable par sage-femme, période et type d'acte
     """
+    form = RechercheConsultationForm(request.GET or None)
+    resultats = None
+    # La sage-femme choisie est vérifiée en base : validation par l'ORM synchrone
+    if form.is_bound and await sync_to_async(form.is_valid)() and form.cleaned_data['q'].strip():
+        queryset = Consultation.objects.select_related('patient', 'sage_femme').defer('notes', 'recherche')
+        resultats = [
+            consultation async for consultation in form.filtrer(queryset)[:NOMBRE_RESULTATS_RECHERCHE]
+        ]
+    
     context = {
-        'page_title': 'Recherche Consultations'
+        'page_title': 'Recherche Consultations',
+        'form': form,
+        'resultats': resultats,
+    }
+    # Saisie dans le formulaire : seuls les résultats sont rafraîchis
+    if request.headers.get('HX-Target') == 'resultats-recherche':
+        return render(request, 'core/feuille_soins/recherche_resultats.html', context)
+    # Le formulaire complet liste les sages-femmes : rendu hors de la boucle d'événements
+    # Chargé par HTMX dans le tableau de bord : seul le contenu est renvoyé
+    return await sync_to_async(rendre)(
+        request, 'core/feuille_soins/recherche.html', context,
+        fragment='core/feuille_soins/recherche_contenu.html',
+    )
+
+
+def _historique_queryset(request):
+    """Consultations de l'historique, filtrées par sage-femme ou patiente si demandé"""
+    queryset = Consultation.objects.select_related('patient').only(
+        'date', 'type_acte', 'statut', 'sage_femme_id', 'patient__nom', 'patient__prenom'
+    )
+    for parametre in ('sage_femme', 'patient'):
+        try:
+            valeur = int(request.GET.get(parametre, ''))
+        except ValueError:
+            continue
+        queryset = queryset.filter(**{f'{parametre}_id': valeur})
+    return queryset
+
+
+def _historique_context(request):
+    consultations, curseur_suivant = page_par_curseur(
+        _historique_queryset(request),
+        curseur=request.GET.get('apres'),
+        taille=TAILLE_PAGE_HISTORIQUE,
+    )
+    filtres = request.GET.copy()
+    filtres.pop('apres', None)
+    return {
+        'consultations': consultations,
+        'curseur_suivant': curseur_suivant,
+        'filtres': filtres.urlencode(),
     }
-    return render(request, 'core/feuille_soins/recherche.html', context)
 
 
+@permission_required('core.view_consultation', raise_exception=True)
 def historique_consultation_view(request):
     """
     Vue pour l'historique des consultations
     """
     context = {
-        'page_title': 'Historique Consultations'
+        'page_title': 'Historique Consultations',
+        **_historique_context(request),
     }
-    return render(request, 'core/feuille_soins/historique.html', context)
\ No newline at end of file
+    # Chargé par HTMX dans le tableau de bord : seul le contenu est renvoyé
+    return rendre(
+        request, 'core/feuille_soins/historique.html', context,
+        fragment='core/feuille_soins/historique_contenu.html',
+    )
+
+
+@permission_required('core.view_consultation', raise_exception=True)
+def historique_consultation_page_view(request):
+    """
+    Fragment HTMX : lignes suivantes de l'historique (défilement infini)
+    """
+    return render(request, 'core/feuille_soins/historique_lignes.html', _historique_context(request))
+
+
+@permission_required('core.view_consultation', raise_exception=True)
+def feuille_soins_pdf_view(request, pk):
+    """
+    Impression de la feuille de soins d'une consultation
+    Une réimpression ne coûte que la lecture de la consultation : le PDF déjà
+    rendu est retrouvé par l'empreinte de son contenu et envoyé par nginx
+    """
+    consultation = get_object_or_404(
+        Consultation.objects.select_related('patient', 'sage_femme__remplacement_de').defer('notes', 'recherche'),
+        pk=pk,
+    )
+    nom = feuille_pdf(consultation, Cabinet.get_cached())
+    return servir_fichier(nom, f"feuille-soins-{consultation.date:%Y-%m-%d}-{consultation.pk}.pdf")
@@ -3,7 +3,18 @@ Views pour les outils
 Logique métier pour les fonctionnalités utilitaires
 """
 
+from django.http import Http404
 from django.shortcuts import render
+from django.utils import timezone
+
+from core.calendrier_grossesse import calendrier
+from core.forms import CalculatriceForm, CalendrierGrossesseForm
+from core.htmx import rendre
+from core.references import index_references
+from core.tarifs import index_tarifs
+
+
+NOMBRE_RESULTATS_REFERENCES = 20
 
 
 def outils_view(request):
@@ -20,18 +31,84 @@ def outils_view(request):
 def calculatrice_view(request):
     """
     Vue pour les outils de calcul
+    Tarife des actes CAFAT à la date des soins, sans requête : l'index des tarifs
+    est en mémoire (core.tarifs)
     """
+    form = CalculatriceForm(request.GET)
+    form.is_valid()
+    jour = form.cleaned_data.get('date') or timezone.localdate()
+    lignes = form.cleaned_data.get('lignes') or []
+    index = index_tarifs()
+    detail, total = index.tarifer(lignes, jour) if lignes else ([], None)
+    
     context = {
-        'page_title': 'Calculatrice'
+        'page_title': 'Calculatrice',
+        'form': form,
+        'jour': jour,
+        'detail': detail,
+        'total': total,
+        'tarifs': index.en_vigueur(jour),
     }
-    return render(request, 'core/outils/calculatrice.html', context)
+    # Saisie dans le formulaire : seul le résultat est rafraîchi
+    return rendre(request, 'core/outils/calculatrice.html', context, fragment='core/outils/calculatrice_resultat.html')
+
+
+def calendrier_grossesse_view(request):
+    """
+    Vue pour le calendrier de grossesse
+    Terme, âge gestationnel et fenêtres des examens à partir de la DDR
+    (même moteur que l'échéancier des patientes, core.calendrier_grossesse)
+    """
+    form = CalendrierGrossesseForm(request.GET or None)
+    resultat = None
+    if form.is_valid():
+        resultat = calendrier(
+            form.cleaned_data['date_dernieres_regles'],
+            form.cleaned_data['date'],
+            form.cleaned_data['date_terme_echographique'],
+        )
+    
+    context = {
+        'page_title': 'Calendrier de grossesse',
+        'form': form,
+        'resultat': resultat,
+    }
+    return rendre(
+        request, 'core/outils/calendrier_grossesse.html', context,
+        fragment='core/outils/calendrier_grossesse_resultat.html',
+    )
 
 
 def references_view(request):
     """
     Vue pour les références médicales
+    Recherche pendant la saisie dans l'index projeté en mémoire (core.references),
+    sans requête en base
+    """
+    index = index_references()
+    saisie = request.GET.get('q', '').strip()
+    resultats = index.rechercher(saisie, limite=NOMBRE_RESULTATS_REFERENCES) if index and saisie else None
+    
+    context = {
+        'page_title': 'Références Médicales',
+        'index': index,
+        'saisie': saisie,
+        'resultats': resultats,
+    }
+    return rendre(request, 'core/outils/references.html', context, fragment='core/outils/references_resultats.html')
+
+
+def reference_view(request, slug):
+    """
+    Vue pour une référence médicale
     """
+    index = index_references()
+    reference = index.reference(slug) if index else None
+    if reference is None:
+        raise Http404("Référence introuvable")
+    
     context = {
-        'page_title': 'Références Médicales'
+        'page_title': reference.titre,
+        'reference': reference,
     }
-    return render(request, 'core/outils/references.html', context)
\ No newline at end of file
+    return render(request, 'core/outils/reference.html', context)
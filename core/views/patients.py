@@ -3,20 +3,153 @@ Views pour la gestion des patients
 Logique métier pour le suivi des patientes
 """
 
+import datetime
+import hashlib
+import re
+import secrets
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.decorators import permission_required
+from django.core.cache import cache
+from django.db import connection
+from django.http import HttpResponse
 from django.shortcuts import render
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from core.cache import aget_version
+from core.calendrier_grossesse import RECUL_ECHEANCIER, echeancier
+from core.htmx import rendre
+from core.models import Patient
+from core.models.functions import normaliser_recherche
+from core.models.patient import PATIENTS_CACHE_VERSION
+
 
+NOMBRE_RESULTATS_PATIENTS = 10
+LONGUEUR_MIN_RECHERCHE = 2
+# Durée de vie des réponses en cache ; toute modification de patiente les invalide
+DUREE_CACHE_RECHERCHE = 30
+CACHE_RECHERCHE_PREFIX = 'maieutix:patients:recherche:'
+JOURS_ECHEANCIER = 7
+JOURS_ECHEANCIER_MAX = 62
+CHOIX_JOURS_ECHEANCIER = [7, 14, 31]
+# Bornes du début de la période : la lecture remonte de RECUL_ECHEANCIER jours
+# et la période peut durer JOURS_ECHEANCIER_MAX jours
+DEBUT_ECHEANCIER_MIN = datetime.date.min + datetime.timedelta(days=RECUL_ECHEANCIER)
+DEBUT_ECHEANCIER_MAX = datetime.date.max - datetime.timedelta(days=JOURS_ECHEANCIER_MAX)
+# Jeton de la page de recherche (secrets.token_hex(8)), clé de sa numérotation
+FORMAT_JETON_RECHERCHE = re.compile(r'[0-9a-f]{16}')
 
-def patients_view(request):
+
+@permission_required('core.view_patient', raise_exception=True)
+async def patients_view(request):
     """
     Vue principale pour la gestion des patients
     """
     context = {
         'page_title': 'Patients',
-        'section': 'patients'
+        'section': 'patients',
+        'jeton_recherche': secrets.token_hex(8),
+        'voir_echeancier': await (await request.auser()).ahas_perm('core.view_grossesse'),
     }
     return render(request, 'core/patients/index.html', context)
 
 
+async def _requete_remplacee(request):
+    """
+    Annulation côté serveur : chaque affichage de la page reçoit un jeton
+    aléatoire et numérote ses saisies (`seq`, compteur du navigateur). Une
+    requête déjà dépassée par une saisie plus récente de la même page n'est
+    pas exécutée. Sert quand plusieurs requêtes attendent un worker (WSGI) ou
+    la base. Le jeton, tiré par le serveur, isole les pages les unes des
+    autres : ni l'adresse du proxy ni l'horloge du client n'entrent en jeu.
+    """
+    jeton = request.GET.get('jeton', '')
+    try:
+        seq = int(request.GET.get('seq', ''))
+    except ValueError:
+        return False
+    if not FORMAT_JETON_RECHERCHE.fullmatch(jeton):
+        return False
+    cle = f"{CACHE_RECHERCHE_PREFIX}seq:{jeton}"
+    # Lecture puis écriture non atomiques : deux saisies simultanées de la même
+    # page peuvent toutes deux s'exécuter, au pire une requête inutile
+    derniere = await cache.aget(cle)
+    if derniere is not None and derniere > seq:
+        return True
+    await cache.aset(cle, seq, timeout=60)
+    return False
+
+
+@sync_to_async
+def _dans_une_transaction():
+    # Lu dans le thread où l'ORM asynchrone exécute les requêtes
+    return connection.in_atomic_block
+
+
+@permission_required('core.view_patient', raise_exception=True)
+async def recherche_patient_view(request):
+    """
+    Fragment HTMX : recherche de patientes pendant la saisie
+    (nom, prénom, date de naissance jj/mm/aaaa)
+    Vue asynchrone : une frappe en attente de la base n'occupe pas de worker.
+    Le cache partagé n'est lu et écrit qu'après le contrôle des droits
+    """
+    if await _requete_remplacee(request):
+        # 204 : HTMX ne remplace pas le contenu affiché
+        return HttpResponse(status=204)
+    
+    saisie = ' '.join(normaliser_recherche(request.GET.get('q', '')).split())
+    if len(saisie) < LONGUEUR_MIN_RECHERCHE:
+        return render(request, 'core/patients/recherche_resultats.html', {'patients': None})
+    
+    cle = '{}{}:{}'.format(
+        CACHE_RECHERCHE_PREFIX,
+        await aget_version(PATIENTS_CACHE_VERSION),
+        hashlib.sha1(saisie.encode()).hexdigest(),
+    )
+    html = await cache.aget(cle)
+    if html is None:
+        patients = await Patient.objects.only('nom', 'prenom', 'date_naissance').arecherche(
+            saisie, limite=NOMBRE_RESULTATS_PATIENTS
+        )
+        html = render_to_string(
+            'core/patients/recherche_resultats.html', {'patients': patients}, request
+        )
+        # Une lecture faite dans une transaction peut être annulée : pas de mise en cache
+        if not await _dans_une_transaction():
+            await cache.aset(cle, html, timeout=DUREE_CACHE_RECHERCHE)
+    return HttpResponse(html)
+
+
+@permission_required('core.view_grossesse', raise_exception=True)
+def echeancier_grossesses_view(request):
+    """
+    Vue pour l'échéancier des grossesses
+    Examens à faire sur la période (7 jours à partir d'aujourd'hui par défaut)
+    pour toutes les grossesses en cours, calculés d'un seul passage vectorisé
+    """
+    try:
+        debut = datetime.date.fromisoformat(request.GET.get('debut', ''))
+    except ValueError:
+        debut = timezone.localdate()
+    debut = min(max(debut, DEBUT_ECHEANCIER_MIN), DEBUT_ECHEANCIER_MAX)
+    try:
+        jours = min(max(int(request.GET.get('jours', JOURS_ECHEANCIER)), 1), JOURS_ECHEANCIER_MAX)
+    except ValueError:
+        jours = JOURS_ECHEANCIER
+    
+    context = {
+        'page_title': 'Échéancier des grossesses',
+        'debut': debut,
+        'fin': debut + datetime.timedelta(days=jours - 1),
+        'jours': jours,
+        'choix_jours': CHOIX_JOURS_ECHEANCIER,
+        'echeances': echeancier(debut, jours),
+    }
+    return rendre(request, 'core/patients/echeancier.html', context, fragment='core/patients/echeancier_lignes.html')
+
+
 def patient_detail_view(request, patient_id):
     """
     Vue pour le détail d'un patient
@@ -35,4 +168,4 @@ def nouveau_patient_view(request):
     context = {
         'page_title': 'Nouveau Patient'
     }
-    return render(request, 'core/patients/nouveau.html', context)
\ No newline at end of file
+    return render(request, 'core/patients/nouveau.html', context)
@@ -3,7 +3,31 @@ Views pour les statistiques
 Logique métier pour l'analyse et le reporting
 """
 
+import datetime
+
+from django.contrib.auth.decorators import permission_required
 from django.shortcuts import render
+from django.utils import timezone
+
+from core.analyse_activite import analyse_activite
+from core.models import CumulMensuel
+from core.partitions import debut_mois, mois_suivant
+
+
+ANNEES_ANALYSE = 2
+ANNEES_ANALYSE_MAX = 10
+# Le rapport lie les mois précédent et suivant : ils doivent exister
+MOIS_MIN = datetime.date(datetime.MINYEAR, 2, 1)
+MOIS_MAX = datetime.date(datetime.MAXYEAR, 11, 1)
+
+
+def _mois_demande(request):
+    """Mois AAAA-MM du paramètre `mois`, mois courant par défaut"""
+    try:
+        mois = datetime.datetime.strptime(request.GET.get('mois', ''), '%Y-%m').date()
+    except ValueError:
+        return debut_mois(timezone.localdate())
+    return min(max(mois, MOIS_MIN), MOIS_MAX)
 
 
 def statistiques_view(request):
@@ -17,21 +41,64 @@ def statistiques_view(request):
     return render(request, 'core/statistiques/index.html', context)
 
 
+@permission_required('core.view_etatrecapitulatif', raise_exception=True)
 def rapport_mensuel_view(request):
     """
     Vue pour le rapport mensuel
+    Lit les cumuls pré-calculés (CumulMensuel) : une ligne par sage-femme et type d'acte
     """
+    mois = _mois_demande(request)
+    cumuls = (
+        CumulMensuel.objects
+        .filter(mois=mois)
+        .select_related('sage_femme')
+        .order_by('sage_femme__nom', 'sage_femme__prenom', 'type_acte')
+    )
+    
+    sages_femmes = {}
+    total = {'nombre': 0, 'montant_total': 0, 'duree_totale': 0}
+    for cumul in cumuls:
+        groupe = sages_femmes.setdefault(cumul.sage_femme_id, {
+            'sage_femme': cumul.sage_femme,
+            'cumuls': [],
+            'nombre': 0, 'montant_total': 0, 'duree_totale': 0,
+        })
+        groupe['cumuls'].append(cumul)
+        for champ in total:
+            groupe[champ] += getattr(cumul, champ)
+            total[champ] += getattr(cumul, champ)
+    
     context = {
-        'page_title': 'Rapport Mensuel'
+        'page_title': 'Rapport Mensuel',
+        'mois': mois,
+        'mois_precedent': debut_mois(mois - datetime.timedelta(days=1)),
+        'mois_suivant': mois_suivant(mois),
+        'sages_femmes': list(sages_femmes.values()),
+        'total': total,
     }
     return render(request, 'core/statistiques/rapport_mensuel.html', context)
 
 
+@permission_required('core.view_etatrecapitulatif', raise_exception=True)
 def analyse_activite_view(request):
     """
     Vue pour l'analyse d'activité
+    Séries calculées par core.analyse_activite sur les `annees` dernières années
     """
+    try:
+        annees = int(request.GET.get('annees', ''))
+    except ValueError:
+        annees = ANNEES_ANALYSE
+    annees = min(annees, ANNEES_ANALYSE_MAX) if annees > 0 else ANNEES_ANALYSE
+    fin = mois_suivant(debut_mois(timezone.localdate()))
+    debut = fin.replace(year=fin.year - annees)
+    
+    analyse = analyse_activite(debut, fin)
+    semaine_max = max((semaine['nombre'] for semaine in analyse['semaines']), default=0)
     context = {
-        'page_title': 'Analyse d\'Activité'
+        'page_title': 'Analyse d\'Activité',
+        'annees': annees,
+        'analyse': analyse,
+        'semaine_max': semaine_max or 1,
     }
     return render(request, 'core/statistiques/analyse.html', context)
\ No newline at end of file
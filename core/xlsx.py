@@ -0,0 +1,141 @@
+"""
+Écriture de classeurs XLSX en flux, sans dépendance
+Une seule feuille, chaînes écrites en ligne (inlineStr) : aucune table de
+chaînes partagées à garder en mémoire, les lignes sont compressées et émises
+au fil de l'eau. (Le mode write_only d'openpyxl doit finir le fichier avant
+de pouvoir l'envoyer.)
+"""
+
+import datetime
+import re
+import zipfile
+from decimal import Decimal
+from itertools import chain
+from xml.sax.saxutils import escape
+
+from core.fichiers import TamponFlux
+
+
+CONTENT_TYPE_XLSX = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+# Nombre de lignes écrites entre deux morceaux émis
+LIGNES_PAR_MORCEAU = 500
+
+ORIGINE_EXCEL = datetime.date(1899, 12, 30)
+# Caractères de contrôle interdits en XML 1.0
+CARACTERES_INTERDITS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+# Styles (xl/styles.xml) : 0 normal, 1 date, 2 en-tête en gras, 3 montant
+STYLE_DATE = 1
+STYLE_ENTETE = 2
+STYLE_MONTANT = 3
+
+XML = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+NS_MAIN = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+NS_REL = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+NS_PKG = 'http://schemas.openxmlformats.org/package/2006/relationships'
+
+PARTIES = {
+    '[Content_Types].xml': (
+        XML + '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '<Override PartName="/xl/styles.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+        '</Types>'
+    ),
+    '_rels/.rels': (
+        XML + f'<Relationships xmlns="{NS_PKG}">'
+        f'<Relationship Id="rId1" Type="{NS_REL}/officeDocument" Target="xl/workbook.xml"/>'
+        '</Relationships>'
+    ),
+    'xl/_rels/workbook.xml.rels': (
+        XML + f'<Relationships xmlns="{NS_PKG}">'
+        f'<Relationship Id="rId1" Type="{NS_REL}/worksheet" Target="worksheets/sheet1.xml"/>'
+        f'<Relationship Id="rId2" Type="{NS_REL}/styles" Target="styles.xml"/>'
+        '</Relationships>'
+    ),
+    'xl/styles.xml': (
+        XML + f'<styleSheet xmlns="{NS_MAIN}">'
+        '<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font>'
+        '<font><b/><sz val="11"/><name val="Calibri"/></font></fonts>'
+        '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+        '<fill><patternFill patternType="gray125"/></fill></fills>'
+        '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+        '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+        '<cellXfs count="4">'
+        '<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+        '<xf numFmtId="14" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+        '<xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1"/>'
+        '<xf numFmtId="4" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+        '</cellXfs>'
+        '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+        '</styleSheet>'
+    ),
+}
+
+DEBUT_FEUILLE = (
+    XML + f'<worksheet xmlns="{NS_MAIN}">'
+    '<sheetViews><sheetView workbookViewId="0">'
+    '<pane ySplit="1" topLeftCell="A2" activePane="bottomLeft" state="frozen"/>'
+    '</sheetView></sheetViews><sheetData>'
+)
+FIN_FEUILLE = '</sheetData></worksheet>'
+
+
+def classeur(nom_feuille):
+    return (
+        XML + f'<workbook xmlns="{NS_MAIN}" xmlns:r="{NS_REL}"><sheets>'
+        f'<sheet name="{escape(nom_feuille[:31], {chr(34): "&quot;"})}" sheetId="1" r:id="rId1"/>'
+        '</sheets></workbook>'
+    )
+
+
+def cellule(valeur, style=0):
+    """XML d'une cellule ; None donne une cellule vide"""
+    if valeur is None or valeur == '':
+        return '<c/>'
+    if isinstance(valeur, bool):
+        return f'<c t="b"><v>{int(valeur)}</v></c>'
+    if isinstance(valeur, datetime.datetime):
+        valeur = valeur.date()
+    if isinstance(valeur, datetime.date):
+        return f'<c s="{STYLE_DATE}"><v>{(valeur - ORIGINE_EXCEL).days}</v></c>'
+    if isinstance(valeur, Decimal):
+        return f'<c s="{STYLE_MONTANT}"><v>{valeur}</v></c>'
+    if isinstance(valeur, (int, float)):
+        return f'<c><v>{valeur}</v></c>'
+    texte = escape(CARACTERES_INTERDITS.sub('', str(valeur)))
+    attribut_style = f' s="{style}"' if style else ''
+    return f'<c t="inlineStr"{attribut_style}><is><t xml:space="preserve">{texte}</t></is></c>'
+
+
+def ligne(numero, valeurs, style=0):
+    return f'<row r="{numero}">' + ''.join(cellule(valeur, style) for valeur in valeurs) + '</row>'
+
+
+def ecrire_xlsx(entetes, lignes, nom_feuille='Export'):
+    """
+    Générateur des octets d'un classeur d'une feuille : une ligne d'en-têtes
+    en gras, figée, puis les lignes (itérable de tuples) lues au fil de l'eau
+    """
+    tampon = TamponFlux()
+    with zipfile.ZipFile(tampon, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for nom, contenu in chain(PARTIES.items(), [('xl/workbook.xml', classeur(nom_feuille))]):
+            archive.writestr(nom, contenu)
+        yield tampon.vider()
+
+        with archive.open('xl/worksheets/sheet1.xml', 'w') as feuille:
+            morceau = [DEBUT_FEUILLE, ligne(1, entetes, STYLE_ENTETE)]
+            for numero, valeurs in enumerate(lignes, start=2):
+                morceau.append(ligne(numero, valeurs))
+                if len(morceau) >= LIGNES_PAR_MORCEAU:
+                    feuille.write(''.join(morceau).encode())
+                    morceau.clear()
+                    yield tampon.vider()
+            morceau.append(FIN_FEUILLE)
+            feuille.write(''.join(morceau).encode())
+    yield tampon.vider()
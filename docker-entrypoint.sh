@@ -16,10 +16,22 @@ echo "PostgreSQL est prêt!"
 echo "Application des migrations..."
 python manage.py migrate --noinput
 
-# Collecter les fichiers statiques
+# Préparer les partitions mensuelles (mois courant et suivants)
+echo "Préparation des partitions mensuelles..."
+python manage.py gerer_partitions
+
+# Compiler les styles Tailwind d'après les gabarits
+echo "Compilation des styles..."
+python manage.py construire_styles
+
+# Collecter les fichiers statiques (noms empreints en production)
 echo "Collecte des fichiers statiques..."
 python manage.py collectstatic --noinput
 
+# Compiler l'index des références médicales (projeté en mémoire par les workers)
+echo "Compilation de l'index des références..."
+python manage.py construire_index_references
+
 # Créer un superutilisateur si il n'existe pas
 echo "Création du superutilisateur par défaut..."
 python manage.py shell << EOF
@@ -32,5 +44,6 @@ else:
     print('Superutilisateur existe déjà')
 EOF
 
+# Workers, préchargement, recyclage et type de serveur (SERVEUR=wsgi|asgi) : gunicorn.conf.py
 echo "Démarrage du serveur de production avec Gunicorn..."
-exec gunicorn --bind 0.0.0.0:8000 --workers 3 maieutix.wsgi:application
\ No newline at end of file
+exec gunicorn -c gunicorn.conf.py
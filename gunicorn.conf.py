@@ -0,0 +1,122 @@
+"""
+Configuration gunicorn de production (docker-entrypoint.sh : gunicorn -c gunicorn.conf.py)
+
+Réglable par variables d'environnement, voir le README (Serveur d'application) :
+- SERVEUR : wsgi (workers gthread, synchrones si GUNICORN_THREADS=1) ou asgi (uvicorn)
+- GUNICORN_WORKERS / GUNICORN_THREADS : dimensionnés par défaut sur les CPU du conteneur
+- GUNICORN_MAX_REQUESTS / GUNICORN_MAX_REQUESTS_JITTER : recyclage des workers
+- GUNICORN_PRELOAD : application chargée une fois par le maître, partagée par les workers
+"""
+
+import math
+import os
+import time
+
+import decouple
+
+
+def processeurs_disponibles():
+    """CPU utilisables : affinité du processus, bornée par le quota cgroup (v2) du conteneur"""
+    if hasattr(os, 'sched_getaffinity'):
+        nombre = len(os.sched_getaffinity(0))
+    else:
+        nombre = os.cpu_count() or 1
+    try:
+        with open('/sys/fs/cgroup/cpu.max') as fichier:
+            quota, periode = fichier.read().split()
+        if quota != 'max':
+            nombre = min(nombre, max(1, math.ceil(int(quota) / int(periode))))
+    except (OSError, ValueError):
+        pass
+    return nombre
+
+
+SERVEUR = decouple.config('SERVEUR', default='wsgi')
+CPU = processeurs_disponibles()
+
+bind = decouple.config('GUNICORN_BIND', default='0.0.0.0:8000')
+
+if SERVEUR == 'asgi':
+    wsgi_app = 'maieutix.asgi:application'
+    worker_class = 'uvicorn_worker.UvicornWorker'
+    # Une boucle d'événements par CPU suffit : l'attente ne bloque pas le worker
+    workers = decouple.config('GUNICORN_WORKERS', default=max(2, CPU), cast=int)
+    threads = 1
+else:
+    wsgi_app = 'maieutix.wsgi:application'
+    # gthread : une requête longue (téléchargement en flux) n'occupe qu'un thread et
+    # n'empêche pas le worker de signaler qu'il est vivant. Chaque thread garde sa
+    # connexion persistante : workers × threads connexions au plus.
+    workers = decouple.config('GUNICORN_WORKERS', default=min(CPU + 1, 8), cast=int)
+    threads = decouple.config('GUNICORN_THREADS', default=4, cast=int)
+    worker_class = 'gthread' if threads > 1 else 'sync'
+
+# Le maître importe Django, les vues et l'index des tarifs une seule fois ; les workers
+# forkés partagent ces pages (copie à l'écriture). Un rechargement (HUP) ne relit
+# alors pas le code : redémarrer le conteneur pour déployer.
+preload_app = decouple.config('GUNICORN_PRELOAD', default=True, cast=bool)
+
+# Recyclage : chaque worker est remplacé après ~1000 requêtes pour borner la croissance
+# mémoire ; la gigue évite que tous les workers redémarrent en même temps
+max_requests = decouple.config('GUNICORN_MAX_REQUESTS', default=1000, cast=int)
+max_requests_jitter = decouple.config('GUNICORN_MAX_REQUESTS_JITTER', default=max_requests // 10, cast=int)
+
+# Délai au-delà duquel un worker muet est tué. Un worker gthread (ou uvicorn) signale
+# qu'il est vivant pendant ses requêtes : seul un worker bloqué est concerné. Un worker
+# synchrone (GUNICORN_THREADS=1) ne le signale qu'entre deux requêtes et serait tué
+# en plein téléchargement : l'augmenter alors au-delà des exports les plus longs.
+timeout = decouple.config('GUNICORN_TIMEOUT', default=120, cast=int)
+graceful_timeout = decouple.config('GUNICORN_GRACEFUL_TIMEOUT', default=30, cast=int)
+keepalive = decouple.config('GUNICORN_KEEPALIVE', default=5, cast=int)
+# Battements des workers en mémoire plutôt que sur le disque du conteneur
+worker_tmp_dir = '/dev/shm' if os.path.isdir('/dev/shm') else None
+
+# Requêtes signalées dans le journal au-delà de ce seuil (workers sync et gthread)
+SEUIL_REQUETE_LENTE = decouple.config('GUNICORN_SEUIL_LENT_MS', default=1000, cast=int) / 1000
+
+loglevel = decouple.config('GUNICORN_LOGLEVEL', default='info')
+errorlog = '-'
+
+
+def when_ready(server):
+    if server.cfg.preload_app:
+        from core.prechauffage import fermer_connexions, prechauffer
+        bilan = prechauffer()
+        fermer_connexions()
+        server.log.info(
+            "Préchauffage : %(urls)s URL, %(gabarits)s gabarits, %(modeles)s modèles en %(duree).2f s", bilan
+        )
+    server.log.info(
+        "Serveur %s : %s worker(s) %s × %s thread(s), recyclage après %s (+%s) requêtes",
+        SERVEUR, server.cfg.workers, server.cfg.worker_class_str, server.cfg.threads,
+        server.cfg.max_requests, server.cfg.max_requests_jitter,
+    )
+
+
+def post_fork(server, worker):
+    worker.demarrage = time.monotonic()
+
+
+def post_worker_init(worker):
+    from core.prechauffage import ouvrir_connexions, prechauffer
+    if not worker.cfg.preload_app:
+        prechauffer()
+    ouvrir_connexions()
+    worker.log.info("Worker %s prêt en %.2f s", worker.pid, time.monotonic() - worker.demarrage)
+
+
+def pre_request(worker, req):
+    req.debut = time.monotonic()
+
+
+def post_request(worker, req, environ, resp):
+    duree = time.monotonic() - req.debut
+    if duree >= SEUIL_REQUETE_LENTE:
+        worker.log.warning(
+            "Requête lente (worker %s) : %s %s -> %s en %.0f ms",
+            worker.pid, req.method, req.path, resp.status, duree * 1000,
+        )
+
+
+def worker_exit(server, worker):
+    server.log.info("Worker %s arrêté après %s requête(s)", worker.pid, worker.nr)
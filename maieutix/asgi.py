@@ -14,3 +14,8 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'maieutix.settings')
 
 application = get_asgi_application()
+
+# Index des tarifs construit au démarrage du worker
+from core.tarifs import precharger_index  # noqa: E402
+
+precharger_index()
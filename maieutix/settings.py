@@ -24,6 +24,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'core',
 ]
 
@@ -35,6 +36,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.htmx.VaryHtmxMiddleware',
 ]
 
 ROOT_URLCONF = 'maieutix.urls'
@@ -43,18 +45,31 @@ TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [],
-        'APP_DIRS': True,
         'OPTIONS': {
             'context_processors': [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'core.htmx.gabarit_base',
+            ],
+            # Gabarits compilés une fois par processus (préchauffés par gunicorn), pages et
+            # fragments HTMX compris ; en DEBUG, le chargeur est vidé à chaque modification
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
             ],
         },
     },
 ]
 
 WSGI_APPLICATION = 'maieutix.wsgi.application'
+ASGI_APPLICATION = 'maieutix.asgi.application'
+
+# Serveur d'application : 'wsgi' (gunicorn, workers gthread) ou 'asgi'
+# (gunicorn + workers uvicorn, vues async) ; voir docker-entrypoint.sh
+SERVEUR = config('SERVEUR', default='wsgi')
 
 # Database
 DATABASES = {
@@ -72,6 +87,24 @@ DATABASES = {
     }
 }
 
+if SERVEUR == 'asgi':
+    # Sous ASGI, les vues synchrones tournent chacune dans un thread : des connexions
+    # persistantes par thread s'accumuleraient. Pool de connexions du processus à la place.
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+    DATABASES['default']['OPTIONS']['pool'] = {
+        'min_size': 2,
+        'max_size': config('DB_POOL_MAX', default=10, cast=int),
+        'timeout': 10,
+    }
+
+# Cache partagé entre les workers Gunicorn (même conteneur, sans service externe)
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': config('CACHE_LOCATION', default='/tmp/maieutix_cache'),
+    }
+}
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -97,10 +130,42 @@ USE_TZ = True
 # Static files (CSS, JavaScript, Images)
 STATIC_URL = '/static/'
 STATIC_ROOT = BASE_DIR / 'staticfiles'
+# En production, noms empreints (tailwind.3f2a…c9.css) : nginx les sert avec
+# Cache-Control immutable, un déploiement change les noms des fichiers modifiés.
+# collectstatic y ajoute les versions .gz et .br (core.stockage, gzip_static de nginx)
+STATIC_MANIFEST = config('STATIC_MANIFEST', default=not DEBUG, cast=bool)
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': (
+            'core.stockage.StockageStatiqueCompresse' if STATIC_MANIFEST
+            else 'django.contrib.staticfiles.storage.StaticFilesStorage'
+        ),
+    },
+}
+
+# Styles : compilateur Tailwind autonome (manage.py construire_styles), installé par le Dockerfile
+TAILWIND_CLI = config('TAILWIND_CLI', default='tailwindcss')
+TAILWIND_VERSION = '3.4.17'
 
 # Media files
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
+# PDF servis par nginx (X-Accel-Redirect) ; sans nginx, en développement, par Django
+MEDIA_X_ACCEL_REDIRECT = config('MEDIA_X_ACCEL_REDIRECT', default=not DEBUG, cast=bool)
+
+# Références médicales : corpus Markdown versionné et index compilé (manage.py construire_index_references)
+REFERENCES_DIR = Path(config('REFERENCES_DIR', default=str(BASE_DIR / 'references')))
+REFERENCES_INDEX = Path(config('REFERENCES_INDEX', default=str(BASE_DIR / 'var' / 'references.idx')))
+
+# Facturation CAFAT : nombre maximal de feuilles de soins par bon de dépôt
+CAFAT_FEUILLES_PAR_BORDEREAU = config('CAFAT_FEUILLES_PAR_BORDEREAU', default=20, cast=int)
+
+# Processus de rendu PDF d'une génération d'états lancée depuis l'interface.
+# Le worker (run_jobs --concurrency) exécute déjà plusieurs tâches en parallèle.
+ETATS_RECAPITULATIFS_PROCESSUS = config('ETATS_RECAPITULATIFS_PROCESSUS', default=1, cast=int)
 
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
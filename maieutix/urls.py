@@ -17,16 +17,42 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path
 from core.views import (
-    home_view, feuille_soins_view, patients_view, outils_view, 
-    statistiques_view, administration_sages_femmes_view
+    home_view, feuille_soins_view, patients_view, outils_view, calculatrice_view,
+    calendrier_grossesse_view, echeancier_grossesses_view, references_view, reference_view,
+    statistiques_view, administration_sages_femmes_view,
+    historique_consultation_view, historique_consultation_page_view,
+    recherche_consultation_view, feuille_soins_pdf_view, recherche_patient_view, rapport_mensuel_view,
+    analyse_activite_view, etats_recapitulatifs_view, etats_recapitulatifs_progression_view,
+    etat_recapitulatif_pdf_view, bons_depot_view, bons_depot_telechargement_view,
+    exports_view, export_consultations_view, export_sages_femmes_view,
 )
 
 urlpatterns = [
     path('', home_view, name='home'),
     path('feuille-soins/', feuille_soins_view, name='feuille_soins'),
+    path('feuille-soins/recherche/', recherche_consultation_view, name='recherche_consultations'),
+    path('feuille-soins/historique/', historique_consultation_view, name='historique_consultations'),
+    path('feuille-soins/historique/page/', historique_consultation_page_view, name='historique_consultations_page'),
+    path('feuille-soins/<int:pk>/pdf/', feuille_soins_pdf_view, name='feuille_soins_pdf'),
     path('patients/', patients_view, name='patients'),
+    path('patients/recherche/', recherche_patient_view, name='recherche_patients'),
+    path('patients/echeancier/', echeancier_grossesses_view, name='echeancier_grossesses'),
     path('outils/', outils_view, name='outils'),
+    path('outils/calculatrice/', calculatrice_view, name='calculatrice'),
+    path('outils/grossesse/', calendrier_grossesse_view, name='calendrier_grossesse'),
+    path('outils/references/', references_view, name='references'),
+    path('outils/references/<slug:slug>/', reference_view, name='reference'),
     path('statistiques/', statistiques_view, name='statistiques'),
+    path('statistiques/rapport-mensuel/', rapport_mensuel_view, name='rapport_mensuel'),
+    path('statistiques/analyse/', analyse_activite_view, name='analyse_activite'),
     path('administration/sages-femmes/', administration_sages_femmes_view, name='administration_sages_femmes'),
+    path('facturation/etats-recapitulatifs/', etats_recapitulatifs_view, name='etats_recapitulatifs'),
+    path('facturation/etats-recapitulatifs/progression/<int:pk>/', etats_recapitulatifs_progression_view, name='etats_recapitulatifs_progression'),
+    path('facturation/etats-recapitulatifs/<int:pk>/pdf/', etat_recapitulatif_pdf_view, name='etat_recapitulatif_pdf'),
+    path('facturation/bons-depot/', bons_depot_view, name='bons_depot'),
+    path('facturation/bons-depot/telechargement/', bons_depot_telechargement_view, name='bons_depot_telechargement'),
+    path('facturation/exports/', exports_view, name='exports'),
+    path('facturation/exports/consultations/', export_consultations_view, name='export_consultations'),
+    path('facturation/exports/sages-femmes/', export_sages_femmes_view, name='export_sages_femmes'),
     path('admin/', admin.site.urls),
 ]
@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'maieutix.settings')
 
 application = get_wsgi_application()
+
+# Index des tarifs construit au démarrage du worker
+from core.tarifs import precharger_index  # noqa: E402
+
+precharger_index()
@@ -0,0 +1,25 @@
+/**
+ * Configuration Tailwind CSS (v3)
+ * Compilée avec les gabarits par `python manage.py construire_styles` :
+ * seules les classes présentes dans les fichiers de `content` sont générées.
+ */
+module.exports = {
+  content: [
+    './core/templates/**/*.html',
+    './core/static/core/js/**/*.js',
+    // Classes des widgets de formulaires
+    './core/forms/**/*.py',
+  ],
+  theme: {
+    extend: {
+      colors: {
+        'primary': '#2D4B73',
+        'secondary': '#253C59',
+        'accent': '#99B4BF',
+        'highlight': '#D9BA23',
+        'warning': '#BF8D30',
+      },
+    },
+  },
+  plugins: [],
+}